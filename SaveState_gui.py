@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QStatusBar, QFrame, QSizePolicy,
     QGroupBox, QLineEdit,
-    QStyle, QDockWidget, QPlainTextEdit, QTextEdit, QTableWidget, QGraphicsOpacityEffect,
+    QStyle, QDockWidget, QPlainTextEdit, QTextEdit, QGraphicsOpacityEffect,
     QDialog, QFileDialog, QMenu, QSpinBox, QComboBox, QCheckBox, QFormLayout,
     QSizeGrip, QMessageBox, QGridLayout, QSystemTrayIcon, QInputDialog
 )
@@ -58,6 +58,7 @@ else:
 from gui.gui_utils import QtLogHandler
 from common.utils import resource_path
 from gui_components.profile_list_manager import ProfileListManager
+from gui_components.profile_table_model import ProfileTableView
 from gui_components.theme_manager import ThemeManager
 from gui_components.profile_creation_manager import ProfileCreationManager
 from gui_components.drag_drop_handler import DragDropHandler
@@ -296,7 +297,7 @@ class _DialogConfirmButtonStyler(_QObject):
 class _MainSearchKeyFilter(_QObject):
     """Route typing in the main profile view to its hidden search field.
 
-    QTableWidget implements its own keyboard search and can consume printable
+    The profile table view implements its own keyboard search and can consume printable
     key presses before they reach MainWindow.event(). Filtering at application
     level lets SaveState claim the first character consistently, regardless of
     which control received focus when the main window was shown.
@@ -464,7 +465,7 @@ class MainWindow(QMainWindow):
         icon_size = QSize(16, 16) # Dimensione comune icone
 
         # --- Widget ---
-        self.profile_table_widget = QTableWidget()
+        self.profile_table_widget = ProfileTableView()
         
         self.settings_button = QPushButton()
         self.controller_button = QPushButton()
@@ -853,7 +854,7 @@ class MainWindow(QMainWindow):
         overrides_form.addRow("Max backups:", self.override_max_backups_row)
         # Compression mode
         self.override_compression_combo = QComboBox()
-        self.override_compression_combo.addItems(["standard", "maximum", "stored"])
+        self.override_compression_combo.addItems(["standard", "maximum", "stored", "adaptive", "lzma", "zstd"])
         self.override_compression_combo.setSizePolicy(
             QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed
         )
@@ -1120,7 +1121,10 @@ class MainWindow(QMainWindow):
         self.settings_compression_options = {
             "standard": "Standard (Recommended)",
             "maximum": "Maximum (Slower)",
-            "stored": "None (Faster)"
+            "stored": "None (Faster)",
+            "adaptive": "Adaptive (Skip Compressed Files)",
+            "lzma": "LZMA (Smallest, Slowest)",
+            "zstd": "Zstandard (Fast, needs zstandard)"
         }
         for key, text in self.settings_compression_options.items():
             self.settings_compression_combo.addItem(text, key)
@@ -1477,7 +1481,7 @@ class MainWindow(QMainWindow):
         self._update_dialog = None
 
         # MainWindow.event() alone cannot see keys consumed by focused child
-        # widgets (notably QTableWidget's built-in type-ahead navigation).
+        # widgets (notably the table view's built-in type-ahead navigation).
         # Keep a dedicated application filter alive for the window lifetime.
         self._main_search_key_filter = _MainSearchKeyFilter(self)
         QApplication.instance().installEventFilter(self._main_search_key_filter)
@@ -2062,37 +2066,10 @@ class MainWindow(QMainWindow):
             logging.warning("_on_main_search_text_changed: profile_table_widget not found.")
             return
 
-        visible_rows = 0
-        for i in range(self.profile_table_widget.rowCount()):
-            item = self.profile_table_widget.item(i, 1)  # Profile name in the SECOND column (index 1)
-            row_should_be_hidden = True # Default to hiding
-
-            if item and item.text():
-                profile_name = item.text().lower()
-                logging.debug(f"  Row {i}: Profile name '{profile_name}'")
-                if search_term:
-                    if search_term in profile_name:
-                        row_should_be_hidden = False
-                        logging.debug(f"    -> Match found. Row {i} will be SHOWN.")
-                    else:
-                        row_should_be_hidden = True
-                        logging.debug(f"    -> No match. Row {i} will be HIDDEN.")
-                else: # No search term, so show all valid rows
-                    row_should_be_hidden = False
-                    logging.debug(f"    -> No search term. Row {i} (valid item) will be SHOWN.")
-            else:
-                logging.debug(f"  Row {i}: No item or item has no text.")
-                if search_term: # If searching and item is invalid, hide it
-                    row_should_be_hidden = True
-                    logging.debug(f"    -> Invalid item and searching. Row {i} will be HIDDEN.")
-                else: # No search term, show even if item is somehow invalid (though ideally shouldn't happen)
-                    row_should_be_hidden = False # Or True, depending on desired behavior for empty/invalid rows with no search
-                    logging.debug(f"    -> Invalid item, no search term. Row {i} will be SHOWN (or HIDDEN based on policy).")
-            
-            self.profile_table_widget.setRowHidden(i, row_should_be_hidden)
-            if not row_should_be_hidden:
-                visible_rows += 1
-        
+        # Filtering runs in the table's proxy model (rows are not rebuilt)
+        self.profile_table_manager.set_filter_text(text)
+        visible_rows = self.profile_table_widget.rowCount()
+
         logging.debug(f"Total visible rows after filter: {visible_rows}")
 
         if not text:
@@ -3972,11 +3949,7 @@ class MainWindow(QMainWindow):
         # If there's a specific profile targeted, try to select it first so regular actions apply to it
         if target_profile and hasattr(self, 'profile_table_manager') and hasattr(self, 'profile_table_widget'):
             # Find row with this profile and select it
-            for row in range(self.profile_table_widget.rowCount()):
-                item = self.profile_table_widget.item(row, 0)
-                if item and item.text() == target_profile:
-                    self.profile_table_widget.selectRow(row)
-                    break
+            self.profile_table_manager.select_profile_in_table(target_profile)
         
         # Set flag so backup-finished callbacks show a tray notification when app is in background
         if is_bg and hasattr(self, 'handlers'):
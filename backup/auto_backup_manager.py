@@ -6,7 +6,7 @@ In-process automatic local backup engine for SaveState.
 Runs entirely inside the main application process (no subprocess, no extra
 executable) so it stays compatible with single-file Nuitka builds. A single
 lightweight QTimer ticks on the GUI thread; the actual backup work is offloaded
-to a WorkerThread so the UI never freezes.
+to WorkerThreads so the UI never freezes.
 
 The feature relies on the application staying alive in the system tray, exactly
 like the cloud periodic sync already does. When at least one profile has
@@ -29,18 +29,31 @@ Modes
 - interval_fixed   : back up every ``interval_minutes`` unconditionally.
 - process_close    : back up whenever a watched process transitions from
                      running to not-running (i.e. the game was closed).
+
+"Changed since the last backup" is answered by ``save_watcher`` from
+filesystem events where possible (inotify on Linux); otherwise the save
+folders are scanned for their newest mtime. On Linux, game closes are
+reported by ``process_watch_utils.ProcessWatcher`` as they happen instead of
+on the next tick.
+
+Backups that are due are queued in ``auto_backup_scheduler`` and run
+concurrently on a few WorkerThreads, most urgent first.
 """
 
+import functools
 import logging
 import os
 import time
 from datetime import datetime
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QObject, QTimer, Signal
 
+from core import backup_catalog
 from core import core_logic
+from backup import auto_backup_scheduler
 from backup import backup_runner
 from backup import backup_safety
+from backup import save_watcher
 from common import process_watch_utils
 from gui.gui_utils import WorkerThread
 
@@ -72,7 +85,7 @@ def _default_auto_backup_config() -> dict:
     }
 
 
-def _do_silent_backup(profile_name, paths=None):
+def _do_silent_backup(profile_name, paths=None, quiet_since=None):
     """Worker entry point. Returns (success, message) for WorkerThread.
 
     Runs on a WorkerThread (never the GUI thread), so the blocking quiescence
@@ -82,7 +95,9 @@ def _do_silent_backup(profile_name, paths=None):
     try:
         # Safety gate: never archive a save while an app is writing it.
         try:
-            safe = backup_safety.wait_for_quiescence(paths, profile_name=profile_name)
+            safe = backup_safety.wait_for_quiescence(
+                paths, profile_name=profile_name, quiet_since=quiet_since,
+            )
         except Exception as e_safe:
             # A failure in the safety check itself must not silently allow an
             # unsafe backup: be conservative and skip.
@@ -103,6 +118,11 @@ def _do_silent_backup(profile_name, paths=None):
         return False, f"Auto-backup error for {profile_name}: {e}"
 
 
+class _ProcessEventBridge(QObject):
+    """Carries ProcessWatcher callbacks from its thread to the GUI thread."""
+    changed = Signal()
+
+
 class AutoBackupManager:
     """Manages the automatic local backup timer and its per-profile state."""
 
@@ -110,9 +130,15 @@ class AutoBackupManager:
         self.main_window = main_window
         self._timer: QTimer | None = None
         self._started = False
-        self._busy = False
-        self._worker: WorkerThread | None = None
-        self._active_profile: str | None = None
+        # Pending/running backups and the workers running them (name -> WorkerThread).
+        self._scheduler: auto_backup_scheduler.AutoBackupScheduler | None = None
+        self._workers: dict[str, WorkerThread] = {}
+        # Filesystem event tracker; answers "changed since last backup?"
+        # without walking the save folders when the platform supports it.
+        self._watcher: save_watcher.SaveWatcher | None = None
+        # Event-driven process_close detection (Linux); None -> per-tick scans.
+        self._process_watcher: process_watch_utils.ProcessWatcher | None = None
+        self._process_bridge: _ProcessEventBridge | None = None
 
         # name -> resolved config dict ({mode, interval_minutes, process_names, paths, data})
         self._enabled: dict[str, dict] = {}
@@ -138,9 +164,22 @@ class AutoBackupManager:
         self._timer = QTimer(self.main_window)
         self._timer.setInterval(CHECK_INTERVAL_MS)
         self._timer.timeout.connect(self._on_tick)
+        settings = getattr(self.main_window, "current_settings", {}) or {}
+        if self._scheduler is None:
+            self._scheduler = auto_backup_scheduler.AutoBackupScheduler(settings.get("auto_backup_workers"))
+        self._watcher = save_watcher.create_save_watcher(settings.get("auto_backup_watcher", "auto"))
+        if process_watch_utils.ProcessWatcher.is_supported():
+            try:
+                self._process_bridge = _ProcessEventBridge()
+                self._process_bridge.changed.connect(self._on_process_event)
+                self._process_watcher = process_watch_utils.ProcessWatcher(self._process_bridge.changed.emit)
+            except Exception as e:
+                logging.warning(f"AutoBackupManager: process watcher unavailable, using per-tick scans: {e}")
+                self._process_watcher = None
         self._started = True
         logging.info("AutoBackupManager started.")
         self.reload()
+        self._restore_queue()
 
     def stop(self):
         if not self._started:
@@ -150,6 +189,12 @@ class AutoBackupManager:
                 self._timer.stop()
             except Exception:
                 pass
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+        if self._process_watcher:
+            self._process_watcher.close()
+            self._process_watcher = None
         self._started = False
         logging.info("AutoBackupManager stopped.")
 
@@ -195,6 +240,13 @@ class AutoBackupManager:
 
         self._enabled = new_enabled
 
+        if self._process_watcher:
+            self._process_watcher.set_watched_names({
+                p for cfg in self._enabled.values()
+                if cfg["mode"] == MODE_PROCESS_CLOSE
+                for p in cfg["process_names"]
+            })
+
         # Rebuild runtime state, preserving timers for profiles that stayed enabled.
         now = time.monotonic()
         running_names = None
@@ -205,7 +257,7 @@ class AutoBackupManager:
             st.setdefault("last_check", now)
             if cfg["mode"] == MODE_PROCESS_CLOSE:
                 if running_names is None:
-                    running_names = process_watch_utils.list_running_process_names()
+                    running_names = self._running_process_names()
                 # Initialize so we only fire on a future running -> not-running edge.
                 matched = set(cfg["process_names"]) & running_names
                 st["proc_was_running"] = bool(matched)
@@ -239,6 +291,17 @@ class AutoBackupManager:
             new_state[name] = st
         self._state = new_state
 
+        # Only the interval modes ask whether the save changed.
+        if self._watcher:
+            self._watcher.set_profiles({
+                name: cfg["paths"] for name, cfg in self._enabled.items()
+                if cfg["mode"] != MODE_PROCESS_CLOSE
+            })
+
+        for name in self._scheduler.queued_names():
+            if name not in self._enabled:
+                self._scheduler.discard(name)
+
         # Start/stop the timer depending on whether anything is enabled.
         if self._enabled:
             if self._timer and not self._timer.isActive():
@@ -260,11 +323,15 @@ class AutoBackupManager:
         """Return sorted profile names that currently have auto-backup enabled."""
         return sorted(self._enabled.keys())
 
+    def get_scheduler_metrics(self) -> dict:
+        """Queue depth, running backups and wait/run times (see AutoBackupScheduler.metrics)."""
+        return self._scheduler.metrics() if self._scheduler else {}
+
     # ------------------------------------------------------------------
     # Tick logic
     # ------------------------------------------------------------------
     def _on_tick(self):
-        if self._busy or not self._enabled:
+        if not self._enabled:
             return
         try:
             settings = getattr(self.main_window, "current_settings", {}) or {}
@@ -281,6 +348,8 @@ class AutoBackupManager:
 
                 mode = cfg["mode"]
                 interval_sec = cfg["interval_minutes"] * 60
+                if mode != MODE_PROCESS_CLOSE and self._scheduler.is_pending(name):
+                    continue
 
                 should_backup = False
 
@@ -288,7 +357,7 @@ class AutoBackupManager:
                     if not cfg["process_names"]:
                         continue
                     if running_names is None:
-                        running_names = process_watch_utils.list_running_process_names()
+                        running_names = self._running_process_names()
                     is_running = bool(set(cfg["process_names"]) & running_names)
                     was_running = bool(st.get("proc_was_running"))
                     # Log only on a running-state change to keep the log readable.
@@ -366,20 +435,53 @@ class AutoBackupManager:
                     )
                     continue
 
-                self._trigger_backup(name)
-                # Only one backup per tick; the rest are evaluated next tick.
-                break
+                self._enqueue_backup(name, cfg, backup_base_dir)
+            self._dispatch()
         except Exception as e:
             logging.error(f"AutoBackupManager tick error: {e}", exc_info=True)
 
+    def _running_process_names(self) -> set[str]:
+        if self._process_watcher:
+            return self._process_watcher.running_names()
+        return process_watch_utils.list_running_process_names()
+
+    def _on_process_event(self):
+        """A watched process started or exited: evaluate now instead of next tick."""
+        if self._started:
+            self._on_tick()
+
     def _save_changed_since_last_backup(self, name, cfg, backup_base_dir) -> bool:
-        """True if the save folder is newer than the most recent backup."""
+        """True if the save folder is newer than the most recent backup.
+
+        Answered from filesystem events when the watcher tracks the profile;
+        otherwise the save folders are scanned and, if they match the last
+        backup, that point becomes the watcher's baseline.
+        """
         paths = cfg.get("paths") or []
         if not paths:
             logging.warning(
                 "[AutoBackup] '%s' change check: no save paths configured.", name,
             )
             return False
+        watched = self._watcher.changed_since_clean(name) if self._watcher else None
+        if watched is not None:
+            last_write = self._watcher.last_write(name)
+            logging.info(
+                "[AutoBackup] '%s' change check (%s): last write=%s.",
+                name, self._watcher.backend,
+                datetime.fromtimestamp(last_write).strftime("%Y-%m-%d %H:%M:%S")
+                if last_write else "none since last backup",
+            )
+            return watched
+        scan_started = time.time()
+        changed = self._scan_changed_since_last_backup(name, cfg, backup_base_dir)
+        if not changed and self._watcher:
+            self._watcher.mark_clean(name, scan_started)
+        return changed
+
+    def _scan_changed_since_last_backup(self, name, cfg, backup_base_dir) -> bool:
+        """Polling fallback: compare the newest save mtime with the last backup."""
+        paths = cfg.get("paths") or []
         latest_mtime = self._latest_mtime(paths)
         if latest_mtime <= 0:
             logging.warning(
@@ -416,27 +518,74 @@ class AutoBackupManager:
     # ------------------------------------------------------------------
     # Backup execution
     # ------------------------------------------------------------------
-    def _trigger_backup(self, profile_name):
-        if self._busy:
+    def _enqueue_backup(self, name, cfg, backup_base_dir, reason=None, enqueued_at=None):
+        """Queue a backup; priority uses the age and size of the last backup."""
+        stale_seconds = 0.0
+        size_bytes = 0
+        try:
+            _count, last_dt = core_logic.get_profile_backup_summary(
+                name, backup_base_dir, profile_data=cfg.get("data")
+            )
+            stale_seconds = (datetime.now() - last_dt).total_seconds() if last_dt else float("inf")
+            folder = core_logic.get_backup_folder_name(name, cfg.get("data"))
+            size_bytes = backup_catalog.get_latest_size(backup_base_dir, folder) or 0
+        except Exception as e:
+            logging.debug(f"AutoBackupManager: priority inputs unavailable for '{name}': {e}")
+        entry = {"profile_name": name, "mode": cfg["mode"], "reason": reason or cfg["mode"],
+                 "enqueued_at": enqueued_at}
+        self._scheduler.restore(entry, cfg.get("paths") or [], stale_seconds, size_bytes)
+        logging.info(
+            "[AutoBackup] '%s' queued (%s); queue depth %d.",
+            name, entry["reason"], self._scheduler.metrics()["queue_depth"],
+        )
+
+    def _restore_queue(self):
+        """Re-queue backups left pending by the previous session."""
+        if not self._enabled:
             return
-        self._busy = True
-        self._active_profile = profile_name
-        logging.info(f"AutoBackupManager: triggering automatic backup for '{profile_name}'.")
+        settings = getattr(self.main_window, "current_settings", {}) or {}
+        backup_base_dir = settings.get("backup_base_dir")
+        for entry in self._scheduler.load_persisted():
+            cfg = self._enabled.get(entry["profile_name"])
+            if cfg is None or self._scheduler.is_pending(entry["profile_name"]):
+                continue
+            self._enqueue_backup(entry["profile_name"], cfg, backup_base_dir,
+                                 reason="resumed from previous session",
+                                 enqueued_at=entry.get("enqueued_at"))
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start queued backups while the scheduler has free worker/device slots."""
+        while True:
+            job = self._scheduler.pop_ready()
+            if job is None:
+                return
+            self._start_worker(job)
+
+    def _start_worker(self, job):
+        profile_name = job.profile_name
+        logging.info(
+            "AutoBackupManager: starting automatic backup for '%s' (%s, waited %.1fs).",
+            profile_name, job.reason, job.started_at - job.enqueued_at,
+        )
+        # Writes after this point are not guaranteed to be in the archive.
+        if profile_name in self._state:
+            self._state[profile_name]["backup_started_at"] = job.started_at
         try:
             # Pass the resolved save paths so the worker can run the in-use
             # safety check before archiving anything.
-            cfg = self._enabled.get(profile_name) or {}
-            paths = list(cfg.get("paths") or [])
-            self._worker = WorkerThread(_do_silent_backup, profile_name, paths)
-            self._worker.finished.connect(self._on_backup_finished)
-            self._worker.start()
+            quiet_since = (functools.partial(self._watcher.quiet_since, profile_name)
+                           if self._watcher else None)
+            worker = WorkerThread(_do_silent_backup, profile_name, list(job.paths), quiet_since)
+            worker.finished.connect(functools.partial(self._on_backup_finished, profile_name))
+            self._workers[profile_name] = worker
+            worker.start()
         except Exception as e:
             logging.error(f"AutoBackupManager: failed to start backup worker: {e}", exc_info=True)
-            self._busy = False
-            self._active_profile = None
+            self._workers.pop(profile_name, None)
+            self._scheduler.finish(profile_name, auto_backup_scheduler.RESULT_FAILED)
 
-    def _on_backup_finished(self, success, message):
-        name = self._active_profile
+    def _on_backup_finished(self, name, success, message):
         skipped = isinstance(message, str) and message.startswith(SKIPPED_IN_USE_PREFIX)
 
         # Update trigger time and reset the change-detection clock only when a
@@ -446,15 +595,28 @@ class AutoBackupManager:
         if not skipped and name and name in self._state:
             self._state[name]["last_trigger"] = time.monotonic()
             self._state[name]["last_check"] = time.monotonic()
+            started_at = self._state[name].get("backup_started_at")
+            if success and self._watcher and started_at:
+                self._watcher.mark_clean(name, started_at)
 
-        self._busy = False
-        self._active_profile = None
-        if self._worker is not None:
-            try:
-                self._worker.finished.disconnect(self._on_backup_finished)
-            except Exception:
-                pass
-            self._worker = None
+        self._workers.pop(name, None)
+        if skipped:
+            result = auto_backup_scheduler.RESULT_SKIPPED
+        else:
+            result = auto_backup_scheduler.RESULT_SUCCESS if success else auto_backup_scheduler.RESULT_FAILED
+        self._scheduler.finish(name, result)
+        metrics = self._scheduler.metrics()
+        logging.info(
+            "[AutoBackup] Scheduler: %d queued, %d running; wait avg %.1fs (max %.1fs), "
+            "run avg %.1fs (max %.1fs).",
+            metrics["queue_depth"], metrics["running"],
+            metrics["wait_s"]["avg"], metrics["wait_s"]["max"],
+            metrics["run_s"]["avg"], metrics["run_s"]["max"],
+        )
+        try:
+            self._dispatch()
+        except Exception as e:
+            logging.error(f"AutoBackupManager dispatch error: {e}", exc_info=True)
 
         # A skipped backup produced nothing: don't refresh "Last backup" and
         # don't raise an error popup (it is not a failure). The safety module
@@ -467,11 +629,11 @@ class AutoBackupManager:
             )
             return
 
-        # Refresh the profile table so "Last backup" updates.
+        # Refresh the profile's row so "Last backup" updates.
         try:
             ptm = getattr(self.main_window, "profile_table_manager", None)
-            if ptm is not None and hasattr(ptm, "update_profile_table"):
-                ptm.update_profile_table()
+            if ptm is not None and hasattr(ptm, "refresh_profile"):
+                ptm.refresh_profile(name)
         except Exception:
             pass
 
@@ -0,0 +1,261 @@
+"""
+auto_backup_scheduler.py
+
+Queue of pending automatic backups for ``AutoBackupManager``.
+
+The manager used to start one backup per timer tick and ignore everything
+else while it ran, so when several games closed at once or the machine woke
+up with many overdue interval profiles, backups trickled out one tick at a
+time. Requests now go through this queue instead:
+
+- one entry per profile: a request for a profile that is already queued is
+  merged into the existing entry (keeping the most urgent mode);
+- entries are ordered by mode (a game that just closed first, then changed
+  saves, then fixed schedules), then by staleness (oldest last backup first),
+  then by size of the last archive (small saves first);
+- up to ``max_workers`` backups run at once, and each one holds a slot on
+  every device its save paths live on: one per rotational disk, more on SSDs
+  and unknown devices (same rules as ``batch_backup``);
+- queued and running entries are kept in ``auto_backup_queue.json`` next to
+  the other configs, so backups interrupted by a quit or a crash run again on
+  the next start;
+- ``metrics()`` reports queue depth and wait/run times.
+
+The scheduler only does bookkeeping; the manager runs the jobs it hands out
+and reports back with ``finish``. It is used from the GUI thread only.
+"""
+
+import collections
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+from backup import batch_backup
+
+QUEUE_FILENAME = "auto_backup_queue.json"
+DEFAULT_MAX_WORKERS = 2
+
+# Lower runs first. Unknown modes sort after the known ones.
+MODE_PRIORITY = {"process_close": 0, "interval_changed": 1, "interval_fixed": 2}
+# Staleness is compared in whole hours so that size can break ties.
+_STALENESS_BUCKET_S = 3600
+# Cap for profiles that were never backed up (infinite staleness).
+_MAX_STALENESS_S = 10 * 365 * 86400
+# Wait/run times kept for metrics.
+_METRICS_WINDOW = 200
+
+RESULT_SUCCESS = "success"
+RESULT_FAILED = "failed"
+RESULT_SKIPPED = "skipped"
+
+
+def get_max_workers(setting_value=None) -> int:
+    """Resolve the ``auto_backup_workers`` setting: 0 means automatic."""
+    if isinstance(setting_value, int) and not isinstance(setting_value, bool) and setting_value > 0:
+        return setting_value
+    return max(1, min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1))
+
+
+@dataclass
+class ScheduledBackup:
+    """One queued (or running) automatic backup."""
+    profile_name: str
+    mode: str
+    reason: str = ""
+    paths: list = field(default_factory=list)
+    stale_seconds: float = 0.0
+    size_bytes: int = 0
+    devices: tuple = ()
+    enqueued_at: float = 0.0  # wall clock, persisted
+    started_at: float = 0.0   # wall clock, set when handed out
+
+    def sort_key(self):
+        return (
+            MODE_PRIORITY.get(self.mode, len(MODE_PRIORITY)),
+            -int(min(self.stale_seconds, _MAX_STALENESS_S) // _STALENESS_BUCKET_S),
+            self.size_bytes,
+            self.enqueued_at,
+        )
+
+
+def _devices_for(paths) -> tuple:
+    devices = set()
+    for p in paths:
+        try:
+            devices.add(os.stat(p).st_dev)
+        except OSError:
+            pass
+    return tuple(sorted(devices))
+
+
+class AutoBackupScheduler:
+    """Priority queue plus bounded, device-aware dispatch of automatic backups."""
+
+    def __init__(self, max_workers: int = None, queue_path: str = None, per_device_limit: int = None):
+        self.max_workers = get_max_workers(max_workers)
+        self.per_device_limit = per_device_limit
+        if queue_path is None:
+            from core import settings_manager
+            queue_path = os.path.join(settings_manager.get_active_config_dir(), QUEUE_FILENAME)
+        self.queue_path = queue_path
+        self._queued: dict[str, ScheduledBackup] = {}
+        self._running: dict[str, ScheduledBackup] = {}
+        self._device_use: dict[int, int] = {}
+        self._device_limits: dict[int, int] = {}
+        self._completed = {RESULT_SUCCESS: 0, RESULT_FAILED: 0, RESULT_SKIPPED: 0}
+        self._wait_times = collections.deque(maxlen=_METRICS_WINDOW)
+        self._run_times = collections.deque(maxlen=_METRICS_WINDOW)
+
+    # --- queue -------------------------------------------------------------
+    def enqueue(self, profile_name: str, mode: str, paths, reason: str = "",
+                stale_seconds: float = 0.0, size_bytes: int = 0) -> bool:
+        """Queue a backup. Returns False if the profile was already queued (the entry is merged)."""
+        existing = self._queued.get(profile_name)
+        if existing is not None:
+            if MODE_PRIORITY.get(mode, 99) < MODE_PRIORITY.get(existing.mode, 99):
+                existing.mode = mode
+                existing.reason = reason
+                self._save()
+            existing.paths = list(paths)
+            existing.devices = _devices_for(paths)
+            return False
+        self._queued[profile_name] = ScheduledBackup(
+            profile_name=profile_name,
+            mode=mode,
+            reason=reason,
+            paths=list(paths),
+            stale_seconds=max(0.0, stale_seconds),
+            size_bytes=max(0, size_bytes),
+            devices=_devices_for(paths),
+            enqueued_at=time.time(),
+        )
+        self._save()
+        return True
+
+    def discard(self, profile_name: str) -> None:
+        """Drop a queued entry (profile deleted or auto-backup disabled)."""
+        if self._queued.pop(profile_name, None) is not None:
+            self._save()
+
+    def is_pending(self, profile_name: str) -> bool:
+        """True if the profile is queued or running."""
+        return profile_name in self._queued or profile_name in self._running
+
+    def queued_names(self) -> list[str]:
+        return [job.profile_name for job in sorted(self._queued.values(), key=ScheduledBackup.sort_key)]
+
+    # --- dispatch ----------------------------------------------------------
+    def _device_limit(self, device: int) -> int:
+        limit = self._device_limits.get(device)
+        if limit is None:
+            if self.per_device_limit:
+                limit = self.per_device_limit
+            else:
+                rotational = batch_backup.is_rotational(device)
+                if rotational is True:
+                    limit = 1
+                elif rotational is False:
+                    limit = self.max_workers
+                else:
+                    limit = batch_backup.DEFAULT_UNKNOWN_DEVICE_LIMIT
+            self._device_limits[device] = limit
+        return limit
+
+    def pop_ready(self):
+        """Hand out the most urgent job that fits the worker and device limits, or None."""
+        if len(self._running) >= self.max_workers:
+            return None
+        for job in sorted(self._queued.values(), key=ScheduledBackup.sort_key):
+            if job.profile_name in self._running:
+                # Requested again while running: start after the current run.
+                continue
+            if any(self._device_use.get(d, 0) >= self._device_limit(d) for d in job.devices):
+                continue
+            del self._queued[job.profile_name]
+            for d in job.devices:
+                self._device_use[d] = self._device_use.get(d, 0) + 1
+            job.started_at = time.time()
+            self._running[job.profile_name] = job
+            self._wait_times.append(job.started_at - job.enqueued_at)
+            # Still persisted (as running) until finish(), so a crash re-runs it.
+            return job
+        return None
+
+    def finish(self, profile_name: str, result: str) -> ScheduledBackup | None:
+        """Release a running job's slots and record its outcome."""
+        job = self._running.pop(profile_name, None)
+        if job is None:
+            return None
+        for d in job.devices:
+            remaining = self._device_use.get(d, 0) - 1
+            if remaining > 0:
+                self._device_use[d] = remaining
+            else:
+                self._device_use.pop(d, None)
+        self._run_times.append(time.time() - job.started_at)
+        self._completed[result] = self._completed.get(result, 0) + 1
+        self._save()
+        return job
+
+    # --- metrics -----------------------------------------------------------
+    def metrics(self) -> dict:
+        """Queue depth, running jobs, outcomes and wait/run times in seconds."""
+        def _stats(values):
+            if not values:
+                return {"last": 0.0, "avg": 0.0, "max": 0.0}
+            return {"last": values[-1], "avg": sum(values) / len(values), "max": max(values)}
+
+        return {
+            "queue_depth": len(self._queued),
+            "running": len(self._running),
+            "max_workers": self.max_workers,
+            "completed": dict(self._completed),
+            "wait_s": _stats(self._wait_times),
+            "run_s": _stats(self._run_times),
+            "oldest_wait_s": max((time.time() - j.enqueued_at for j in self._queued.values()), default=0.0),
+        }
+
+    # --- persistence -------------------------------------------------------
+    def load_persisted(self) -> list[dict]:
+        """Entries left by a previous session: ``[{'profile_name', 'mode', 'reason', 'enqueued_at'}]``."""
+        try:
+            with open(self.queue_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            logging.warning(f"[AutoBackup] Ignoring unreadable backup queue '{self.queue_path}': {e}")
+            return []
+        entries = data.get("queue") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            return []
+        return [e for e in entries if isinstance(e, dict) and isinstance(e.get("profile_name"), str)]
+
+    def restore(self, entry: dict, paths, stale_seconds: float = 0.0, size_bytes: int = 0) -> None:
+        """Re-queue a persisted entry, keeping its original enqueue time."""
+        if self.enqueue(entry["profile_name"], entry.get("mode", ""), paths,
+                        reason=entry.get("reason") or "resumed", stale_seconds=stale_seconds,
+                        size_bytes=size_bytes):
+            enqueued_at = entry.get("enqueued_at")
+            if isinstance(enqueued_at, (int, float)):
+                self._queued[entry["profile_name"]].enqueued_at = float(enqueued_at)
+
+    def _save(self) -> None:
+        jobs = list(self._running.values()) + list(self._queued.values())
+        try:
+            if not jobs:
+                if os.path.exists(self.queue_path):
+                    os.remove(self.queue_path)
+                return
+            tmp_path = self.queue_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"queue": [
+                    {"profile_name": j.profile_name, "mode": j.mode, "reason": j.reason,
+                     "enqueued_at": j.enqueued_at}
+                    for j in jobs
+                ]}, f, indent=2)
+            os.replace(tmp_path, self.queue_path)
+        except OSError as e:
+            logging.warning(f"[AutoBackup] Unable to persist backup queue '{self.queue_path}': {e}")
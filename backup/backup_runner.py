@@ -29,6 +29,7 @@ except ImportError:
 try:
     from core import core_logic
     from core import settings_manager
+    from backup import batch_backup
     import config # Needed to load the correct QSS
     from gui.gui_utils import NotificationPopup 
     from common.utils import resource_path
@@ -222,7 +223,7 @@ def show_notification(success, message, force=False, profile_name=None, profile_
 # --- Group Backup Helper Function ---
 def _run_group_backup(group_name, profiles, settings):
     """
-    Backup all profiles in a group sequentially.
+    Backup all profiles in a group through the batch backup engine.
     
     Uses group settings override if enabled, otherwise falls back to global settings.
     Priority: Group override > Profile override > Global settings
@@ -249,72 +250,15 @@ def _run_group_backup(group_name, profiles, settings):
     
     logging.info(f"Starting group backup for '{group_name}' with {len(member_profiles)} profiles")
     
-    all_success = True
-    success_count = 0
-    failed_profiles = []
-    backup_base_dir = settings.get("backup_base_dir")
-    
-    for idx, member_name in enumerate(member_profiles, 1):
-        logging.info(f"[Group Backup {idx}/{len(member_profiles)}] Backing up: '{member_name}'")
-        
-        member_data = profiles.get(member_name)
-        if not member_data or not isinstance(member_data, dict):
-            logging.error(f"Invalid profile data for group member '{member_name}'")
-            failed_profiles.append(member_name)
-            all_success = False
-            continue
-        
-        # Get paths for this member
-        paths_to_backup = None
-        if 'paths' in member_data and isinstance(member_data['paths'], list):
-            paths_to_backup = member_data['paths']
-        elif 'path' in member_data and isinstance(member_data['path'], str):
-            paths_to_backup = [member_data['path']]
-        
-        if not paths_to_backup:
-            logging.error(f"No valid path for group member '{member_name}'")
-            failed_profiles.append(member_name)
-            all_success = False
-            continue
-        
-        # Get effective settings using helper (respects group > profile > global priority)
-        try:
-            effective = core_logic.get_effective_profile_settings(
-                member_name, member_data, profiles, settings
-            )
-            max_bk = effective.get('max_backups')
-            max_src_size = effective.get('max_source_size_mb')
-            compression_mode = effective.get('compression_mode', 'standard')
-        except Exception as e:
-            logging.warning(f"Error getting effective settings for '{member_name}': {e}")
-            max_bk = settings.get("max_backups")
-            max_src_size = settings.get("max_source_size_mb")
-            compression_mode = settings.get("compression_mode", "standard")
-        
-        # Perform backup for this member
-        try:
-            success, message = core_logic.perform_backup(
-                member_name,
-                paths_to_backup,
-                backup_base_dir,
-                max_bk,
-                max_src_size,
-                compression_mode,
-                member_data
-            )
-            
-            if success:
-                success_count += 1
-                logging.info(f"[Group Backup] '{member_name}' backup succeeded")
-            else:
-                failed_profiles.append(member_name)
-                all_success = False
-                logging.error(f"[Group Backup] '{member_name}' backup failed: {message}")
-                
-        except Exception as e:
-            failed_profiles.append(member_name)
-            all_success = False
-            logging.error(f"[Group Backup] Error backing up '{member_name}': {e}", exc_info=True)
+    # Members run concurrently (bounded pool, per-disk limits); settings
+    # priority group > profile > global is resolved per member by the batch.
+    results = batch_backup.run_batch_backup(member_profiles, profiles, settings)
+    success_count = sum(1 for r in results if r.success)
+    failed_profiles = [r.profile_name for r in results if not r.success]
+    all_success = not failed_profiles
+    for r in results:
+        if not r.success:
+            logging.error(f"[Group Backup] '{r.profile_name}' backup {r.status}: {r.message}")
     
     # Show final notification
     group_data = profiles.get(group_name)
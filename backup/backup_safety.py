@@ -27,11 +27,16 @@ Design constraints (safety first)
 - "In use" is inferred from instability: if any file's size or modification
   time changes across a short settle window, an application is writing and the
   backup is deferred; if the files stay unchanged, the save is considered safe.
+- The settle window is measured from the last write (filesystem events when
+  available, otherwise the newest mtime), so a save that has been quiet for a
+  while is confirmed immediately instead of after a fixed sleep.
 """
 
 import logging
 import os
 import time
+from dataclasses import dataclass
+from datetime import datetime
 
 # --- Tunables (seconds) ---------------------------------------------------
 # Required period during which nothing under the save paths may change for the
@@ -42,6 +47,11 @@ DEFAULT_POLL_SECONDS = 2.0
 # Upper bound on how long we wait for the save to settle. If it never settles
 # within this window, the caller MUST skip the backup (something keeps writing).
 DEFAULT_MAX_WAIT_SECONDS = 45.0
+# While waiting, only files modified this recently are re-stat'ed (plus every
+# directory, whose mtime reveals created/deleted/renamed files).
+RECENT_WINDOW_SECONDS = 60.0
+# Gap between the two full scans that confirm a quiet save.
+CONFIRM_SECONDS = 0.5
 
 
 def _iter_files(paths):
@@ -78,11 +88,180 @@ def snapshot(paths) -> dict:
     return snap
 
 
+@dataclass
+class QuiescenceResult:
+    """Outcome of ``check_quiescence``."""
+    safe: bool
+    # Wall-clock time of the last write seen (event or mtime), None if unknown.
+    last_write_at: float | None
+    waited_seconds: float
+    full_scans: int
+    source: str  # "events" or "scan"
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+def _dir_key(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_tree(paths):
+    """Full scan: ``({file: (size, mtime_ns) | None}, {directory: mtime_ns | None})``."""
+    files, dirs = {}, {}
+    for p in paths:
+        if not p:
+            continue
+        try:
+            if os.path.isfile(p):
+                files[p] = _stat_key(p)
+            elif os.path.isdir(p):
+                for root, _dirs, names in os.walk(p):
+                    dirs[root] = _dir_key(root)
+                    for f in names:
+                        fp = os.path.join(root, f)
+                        files[fp] = _stat_key(fp)
+        except OSError:
+            continue
+    return files, dirs
+
+
+def _rescan_dir(directory, files, dirs):
+    """Refresh the direct children of one directory whose mtime changed."""
+    for fp in [fp for fp in files if os.path.dirname(fp) == directory]:
+        del files[fp]
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if entry.path not in dirs:
+                        sub_files, sub_dirs = _scan_tree([entry.path])
+                        files.update(sub_files)
+                        dirs.update(sub_dirs)
+                else:
+                    files[entry.path] = _stat_key(entry.path)
+    except OSError:
+        pass
+    dirs[directory] = _dir_key(directory)
+
+
+def _newest_mtime(files, dirs) -> float:
+    newest = 0
+    for key in files.values():
+        if key is not None and key[1] > newest:
+            newest = key[1]
+    for key in dirs.values():
+        if key is not None and key > newest:
+            newest = key
+    return newest / 1e9
+
+
+def _poll_recent(files, dirs, hot_since_ns) -> float:
+    """Re-stat directories and recently modified files only.
+
+    Returns the time of the newest change found (its mtime, or now for a
+    vanished entry), 0.0 if nothing changed.
+    """
+    newest_ns = 0
+    for d, key in list(dirs.items()):
+        new_key = _dir_key(d)
+        if new_key != key:
+            _rescan_dir(d, files, dirs)
+            newest_ns = max(newest_ns, new_key if new_key is not None else time.time_ns())
+    for fp, key in list(files.items()):
+        if key is not None and key[1] < hot_since_ns:
+            continue
+        new_key = _stat_key(fp)
+        if new_key != key:
+            files[fp] = new_key
+            newest_ns = max(newest_ns, new_key[1] if new_key is not None else time.time_ns())
+    return min(newest_ns / 1e9, time.time())
+
+
+def check_quiescence(paths,
+                     settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                     poll_seconds: float = DEFAULT_POLL_SECONDS,
+                     max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+                     profile_name: str = "",
+                     quiet_since=None) -> QuiescenceResult:
+    """Wait until nothing under ``paths`` was written for ``settle_seconds``.
+
+    ``quiet_since`` is an optional callable returning the wall-clock time since
+    which a filesystem watcher saw no write (``SaveWatcher.quiet_since``), or
+    None when it cannot tell; with it, no file is stat'ed at all.
+
+    Otherwise the tree is scanned once and the newest mtime gives the last
+    write. While that is more recent than ``settle_seconds``, only directories
+    and files modified within ``RECENT_WINDOW_SECONDS`` are re-stat'ed. Once
+    quiet, a second full scan ``CONFIRM_SECONDS`` later must match exactly
+    (sizes, mtimes, set of files), as the two-snapshot check always did.
+    """
+    paths = [p for p in (paths or []) if p]
+    if not paths:
+        # Nothing to protect; let the normal backup validation handle it.
+        return QuiescenceResult(True, None, 0.0, 0, "scan")
+
+    settle_seconds = max(0.5, float(settle_seconds))
+    poll_seconds = max(0.1, float(poll_seconds))
+    max_wait_seconds = max(settle_seconds, float(max_wait_seconds))
+    started = time.monotonic()
+    deadline = started + max_wait_seconds
+
+    def _result(safe, last_write_at, full_scans, source):
+        return QuiescenceResult(safe, last_write_at, time.monotonic() - started, full_scans, source)
+
+    if quiet_since is not None:
+        while True:
+            since = quiet_since()
+            if since is None:
+                break
+            quiet_for = time.time() - since
+            if quiet_for >= settle_seconds:
+                return _result(True, since, 0, "events")
+            if time.monotonic() >= deadline:
+                return _result(False, since, 0, "events")
+            time.sleep(max(0.05, min(settle_seconds - quiet_for, deadline - time.monotonic())))
+
+    files, dirs = _scan_tree(paths)
+    full_scans = 1
+    last_change = min(_newest_mtime(files, dirs), time.time())
+    while True:
+        quiet_for = time.time() - last_change
+        if quiet_for >= settle_seconds:
+            time.sleep(min(CONFIRM_SECONDS, settle_seconds))
+            confirm_files, confirm_dirs = _scan_tree(paths)
+            full_scans += 1
+            if (confirm_files == files and confirm_dirs == dirs
+                    and all(v is not None for v in confirm_files.values())):
+                return _result(True, last_change or None, full_scans, "scan")
+            # Changed without touching recent files or directories (e.g. an
+            # in-place write to an old file): start a new settle window.
+            files, dirs = confirm_files, confirm_dirs
+            last_change = time.time()
+        elif time.monotonic() < deadline:
+            time.sleep(max(0.05, min(poll_seconds, settle_seconds - quiet_for,
+                                     deadline - time.monotonic())))
+            hot_since_ns = int((time.time() - RECENT_WINDOW_SECONDS) * 1e9)
+            last_change = max(last_change, _poll_recent(files, dirs, hot_since_ns))
+            continue
+        if time.monotonic() >= deadline:
+            return _result(False, last_change or None, full_scans, "scan")
+
+
 def wait_for_quiescence(paths,
                         settle_seconds: float = DEFAULT_SETTLE_SECONDS,
                         poll_seconds: float = DEFAULT_POLL_SECONDS,
                         max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
-                        profile_name: str = "") -> bool:
+                        profile_name: str = "",
+                        quiet_since=None) -> bool:
     """Block until the save files are stable, or until ``max_wait_seconds``.
 
     Returns
@@ -94,43 +273,23 @@ def wait_for_quiescence(paths,
                      partially-written, corrupt save.
 
     This function is intentionally conservative: any doubt (files still
-    changing, files disappearing) results in ``False``.
+    changing, files disappearing) results in ``False``. See
+    ``check_quiescence`` for how the waiting is done.
     """
-    paths = [p for p in (paths or []) if p]
-    if not paths:
-        # Nothing to protect; let the normal backup validation handle it.
-        return True
-
-    settle_seconds = max(0.5, float(settle_seconds))
-    max_wait_seconds = max(settle_seconds, float(max_wait_seconds))
-    deadline = time.monotonic() + max_wait_seconds
-
-    attempt = 0
-    while True:
-        attempt += 1
-        first = snapshot(paths)
-        time.sleep(settle_seconds)
-        second = snapshot(paths)
-
-        stable = (first == second) and all(v is not None for v in second.values())
-        if stable:
-            if attempt > 1:
-                logging.info(
-                    "[AutoBackup] '%s' save folder settled after %d attempt(s); "
-                    "proceeding with backup.", profile_name, attempt,
-                )
-            return True
-
-        if time.monotonic() >= deadline:
-            logging.warning(
-                "[AutoBackup] '%s' save files kept changing for ~%.0fs; SKIPPING "
-                "backup to avoid archiving a partially-written (corrupt) save.",
-                profile_name, max_wait_seconds,
-            )
-            return False
-
-        logging.info(
-            "[AutoBackup] '%s' save files still changing (attempt %d); an app is "
-            "writing, deferring backup.", profile_name, attempt,
+    result = check_quiescence(paths, settle_seconds, poll_seconds, max_wait_seconds,
+                              profile_name, quiet_since)
+    last_write = (datetime.fromtimestamp(result.last_write_at).strftime("%H:%M:%S")
+                  if result.last_write_at else "unknown")
+    if not result.safe:
+        logging.warning(
+            "[AutoBackup] '%s' save files kept changing for ~%.0fs (last write at %s); "
+            "SKIPPING backup to avoid archiving a partially-written (corrupt) save.",
+            profile_name, result.waited_seconds, last_write,
         )
-        time.sleep(max(0.0, float(poll_seconds)))
+        return False
+    logging.info(
+        "[AutoBackup] '%s' save folder quiet since %s (%s, waited %.1fs, %d full scan(s)); "
+        "proceeding with backup.",
+        profile_name, last_write, result.source, result.waited_seconds, result.full_scans,
+    )
+    return True
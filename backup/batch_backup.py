@@ -0,0 +1,330 @@
+# batch_backup.py
+# -*- coding: utf-8 -*-
+"""
+Batch backup of many profiles at once (groups, "Backup All", "Backup Selected").
+
+Profiles are prepared once (effective settings, source paths, safety checks),
+then backed up on a bounded thread pool. ``perform_backup`` spends its time in
+file I/O and zlib, both of which release the GIL, so threads are enough.
+
+To avoid thrashing a spinning disk, each job also holds a slot on every
+device its source paths live on and on the device holding the backup folder
+(every archive is written there): rotational disks allow one job at a time,
+SSDs and unknown devices (network shares included) allow more. A 40-profile group spread over a few
+disks then takes about as long as its slowest member.
+"""
+
+import logging
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from core import core_logic
+from core import settings_manager
+import config
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+STATUS_CANCELLED = "cancelled"
+
+DEFAULT_MAX_WORKERS = 4
+# Concurrent jobs per source device when its type cannot be detected.
+DEFAULT_UNKNOWN_DEVICE_LIMIT = 2
+
+
+@dataclass
+class BatchBackupResult:
+    """Outcome of one profile in a batch backup."""
+    profile_name: str
+    status: str
+    message: str = ""
+    archive_message: str = ""
+    duration_s: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.status == STATUS_SUCCESS
+
+
+@dataclass
+class _BackupJob:
+    profile_name: str
+    profile_data: dict
+    source_paths: list
+    backup_base_dir: str
+    max_backups: int
+    max_source_size_mb: int
+    compression_mode: str
+    devices: list = field(default_factory=list)
+
+
+def get_max_workers(setting_value=None) -> int:
+    """Resolve the ``batch_backup_workers`` setting: 0 means automatic."""
+    if isinstance(setting_value, int) and not isinstance(setting_value, bool) and setting_value > 0:
+        return setting_value
+    return max(1, min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1))
+
+
+def is_rotational(st_dev: int):
+    """True/False for spinning/solid-state disks on Linux, None when unknown."""
+    if platform.system() != "Linux":
+        return None
+    major, minor = os.major(st_dev), os.minor(st_dev)
+    base = f"/sys/dev/block/{major}:{minor}"
+    # Partitions keep the queue attributes on their parent device.
+    for candidate in (os.path.join(base, "queue", "rotational"),
+                      os.path.join(base, "..", "queue", "rotational")):
+        try:
+            with open(candidate, "r", encoding="ascii") as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+class _DeviceLimiter:
+    """Per-device semaphores, acquired in a fixed order to avoid deadlocks."""
+
+    def __init__(self, max_workers: int, per_device_limit=None):
+        self._max_workers = max_workers
+        self._per_device_limit = per_device_limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, device):
+        with self._lock:
+            sem = self._semaphores.get(device)
+            if sem is None:
+                if self._per_device_limit:
+                    limit = self._per_device_limit
+                else:
+                    rotational = is_rotational(device)
+                    if rotational is True:
+                        limit = 1
+                    elif rotational is False:
+                        limit = self._max_workers
+                    else:
+                        limit = DEFAULT_UNKNOWN_DEVICE_LIMIT
+                    logging.debug(f"[Batch Backup] Device {device}: rotational={rotational}, limit={limit}")
+                sem = threading.BoundedSemaphore(limit)
+                self._semaphores[device] = sem
+            return sem
+
+    def acquire(self, devices):
+        sems = [self._semaphore(d) for d in sorted(set(devices))]
+        for sem in sems:
+            sem.acquire()
+        return sems
+
+    @staticmethod
+    def release(sems):
+        for sem in reversed(sems):
+            sem.release()
+
+
+def _device_of(path: str):
+    """st_dev of ``path`` or of its nearest existing parent (the backup folder may not exist yet)."""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+
+def _get_source_paths(profile_data: dict) -> list:
+    paths_data = profile_data.get('paths')
+    path_data = profile_data.get('path')
+    if isinstance(paths_data, list) and paths_data:
+        return [p for p in paths_data if isinstance(p, str) and p]
+    if isinstance(path_data, str) and path_data:
+        return [path_data]
+    return []
+
+
+def _prepare_job(profile_name: str, profiles: dict, settings: dict, backup_base_dir: str,
+                 backup_device=None):
+    """
+    Validate one profile and resolve its effective settings.
+
+    ``backup_device`` is the st_dev of the backup folder; it is added to the
+    devices the job holds a slot on.
+
+    Returns:
+        Tuple (_BackupJob or None, BatchBackupResult or None for a skipped/failed profile)
+    """
+    profile_data = profiles.get(profile_name)
+    if not isinstance(profile_data, dict):
+        return None, BatchBackupResult(profile_name, STATUS_SKIPPED, "invalid data")
+
+    try:
+        effective = core_logic.get_effective_profile_settings(profile_name, profile_data, profiles, settings)
+    except Exception as e:
+        logging.warning(f"[Batch Backup] Error getting effective settings for '{profile_name}': {e}")
+        effective = {
+            'max_backups': settings.get('max_backups', config.MAX_BACKUPS),
+            'max_source_size_mb': settings.get('max_source_size_mb', 200),
+            'compression_mode': settings.get('compression_mode', 'standard'),
+        }
+
+    source_paths = _get_source_paths(profile_data)
+    if not source_paths:
+        return None, BatchBackupResult(profile_name, STATUS_SKIPPED, "no valid path")
+
+    valid_paths = []
+    for sp in source_paths:
+        if os.path.exists(sp):
+            valid_paths.append(sp)
+        else:
+            logging.warning(f"[Batch Backup] Path does not exist for '{profile_name}': {sp}")
+    if not valid_paths:
+        return None, BatchBackupResult(profile_name, STATUS_SKIPPED, "path not found")
+
+    # Prevent recursive backup (source path inside backup folder)
+    backup_base = os.path.normpath(backup_base_dir).lower()
+    for sp in valid_paths:
+        if os.path.normpath(sp).lower().startswith(backup_base):
+            logging.error(f"[Batch Backup] BLOCKED: '{profile_name}' source path is INSIDE backup folder! Path: {sp}")
+            return None, BatchBackupResult(
+                profile_name, STATUS_FAILED,
+                "Source path is inside backup folder (would cause recursive backup)")
+
+    devices = []
+    for sp in valid_paths:
+        try:
+            devices.append(os.stat(sp).st_dev)
+        except OSError:
+            pass
+    if backup_device is not None:
+        devices.append(backup_device)
+
+    job = _BackupJob(
+        profile_name=profile_name,
+        profile_data=profile_data,
+        source_paths=valid_paths,
+        backup_base_dir=backup_base_dir,
+        max_backups=effective.get('max_backups'),
+        max_source_size_mb=effective.get('max_source_size_mb'),
+        compression_mode=effective.get('compression_mode', 'standard'),
+        devices=devices,
+    )
+    return job, None
+
+
+def run_batch_backup(profile_names, profiles: dict, settings: dict = None, max_workers: int = None,
+                     per_device_limit: int = None, cancel_event=None, progress_callback=None) -> list:
+    """
+    Back up several profiles concurrently.
+
+    Args:
+        profile_names: Profiles to back up (duplicates are ignored)
+        profiles: Dictionary of all profiles (needed for group/override settings)
+        settings: Loaded settings; loaded once here when None
+        max_workers: Concurrent backups; None/0 uses the ``batch_backup_workers`` setting
+        per_device_limit: Concurrent backups per device (sources and backup folder); None/0 detects
+            the device type (1 for rotational disks)
+        cancel_event: Optional threading.Event; profiles not yet started when it
+            is set are reported as cancelled
+        progress_callback: Optional callable(done: int, total: int, result: BatchBackupResult)
+
+    Returns:
+        List of BatchBackupResult in the order of ``profile_names``
+    """
+    if settings is None:
+        settings, _ = settings_manager.load_settings()
+    backup_base_dir = settings.get('backup_base_dir', config.BACKUP_BASE_DIR)
+    max_workers = get_max_workers(max_workers or settings.get('batch_backup_workers'))
+
+    # Load the lock state once; every manage_backups() call then hits the cache.
+    try:
+        from gui_components import lock_backup_manager
+        lock_backup_manager.load_locked_backups()
+    except Exception as e:
+        logging.debug(f"[Batch Backup] Lock state preload skipped: {e}")
+
+    names = list(dict.fromkeys(profile_names))
+    results = {}
+    jobs = []
+    backup_device = _device_of(backup_base_dir)
+    for name in names:
+        job, early_result = _prepare_job(name, profiles, settings, backup_base_dir, backup_device)
+        if job is None:
+            results[name] = early_result
+        else:
+            jobs.append(job)
+
+    total = len(names)
+    done_lock = threading.Lock()
+    done = [len(results)]
+    limiter = _DeviceLimiter(max_workers, per_device_limit)
+    logging.info(f"[Batch Backup] {len(jobs)} profile(s) to back up with {max_workers} worker(s), "
+                 f"{len(results)} skipped before start.")
+
+    def _finish(result):
+        with done_lock:
+            results[result.profile_name] = result
+            done[0] += 1
+            current = done[0]
+        if progress_callback:
+            try:
+                progress_callback(current, total, result)
+            except Exception as e:
+                logging.debug(f"[Batch Backup] Progress callback error: {e}")
+
+    def _run(job: _BackupJob):
+        if cancel_event is not None and cancel_event.is_set():
+            _finish(BatchBackupResult(job.profile_name, STATUS_CANCELLED, "not started (cancelled)"))
+            return
+        sems = limiter.acquire(job.devices)
+        try:
+            # Re-check: the job may have waited a long time for its disk.
+            if cancel_event is not None and cancel_event.is_set():
+                _finish(BatchBackupResult(job.profile_name, STATUS_CANCELLED, "not started (cancelled)"))
+                return
+            logging.info(f"[Batch Backup] Backing up: '{job.profile_name}'")
+            start = time.monotonic()
+            try:
+                success, message = core_logic.perform_backup(
+                    job.profile_name,
+                    job.source_paths,
+                    job.backup_base_dir,
+                    job.max_backups,
+                    job.max_source_size_mb,
+                    job.compression_mode,
+                    job.profile_data,
+                )
+            except Exception as e:
+                logging.error(f"[Batch Backup] Exception for '{job.profile_name}': {e}", exc_info=True)
+                success, message = False, str(e)
+            duration = time.monotonic() - start
+        finally:
+            limiter.release(sems)
+
+        if success:
+            logging.info(f"[Batch Backup] Success: '{job.profile_name}' ({duration:.1f}s)")
+            _finish(BatchBackupResult(job.profile_name, STATUS_SUCCESS, archive_message=message,
+                                      duration_s=duration))
+        else:
+            logging.error(f"[Batch Backup] Failed: '{job.profile_name}' - {message}")
+            _finish(BatchBackupResult(job.profile_name, STATUS_FAILED, message, duration_s=duration))
+
+    # Interleave jobs by source device so workers are not all parked on one busy disk.
+    by_device = {}
+    for job in jobs:
+        by_device.setdefault(tuple(sorted(set(job.devices))), []).append(job)
+    queues = list(by_device.values())
+    jobs = [q[i] for i in range(max((len(q) for q in queues), default=0)) for q in queues if i < len(q)]
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-backup") as pool:
+            for future in [pool.submit(_run, job) for job in jobs]:
+                future.result()
+
+    return [results[name] for name in names]
@@ -0,0 +1,429 @@
+"""
+save_watcher.py
+
+Filesystem change tracking for the automatic backup engine.
+
+``AutoBackupManager`` used to decide whether a save changed by walking every
+save tree and comparing the newest mtime with the latest backup, on every
+interval check of every profile. With many profiles that walk is the main
+source of idle disk wakeups.
+
+A watcher keeps, per profile, the wall-clock time of the last filesystem
+event seen in its save paths (``last_write``) and the time the save was last
+known to match a backup (``clean_at``). ``changed_since_clean`` then answers
+without touching the disk:
+
+- True / False: the watcher saw (or did not see) a write since ``clean_at``.
+- None: the watcher cannot tell (polling backend, profile not fully watched,
+  or no clean point yet). The caller falls back to the mtime walk.
+
+Backends:
+
+- inotify (Linux): one watch per directory of every save tree, read on a
+  background thread. New sub-directories are watched as they appear; a queue
+  overflow marks every profile dirty. Save trees are walked on that thread
+  too, outside the lock: ``set_profiles`` only queues them, and a profile
+  answers None until its tree is fully watched.
+- polling (everything else, or ``auto_backup_watcher = "polling"``): tracks
+  nothing, so every check falls back to the existing mtime walk.
+"""
+
+import errno
+import logging
+import os
+import platform
+import select
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+
+BACKEND_INOTIFY = "inotify"
+BACKEND_POLLING = "polling"
+
+# inotify event bits (<sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+               | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+               | IN_ONLYDIR | IN_EXCL_UNLINK)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+@dataclass
+class _ProfileWatch:
+    paths: tuple
+    complete: bool = False
+    clean_at: float | None = None
+    last_write: float | None = None
+    attached_at: float | None = None
+    wds: set = field(default_factory=set)
+
+
+class SaveWatcher:
+    """Polling backend: remembers profiles but never answers from events."""
+
+    backend = BACKEND_POLLING
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: dict[str, _ProfileWatch] = {}
+
+    def set_profiles(self, profile_paths: dict) -> None:
+        """Replace the watched profiles with ``{profile_name: [paths]}``."""
+        with self._lock:
+            new_profiles = {}
+            for name, paths in profile_paths.items():
+                watch = self._profiles.get(name)
+                if watch is None or watch.paths != tuple(paths):
+                    watch = _ProfileWatch(tuple(paths))
+                new_profiles[name] = watch
+            self._profiles = new_profiles
+
+    def changed_since_clean(self, name: str):
+        """True/False if a write was (not) seen since the last clean point, None if unknown."""
+        return None
+
+    def last_write(self, name: str):
+        """Wall-clock time of the last event seen for the profile, or None."""
+        with self._lock:
+            watch = self._profiles.get(name)
+            return watch.last_write if watch else None
+
+    def quiet_since(self, name: str):
+        """Wall-clock time since which no write was seen, or None if the profile is not tracked."""
+        return None
+
+    def mark_clean(self, name: str, at: float) -> None:
+        """Record that the save matched a backup at wall-clock time ``at``."""
+        with self._lock:
+            watch = self._profiles.get(name)
+            if watch is not None:
+                watch.clean_at = at
+
+    def close(self) -> None:
+        with self._lock:
+            self._profiles = {}
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> list:
+        """Drain pending events as (wd, mask, name) tuples."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class InotifySaveWatcher(SaveWatcher):
+    """inotify backend: a reader thread timestamps writes in each save tree."""
+
+    backend = BACKEND_INOTIFY
+
+    def __init__(self):
+        super().__init__()
+        self._inotify = _Inotify()
+        # wd -> [directory, {profile_name: set of file names, or None for the whole tree}]
+        self._targets: dict[int, list] = {}
+        # Profiles whose trees the reader thread still has to walk and watch
+        self._pending: set = set()
+        self._limit_warned = False
+        self._wake_r, self._wake_w = os.pipe()
+        # Wake-ups are written under the lock: never block on a full pipe
+        os.set_blocking(self._wake_w, False)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="save-watcher", daemon=True)
+        self._thread.start()
+
+    # --- watch bookkeeping (caller holds self._lock) -------------------------
+    def _add_target(self, name: str, watch: _ProfileWatch, directory: str, file_name=None) -> bool:
+        try:
+            wd = self._inotify.add_watch(directory, _WATCH_MASK)
+        except OSError as e:
+            if e.errno == errno.ENOSPC and not self._limit_warned:
+                self._limit_warned = True
+                logging.warning(
+                    "[SaveWatcher] inotify watch limit reached (fs.inotify.max_user_watches); "
+                    "remaining save folders fall back to periodic scans.")
+            elif e.errno not in (errno.ENOENT, errno.ENOTDIR, errno.ENOSPC):
+                logging.debug(f"[SaveWatcher] Cannot watch '{directory}': {e}")
+            return False
+        target = self._targets.setdefault(wd, [directory, {}])
+        # The same directory may come back under a new name after a rename.
+        target[0] = directory
+        owners = target[1]
+        if file_name is None:
+            owners[name] = None
+        elif name not in owners or owners[name] is not None:
+            owners.setdefault(name, set()).add(file_name)
+        watch.wds.add(wd)
+        return True
+
+    def _add_tree(self, name: str, watch: _ProfileWatch, root: str) -> bool:
+        ok = self._add_target(name, watch, root)
+        for folder, dirs, _files in os.walk(root):
+            for d in dirs:
+                ok = self._add_target(name, watch, os.path.join(folder, d)) and ok
+        return ok
+
+    def _schedule_attach(self, name: str) -> None:
+        """Queue a profile for the reader thread, which walks its tree outside the lock."""
+        self._pending.add(name)
+        try:
+            os.write(self._wake_w, b"a")
+        except OSError:
+            pass
+
+    def _detach(self, name: str, watch: _ProfileWatch) -> None:
+        for wd in watch.wds:
+            target = self._targets.get(wd)
+            if target is None:
+                continue
+            target[1].pop(name, None)
+            if not target[1]:
+                del self._targets[wd]
+                self._inotify.rm_watch(wd)
+        watch.wds.clear()
+        watch.complete = False
+
+    # --- public API ----------------------------------------------------------
+    def set_profiles(self, profile_paths: dict) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            new_profiles = {}
+            for name, paths in profile_paths.items():
+                paths = tuple(paths)
+                watch = self._profiles.pop(name, None)
+                if watch is not None and watch.paths != paths:
+                    self._detach(name, watch)
+                    watch = None
+                if watch is None:
+                    watch = _ProfileWatch(paths)
+                    self._schedule_attach(name)
+                new_profiles[name] = watch
+            for name, watch in self._profiles.items():
+                self._detach(name, watch)
+            self._profiles = new_profiles
+            watched = sum(1 for w in new_profiles.values() if w.complete)
+            queued = len(self._pending)
+        logging.debug(f"[SaveWatcher] {watched}/{len(profile_paths)} profile(s) fully watched, "
+                      f"{queued} queued, {len(self._targets)} watch(es).")
+
+    def changed_since_clean(self, name: str):
+        with self._lock:
+            watch = self._profiles.get(name)
+            if watch is None:
+                return None
+            if not watch.complete:
+                # Save folder missing at attach time, deleted, or over the
+                # watch limit: retry, and let the caller scan this time.
+                if name not in self._pending:
+                    self._detach(name, watch)
+                    self._schedule_attach(name)
+                return None
+            if watch.clean_at is None:
+                return None
+            return watch.last_write is not None and watch.last_write >= watch.clean_at
+
+    def quiet_since(self, name: str):
+        with self._lock:
+            watch = self._profiles.get(name)
+            if watch is None or not watch.complete or self._closed:
+                return None
+            return max(watch.last_write or 0.0, watch.attached_at or 0.0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        self._thread.join(timeout=2.0)
+        with self._lock:
+            self._targets.clear()
+            self._pending.clear()
+            self._profiles = {}
+            self._inotify.close()
+            for fd in (self._wake_r, self._wake_w):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    # --- reader thread -------------------------------------------------------
+    def _run(self):
+        # poll() rather than select(): descriptors above FD_SETSIZE are fine
+        poller = select.poll()
+        poller.register(self._inotify.fd, select.POLLIN)
+        poller.register(self._wake_r, select.POLLIN)
+        while True:
+            try:
+                ready = {fd for fd, _mask in poller.poll()}
+            except OSError:
+                return
+            if self._wake_r in ready:
+                try:
+                    os.read(self._wake_r, 4096)
+                except OSError:
+                    return
+                with self._lock:
+                    if self._closed:
+                        return
+                self._attach_pending()
+            if self._inotify.fd not in ready:
+                continue
+            try:
+                events = self._inotify.read_events()
+            except OSError as e:
+                logging.error(f"[SaveWatcher] inotify read failed: {e}")
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                self._handle_events(events, time.time())
+
+    def _attach_pending(self) -> None:
+        """Watch the queued profiles; the tree walks run without holding the lock."""
+        while True:
+            with self._lock:
+                if self._closed or not self._pending:
+                    return
+                name = self._pending.pop()
+                watch = self._profiles.get(name)
+                if watch is None:
+                    continue
+                # Roots first, so sub-directories created during the walk raise events
+                complete = bool(watch.paths)
+                roots = []
+                for path in watch.paths:
+                    if os.path.isdir(path):
+                        complete = self._add_target(name, watch, path) and complete
+                        roots.append(path)
+                    elif os.path.isfile(path):
+                        parent, file_name = os.path.split(os.path.abspath(path))
+                        complete = self._add_target(name, watch, parent, file_name) and complete
+                    else:
+                        complete = False
+
+            subdirs = []
+            for root in roots:
+                for folder, dirs, _files in os.walk(root):
+                    subdirs.extend(os.path.join(folder, d) for d in dirs)
+
+            with self._lock:
+                if self._closed:
+                    return
+                if self._profiles.get(name) is not watch or name in self._pending:
+                    # Replaced, removed or re-queued while we were walking
+                    continue
+                for directory in subdirs:
+                    complete = self._add_target(name, watch, directory) and complete
+                watch.complete = complete
+                watch.attached_at = time.time()
+                # Writes may have happened while the profile was unwatched.
+                watch.clean_at = None
+
+    def _handle_events(self, events, now: float) -> None:
+        for wd, mask, event_name in events:
+            if mask & IN_Q_OVERFLOW:
+                logging.info("[SaveWatcher] Event queue overflow; marking all profiles changed.")
+                for watch in self._profiles.values():
+                    watch.last_write = now
+                continue
+            target = self._targets.get(wd)
+            if target is None:
+                continue
+            directory, owners = target
+            for name, file_names in list(owners.items()):
+                watch = self._profiles.get(name)
+                if watch is None:
+                    continue
+                if file_names is None or event_name in file_names or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    watch.last_write = now
+                if file_names is None and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    if not self._add_tree(name, watch, os.path.join(directory, event_name)):
+                        watch.complete = False
+            if mask & (IN_IGNORED | IN_MOVE_SELF):
+                # The directory is gone (or moved away): a profile whose root
+                # it was has to be re-attached before events can be trusted.
+                for name in owners:
+                    watch = self._profiles.get(name)
+                    if watch is None:
+                        continue
+                    watch.wds.discard(wd)
+                    roots = set(watch.paths) | {os.path.dirname(os.path.abspath(p)) for p in watch.paths}
+                    if directory in roots:
+                        watch.complete = False
+                if mask & IN_IGNORED:
+                    self._targets.pop(wd, None)
+
+
+def create_save_watcher(backend: str = "auto") -> SaveWatcher:
+    """Return the best available watcher; ``backend="polling"`` forces the fallback."""
+    if backend != BACKEND_POLLING and platform.system() == "Linux":
+        try:
+            watcher = InotifySaveWatcher()
+            logging.info("[SaveWatcher] Using inotify for auto-backup change detection.")
+            return watcher
+        except (OSError, AttributeError) as e:
+            logging.warning(f"[SaveWatcher] inotify unavailable ({e}); using periodic scans.")
+    return SaveWatcher()
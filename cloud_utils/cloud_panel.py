@@ -9,6 +9,8 @@ import os
 import logging
 import time
 from cloud_utils.cloud_sync_availability import AUTO_UPLOAD_COOLDOWN_SEC
+from cloud_utils import transfer_scheduler
+from core import backup_catalog
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox,
@@ -145,6 +147,7 @@ class UploadWorker(QObject):
         self.latest_only = bool(latest_only)
         self._cancelled = False
         self._current_file_msg = ""
+        self._scheduler = None
 
     def _on_file_progress(self, idx, total, message):
         self._current_file_msg = message
@@ -157,6 +160,8 @@ class UploadWorker(QObject):
     def cancel(self):
         """Request cancellation of the upload operation."""
         self._cancelled = True
+        if self._scheduler is not None:
+            self._scheduler.cancel()
         # Also request cancellation from provider if it supports it
         if self.provider and hasattr(self.provider, 'request_cancellation'):
             self.provider.request_cancellation()
@@ -171,6 +176,10 @@ class UploadWorker(QObject):
             self.provider.set_chunk_callback(self._on_chunk_progress)
         
         try:
+            if transfer_scheduler.can_schedule(self.provider):
+                self._run_scheduled()
+                return
+            
             success_count = 0
             total = len(self.backup_list)
             results = []
@@ -197,12 +206,14 @@ class UploadWorker(QObject):
                     )
                     ok = False
                     uploaded_cnt = 0
+                    failed_cnt = 0
                     skipped_cnt = 0
                     was_cancelled = False
                     
                     if isinstance(res, dict):
                         ok = bool(res.get('ok', True))
                         uploaded_cnt = int(res.get('uploaded_count', 0))
+                        failed_cnt = int(res.get('failed_count', 0))
                         skipped_cnt = int(res.get('skipped_newer_or_same', 0))
                         was_cancelled = bool(res.get('cancelled', False))
                     else:
@@ -224,6 +235,7 @@ class UploadWorker(QObject):
                         'name': backup_name,
                         'ok': ok,
                         'uploaded_count': uploaded_cnt,
+                        'failed_count': failed_cnt,
                         'skipped_newer_or_same': skipped_cnt
                     })
                 except Exception as e:
@@ -234,25 +246,7 @@ class UploadWorker(QObject):
                         return
                     logging.error(f"Error uploading {backup_name}: {e}")
             
-            # Aggregate and emit summary for UI
-            try:
-                profiles_changed = sum(1 for r in results if r.get('uploaded_count', 0) > 0)
-                files_uploaded = sum(int(r.get('uploaded_count', 0)) for r in results)
-                files_skipped = sum(int(r.get('skipped_newer_or_same', 0)) for r in results)
-                summary = {
-                    'profiles_total': total,
-                    'profiles_ok': success_count,
-                    'profiles_changed': profiles_changed,
-                    'profiles_unchanged': max(0, total - profiles_changed),
-                    'files_uploaded': files_uploaded,
-                    'files_skipped': files_skipped,
-                    'details': results,
-                }
-                self.summary_ready.emit(summary)
-            except Exception:
-                pass
-
-            self.finished.emit(success_count, total)
+            self._emit_summary(results, success_count, total)
             
         finally:
             # Clear callbacks if the provider supports them
@@ -260,6 +254,66 @@ class UploadWorker(QObject):
                 self.provider.set_progress_callback(None)
             if hasattr(self.provider, 'set_chunk_callback'):
                 self.provider.set_chunk_callback(None)
+    
+    def _run_scheduled(self):
+        """Upload all profiles concurrently through the transfer scheduler."""
+        max_transfers = cloud_settings_manager.load_cloud_settings().get('parallel_transfers')
+        self._scheduler = transfer_scheduler.TransferScheduler(self.provider, max_transfers)
+        if self._cancelled:
+            self._scheduler.cancel()
+        total = len(self.backup_list)
+        self._current_file_msg = f"Uploading {total} profile(s)"
+        self.progress.emit(0, total, self._current_file_msg)
+        
+        jobs = [
+            transfer_scheduler.UploadJob(name, os.path.join(self.backup_base_dir, name))
+            for name in self.backup_list
+        ]
+        outcomes = self._scheduler.run(jobs, max_backups=self.max_backups, latest_only=self.latest_only)
+        if self._cancelled or self._scheduler.cancelled:
+            logging.info("Upload cancelled by user")
+            self.cancelled.emit()
+            return
+        
+        results = []
+        success_count = 0
+        for outcome in outcomes:
+            if outcome['ok']:
+                success_count += 1
+                logging.info(f"Successfully uploaded: {outcome['name']}")
+            else:
+                logging.error(f"Failed to upload: {outcome['name']} ({outcome.get('error')})")
+            results.append({
+                'name': outcome['name'],
+                'ok': outcome['ok'],
+                'uploaded_count': outcome['uploaded_count'],
+                'failed_count': outcome['failed_count'],
+                'skipped_newer_or_same': outcome['skipped_newer_or_same']
+            })
+        self._emit_summary(results, success_count, total)
+    
+    def _emit_summary(self, results, success_count, total):
+        # Aggregate and emit summary for UI
+        try:
+            profiles_changed = sum(1 for r in results if r.get('uploaded_count', 0) > 0)
+            files_uploaded = sum(int(r.get('uploaded_count', 0)) for r in results)
+            files_skipped = sum(int(r.get('skipped_newer_or_same', 0)) for r in results)
+            files_failed = sum(int(r.get('failed_count', 0)) for r in results)
+            summary = {
+                'profiles_total': total,
+                'profiles_ok': success_count,
+                'profiles_changed': profiles_changed,
+                'profiles_unchanged': max(0, total - profiles_changed),
+                'files_uploaded': files_uploaded,
+                'files_skipped': files_skipped,
+                'files_failed': files_failed,
+                'details': results,
+            }
+            self.summary_ready.emit(summary)
+        except Exception:
+            pass
+
+        self.finished.emit(success_count, total)
 
 
 class DownloadWorker(QObject):
@@ -478,12 +532,14 @@ class BackupScannerWorker(QObject):
                     if entry.startswith('.') or entry == '__pycache__':
                         continue
                         
-                    # Count backup files in this folder
-                    try:
-                        backup_files = [f for f in os.listdir(entry_path) if f.endswith('.zip')]
-                        file_count = len(backup_files)
-                    except Exception:
-                        file_count = 0
+                    # Count .zip files in this folder (catalog first, scan as fallback)
+                    file_count = backup_catalog.get_zip_count(self.backup_base_dir, entry)
+                    if file_count is None:
+                        try:
+                            backup_files = [f for f in os.listdir(entry_path) if f.endswith('.zip')]
+                            file_count = len(backup_files)
+                        except Exception:
+                            file_count = 0
                         
                     local_backups[entry] = {
                         'name': entry,
@@ -2179,7 +2235,8 @@ class CloudSavePanel(QWidget):
                 password=self.cloud_settings.get('ftp_password', ''),
                 use_tls=self.cloud_settings.get('ftp_use_tls', False),
                 passive_mode=self.cloud_settings.get('ftp_passive_mode', True),
-                base_path=self.cloud_settings.get('ftp_base_path', '/')
+                base_path=self.cloud_settings.get('ftp_base_path', '/'),
+                block_size=self.cloud_settings.get('ftp_block_size')
             )
             
             if success:
@@ -3406,7 +3463,10 @@ class CloudSavePanel(QWidget):
             unchanged = int(self._last_upload_summary.get('profiles_unchanged', 0))
             files_up = int(self._last_upload_summary.get('files_uploaded', 0))
             files_skip = int(self._last_upload_summary.get('files_skipped', 0))
-            if changed == 0 and unchanged > 0:
+            files_failed = int(self._last_upload_summary.get('files_failed', 0))
+            if files_failed:
+                title = "Upload Completed with Errors"
+            elif changed == 0 and unchanged > 0:
                 title = "No Upload Needed"
                 msg = f"No changes uploaded. {unchanged} profile(s) had newer or identical backups in the cloud."
             elif unchanged > 0:
@@ -3418,6 +3478,8 @@ class CloudSavePanel(QWidget):
             # Add file-level stats when available
             if files_up or files_skip:
                 msg += f"\nFiles: {files_up} uploaded, {files_skip} skipped."
+            if files_failed:
+                msg += f"\n{files_failed} file(s) failed to upload; old cloud backups were kept for those profiles."
         
         # Show notifications
         self._show_notification(title, msg)
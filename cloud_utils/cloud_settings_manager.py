@@ -36,6 +36,8 @@ def load_cloud_settings() -> dict:
         'max_cloud_backups_count': 5,
         'max_cloud_storage_enabled': False,
         'max_cloud_storage_gb': 5,
+        # Concurrent file transfers for providers that support it (FTP, WebDAV, SMB)
+        'parallel_transfers': 3,
         
         # Provider selection (google_drive, smb, ftp, webdav)
         'active_provider': 'google_drive',
@@ -56,6 +58,7 @@ def load_cloud_settings() -> dict:
         'ftp_use_tls': False,
         'ftp_passive_mode': True,
         'ftp_auto_connect': False,
+        'ftp_block_size': 1048576,  # Transfer block size in bytes
         
         # WebDAV settings
         'webdav_enabled': False,
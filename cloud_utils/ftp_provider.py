@@ -12,16 +12,63 @@ Uses Python's built-in ftplib - no external dependencies required.
 """
 
 import os
+import time
+import posixpath
 import logging
 import hashlib
 import ftplib
 import ssl
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from io import BytesIO
 
-from cloud_utils.storage_provider import StorageProvider, ProviderType, select_zip_files_for_upload
+from cloud_utils.storage_provider import StorageProvider, ProviderType
+
+# Transfer block size: ftplib's 8 KiB default caps throughput on fast links.
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+# Uploads and downloads go to "<name>.part" first and can be resumed with REST.
+PARTIAL_SUFFIX = ".part"
+# Directory listings are reused for this long (about the length of a sync).
+_LISTING_TTL_S = 120
+
+
+class _ListingCache:
+    """MLSD results per remote directory, shared by a provider and its pooled clones."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}
+    
+    def get(self, path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or time.monotonic() - entry[0] > _LISTING_TTL_S:
+                return None
+            return dict(entry[1])
+    
+    def put(self, path: str, files: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[path] = (time.monotonic(), dict(files))
+    
+    def update(self, path: str, name: str, facts: Optional[Dict[str, Any]]) -> None:
+        """Reflect our own change to a directory (facts=None for a removal)."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return
+            if facts is None:
+                entry[1].pop(name, None)
+            else:
+                entry[1][name] = facts
+    
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
 
 
 class FTPProvider(StorageProvider):
@@ -52,8 +99,18 @@ class FTPProvider(StorageProvider):
         self._ftp: Optional[ftplib.FTP] = None
         self._connected = False
         
-        # Full path to app folder on server
+        # Absolute paths on the server: the working directory after login and
+        # base path navigation, and the app folder below it. Every command uses
+        # absolute paths, so the control connection's cwd never matters.
+        self._home_path: str = "/"
         self._app_folder_path: Optional[str] = None
+        
+        # Transfer tuning and sync state
+        self._block_size: int = DEFAULT_BLOCK_SIZE
+        self._listing_cache = _ListingCache()
+        # Authenticated connections kept open between syncs for the transfer pool
+        self._idle_clones: List['FTPProvider'] = []
+        self._idle_lock = threading.Lock()
     
     @property
     def provider_type(self) -> ProviderType:
@@ -97,6 +154,7 @@ class FTPProvider(StorageProvider):
                 use_tls: bool = None,
                 passive_mode: bool = None,
                 base_path: str = None,
+                block_size: int = None,
                 **kwargs) -> bool:
         """
         Connect to the FTP server.
@@ -109,6 +167,7 @@ class FTPProvider(StorageProvider):
             use_tls: Use FTPS (TLS/SSL)
             passive_mode: Use passive mode (recommended for firewalls)
             base_path: Remote base directory
+            block_size: Transfer block size in bytes (default: 1 MiB)
             
         Returns:
             bool: True if connection successful
@@ -128,6 +187,8 @@ class FTPProvider(StorageProvider):
             self._passive_mode = passive_mode
         if base_path is not None:
             self._base_path = base_path or "/"
+        if isinstance(block_size, int) and not isinstance(block_size, bool) and block_size > 0:
+            self._block_size = block_size
         
         if not self._host:
             logging.error("FTP Provider: No host configured")
@@ -136,6 +197,7 @@ class FTPProvider(StorageProvider):
         try:
             # Close existing connection if any
             self.disconnect()
+            self._listing_cache = _ListingCache()
             
             # Create FTP connection
             if self._use_tls:
@@ -179,11 +241,17 @@ class FTPProvider(StorageProvider):
                     self._mkdirs(self._base_path)
                     self._ftp.cwd(self._base_path)
             
+            try:
+                self._home_path = self._ftp.pwd() or "/"
+            except ftplib.all_errors as e:
+                logging.debug(f"PWD failed ({e}), assuming base path")
+                self._home_path = posixpath.join("/", self._base_path or "/")
+            
             # Create or verify SaveState folder
-            self._app_folder_path = self.APP_FOLDER_NAME
+            self._app_folder_path = posixpath.join(self._home_path, self.APP_FOLDER_NAME)
             try:
                 self._ftp.cwd(self._app_folder_path)
-                self._ftp.cwd("..")  # Go back after checking
+                self._ftp.cwd(self._home_path)  # Go back after checking
             except ftplib.error_perm:
                 # Folder doesn't exist, create it
                 try:
@@ -208,6 +276,10 @@ class FTPProvider(StorageProvider):
     
     def disconnect(self) -> bool:
         """Disconnect from the FTP server."""
+        with self._idle_lock:
+            idle, self._idle_clones = self._idle_clones, []
+        for clone in idle:
+            clone.disconnect()
         try:
             if self._ftp:
                 try:
@@ -252,10 +324,8 @@ class FTPProvider(StorageProvider):
             
             try:
                 # Upload empty test file
-                self._ftp.cwd(self._app_folder_path)
-                self._ftp.storbinary(f"STOR {test_filename}", BytesIO(b"test"))
-                self._ftp.delete(test_filename)
-                self._ftp.cwd("..")
+                self._ftp.storbinary(f"STOR {test_path}", BytesIO(b"test"))
+                self._ftp.delete(test_path)
                 result['details']['writable'] = True
             except ftplib.error_perm:
                 result['message'] = 'Path is read-only'
@@ -289,130 +359,151 @@ class FTPProvider(StorageProvider):
         Returns:
             Dict with upload statistics
         """
-        result = {
-            'ok': False,
-            'uploaded_count': 0,
-            'skipped_newer_or_same': 0,
-            'total_candidates': 0,
-            'error': None
-        }
+        return self._upload_files_serially(local_path, profile_name, overwrite,
+                                           max_backups, latest_only)
+    
+    # -------------------------------------------------------------------------
+    # Per-file Uploads
+    # -------------------------------------------------------------------------
+    
+    @property
+    def supports_parallel_upload(self) -> bool:
+        return True
+    
+    def clone_for_transfer(self) -> Optional['FTPProvider']:
+        """Reuse an idle pooled connection, or log in once more with the same settings."""
+        while True:
+            with self._idle_lock:
+                clone = self._idle_clones.pop() if self._idle_clones else None
+            if clone is None:
+                break
+            if clone.is_connected:
+                clone.reset_cancellation()
+                return clone
+            clone.disconnect()
         
-        if not self.is_connected:
-            result['error'] = 'Not connected'
-            return result
+        clone = FTPProvider()
+        clone.load_config(self.get_config())
+        clone._password = self._password
+        if not clone.connect():
+            return None
+        clone._listing_cache = self._listing_cache
+        return clone
+    
+    def release_transfer_clone(self, clone: 'FTPProvider') -> None:
+        """Keep the connection logged in for the next sync (up to the pool size)."""
+        with self._idle_lock:
+            if self._connected and len(self._idle_clones) < self.max_transfer_connections - 1:
+                self._idle_clones.append(clone)
+                return
+        clone.disconnect()
+    
+    def prefetch_listings(self, profile_names: Optional[List[str]] = None) -> List[str]:
+        """Start a sync with fresh listings; the app folder is listed once for all profiles."""
+        self._listing_cache.invalidate()
+        entries = self._list_dir(self._app_folder_path)
+        return [name for name, facts in entries.items() if facts.get('type') == 'dir']
+    
+    def plan_upload(self, local_path: str, profile_name: str,
+                    filenames: List[str], overwrite: bool = True) -> Dict[str, Any]:
+        """Create the profile folder and skip files already on the server with the same size."""
+        plan = {'ok': False, 'to_upload': [], 'skipped': 0, 'error': None}
+        try:
+            self._ensure_profile_dir(profile_name)
+            remote_files = self._list_dir(self._profile_path(profile_name))
+        except Exception as e:
+            logging.error(f"Upload preparation failed for {profile_name}: {e}")
+            plan['error'] = str(e)
+            return plan
         
-        if not os.path.isdir(local_path):
-            result['error'] = f'Local path not found: {local_path}'
-            return result
+        for filename in filenames:
+            if filename in remote_files:
+                local_size = os.path.getsize(os.path.join(local_path, filename))
+                if remote_files[filename].get('size', 0) == local_size:
+                    logging.debug(f"Skipping {filename}: same size")
+                    plan['skipped'] += 1
+                    continue
+                if not overwrite:
+                    plan['skipped'] += 1
+                    continue
+            plan['to_upload'].append(filename)
+        plan['ok'] = True
+        return plan
+    
+    def upload_file(self, local_file: str, profile_name: str, filename: str,
+                    progress=None) -> bool:
+        """
+        Upload one file into the profile folder.
+        
+        The data goes to "<filename>.part", renamed once complete. If a
+        previous attempt left a shorter .part behind, the upload resumes
+        from its size with REST (or restarts if the server refuses).
+        """
+        if self._cancelled:
+            return False
+        remote_dir = self._profile_path(profile_name)
+        part_name = filename + PARTIAL_SUFFIX
+        local_size = os.path.getsize(local_file)
+        
+        offset = 0
+        part_info = self._list_dir(remote_dir).get(part_name)
+        if part_info and 0 < part_info.get('size', 0) < local_size:
+            offset = part_info['size']
+        
+        # Bytes to hold back from progress when a refused resume restarts from 0.
+        already_reported = [0]
+        
+        def callback(data):
+            if self._cancelled:
+                raise InterruptedError("Upload cancelled")
+            nbytes = len(data)
+            if already_reported[0]:
+                held = min(nbytes, already_reported[0])
+                already_reported[0] -= held
+                nbytes -= held
+            if progress and nbytes:
+                progress(nbytes)
         
         try:
-            # Navigate to app folder
-            self._ftp.cwd(self._app_folder_path)
-            
-            # Create profile folder
-            try:
-                self._ftp.mkd(profile_name)
-            except ftplib.error_perm:
-                pass  # Folder already exists
-            
-            self._ftp.cwd(profile_name)
+            if offset:
+                logging.info(f"Resuming upload of {filename} at {offset} bytes")
+                if progress:
+                    progress(offset)
+                try:
+                    self._store(local_file, f"{remote_dir}/{part_name}", offset, callback)
+                except (ftplib.error_perm, ftplib.error_reply) as e:
+                    logging.info(f"Server refused to resume {filename} ({e}), restarting")
+                    already_reported[0] = offset
+                    self._store(local_file, f"{remote_dir}/{part_name}", 0, callback)
+            else:
+                self._store(local_file, f"{remote_dir}/{part_name}", 0, callback)
             
-            # Get existing files on server
-            remote_files = {}
+            target = f"{remote_dir}/{filename}"
             try:
-                for entry in self._ftp.mlsd():
-                    name, facts = entry
-                    if facts.get('type') == 'file':
-                        remote_files[name] = {
-                            'size': int(facts.get('size', 0)),
-                            'modify': facts.get('modify', '')
-                        }
+                self._ftp.rename(f"{remote_dir}/{part_name}", target)
             except ftplib.error_perm:
-                # MLSD not supported, try NLST
-                try:
-                    remote_files = {f: {} for f in self._ftp.nlst()}
-                except Exception:
-                    pass
-            
-            # Get list of .zip files to upload
-            files_to_upload = select_zip_files_for_upload(
-                local_path, max_backups=max_backups, latest_only=latest_only,
-            )
-            if not files_to_upload:
-                logging.warning(f"No .zip files found in {local_path}")
-                self._ftp.cwd("../..")  # Go back to root
-                result['ok'] = True
-                return result
-            
-            result['total_candidates'] = len(files_to_upload)
-            
-            # Upload each file
-            for idx, filename in enumerate(files_to_upload, 1):
-                # Check for cancellation
-                if self._cancelled:
-                    result['cancelled'] = True
-                    self._ftp.cwd("../..")
-                    return result
-                
-                local_file = os.path.join(local_path, filename)
-                local_size = os.path.getsize(local_file)
-                
-                # Report progress
-                if self.progress_callback:
-                    self.progress_callback(idx, len(files_to_upload), f"Uploading {filename}")
-                
-                # Check if file exists and compare sizes
-                if filename in remote_files:
-                    remote_info = remote_files[filename]
-                    remote_size = remote_info.get('size', 0)
-                    
-                    if remote_size == local_size:
-                        logging.debug(f"Skipping {filename}: same size")
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                    
-                    if not overwrite:
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                
-                # Upload the file
-                try:
-                    with open(local_file, 'rb') as f:
-                        # Track upload progress
-                        uploaded_bytes = [0]
-                        
-                        def callback(data):
-                            uploaded_bytes[0] += len(data)
-                            if self.chunk_callback:
-                                self.chunk_callback(uploaded_bytes[0], local_size)
-                        
-                        self._ftp.storbinary(f"STOR {filename}", f, 8192, callback)
-                    
-                    result['uploaded_count'] += 1
-                    logging.debug(f"Uploaded {filename}")
-                    
-                except Exception as e:
-                    logging.error(f"Failed to upload {filename}: {e}")
-            
-            # Delete old backups if max_backups is set
-            if max_backups and max_backups > 0:
-                self._cleanup_old_backups_ftp(max_backups)
-            
-            # Go back to root
-            self._ftp.cwd("../..")
-            
-            result['ok'] = True
-            logging.info(f"Upload complete: {result['uploaded_count']} files uploaded")
-            return result
-            
+                # Some servers refuse to rename over an existing file
+                self._ftp.delete(target)
+                self._ftp.rename(f"{remote_dir}/{part_name}", target)
+            
+            self._listing_cache.update(remote_dir, part_name, None)
+            self._listing_cache.update(remote_dir, filename, {
+                'type': 'file',
+                'size': local_size,
+                'modify': datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S'),
+            })
+            logging.debug(f"Uploaded {filename}")
+            return True
         except Exception as e:
-            logging.error(f"Upload failed: {e}")
-            result['error'] = str(e)
-            try:
-                self._ftp.cwd("/")  # Try to go back to root
-            except Exception:
-                pass
-            return result
+            logging.error(f"Failed to upload {filename}: {e}")
+            # The .part file (if any) is now a different size: list again next time.
+            self._listing_cache.invalidate(remote_dir)
+            return False
+    
+    def finish_upload(self, profile_name: str, max_backups: Optional[int] = None) -> None:
+        """Delete the oldest backups of the profile beyond max_backups."""
+        if max_backups and max_backups > 0:
+            self._cleanup_old_backups_ftp(self._profile_path(profile_name), max_backups)
     
     def download_backup(self, profile_name: str, local_path: str,
                         overwrite: bool = True,
@@ -420,6 +511,9 @@ class FTPProvider(StorageProvider):
         """
         Download a backup folder from the FTP server.
         
+        Files are written to "<name>.part" and renamed when complete; an
+        interrupted download resumes from the partial file with REST.
+        
         Args:
             profile_name: Name of the profile to download
             local_path: Local path where to save the backup
@@ -442,39 +536,26 @@ class FTPProvider(StorageProvider):
             return result
         
         try:
-            # Navigate to profile folder
-            profile_path = f"{self._app_folder_path}/{profile_name}"
-            try:
-                self._ftp.cwd(profile_path)
-            except ftplib.error_perm:
+            # Check the profile folder exists
+            profile_path = self._profile_path(profile_name)
+            app_entries = self._list_dir(self._app_folder_path)
+            if app_entries and profile_name not in app_entries:
                 result['error'] = f'Profile not found: {profile_name}'
                 return result
             
             # Create local directory if needed
             os.makedirs(local_path, exist_ok=True)
             
-            # Get list of files
-            files = []
-            try:
-                for entry in self._ftp.mlsd():
-                    name, facts = entry
-                    if facts.get('type') == 'file':
-                        files.append({
-                            'name': name,
-                            'size': int(facts.get('size', 0)),
-                            'modify': facts.get('modify', '')
-                        })
-            except ftplib.error_perm:
-                # MLSD not supported, use NLST
-                try:
-                    files = [{'name': f} for f in self._ftp.nlst()]
-                except Exception:
-                    pass
+            # Get list of files (unfinished uploads are not backups)
+            files = [
+                {'name': name, **facts}
+                for name, facts in self._list_dir(profile_path).items()
+                if facts.get('type', 'file') == 'file' and not name.endswith(PARTIAL_SUFFIX)
+            ]
             
             result['total'] = len(files)
             
             if not files:
-                self._ftp.cwd("../..")
                 result['ok'] = True
                 return result
             
@@ -484,7 +565,6 @@ class FTPProvider(StorageProvider):
                 
                 # Check for cancellation
                 if self._cancelled:
-                    self._ftp.cwd("../..")
                     return result
                 
                 local_file = os.path.join(local_path, filename)
@@ -508,37 +588,18 @@ class FTPProvider(StorageProvider):
                 
                 # Download the file
                 try:
-                    remote_size = file_info.get('size', 0)
-                    downloaded_bytes = [0]
-                    
-                    with open(local_file, 'wb') as f:
-                        def callback(data):
-                            f.write(data)
-                            downloaded_bytes[0] += len(data)
-                            if self.chunk_callback:
-                                self.chunk_callback(downloaded_bytes[0], remote_size)
-                        
-                        self._ftp.retrbinary(f"RETR {filename}", callback)
-                    
+                    self._retrieve(f"{profile_path}/{filename}", local_file, file_info.get('size', 0))
                     result['downloaded'] += 1
-                    
                 except Exception as e:
                     logging.error(f"Failed to download {filename}: {e}")
                     result['failed'] += 1
             
-            # Go back to root
-            self._ftp.cwd("../..")
-            
             result['ok'] = True
             return result
             
         except Exception as e:
             logging.error(f"Download failed: {e}")
             result['error'] = str(e)
-            try:
-                self._ftp.cwd("/")
-            except Exception:
-                pass
             return result
     
     def list_cloud_backups(self) -> List[Dict[str, Any]]:
@@ -549,61 +610,15 @@ class FTPProvider(StorageProvider):
             return backups
         
         try:
-            # Navigate to app folder
-            self._ftp.cwd(self._app_folder_path)
-            
-            # List directories
             try:
-                for entry in self._ftp.mlsd():
-                    name, facts = entry
-                    if facts.get('type') == 'dir' and name not in ('.', '..'):
-                        # Count files in this directory
-                        try:
-                            self._ftp.cwd(name)
-                            file_count = 0
-                            total_size = 0
-                            last_modified = None
-                            
-                            for file_entry in self._ftp.mlsd():
-                                fname, ffacts = file_entry
-                                if ffacts.get('type') == 'file':
-                                    file_count += 1
-                                    total_size += int(ffacts.get('size', 0))
-                                    
-                                    modify = ffacts.get('modify', '')
-                                    if modify and (last_modified is None or modify > last_modified):
-                                        last_modified = modify
-                            
-                            self._ftp.cwd('..')
-                            
-                            # Parse modify time
-                            last_mod_iso = None
-                            if last_modified:
-                                try:
-                                    dt = datetime.strptime(last_modified[:14], '%Y%m%d%H%M%S')
-                                    last_mod_iso = dt.isoformat()
-                                except Exception:
-                                    pass
-                            
-                            backups.append({
-                                'name': name,
-                                'file_count': file_count,
-                                'size': total_size,
-                                'last_modified': last_mod_iso
-                            })
-                            
-                        except Exception as e:
-                            logging.debug(f"Error reading folder {name}: {e}")
-                            try:
-                                self._ftp.cwd('..')
-                            except Exception:
-                                pass
-                            
+                entries = list(self._ftp.mlsd(self._app_folder_path))
             except ftplib.error_perm:
                 # MLSD not supported, use NLST
+                entries = None
                 try:
-                    for name in self._ftp.nlst():
-                        if name not in ('.', '..'):
+                    for path in self._ftp.nlst(self._app_folder_path):
+                        name = posixpath.basename(path.rstrip('/'))
+                        if name not in ('', '.', '..'):
                             backups.append({
                                 'name': name,
                                 'file_count': 0,
@@ -613,17 +628,47 @@ class FTPProvider(StorageProvider):
                 except Exception:
                     pass
             
-            # Go back to root
-            self._ftp.cwd("..")
+            for name, facts in entries or []:
+                if facts.get('type') != 'dir' or name in ('.', '..'):
+                    continue
+                # Count files in this directory
+                try:
+                    file_count = 0
+                    total_size = 0
+                    last_modified = None
+                    
+                    for fname, ffacts in self._ftp.mlsd(f"{self._app_folder_path}/{name}"):
+                        if ffacts.get('type') == 'file':
+                            file_count += 1
+                            total_size += int(ffacts.get('size', 0))
+                            
+                            modify = ffacts.get('modify', '')
+                            if modify and (last_modified is None or modify > last_modified):
+                                last_modified = modify
+                    
+                    # Parse modify time
+                    last_mod_iso = None
+                    if last_modified:
+                        try:
+                            dt = datetime.strptime(last_modified[:14], '%Y%m%d%H%M%S')
+                            last_mod_iso = dt.isoformat()
+                        except Exception:
+                            pass
+                    
+                    backups.append({
+                        'name': name,
+                        'file_count': file_count,
+                        'size': total_size,
+                        'last_modified': last_mod_iso
+                    })
+                    
+                except Exception as e:
+                    logging.debug(f"Error reading folder {name}: {e}")
             
             return backups
             
         except Exception as e:
             logging.error(f"Failed to list backups: {e}")
-            try:
-                self._ftp.cwd("/")
-            except Exception:
-                pass
             return backups
     
     def delete_cloud_backup(self, profile_name: str) -> bool:
@@ -632,49 +677,37 @@ class FTPProvider(StorageProvider):
             return False
         
         try:
-            profile_path = f"{self._app_folder_path}/{profile_name}"
-            
-            # Navigate to profile folder
-            try:
-                self._ftp.cwd(profile_path)
-            except ftplib.error_perm:
-                logging.warning(f"Profile folder not found: {profile_name}")
-                return False
+            profile_path = self._profile_path(profile_name)
             
             # Delete all files in the folder
             try:
-                for entry in self._ftp.mlsd():
-                    name, facts = entry
-                    if facts.get('type') == 'file':
-                        self._ftp.delete(name)
+                names = [name for name, facts in self._ftp.mlsd(profile_path)
+                         if facts.get('type') == 'file']
             except ftplib.error_perm:
-                # MLSD not supported, use NLST
+                # MLSD not supported (or missing folder), use NLST
                 try:
-                    for name in self._ftp.nlst():
-                        if name not in ('.', '..'):
-                            try:
-                                self._ftp.delete(name)
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
-            
-            # Go back and remove the folder
-            self._ftp.cwd("..")
-            self._ftp.rmd(profile_name)
+                    names = [posixpath.basename(path.rstrip('/')) for path in self._ftp.nlst(profile_path)]
+                except ftplib.error_perm:
+                    logging.warning(f"Profile folder not found: {profile_name}")
+                    return False
+            for name in names:
+                if name in ('', '.', '..'):
+                    continue
+                try:
+                    self._ftp.delete(f"{profile_path}/{name}")
+                except ftplib.error_perm as e:
+                    logging.debug(f"Could not delete {name}: {e}")
             
-            # Go back to root
-            self._ftp.cwd("..")
+            # Remove the folder
+            self._ftp.rmd(profile_path)
             
+            self._listing_cache.invalidate()
             logging.info(f"Deleted backup folder: {profile_name}")
             return True
             
         except Exception as e:
             logging.error(f"Failed to delete backup: {e}")
-            try:
-                self._ftp.cwd("/")
-            except Exception:
-                pass
+            self._listing_cache.invalidate()
             return False
     
     # -------------------------------------------------------------------------
@@ -726,7 +759,8 @@ class FTPProvider(StorageProvider):
             # Note: password is NOT stored here for security
             'use_tls': self._use_tls,
             'passive_mode': self._passive_mode,
-            'base_path': self._base_path
+            'base_path': self._base_path,
+            'block_size': self._block_size
         }
     
     def load_config(self, config: Dict[str, Any]) -> bool:
@@ -738,6 +772,9 @@ class FTPProvider(StorageProvider):
             self._use_tls = config.get('use_tls', False)
             self._passive_mode = config.get('passive_mode', True)
             self._base_path = config.get('base_path', '/')
+            block_size = config.get('block_size')
+            if isinstance(block_size, int) and not isinstance(block_size, bool) and block_size > 0:
+                self._block_size = block_size
             return True
         except Exception as e:
             logging.error(f"Failed to load FTP config: {e}")
@@ -817,18 +854,125 @@ class FTPProvider(StorageProvider):
             except ftplib.error_perm:
                 pass  # Directory already exists
     
-    def _cleanup_old_backups_ftp(self, max_backups: int) -> None:
+    def _profile_path(self, profile_name: str) -> str:
+        """Absolute path of a profile folder."""
+        return f"{self._app_folder_path}/{profile_name}"
+    
+    def _list_dir(self, path: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Entries of a remote directory as {name: {'type', 'size', 'modify'}}.
+        
+        Results are cached for the length of a sync (see prefetch_listings)
+        and updated by our own uploads and deletions.
+        """
+        cached = self._listing_cache.get(path)
+        if cached is not None:
+            return cached
+        
+        entries = {}
+        try:
+            for name, facts in self._ftp.mlsd(path):
+                entry_type = facts.get('type')
+                if entry_type not in ('file', 'dir'):
+                    continue  # cdir/pdir
+                entries[name] = {
+                    'type': entry_type,
+                    'size': int(facts.get('size', 0) or 0),
+                    'modify': facts.get('modify', '')
+                }
+        except ftplib.error_perm:
+            # MLSD not supported (or missing folder), try NLST
+            try:
+                entries = {posixpath.basename(f): {} for f in self._ftp.nlst(path)}
+            except Exception:
+                pass
+        
+        self._listing_cache.put(path, entries)
+        return entries
+    
+    def _ensure_profile_dir(self, profile_name: str) -> None:
+        """Create the profile folder unless the app folder listing already has it."""
+        app_entries = self._list_dir(self._app_folder_path)
+        if app_entries.get(profile_name, {}).get('type') == 'dir':
+            return
+        try:
+            self._ftp.mkd(self._profile_path(profile_name))
+        except ftplib.error_perm:
+            pass  # Folder already exists
+        self._listing_cache.update(self._app_folder_path, profile_name, {'type': 'dir'})
+    
+    def _store(self, local_file: str, remote_path: str, offset: int, callback) -> None:
+        """
+        STOR a file (from ``offset`` with REST) using the configured block size.
+        
+        Unlike ftplib.storbinary, the server's final reply is always read,
+        even when the callback aborts the transfer, so the control
+        connection stays usable for the next file.
+        """
+        with open(local_file, 'rb') as f:
+            f.seek(offset)
+            # Listings switch the session to ASCII; REST and binary data need TYPE I.
+            self._ftp.voidcmd("TYPE I")
+            conn = self._ftp.transfercmd(f"STOR {remote_path}", offset or None)
+            try:
+                with conn:
+                    while True:
+                        buf = f.read(self._block_size)
+                        if not buf:
+                            break
+                        conn.sendall(buf)
+                        callback(buf)
+                    if isinstance(conn, ssl.SSLSocket):
+                        conn.unwrap()
+            except BaseException:
+                try:
+                    self._ftp.voidresp()
+                except ftplib.all_errors:
+                    pass
+                raise
+            self._ftp.voidresp()
+    
+    def _retrieve(self, remote_path: str, local_file: str, remote_size: int) -> None:
+        """RETR a file into "<local_file>.part", resuming a previous partial download."""
+        part_file = local_file + PARTIAL_SUFFIX
+        offset = 0
+        if remote_size and os.path.exists(part_file):
+            offset = os.path.getsize(part_file)
+            if offset >= remote_size:
+                offset = 0
+        
+        downloaded = [offset]
+        
+        def run(start):
+            with open(part_file, 'ab' if start else 'wb') as f:
+                def callback(data):
+                    f.write(data)
+                    downloaded[0] += len(data)
+                    if self.chunk_callback:
+                        self.chunk_callback(downloaded[0], remote_size)
+                self._ftp.retrbinary(f"RETR {remote_path}", callback, self._block_size, start or None)
+        
+        if offset:
+            logging.info(f"Resuming download of {remote_path} at {offset} bytes")
+            try:
+                run(offset)
+            except (ftplib.error_perm, ftplib.error_reply) as e:
+                logging.info(f"Server refused to resume {remote_path} ({e}), restarting")
+                downloaded[0] = 0
+                run(0)
+        else:
+            run(0)
+        os.replace(part_file, local_file)
+    
+    def _cleanup_old_backups_ftp(self, profile_path: str, max_backups: int) -> None:
         """Delete old backups exceeding the max_backups limit."""
         try:
             # Get list of files with modification times
-            files = []
-            for entry in self._ftp.mlsd():
-                name, facts = entry
-                if facts.get('type') == 'file' and name.endswith('.zip'):
-                    files.append({
-                        'name': name,
-                        'modify': facts.get('modify', '')
-                    })
+            files = [
+                {'name': name, 'modify': facts.get('modify', '')}
+                for name, facts in self._list_dir(profile_path).items()
+                if facts.get('type') == 'file' and name.endswith('.zip')
+            ]
             
             if len(files) <= max_backups:
                 return
@@ -841,7 +985,8 @@ class FTPProvider(StorageProvider):
             
             for file_info in files_to_delete:
                 try:
-                    self._ftp.delete(file_info['name'])
+                    self._ftp.delete(f"{profile_path}/{file_info['name']}")
+                    self._listing_cache.update(profile_path, file_info['name'], None)
                     logging.info(f"Deleted old backup: {file_info['name']}")
                 except Exception as e:
                     logging.warning(f"Failed to delete {file_info['name']}: {e}")
@@ -51,8 +51,8 @@ def _lazy_init():
     MediaIoBaseDownload = _MediaIoBaseDownload
     HttpError = _HttpError
 
-import hashlib
 from cloud_utils.storage_provider import select_zip_files_for_upload
+from core import hash_cache
 from common.utils import resource_path
 from config import get_app_data_folder
 
@@ -560,16 +560,11 @@ class GoogleDriveManager:
             return None
     
     def _compute_local_md5(self, file_path: str) -> Optional[str]:
-        """Compute MD5 hash of a local file."""
-        try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except Exception as e:
-            logging.error(f"Error computing MD5 for {file_path}: {e}")
-            return None
+        """MD5 of a local file, from the shared hash cache when the file is unchanged."""
+        md5 = hash_cache.get_md5(file_path)
+        if md5 is None:
+            logging.error(f"Error computing MD5 for {file_path}")
+        return md5
 
     def _get_remote_md5(self, file_id: str) -> Optional[str]:
         """Get MD5 hash of a remote file from Google Drive metadata."""
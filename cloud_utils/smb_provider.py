@@ -22,17 +22,18 @@ standard library plus the ``gio`` binary on Linux.
 
 import os
 import re
+import copy
 import sys
 import shutil
 import logging
-import hashlib
 import posixpath
 import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 
-from cloud_utils.storage_provider import StorageProvider, ProviderType, select_zip_files_for_upload
+from cloud_utils.storage_provider import StorageProvider, ProviderType
+from core import hash_cache
 
 
 # ---------------------------------------------------------------------------
@@ -514,102 +515,80 @@ class SMBProvider(StorageProvider):
         Returns:
             Dict with upload statistics
         """
-        result = {
-            'ok': False,
-            'uploaded_count': 0,
-            'skipped_newer_or_same': 0,
-            'total_candidates': 0,
-            'error': None
-        }
-        
+        return self._upload_files_serially(local_path, profile_name, overwrite,
+                                           max_backups, latest_only)
+    
+    # -------------------------------------------------------------------------
+    # Per-file Uploads
+    # -------------------------------------------------------------------------
+    
+    @property
+    def supports_parallel_upload(self) -> bool:
+        return True
+    
+    def clone_for_transfer(self) -> Optional['SMBProvider']:
+        """The share is a mounted path: a copy with its own callbacks is enough."""
         if not self.is_connected:
-            result['error'] = 'Not connected'
-            return result
-        
-        if not os.path.isdir(local_path):
-            result['error'] = f'Local path not found: {local_path}'
-            return result
-        
+            return None
+        clone = copy.copy(self)
+        clone.progress_callback = None
+        clone.chunk_callback = None
+        return clone
+    
+    def plan_upload(self, local_path: str, profile_name: str,
+                    filenames: List[str], overwrite: bool = True) -> Dict[str, Any]:
+        """Create the profile folder and skip files whose copy is identical or newer."""
+        plan = {'ok': False, 'to_upload': [], 'skipped': 0, 'error': None}
+        profile_folder = os.path.join(self._app_folder_path, profile_name)
         try:
-            # Create profile folder on network share
-            profile_folder = os.path.join(self._app_folder_path, profile_name)
             os.makedirs(profile_folder, exist_ok=True)
-            
-            # Get list of .zip files to upload
-            files_to_upload = select_zip_files_for_upload(
-                local_path, max_backups=max_backups, latest_only=latest_only,
-            )
-            if not files_to_upload:
-                logging.warning(f"No .zip files found in {local_path}")
-                result['ok'] = True
-                return result
-            
-            result['total_candidates'] = len(files_to_upload)
-            
-            # Upload each file
-            for idx, filename in enumerate(files_to_upload, 1):
-                # Check for cancellation
-                if self._cancelled:
-                    result['cancelled'] = True
-                    return result
-                
-                local_file = os.path.join(local_path, filename)
-                remote_file = os.path.join(profile_folder, filename)
-                
-                # Report progress
-                if self.progress_callback:
-                    self.progress_callback(idx, len(files_to_upload), f"Copying {filename}")
-                
-                # Check if file exists and compare
-                if os.path.exists(remote_file):
-                    # Compare MD5 hashes
-                    local_md5 = self._compute_md5(local_file)
-                    remote_md5 = self._compute_md5(remote_file)
-                    
-                    if local_md5 and remote_md5 and local_md5 == remote_md5:
-                        logging.debug(f"Skipping {filename}: identical content")
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                    
-                    # Compare timestamps if MD5 differs
-                    if not overwrite:
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                    
-                    local_mtime = os.path.getmtime(local_file)
-                    remote_mtime = os.path.getmtime(remote_file)
-                    
-                    if remote_mtime >= local_mtime:
-                        logging.debug(f"Skipping {filename}: remote is newer or same")
-                        result['skipped_newer_or_same'] += 1
-                        continue
+        except OSError as e:
+            logging.error(f"Upload preparation failed for {profile_name}: {e}")
+            plan['error'] = str(e)
+            return plan
+        
+        for filename in filenames:
+            local_file = os.path.join(local_path, filename)
+            remote_file = os.path.join(profile_folder, filename)
+            if os.path.exists(remote_file):
+                if self._same_content(local_file, remote_file):
+                    logging.debug(f"Skipping {filename}: identical content")
+                    plan['skipped'] += 1
+                    continue
                 
-                # Copy the file
-                try:
-                    shutil.copy2(local_file, remote_file)
-                    result['uploaded_count'] += 1
-                    logging.debug(f"Copied {filename} to network share")
-                    
-                    # Report chunk progress (file size)
-                    if self.chunk_callback:
-                        file_size = os.path.getsize(local_file)
-                        self.chunk_callback(file_size, file_size)
-                        
-                except Exception as e:
-                    logging.error(f"Failed to copy {filename}: {e}")
-            
-            # Delete old backups if max_backups is set
-            if max_backups and max_backups > 0:
-                self._cleanup_old_backups(profile_folder, max_backups)
-            
-            result['ok'] = True
-            logging.info(f"Upload complete: {result['uploaded_count']} files copied")
-            return result
-            
+                # Compare timestamps if MD5 differs
+                if not overwrite:
+                    plan['skipped'] += 1
+                    continue
+                if os.path.getmtime(remote_file) >= os.path.getmtime(local_file):
+                    logging.debug(f"Skipping {filename}: remote is newer or same")
+                    plan['skipped'] += 1
+                    continue
+            plan['to_upload'].append(filename)
+        plan['ok'] = True
+        return plan
+    
+    def upload_file(self, local_file: str, profile_name: str, filename: str,
+                    progress=None) -> bool:
+        """Copy one file to the profile folder, keeping its timestamps."""
+        if self._cancelled:
+            return False
+        remote_file = os.path.join(self._app_folder_path, profile_name, filename)
+        try:
+            shutil.copy2(local_file, remote_file)
+            self._remember_copy(local_file, remote_file)
+            logging.debug(f"Copied {filename} to network share")
+            if progress:
+                progress(os.path.getsize(local_file))
+            return True
         except Exception as e:
-            logging.error(f"Upload failed: {e}")
-            result['error'] = str(e)
-            return result
+            logging.error(f"Failed to copy {filename}: {e}")
+            return False
+    
+    def finish_upload(self, profile_name: str, max_backups: Optional[int] = None) -> None:
+        """Delete the oldest backups of the profile beyond max_backups."""
+        if max_backups and max_backups > 0:
+            self._cleanup_old_backups(os.path.join(self._app_folder_path, profile_name), max_backups)
     
     def download_backup(self, profile_name: str, local_path: str,
                         overwrite: bool = True,
@@ -676,11 +655,7 @@ class SMBProvider(StorageProvider):
                 
                 # Check if local file exists
                 if os.path.exists(local_file):
-                    # Compare MD5
-                    local_md5 = self._compute_md5(local_file)
-                    remote_md5 = self._compute_md5(remote_file)
-                    
-                    if local_md5 and remote_md5 and local_md5 == remote_md5:
+                    if self._same_content(local_file, remote_file):
                         result['skipped'] += 1
                         continue
                     
@@ -698,6 +673,7 @@ class SMBProvider(StorageProvider):
                 # Copy the file
                 try:
                     shutil.copy2(remote_file, local_file)
+                    self._remember_copy(remote_file, local_file)
                     result['downloaded'] += 1
                     
                     if self.chunk_callback:
@@ -865,16 +841,32 @@ class SMBProvider(StorageProvider):
     # -------------------------------------------------------------------------
     
     def _compute_md5(self, file_path: str) -> Optional[str]:
-        """Compute MD5 hash of a file."""
+        """MD5 of a file, from the shared hash cache when the file is unchanged."""
+        md5 = hash_cache.get_md5(file_path)
+        if md5 is None:
+            logging.debug(f"Failed to compute MD5 for {file_path}")
+        return md5
+    
+    def _same_content(self, local_file: str, remote_file: str) -> bool:
+        """True if both files hold the same bytes.
+        
+        Different sizes answer without hashing; otherwise the digests come from
+        the hash cache, so an unchanged remote copy is not read over the network.
+        """
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except Exception as e:
-            logging.debug(f"Failed to compute MD5 for {file_path}: {e}")
-            return None
+            if os.path.getsize(local_file) != os.path.getsize(remote_file):
+                return False
+        except OSError:
+            return False
+        local_md5 = self._compute_md5(local_file)
+        remote_md5 = self._compute_md5(remote_file)
+        return bool(local_md5 and remote_md5 and local_md5 == remote_md5)
+    
+    def _remember_copy(self, source_file: str, copied_file: str) -> None:
+        """Give a fresh copy the cached digests of its source (no extra read)."""
+        digests = hash_cache.peek(source_file)
+        if digests:
+            hash_cache.remember(copied_file, digests)
     
     def _get_folder_size(self, folder_path: str) -> int:
         """Calculate total size of a folder in bytes."""
@@ -10,6 +10,10 @@ from typing import Dict, List, Optional, Callable, Any
 from enum import Enum
 import logging
 import os
+import shutil
+import tempfile
+
+from core import dedup_store
 
 
 def select_zip_files_for_upload(
@@ -22,6 +26,8 @@ def select_zip_files_for_upload(
 
     When *latest_only* is True only the most recent archive is returned
     (used after event-driven auto-backups to avoid scanning the whole folder).
+    Deduplicated snapshots are left out: their content lives in the local
+    chunk store, so the snapshot ZIP alone could not be restored elsewhere.
     """
     try:
         zip_files = [f for f in os.listdir(local_path) if f.endswith('.zip')]
@@ -37,11 +43,21 @@ def select_zip_files_for_upload(
         )
     except Exception:
         zip_files_sorted = zip_files
-    if latest_only:
-        return zip_files_sorted[:1]
-    if max_backups and max_backups > 0:
-        return zip_files_sorted[:max_backups]
-    return zip_files_sorted
+    limit = 1 if latest_only else (max_backups if max_backups and max_backups > 0 else None)
+    # Only the archives that would be selected are opened to look for snapshots
+    selected = []
+    snapshots = 0
+    for name in zip_files_sorted:
+        if limit is not None and len(selected) >= limit:
+            break
+        if dedup_store.is_snapshot_archive(os.path.join(local_path, name)):
+            snapshots += 1
+            continue
+        selected.append(name)
+    if snapshots:
+        logging.warning(f"Skipping {snapshots} deduplicated snapshot(s) in {local_path}: "
+                        "they cannot be restored without the local chunk store.")
+    return selected
 
 
 class ProviderType(Enum):
@@ -248,6 +264,194 @@ class StorageProvider(ABC):
         """
         pass
     
+    # -------------------------------------------------------------------------
+    # Per-file Uploads (used by cloud_utils.transfer_scheduler)
+    # -------------------------------------------------------------------------
+    
+    # Upper bound for pooled connections, whatever the user configured.
+    max_transfer_connections: int = 4
+    
+    @property
+    def supports_parallel_upload(self) -> bool:
+        """
+        True if the provider implements plan_upload/upload_file/finish_upload
+        and clone_for_transfer, so files can be sent on several connections.
+        """
+        return False
+    
+    def clone_for_transfer(self) -> Optional['StorageProvider']:
+        """
+        Return an independent, connected copy of this provider (one extra pooled
+        connection with the same configuration and credentials), or None.
+        """
+        return None
+    
+    def release_transfer_clone(self, clone: 'StorageProvider') -> None:
+        """Called when a sync no longer needs a clone; providers may keep it for reuse."""
+        clone.disconnect()
+    
+    def prefetch_listings(self, profile_names: Optional[List[str]] = None) -> Optional[List[str]]:
+        """
+        Optional hook called before planning many profiles at once, so the
+        provider can fetch their remote state in a single batched request.
+        """
+        return None
+    
+    def plan_upload(self, local_path: str, profile_name: str,
+                    filenames: List[str], overwrite: bool = True) -> Dict[str, Any]:
+        """
+        Create the profile folder in the storage and decide which files to send.
+        
+        Args:
+            local_path: Local path to the backup folder
+            profile_name: Name of the profile (folder name in storage)
+            filenames: Candidate file names inside local_path
+            overwrite: If False, files already present in storage are skipped
+            
+        Returns:
+            Dict with keys:
+                - ok: bool
+                - to_upload: List[str] (subset of filenames, same order)
+                - skipped: int (files already up to date)
+                - error: str (optional, if failed)
+        
+        The default sends every file: it has no cheap way to look at the remote
+        folder, and ``upload_file`` creates the folder when needed. Providers
+        with a listing override it to skip files already up to date.
+        """
+        if not self.is_connected:
+            return {'ok': False, 'to_upload': [], 'skipped': 0, 'error': 'Not connected'}
+        return {'ok': True, 'to_upload': list(filenames), 'skipped': 0}
+    
+    def upload_file(self, local_file: str, profile_name: str, filename: str,
+                    progress: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Upload one file into the profile folder (created by plan_upload).
+        
+        Args:
+            local_file: Full local path of the file
+            profile_name: Name of the profile (folder name in storage)
+            filename: Remote file name
+            progress: Optional callable(bytes_sent_since_last_call)
+            
+        Returns:
+            bool: True if the file was uploaded
+        
+        The default goes through ``upload_backup`` with a temporary folder
+        holding only this file (a hard link when possible). Providers whose
+        ``upload_backup`` is built on ``_upload_files_serially`` must override it.
+        """
+        with tempfile.TemporaryDirectory(prefix="savestate_upload_") as staging:
+            staged_file = os.path.join(staging, filename)
+            try:
+                os.link(local_file, staged_file)
+            except OSError:
+                shutil.copy2(local_file, staged_file)
+            
+            previous_callback = self.chunk_callback
+            reported = [0]
+            
+            def _forward(current_bytes, total_bytes):
+                if progress and current_bytes > reported[0]:
+                    progress(current_bytes - reported[0])
+                    reported[0] = current_bytes
+                if previous_callback:
+                    previous_callback(current_bytes, total_bytes)
+            
+            self.chunk_callback = _forward
+            try:
+                result = self.upload_backup(staging, profile_name, overwrite=True)
+            finally:
+                self.chunk_callback = previous_callback
+        if not result.get('ok'):
+            logging.error(f"{self.name}: upload of {filename} failed: {result.get('error')}")
+            return False
+        return result.get('uploaded_count', 0) > 0 or result.get('skipped_newer_or_same', 0) > 0
+    
+    def finish_upload(self, profile_name: str, max_backups: Optional[int] = None) -> None:
+        """Apply the max_backups retention once all files of a profile were sent."""
+        pass
+    
+    def _upload_files_serially(self, local_path: str, profile_name: str,
+                               overwrite: bool = True,
+                               max_backups: Optional[int] = None,
+                               latest_only: bool = False) -> Dict[str, Any]:
+        """upload_backup() built on the per-file methods, one file after the other."""
+        result = {
+            'ok': False,
+            'uploaded_count': 0,
+            'failed_count': 0,
+            'skipped_newer_or_same': 0,
+            'total_candidates': 0,
+            'error': None
+        }
+        
+        if not self.is_connected:
+            result['error'] = 'Not connected'
+            return result
+        
+        if not os.path.isdir(local_path):
+            result['error'] = f'Local path not found: {local_path}'
+            return result
+        
+        try:
+            files_to_upload = select_zip_files_for_upload(
+                local_path, max_backups=max_backups, latest_only=latest_only,
+            )
+            plan = self.plan_upload(local_path, profile_name, files_to_upload, overwrite)
+            if not plan.get('ok'):
+                result['error'] = plan.get('error') or 'Upload preparation failed'
+                return result
+            if not files_to_upload:
+                logging.warning(f"No .zip files found in {local_path}")
+                result['ok'] = True
+                return result
+            
+            result['total_candidates'] = len(files_to_upload)
+            result['skipped_newer_or_same'] = plan.get('skipped', 0)
+            pending = plan.get('to_upload', [])
+            
+            for idx, filename in enumerate(pending, 1):
+                if self._cancelled:
+                    result['cancelled'] = True
+                    return result
+                
+                if self.progress_callback:
+                    self.progress_callback(idx, len(pending), f"Uploading {filename}")
+                
+                local_file = os.path.join(local_path, filename)
+                local_size = os.path.getsize(local_file)
+                sent = [0]
+                
+                def _on_progress(nbytes, _size=local_size):
+                    sent[0] += nbytes
+                    if self.chunk_callback:
+                        self.chunk_callback(sent[0], _size)
+                
+                if self.upload_file(local_file, profile_name, filename, _on_progress):
+                    result['uploaded_count'] += 1
+                else:
+                    result['failed_count'] += 1
+            
+            if result['failed_count']:
+                # Keep the old remote backups: retention after a failed upload
+                # could leave fewer copies than max_backups.
+                result['error'] = f"{result['failed_count']} of {len(pending)} file(s) failed to upload"
+                logging.error(f"Upload incomplete for {profile_name}: {result['error']}")
+                return result
+            
+            if max_backups and max_backups > 0:
+                self.finish_upload(profile_name, max_backups)
+            
+            result['ok'] = True
+            logging.info(f"Upload complete: {result['uploaded_count']} files uploaded")
+            return result
+            
+        except Exception as e:
+            logging.error(f"Upload failed: {e}")
+            result['error'] = str(e)
+            return result
+    
     # -------------------------------------------------------------------------
     # Storage Information
     # -------------------------------------------------------------------------
@@ -0,0 +1,426 @@
+# cloud_utils/transfer_scheduler.py
+# -*- coding: utf-8 -*-
+"""
+Transfer Scheduler - parallel, resumable uploads across profiles.
+
+``StorageProvider.upload_backup`` sends one file at a time over one
+connection; on high-latency links (WebDAV, FTP) most of a sync is spent
+waiting for round trips. For providers that implement the per-file upload
+methods (``supports_parallel_upload``) the scheduler instead:
+
+- lets the provider fetch the remote state of all profiles in one batch
+  (``prefetch_listings``), then plans every profile (remote listing, skip
+  checks) and sends every file as independent tasks on a bounded thread
+  pool, across profiles;
+- gives each task its own connection from a per-provider pool (the primary
+  provider plus clones from ``clone_for_transfer``, opened on demand);
+- reports the aggregated byte progress of all transfers through the primary
+  provider's ``chunk_callback`` and file progress through ``progress_callback``;
+- keeps the files still to send in ``cloud_upload_queue.json`` next to the
+  other configs, so a sync interrupted by a crash, a cancel or a failed
+  transfer sends the missing files on the next run, even with ``latest_only``.
+
+Retention (``max_backups``) is applied per profile once all its files are sent,
+and skipped for a profile whose uploads failed.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from cloud_utils.storage_provider import StorageProvider, select_zip_files_for_upload
+
+QUEUE_FILENAME = "cloud_upload_queue.json"
+DEFAULT_PARALLEL_TRANSFERS = 3
+
+# Minimum interval between two aggregated chunk_callback reports.
+_PROGRESS_INTERVAL_S = 0.1
+
+
+def can_schedule(provider) -> bool:
+    """True if the provider supports per-file parallel uploads."""
+    return bool(getattr(provider, 'supports_parallel_upload', False))
+
+
+def get_transfer_count(setting_value=None) -> int:
+    """Resolve the ``parallel_transfers`` cloud setting (invalid values use the default)."""
+    if isinstance(setting_value, int) and not isinstance(setting_value, bool) and setting_value > 0:
+        return setting_value
+    return DEFAULT_PARALLEL_TRANSFERS
+
+
+@dataclass
+class UploadJob:
+    """One profile backup folder to upload."""
+    profile_name: str
+    local_path: str
+
+
+class ConnectionPool:
+    """Connections of one provider: the primary instance plus clones opened on demand."""
+
+    def __init__(self, provider: StorageProvider, size: int):
+        self._provider = provider
+        self._size = max(1, size)
+        self._idle = queue.Queue()
+        self._idle.put(provider)
+        self._clones: List[StorageProvider] = []
+        self._opened = 1
+        self._can_grow = self._size > 1
+        self._lock = threading.Lock()
+
+    def acquire(self) -> StorageProvider:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            grow = self._can_grow and self._opened < self._size
+            if grow:
+                self._opened += 1
+        if grow:
+            clone = None
+            try:
+                clone = self._provider.clone_for_transfer()
+            except Exception as e:
+                logging.warning(f"{self._provider.name}: could not open an extra connection: {e}")
+            if clone is not None:
+                if self._provider.is_cancelled():
+                    clone.request_cancellation()
+                with self._lock:
+                    self._clones.append(clone)
+                logging.debug(f"{self._provider.name}: opened pooled connection {self._opened}/{self._size}")
+                return clone
+            # The server refused another connection: stay at the current size.
+            with self._lock:
+                self._opened -= 1
+                self._can_grow = False
+        return self._idle.get()
+
+    def release(self, connection: StorageProvider) -> None:
+        self._idle.put(connection)
+
+    def request_cancellation(self) -> None:
+        with self._lock:
+            clones = list(self._clones)
+        for connection in clones:
+            connection.request_cancellation()
+
+    def close(self) -> None:
+        """Hand the clones back to the provider; the primary provider stays connected."""
+        with self._lock:
+            clones, self._clones = self._clones, []
+        for connection in clones:
+            try:
+                self._provider.release_transfer_clone(connection)
+            except Exception as e:
+                logging.debug(f"Error closing pooled connection: {e}")
+
+
+class UploadQueue:
+    """Files still to upload, persisted as JSON per provider type."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            from core import settings_manager
+            path = os.path.join(settings_manager.get_active_config_dir(), QUEUE_FILENAME)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, provider_key: str) -> Dict[str, Dict[str, Any]]:
+        """Return {profile_name: {'local_path': str, 'files': [names]}} left by a previous run."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable upload queue '{self.path}': {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('provider') != provider_key:
+            return {}
+        profiles = data.get('profiles')
+        return profiles if isinstance(profiles, dict) else {}
+
+    def save(self, provider_key: str, profiles: Dict[str, Dict[str, Any]]) -> None:
+        """Write the pending files atomically; an empty queue removes the file."""
+        with self._lock:
+            pending = {name: entry for name, entry in profiles.items() if entry.get('files')}
+            try:
+                if not pending:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                    return
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'provider': provider_key, 'profiles': pending}, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logging.warning(f"Unable to persist upload queue '{self.path}': {e}")
+
+
+class TransferScheduler:
+    """
+    Upload several profiles concurrently over a pool of provider connections.
+
+    Args:
+        provider: Connected provider with ``supports_parallel_upload``
+        max_transfers: Concurrent transfers (capped by ``provider.max_transfer_connections``)
+        upload_queue: Persistence for pending files; None uses the config directory
+    """
+
+    def __init__(self, provider: StorageProvider, max_transfers: Optional[int] = None,
+                 upload_queue: Optional[UploadQueue] = None):
+        self.provider = provider
+        self.max_transfers = min(get_transfer_count(max_transfers),
+                                 max(1, provider.max_transfer_connections))
+        self.upload_queue = upload_queue or UploadQueue()
+        self._cancel_event = threading.Event()
+        self._pool: Optional[ConnectionPool] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._bytes_sent = 0
+        self._bytes_total = 0
+        self._files_done = 0
+        self._files_total = 0
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Stop starting new transfers and abort the running ones."""
+        self._cancel_event.set()
+        self.provider.request_cancellation()
+        if self._pool is not None:
+            self._pool.request_cancellation()
+
+    # -------------------------------------------------------------------------
+    # Progress
+    # -------------------------------------------------------------------------
+
+    def _add_bytes(self, nbytes: int) -> None:
+        callback = self.provider.chunk_callback
+        with self._lock:
+            self._bytes_sent += nbytes
+            now = time.monotonic()
+            if now - self._last_report < _PROGRESS_INTERVAL_S:
+                return
+            self._last_report = now
+            sent, total = self._bytes_sent, self._bytes_total
+        if callback:
+            callback(sent, total)
+
+    def _report_file(self, filename: str, finished: bool) -> None:
+        with self._lock:
+            if finished:
+                self._files_done += 1
+            done, total = self._files_done, self._files_total
+            sent, total_bytes = self._bytes_sent, self._bytes_total
+        if not finished and self.provider.progress_callback:
+            self.provider.progress_callback(min(done + 1, total), total,
+                                            f"Uploading {filename} ({done}/{total} files done)")
+        if finished and self.provider.chunk_callback:
+            self.provider.chunk_callback(sent, total_bytes)
+
+    # -------------------------------------------------------------------------
+    # Queue bookkeeping
+    # -------------------------------------------------------------------------
+
+    def _provider_key(self) -> str:
+        return self.provider.provider_type.value
+
+    def _mark_done(self, profile_name: str, filenames) -> None:
+        with self._lock:
+            entry = self._pending.get(profile_name)
+            if entry is None:
+                return
+            done = set(filenames)
+            entry['files'] = [f for f in entry['files'] if f not in done]
+            snapshot = {name: dict(e) for name, e in self._pending.items()}
+        self.upload_queue.save(self._provider_key(), snapshot)
+
+    def _collect_candidates(self, jobs: List[UploadJob], max_backups, latest_only) -> Dict[str, List[str]]:
+        resumed = self.upload_queue.load(self._provider_key())
+        candidates = {}
+        for job in jobs:
+            names = select_zip_files_for_upload(job.local_path, max_backups=max_backups,
+                                                latest_only=latest_only)
+            previous = resumed.get(job.profile_name, {})
+            if previous.get('local_path') == job.local_path:
+                extra = [f for f in previous.get('files', [])
+                         if f not in names and os.path.isfile(os.path.join(job.local_path, f))]
+                if extra:
+                    logging.info(f"Resuming {len(extra)} interrupted upload(s) for '{job.profile_name}'")
+                    names = extra + names
+            candidates[job.profile_name] = names
+        # Profiles of an interrupted run that are not part of this one stay queued.
+        self._pending = {name: entry for name, entry in resumed.items()}
+        for job in jobs:
+            self._pending[job.profile_name] = {'local_path': job.local_path,
+                                               'files': list(candidates[job.profile_name])}
+        self.upload_queue.save(self._provider_key(), self._pending)
+        return candidates
+
+    # -------------------------------------------------------------------------
+    # Tasks (run on the pool threads)
+    # -------------------------------------------------------------------------
+
+    def _plan(self, job: UploadJob, filenames: List[str], overwrite: bool) -> Dict[str, Any]:
+        if self.cancelled:
+            return {'ok': False, 'to_upload': [], 'skipped': 0, 'error': 'cancelled'}
+        connection = self._pool.acquire()
+        try:
+            return connection.plan_upload(job.local_path, job.profile_name, filenames, overwrite)
+        except Exception as e:
+            logging.error(f"Upload preparation failed for {job.profile_name}: {e}")
+            return {'ok': False, 'to_upload': [], 'skipped': 0, 'error': str(e)}
+        finally:
+            self._pool.release(connection)
+
+    def _send(self, job: UploadJob, filename: str) -> bool:
+        if self.cancelled:
+            return False
+        connection = self._pool.acquire()
+        try:
+            if self.cancelled:
+                return False
+            self._report_file(filename, finished=False)
+            ok = connection.upload_file(os.path.join(job.local_path, filename),
+                                        job.profile_name, filename, self._add_bytes)
+        except Exception as e:
+            logging.error(f"Failed to upload {filename}: {e}")
+            ok = False
+        finally:
+            self._pool.release(connection)
+        if ok:
+            self._mark_done(job.profile_name, [filename])
+            self._report_file(filename, finished=True)
+        return ok
+
+    def _finish(self, job: UploadJob, max_backups: Optional[int]) -> None:
+        connection = self._pool.acquire()
+        try:
+            connection.finish_upload(job.profile_name, max_backups)
+        except Exception as e:
+            logging.error(f"Error cleaning up old backups for {job.profile_name}: {e}")
+        finally:
+            self._pool.release(connection)
+
+    # -------------------------------------------------------------------------
+    # Entry point
+    # -------------------------------------------------------------------------
+
+    def run(self, jobs: List[UploadJob], overwrite: bool = True,
+            max_backups: Optional[int] = None, latest_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Upload all jobs and return one result dict per job, in order.
+
+        Each result has the keys of ``upload_backup``'s return value plus
+        ``name`` (ok, uploaded_count, failed_count, skipped_newer_or_same,
+        total_candidates, cancelled, error). ``ok`` is True only when every
+        planned file was sent; retention runs only for those profiles.
+        """
+        results = {
+            job.profile_name: {
+                'name': job.profile_name,
+                'ok': False,
+                'uploaded_count': 0,
+                'failed_count': 0,
+                'skipped_newer_or_same': 0,
+                'total_candidates': 0,
+                'cancelled': False,
+                'error': None,
+            }
+            for job in jobs
+        }
+        if not self.provider.is_connected:
+            for result in results.values():
+                result['error'] = 'Not connected'
+            return [results[job.profile_name] for job in jobs]
+
+        self.provider.reset_cancellation()
+        candidates = self._collect_candidates(jobs, max_backups, latest_only)
+        try:
+            self.provider.prefetch_listings([job.profile_name for job in jobs])
+        except Exception as e:
+            logging.debug(f"{self.provider.name}: batch listing skipped: {e}")
+        self._pool = ConnectionPool(self.provider, self.max_transfers)
+        logging.info(f"{self.provider.name}: uploading {len(jobs)} profile(s) "
+                     f"with up to {self.max_transfers} parallel transfer(s)")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_transfers,
+                                    thread_name_prefix="cloud-upload") as executor:
+                plan_futures = {}
+                for job in jobs:
+                    names = candidates[job.profile_name]
+                    results[job.profile_name]['total_candidates'] = len(names)
+                    if not os.path.isdir(job.local_path):
+                        results[job.profile_name]['error'] = f'Local path not found: {job.local_path}'
+                        continue
+                    plan_futures[executor.submit(self._plan, job, names, overwrite)] = job
+
+                file_futures = []
+                for future in as_completed(plan_futures):
+                    job = plan_futures[future]
+                    plan = future.result()
+                    result = results[job.profile_name]
+                    if not plan.get('ok'):
+                        result['error'] = plan.get('error') or 'Upload preparation failed'
+                        continue
+                    to_upload = plan.get('to_upload', [])
+                    result['skipped_newer_or_same'] = plan.get('skipped', 0)
+                    self._mark_done(job.profile_name,
+                                    [f for f in candidates[job.profile_name] if f not in to_upload])
+                    sizes = {}
+                    for filename in to_upload:
+                        try:
+                            sizes[filename] = os.path.getsize(os.path.join(job.local_path, filename))
+                        except OSError:
+                            sizes[filename] = 0
+                    with self._lock:
+                        self._files_total += len(to_upload)
+                        self._bytes_total += sum(sizes.values())
+                    for filename in to_upload:
+                        file_futures.append((job, executor.submit(self._send, job, filename)))
+
+                for job, future in file_futures:
+                    key = 'uploaded_count' if future.result() else 'failed_count'
+                    results[job.profile_name][key] += 1
+
+                if self.cancelled:
+                    for result in results.values():
+                        result['cancelled'] = True
+                    return [results[job.profile_name] for job in jobs]
+
+                for job in jobs:
+                    result = results[job.profile_name]
+                    if result['error'] is None and result['failed_count']:
+                        result['error'] = (f"{result['failed_count']} of "
+                                           f"{result['failed_count'] + result['uploaded_count']} "
+                                           f"file(s) failed to upload")
+                # Retention only for profiles whose files all reached the remote:
+                # pruning after a failed upload could leave fewer copies than wanted.
+                complete = [job for job in jobs if results[job.profile_name]['error'] is None]
+                if max_backups and max_backups > 0:
+                    for future in [executor.submit(self._finish, job, max_backups) for job in complete]:
+                        future.result()
+                for job in complete:
+                    results[job.profile_name]['ok'] = True
+        finally:
+            self._pool.close()
+
+        uploaded = sum(r['uploaded_count'] for r in results.values())
+        failed = sum(r['failed_count'] for r in results.values())
+        logging.info(f"Upload complete: {uploaded} files uploaded, {failed} failed "
+                     f"({self._bytes_sent} bytes, {self.max_transfers} transfer(s))")
+        return [results[job.profile_name] for job in jobs]
@@ -13,13 +13,15 @@ Uses requests library with standard WebDAV HTTP methods.
 """
 
 import os
+import time
 import logging
 import hashlib
+import threading
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin, quote
+from urllib.parse import urljoin, quote, unquote, urlsplit
 
 try:
     import requests
@@ -28,7 +30,123 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
-from cloud_utils.storage_provider import StorageProvider, ProviderType, select_zip_files_for_upload
+from cloud_utils.storage_provider import StorageProvider, ProviderType
+
+
+# Listings validated within this window are reused without asking the server.
+_LISTING_FRESH_S = 30
+# Collections that only expose getlastmodified (no ETag) are re-listed after this.
+_LASTMODIFIED_TTL_S = 300
+
+
+class _ListingCache:
+    """
+    Remote listings per collection URL, shared by a provider and its pooled clones.
+    
+    Each entry keeps the collection's validator (its ETag, or ``lm:<getlastmodified>``
+    when the server has no collection ETags), the files listed under it, and
+    when it was last listed/validated. An entry whose ``files`` is None only
+    knows the current validator (from a parent listing) and must be re-listed.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+    
+    def put(self, url: str, validator: Optional[str], files: Dict[str, Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[url] = {'validator': validator, 'files': files, 'exists': True,
+                                  'listed_at': now, 'validated_at': now}
+    
+    def note_validator(self, url: str, validator: Optional[str]) -> None:
+        """Record the validator seen in a parent listing; drop the files if it changed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry and entry['files'] is not None and validator and _validator_matches(entry, validator, now):
+                entry['validated_at'] = now
+                return
+            self._entries[url] = {'validator': validator, 'files': None, 'exists': True,
+                                  'listed_at': 0.0, 'validated_at': now}
+    
+    def note_missing(self, url: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[url] = {'validator': None, 'files': {}, 'exists': False,
+                                  'listed_at': now, 'validated_at': now}
+    
+    def touch(self, url: str) -> None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                entry['validated_at'] = time.monotonic()
+    
+    def record_file(self, url: str, filename: str, info: Optional[Dict[str, Any]]) -> None:
+        """Reflect our own PUT/DELETE; the collection validator is unknown afterwards."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry or entry['files'] is None:
+                return
+            if info is None:
+                entry['files'].pop(filename, None)
+            else:
+                entry['files'][filename] = info
+            entry['validator'] = None
+    
+    def file_info(self, url: str, filename: str) -> tuple:
+        """Return (listing_known: bool, info or None) for a file of a collection."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry or entry['files'] is None:
+                return False, None
+            info = entry['files'].get(filename)
+            return True, dict(info) if info else None
+    
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+
+
+def _validator_matches(entry: Dict[str, Any], validator: Optional[str], now: float) -> bool:
+    if not validator or entry.get('validator') != validator:
+        return False
+    if validator.startswith('lm:'):
+        # A collection's last-modified date does not change when a member is
+        # rewritten in place on every server, so only trust it for a while.
+        return now - entry.get('listed_at', 0.0) < _LASTMODIFIED_TTL_S
+    return True
+
+
+class _ProgressReader:
+    """
+    File wrapper for streamed PUT bodies: reports sent bytes and aborts on cancel.
+    
+    Exposes ``__len__`` so requests still sends a Content-Length header instead
+    of switching to chunked encoding, which some WebDAV servers reject.
+    """
+    
+    def __init__(self, fileobj, progress=None, is_cancelled=None):
+        self._file = fileobj
+        self._progress = progress
+        self._is_cancelled = is_cancelled
+        self._size = os.fstat(fileobj.fileno()).st_size
+    
+    def __len__(self):
+        return self._size
+    
+    def read(self, size=-1):
+        if self._is_cancelled and self._is_cancelled():
+            raise InterruptedError("Upload cancelled")
+        data = self._file.read(size)
+        if data and self._progress:
+            self._progress(len(data))
+        return data
 
 
 class WebDAVProvider(StorageProvider):
@@ -70,6 +188,11 @@ class WebDAVProvider(StorageProvider):
         
         # Timeout for requests (seconds)
         self._timeout = 30
+        
+        # Remote listings, reused across syncs while the server validators match
+        self._listing_cache = _ListingCache()
+        # Cleared once the server refuses a Depth infinity PROPFIND
+        self._depth_infinity_ok = True
     
     @property
     def provider_type(self) -> ProviderType:
@@ -156,6 +279,7 @@ class WebDAVProvider(StorageProvider):
             
             # Create new session
             self._session = requests.Session()
+            self._listing_cache = _ListingCache()
             
             # Set authentication
             if self._username and self._password:
@@ -298,109 +422,169 @@ class WebDAVProvider(StorageProvider):
         """
         Upload a backup folder to the WebDAV server.
         """
-        result = {
-            'ok': False,
-            'uploaded_count': 0,
-            'skipped_newer_or_same': 0,
-            'total_candidates': 0,
-            'error': None
-        }
+        return self._upload_files_serially(local_path, profile_name, overwrite,
+                                           max_backups, latest_only)
+    
+    # -------------------------------------------------------------------------
+    # Per-file Uploads
+    # -------------------------------------------------------------------------
+    
+    @property
+    def supports_parallel_upload(self) -> bool:
+        return True
+    
+    def clone_for_transfer(self) -> Optional['WebDAVProvider']:
+        """Open one more HTTP session with the same settings and credentials."""
+        clone = WebDAVProvider()
+        clone.load_config(self.get_config())
+        clone._password = self._password
+        if not clone.connect():
+            return None
+        # Pooled sessions see the same remote state: share the listings.
+        clone._listing_cache = self._listing_cache
+        clone._depth_infinity_ok = self._depth_infinity_ok
+        return clone
+    
+    def prefetch_listings(self, profile_names: Optional[List[str]] = None) -> List[str]:
+        """
+        Validate or fill the listing cache of many profiles with one request.
         
-        if not self.is_connected:
-            result['error'] = 'Not connected'
-            return result
+        The app folder is listed with Depth infinity where the server allows
+        it, which returns every profile's files at once. Otherwise a Depth 1
+        listing still returns each profile collection's ETag, so only the
+        profiles that changed since the last sync are listed again later.
         
-        if not os.path.isdir(local_path):
-            result['error'] = f'Local path not found: {local_path}'
-            return result
+        Args:
+            profile_names: Profiles of interest; None means every profile folder
+            
+        Returns:
+            Names of the profile folders found in the app folder
+        """
+        root_path = self._url_path(self._base_url)
+        entries = None
+        deep = False
+        try:
+            if self._depth_infinity_ok:
+                status, entries = self._propfind(self._base_url, "infinity")
+                if status != 207:
+                    logging.debug(f"WebDAV: Depth infinity refused ({status}), using Depth 1")
+                    self._depth_infinity_ok = False
+                    entries = None
+            if entries is None:
+                status, entries = self._propfind(self._base_url, "1")
+                if status != 207:
+                    return []
+        except Exception as e:
+            logging.debug(f"WebDAV: batch listing failed: {e}")
+            return []
+        
+        collections = {}  # profile name -> validator
+        children = {}  # collection path -> {filename: info}
+        for entry in entries:
+            parent, _, name = entry['path'].rpartition('/')
+            if not name or entry['path'] == root_path:
+                continue
+            if parent == root_path:
+                if entry['is_dir']:
+                    collections[name] = entry['validator']
+                continue
+            # Servers with infinity disabled may silently answer with Depth 1:
+            # only trust the listing as complete if it went below the profiles.
+            deep = True
+            children.setdefault(parent, {})[name] = self._file_info(entry)
         
+        names = list(collections) if profile_names is None else list(profile_names)
+        for name in names:
+            url = f"{self._base_url}/{quote(name)}"
+            if name not in collections:
+                self._listing_cache.note_missing(url)
+            elif deep:
+                self._listing_cache.put(url, collections[name], children.get(f"{root_path}/{name}", {}))
+            else:
+                self._listing_cache.note_validator(url, collections[name])
+        return list(collections)
+    
+    def plan_upload(self, local_path: str, profile_name: str,
+                    filenames: List[str], overwrite: bool = True) -> Dict[str, Any]:
+        """Create the profile collection and skip files already on the server with the same size."""
+        plan = {'ok': False, 'to_upload': [], 'skipped': 0, 'error': None}
         try:
-            # Create profile folder URL
             profile_url = f"{self._base_url}/{quote(profile_name)}"
-            
-            # Create folder if it doesn't exist
-            response = self._session.request(
-                "PROPFIND",
-                profile_url,
-                headers={"Depth": "0"},
-                timeout=self._timeout
-            )
-            if response.status_code == 404:
-                self._session.request("MKCOL", profile_url, timeout=self._timeout)
-            
-            # Get existing files on server
-            remote_files = self._list_directory(profile_url)
-            
-            # Get list of .zip files to upload
-            files_to_upload = select_zip_files_for_upload(
-                local_path, max_backups=max_backups, latest_only=latest_only,
-            )
-            if not files_to_upload:
-                logging.warning(f"No .zip files found in {local_path}")
-                result['ok'] = True
-                return result
-            
-            result['total_candidates'] = len(files_to_upload)
-            
-            # Upload each file
-            for idx, filename in enumerate(files_to_upload, 1):
-                if self._cancelled:
-                    result['cancelled'] = True
-                    return result
-                
-                local_file = os.path.join(local_path, filename)
-                local_size = os.path.getsize(local_file)
-                file_url = f"{profile_url}/{quote(filename)}"
-                
-                if self.progress_callback:
-                    self.progress_callback(idx, len(files_to_upload), f"Uploading {filename}")
-                
-                # Check if file exists and compare sizes
-                remote_info = remote_files.get(filename)
-                if remote_info:
-                    remote_size = remote_info.get('size', 0)
-                    if remote_size == local_size:
-                        logging.debug(f"Skipping {filename}: same size")
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                    
-                    if not overwrite:
-                        result['skipped_newer_or_same'] += 1
-                        continue
-                
-                # Upload file
-                try:
-                    with open(local_file, 'rb') as f:
-                        response = self._session.put(
-                            file_url,
-                            data=f,
-                            timeout=self._timeout * 10  # Longer timeout for upload
-                        )
-                    
-                    if response.status_code in (200, 201, 204):
-                        result['uploaded_count'] += 1
-                        logging.debug(f"Uploaded {filename}")
-                        
-                        if self.chunk_callback:
-                            self.chunk_callback(local_size, local_size)
-                    else:
-                        logging.error(f"Upload failed for {filename}: {response.status_code}")
-                        
-                except Exception as e:
-                    logging.error(f"Failed to upload {filename}: {e}")
-            
-            # Delete old backups if max_backups is set
-            if max_backups and max_backups > 0:
-                self._cleanup_old_backups_webdav(profile_url, max_backups)
-            
-            result['ok'] = True
-            logging.info(f"Upload complete: {result['uploaded_count']} files uploaded")
-            return result
-            
+            remote_files = self._get_listing(profile_url, create=True)
         except Exception as e:
-            logging.error(f"Upload failed: {e}")
-            result['error'] = str(e)
-            return result
+            logging.error(f"Upload preparation failed for {profile_name}: {e}")
+            plan['error'] = str(e)
+            return plan
+        
+        for filename in filenames:
+            remote_info = remote_files.get(filename)
+            if remote_info and not remote_info.get('is_dir'):
+                local_size = os.path.getsize(os.path.join(local_path, filename))
+                if remote_info.get('size', 0) == local_size:
+                    logging.debug(f"Skipping {filename}: same size")
+                    plan['skipped'] += 1
+                    continue
+                if not overwrite:
+                    plan['skipped'] += 1
+                    continue
+            plan['to_upload'].append(filename)
+        plan['ok'] = True
+        return plan
+    
+    def upload_file(self, local_file: str, profile_name: str, filename: str,
+                    progress=None) -> bool:
+        """
+        Upload one file with a PUT into the profile collection.
+        
+        The PUT is conditional on the listing it was planned from: If-Match
+        the listed ETag when replacing a file, If-None-Match: * when creating
+        one. A 412 means another client changed the file meanwhile; it is
+        left alone and picked up again by the next sync.
+        """
+        if self._cancelled:
+            return False
+        profile_url = f"{self._base_url}/{quote(profile_name)}"
+        file_url = f"{profile_url}/{quote(filename)}"
+        
+        headers = {}
+        listing_known, remote_info = self._listing_cache.file_info(profile_url, filename)
+        etag = (remote_info or {}).get('etag')
+        if etag and not etag.startswith('W/'):  # If-Match needs a strong ETag
+            headers['If-Match'] = etag
+        elif listing_known and remote_info is None:
+            headers['If-None-Match'] = '*'
+        
+        try:
+            with open(local_file, 'rb') as f:
+                reader = _ProgressReader(f, progress, self.is_cancelled)
+                response = self._session.put(
+                    file_url,
+                    data=reader,
+                    headers=headers,
+                    timeout=self._timeout * 10  # Longer timeout for upload
+                )
+            if response.status_code in (200, 201, 204):
+                logging.debug(f"Uploaded {filename}")
+                self._listing_cache.record_file(profile_url, filename, {
+                    'is_dir': False,
+                    'size': len(reader),
+                    'modified': datetime.now(timezone.utc),
+                    'etag': response.headers.get('ETag'),
+                })
+                return True
+            if response.status_code == 412:
+                logging.warning(f"Not uploading {filename}: it changed on the server since it was listed")
+                self._listing_cache.invalidate(profile_url)
+                return False
+            logging.error(f"Upload failed for {filename}: {response.status_code}")
+        except Exception as e:
+            logging.error(f"Failed to upload {filename}: {e}")
+        return False
+    
+    def finish_upload(self, profile_name: str, max_backups: Optional[int] = None) -> None:
+        """Delete the oldest backups of the profile beyond max_backups."""
+        if max_backups and max_backups > 0:
+            self._cleanup_old_backups_webdav(f"{self._base_url}/{quote(profile_name)}", max_backups)
     
     def download_backup(self, profile_name: str, local_path: str,
                         overwrite: bool = True,
@@ -514,16 +698,11 @@ class WebDAVProvider(StorageProvider):
             return backups
         
         try:
-            # List directories in app folder
-            items = self._list_directory(self._base_url)
-            
-            for name, info in items.items():
-                if not info.get('is_dir'):
-                    continue
-                
+            # List directories in app folder (and their files, if the server allows)
+            for name in self.prefetch_listings():
                 # Get details for this profile
                 profile_url = f"{self._base_url}/{quote(name)}"
-                files = self._list_directory(profile_url)
+                files = self._get_listing(profile_url)
                 
                 file_count = sum(1 for f in files.values() if not f.get('is_dir'))
                 total_size = sum(f.get('size', 0) for f in files.values() if not f.get('is_dir'))
@@ -557,6 +736,7 @@ class WebDAVProvider(StorageProvider):
             profile_url = f"{self._base_url}/{quote(profile_name)}"
             
             response = self._session.delete(profile_url, timeout=self._timeout)
+            self._listing_cache.invalidate(profile_url)
             
             if response.status_code in (200, 204):
                 logging.info(f"Deleted backup folder: {profile_name}")
@@ -702,85 +882,166 @@ class WebDAVProvider(StorageProvider):
     # Helper Methods
     # -------------------------------------------------------------------------
     
-    def _list_directory(self, url: str) -> Dict[str, Dict[str, Any]]:
-        """List contents of a WebDAV directory."""
-        files = {}
+    _PROPFIND_BODY = (
+        '<?xml version="1.0" encoding="utf-8" ?>'
+        '<D:propfind xmlns:D="DAV:"><D:prop>'
+        '<D:resourcetype/><D:getcontentlength/><D:getlastmodified/><D:getetag/>'
+        '</D:prop></D:propfind>'
+    )
+    
+    @staticmethod
+    def _url_path(url: str) -> str:
+        """Decoded path of a URL or href, without trailing slash."""
+        return unquote(urlsplit(url).path).rstrip('/')
+    
+    def _propfind(self, url: str, depth: str) -> tuple:
+        """
+        PROPFIND the properties SaveState needs.
         
-        try:
-            response = self._session.request(
-                "PROPFIND",
-                url,
-                headers={"Depth": "1"},
-                timeout=self._timeout
-            )
+        Returns:
+            Tuple (status_code, list of entry dicts with path, is_dir, size,
+            modified, etag, validator); the list is empty unless status is 207
+        """
+        response = self._session.request(
+            "PROPFIND",
+            url,
+            headers={"Depth": depth, "Content-Type": "application/xml"},
+            data=self._PROPFIND_BODY,
+            timeout=self._timeout * (10 if depth == "infinity" else 1)
+        )
+        if response.status_code != 207:
+            return response.status_code, []
+        return 207, self._parse_multistatus(response.content)
+    
+    def _parse_multistatus(self, content: bytes) -> List[Dict[str, Any]]:
+        """Parse a 207 Multi-Status body into entry dicts."""
+        from email.utils import parsedate_to_datetime
+        
+        entries = []
+        root = ET.fromstring(content)
+        ns = {'D': self.DAV_NS}
+        for response_elem in root.findall('.//D:response', ns):
+            href = response_elem.find('D:href', ns)
+            if href is None or not href.text:
+                continue
             
-            if response.status_code != 207:
-                return files
+            # Check if it's a collection (directory)
+            is_dir = response_elem.find('.//D:resourcetype/D:collection', ns) is not None
             
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            ns = {'D': self.DAV_NS}
+            # Get size
+            size = 0
+            size_elem = response_elem.find('.//D:getcontentlength', ns)
+            if size_elem is not None and size_elem.text:
+                try:
+                    size = int(size_elem.text)
+                except ValueError:
+                    pass
             
-            for response_elem in root.findall('.//D:response', ns):
-                href = response_elem.find('D:href', ns)
-                if href is None:
-                    continue
-                
-                href_text = href.text
-                # Skip the directory itself
-                if href_text.rstrip('/') == url.rstrip('/').split('/')[-1] or \
-                   href_text.rstrip('/').endswith(url.rstrip('/').split('/')[-1]):
-                    # This might be the directory itself, check if it's the first entry
+            # Get last modified (RFC 2822 date)
+            modified = None
+            modified_raw = None
+            mod_elem = response_elem.find('.//D:getlastmodified', ns)
+            if mod_elem is not None and mod_elem.text:
+                modified_raw = mod_elem.text.strip()
+                try:
+                    modified = parsedate_to_datetime(modified_raw)
+                except Exception:
                     pass
-                
-                # Get filename from href
-                filename = href_text.rstrip('/').split('/')[-1]
-                # URL decode the filename
-                from urllib.parse import unquote
-                filename = unquote(filename)
-                
-                if not filename or filename == self.APP_FOLDER_NAME:
-                    continue
-                
-                # Check if it's a collection (directory)
-                resourcetype = response_elem.find('.//D:resourcetype/D:collection', ns)
-                is_dir = resourcetype is not None
-                
-                # Get size
-                size = 0
-                size_elem = response_elem.find('.//D:getcontentlength', ns)
-                if size_elem is not None and size_elem.text:
-                    try:
-                        size = int(size_elem.text)
-                    except ValueError:
-                        pass
-                
-                # Get last modified
-                modified = None
-                mod_elem = response_elem.find('.//D:getlastmodified', ns)
-                if mod_elem is not None and mod_elem.text:
-                    try:
-                        # Parse RFC 2822 date
-                        from email.utils import parsedate_to_datetime
-                        modified = parsedate_to_datetime(mod_elem.text)
-                    except Exception:
-                        pass
-                
-                files[filename] = {
-                    'is_dir': is_dir,
-                    'size': size,
-                    'modified': modified
-                }
             
+            etag_elem = response_elem.find('.//D:getetag', ns)
+            etag = etag_elem.text.strip() if etag_elem is not None and etag_elem.text else None
+            
+            entries.append({
+                'path': self._url_path(href.text),
+                'is_dir': is_dir,
+                'size': size,
+                'modified': modified,
+                'etag': etag,
+                'validator': etag or (f"lm:{modified_raw}" if modified_raw else None),
+            })
+        return entries
+    
+    @staticmethod
+    def _file_info(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'is_dir': entry['is_dir'],
+            'size': entry['size'],
+            'modified': entry['modified'],
+            'etag': entry['etag'],
+        }
+    
+    def _list_collection(self, url: str) -> tuple:
+        """
+        Depth 1 listing of a collection.
+        
+        Returns:
+            Tuple (status_code, collection validator, {filename: info})
+        """
+        status, entries = self._propfind(url, "1")
+        own_path = self._url_path(url)
+        validator = None
+        files = {}
+        for entry in entries:
+            if entry['path'] == own_path:
+                validator = entry['validator']
+                continue
+            filename = entry['path'].rsplit('/', 1)[-1]
+            if not filename or filename == self.APP_FOLDER_NAME:
+                continue
+            files[filename] = self._file_info(entry)
+        return status, validator, files
+    
+    def _list_directory(self, url: str) -> Dict[str, Dict[str, Any]]:
+        """List contents of a WebDAV directory (and refresh its cached listing)."""
+        files = {}
+        try:
+            status, validator, files = self._list_collection(url)
+            if status == 207:
+                self._listing_cache.put(url, validator, files)
         except Exception as e:
             logging.error(f"Error listing directory {url}: {e}")
+        return dict(files)
+    
+    def _get_listing(self, url: str, create: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Listing of a collection, from the cache when the server says it is unchanged.
         
-        return files
+        A cached listing is reused as-is right after it was validated (e.g. by
+        prefetch_listings); otherwise a Depth 0 PROPFIND compares the
+        collection's ETag (or last-modified date) before listing it again.
+        With ``create`` a missing collection is created (MKCOL).
+        """
+        now = time.monotonic()
+        entry = self._listing_cache.get(url)
+        if entry and now - entry['validated_at'] < _LISTING_FRESH_S:
+            if not entry['exists']:
+                return self._create_collection(url) if create else {}
+            if entry['files'] is not None:
+                return dict(entry['files'])
+        else:
+            status, entries = self._propfind(url, "0")
+            if status == 404:
+                return self._create_collection(url) if create else {}
+            validator = entries[0]['validator'] if entries else None
+            if entry and entry['files'] is not None and _validator_matches(entry, validator, now):
+                self._listing_cache.touch(url)
+                return dict(entry['files'])
+        
+        status, validator, files = self._list_collection(url)
+        if status == 207:
+            self._listing_cache.put(url, validator, files)
+        return dict(files)
+    
+    def _create_collection(self, url: str) -> Dict[str, Dict[str, Any]]:
+        """MKCOL a collection and cache it as empty."""
+        self._session.request("MKCOL", url, timeout=self._timeout)
+        self._listing_cache.put(url, None, {})
+        return {}
     
     def _cleanup_old_backups_webdav(self, profile_url: str, max_backups: int) -> None:
-        """Delete old backups exceeding the max_backups limit."""
+        """Delete old backups exceeding the max_backups limit (listing from the cache when valid)."""
         try:
-            files = self._list_directory(profile_url)
+            files = self._get_listing(profile_url)
             
             # Filter zip files
             zip_files = [(name, info) for name, info in files.items() 
@@ -792,7 +1053,7 @@ class WebDAVProvider(StorageProvider):
             # Sort by modification time (oldest first)
             zip_files_sorted = sorted(
                 zip_files,
-                key=lambda x: x[1].get('modified') or datetime.min
+                key=lambda x: x[1].get('modified') or datetime.min.replace(tzinfo=timezone.utc)
             )
             
             # Delete oldest files
@@ -801,10 +1062,16 @@ class WebDAVProvider(StorageProvider):
             for filename, _ in files_to_delete:
                 try:
                     file_url = f"{profile_url}/{quote(filename)}"
-                    self._session.delete(file_url, timeout=self._timeout)
-                    logging.info(f"Deleted old backup: {filename}")
+                    response = self._session.delete(file_url, timeout=self._timeout)
+                    if response.status_code in (200, 204, 404):
+                        self._listing_cache.record_file(profile_url, filename, None)
+                        logging.info(f"Deleted old backup: {filename}")
+                    else:
+                        logging.warning(f"Failed to delete {filename}: {response.status_code}")
+                        self._listing_cache.invalidate(profile_url)
                 except Exception as e:
                     logging.warning(f"Failed to delete {filename}: {e}")
+                    self._listing_cache.invalidate(profile_url)
                     
         except Exception as e:
             logging.error(f"Error cleaning up old backups: {e}")
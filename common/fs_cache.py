@@ -0,0 +1,165 @@
+"""
+fs_cache.py
+
+Process-wide directory listing cache shared by the save path finders.
+
+Dropping many shortcuts at once starts one detection per file, and every one
+of them crawls the same roots (XDG dirs, Proton compatdata, the home folder).
+The helpers below answer ``listdir`` / ``isdir`` / ``isfile`` / ``walk`` from
+a shared cache of ``os.scandir`` results instead:
+
+- a listing is keyed by directory path and stamped with the directory's
+  ``st_mtime_ns``; any entry created, removed or renamed inside it bumps that
+  mtime, so a listing is reused only after a single ``stat`` confirms it
+  (within ``VALIDATION_WINDOW_S`` of the last check not even that);
+- child types come from the scandir entries, so ``isdir(parent/child)`` right
+  after listing ``parent`` costs no system call;
+- listings expire after ``TTL_S`` and the cache holds at most ``MAX_ENTRIES``
+  directories (least recently used dropped first).
+
+All functions are thread-safe and mirror the ``os`` functions they replace:
+``listdir`` raises ``OSError`` like ``os.listdir``; ``walk`` behaves like
+``os.walk(top, topdown=True)`` (errors ignored, symlinked directories
+listed but not followed).
+"""
+
+import collections
+import os
+import threading
+import time
+
+TTL_S = 60.0
+VALIDATION_WINDOW_S = 1.0
+MAX_ENTRIES = 20000
+
+_lock = threading.Lock()
+_listings: "collections.OrderedDict[str, _Listing]" = collections.OrderedDict()
+# path -> (checked_at, is_dir, is_file) for paths looked up outside a cached listing
+_stats: "collections.OrderedDict[str, tuple]" = collections.OrderedDict()
+
+
+class _Listing:
+    __slots__ = ("mtime_ns", "listed_at", "validated_at", "names", "dirs", "files", "links")
+
+    def __init__(self, mtime_ns, now, names, dirs, files, links):
+        self.mtime_ns = mtime_ns
+        self.listed_at = now
+        self.validated_at = now
+        self.names = names
+        self.dirs = dirs
+        self.files = files
+        self.links = links
+
+
+def _scan(path: str, mtime_ns: int, now: float) -> _Listing:
+    names, dirs, files, links = [], set(), set(), set()
+    with os.scandir(path) as it:
+        for entry in it:
+            names.append(entry.name)
+            try:
+                if entry.is_dir():
+                    dirs.add(entry.name)
+                elif entry.is_file():
+                    files.add(entry.name)
+                if entry.is_symlink():
+                    links.add(entry.name)
+            except OSError:
+                continue
+    return _Listing(mtime_ns, now, tuple(names), frozenset(dirs), frozenset(files), frozenset(links))
+
+
+def _get_listing(path: str) -> _Listing:
+    """Return a current listing of ``path``; raises OSError like os.scandir."""
+    now = time.monotonic()
+    with _lock:
+        listing = _listings.get(path)
+        if listing is not None and now - listing.validated_at < VALIDATION_WINDOW_S:
+            _listings.move_to_end(path)
+            return listing
+    mtime_ns = os.stat(path).st_mtime_ns
+    if (listing is not None and listing.mtime_ns == mtime_ns
+            and now - listing.listed_at < TTL_S):
+        listing.validated_at = now
+        return listing
+    listing = _scan(path, mtime_ns, now)
+    with _lock:
+        _listings[path] = listing
+        _listings.move_to_end(path)
+        while len(_listings) > MAX_ENTRIES:
+            _listings.popitem(last=False)
+    return listing
+
+
+def _fresh_parent(path: str):
+    """(listing, name) if the parent of ``path`` was validated very recently, else (None, None)."""
+    parent, name = os.path.split(path.rstrip(os.sep) or path)
+    if not name:
+        return None, None
+    with _lock:
+        listing = _listings.get(parent)
+    if listing is None or time.monotonic() - listing.validated_at >= VALIDATION_WINDOW_S:
+        return None, None
+    return listing, name
+
+
+def _stat_kind(path: str):
+    now = time.monotonic()
+    with _lock:
+        cached = _stats.get(path)
+        if cached is not None and now - cached[0] < VALIDATION_WINDOW_S:
+            return cached[1], cached[2]
+    is_dir = os.path.isdir(path)
+    is_file = not is_dir and os.path.isfile(path)
+    with _lock:
+        _stats[path] = (now, is_dir, is_file)
+        _stats.move_to_end(path)
+        while len(_stats) > MAX_ENTRIES:
+            _stats.popitem(last=False)
+    return is_dir, is_file
+
+
+def listdir(path: str) -> list:
+    """Cached ``os.listdir``."""
+    return list(_get_listing(os.fspath(path)).names)
+
+
+def isdir(path: str) -> bool:
+    """Cached ``os.path.isdir``."""
+    path = os.fspath(path)
+    listing, name = _fresh_parent(path)
+    if listing is not None:
+        return name in listing.dirs
+    return _stat_kind(path)[0]
+
+
+def isfile(path: str) -> bool:
+    """Cached ``os.path.isfile``."""
+    path = os.fspath(path)
+    listing, name = _fresh_parent(path)
+    if listing is not None:
+        return name in listing.files
+    return _stat_kind(path)[1]
+
+
+def walk(top: str):
+    """Cached ``os.walk(top, topdown=True)``; callers may prune ``dirs`` in place."""
+    stack = [os.fspath(top)]
+    while stack:
+        root = stack.pop()
+        try:
+            listing = _get_listing(root)
+        except OSError:
+            continue
+        dirs = [n for n in listing.names if n in listing.dirs]
+        files = [n for n in listing.names if n not in listing.dirs]
+        yield root, dirs, files
+        for name in reversed(dirs):
+            if name not in listing.links:
+                stack.append(os.path.join(root, name))
+
+
+def clear() -> None:
+    """Forget every cached listing (e.g. after the app itself changed many folders)."""
+    with _lock:
+        _listings.clear()
+        _stats.clear()
@@ -9,7 +9,9 @@ No subprocess is spawned for enumeration: native APIs are used in-process, which
 keeps compatibility with single-file Nuitka builds.
 
 - Windows: ctypes + Toolhelp32 snapshot (same style as controller_manager.py).
-- Linux / SteamOS: read process names from the /proc filesystem.
+- Linux / SteamOS: read process names from the /proc filesystem, incrementally
+  (only PIDs not seen before are read). ``ProcessWatcher`` additionally polls
+  pidfds of watched processes so exits are reported as they happen.
 - Other platforms: returns an empty set (the "backup on game close" mode is a
   no-op there).
 
@@ -20,6 +22,8 @@ import logging
 import os
 import platform
 import re
+import select
+import threading
 import time
 from dataclasses import dataclass
 
@@ -264,45 +268,259 @@ def list_running_processes_for_picker(cpu_sample_seconds: float = 0.1) -> list[s
 # Linux / SteamOS backend (/proc)
 # ---------------------------------------------------------------------------
 
-def _list_linux() -> set[str]:
+# A wrapper may exec() into the game shortly after being spawned: names of
+# processes younger than this are re-read on every scan.
+_YOUNG_PROCESS_SECONDS = 30.0
+# Every N scans the start time of every cached PID is re-checked, so a
+# recycled PID never keeps the names of the process it replaced.
+_REVALIDATE_EVERY_SCANS = 20
+
+
+def _read_linux_names(pid: int) -> set[str]:
     names: set[str] = set()
+    # /proc/<pid>/comm holds the (possibly truncated) process name.
     try:
-        proc_entries = os.listdir("/proc")
-    except OSError as e:
-        logging.debug(f"process_watch_utils: unable to list /proc: {e}")
-        return names
+        with open(f"/proc/{pid}/comm", "r", encoding="utf-8", errors="ignore") as f:
+            comm = f.read().strip()
+        if comm:
+            names.add(comm.lower())
+    except OSError:
+        pass
+
+    # Also include the executable basename from cmdline so users can match
+    # either the short comm name or the full executable name.
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            raw = f.read()
+        if raw:
+            first = raw.split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
+            if first:
+                names.add(os.path.basename(first).lower())
+    except OSError:
+        pass
+    return names
 
-    for pid in proc_entries:
-        if not pid.isdigit():
-            continue
-        # /proc/<pid>/comm holds the (possibly truncated) process name.
-        added = False
+
+def _read_linux_start_time(pid: int):
+    """Start time of *pid* in clock ticks since boot, or None if it is gone."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses: fields start after
+    # the last ')'. starttime is field 22, i.e. index 19 from there.
+    fields = raw[raw.rfind(b")") + 2:].split()
+    try:
+        return int(fields[19])
+    except (IndexError, ValueError):
+        return None
+
+
+class _LinuxProcessTable:
+    """Incremental view of /proc: only new (or recycled) PIDs are read.
+
+    Entries are keyed by (pid, start_time); a tick on a desktop with hundreds
+    of processes then costs one directory listing instead of two file reads
+    per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # pid -> [start_time, names, first_seen (monotonic)]
+        self._entries: dict[int, list] = {}
+        self._scans = 0
+
+    def scan(self) -> dict[int, set[str]]:
+        """Return {pid: names} for every running process."""
         try:
-            with open(f"/proc/{pid}/comm", "r", encoding="utf-8", errors="ignore") as f:
-                comm = f.read().strip()
-            if comm:
-                names.add(comm.lower())
-                added = True
-        except OSError:
-            pass
+            pids = {int(p) for p in os.listdir("/proc") if p.isdigit()}
+        except OSError as e:
+            logging.debug(f"process_watch_utils: unable to list /proc: {e}")
+            return {}
+
+        with self._lock:
+            now = time.monotonic()
+            revalidate = self._scans % _REVALIDATE_EVERY_SCANS == 0
+            self._scans += 1
+            for pid in set(self._entries) - pids:
+                del self._entries[pid]
+
+            for pid in pids:
+                entry = self._entries.get(pid)
+                young = entry is not None and now - entry[2] < _YOUNG_PROCESS_SECONDS
+                if entry is not None and not young and not revalidate:
+                    continue
+                start_time = _read_linux_start_time(pid)
+                if start_time is None:
+                    self._entries.pop(pid, None)
+                    continue
+                if entry is None or entry[0] != start_time:
+                    self._entries[pid] = [start_time, _read_linux_names(pid), now]
+                elif young:
+                    entry[1] = _read_linux_names(pid)
+            return {pid: entry[1] for pid, entry in self._entries.items()}
+
+    def start_time(self, pid: int):
+        with self._lock:
+            entry = self._entries.get(pid)
+            return entry[0] if entry else None
+
+
+_linux_table = _LinuxProcessTable()
 
-        # Also include the executable basename from cmdline so users can match
-        # either the short comm name or the full executable name.
+
+def _list_linux() -> set[str]:
+    names: set[str] = set()
+    for pid_names in _linux_table.scan().values():
+        names.update(pid_names)
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Process events (Linux)
+# ---------------------------------------------------------------------------
+
+class ProcessWatcher:
+    """Background watcher reporting when watched process names start or stop.
+
+    Every running process whose name is watched is held open as a pidfd and
+    polled, so an exit is noticed as soon as the kernel reports it. New
+    processes are discovered by an incremental /proc scan every
+    ``scan_interval`` seconds. Without pidfd support (Linux < 5.3) exits are
+    picked up by that same scan.
+
+    ``on_change`` is called from the watcher thread, without arguments,
+    whenever the set returned by ``running_names()`` changes.
+
+    The netlink process connector would also report starts instantly, but it
+    needs CAP_NET_ADMIN, which a desktop application does not have.
+    """
+
+    SCAN_INTERVAL_SECONDS = 2.0
+
+    def __init__(self, on_change, scan_interval: float = SCAN_INTERVAL_SECONDS):
+        self._on_change = on_change
+        self._scan_interval = scan_interval
+        self._table = _LinuxProcessTable()
+        self._lock = threading.Lock()
+        self._watched: set[str] = set()
+        self._running: set[str] = set()
+        self._pidfds: dict[int, int] = {}  # pidfd -> pid
+        self._exited: dict[int, int] = {}   # pid -> start_time, exited but maybe not reaped yet
+        self._use_pidfd = hasattr(os, "pidfd_open")
+        self._wake_r, self._wake_w = os.pipe()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="process-watcher", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def is_supported() -> bool:
+        return _SYSTEM == "Linux"
+
+    def set_watched_names(self, names) -> None:
+        """Replace the watched names; ``running_names()`` is current on return."""
+        with self._lock:
+            self._watched = {n for n in names if n}
+            self._refresh_locked()
+        self._wake()
+
+    def running_names(self) -> set[str]:
+        """Watched names that currently have at least one live process."""
+        with self._lock:
+            return set(self._running)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake()
+        self._thread.join(timeout=2.0)
+        with self._lock:
+            for fd in list(self._pidfds) + [self._wake_r, self._wake_w]:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._pidfds.clear()
+
+    def _wake(self):
         try:
-            with open(f"/proc/{pid}/cmdline", "rb") as f:
-                raw = f.read()
-            if raw:
-                first = raw.split(b"\x00", 1)[0].decode("utf-8", errors="ignore")
-                if first:
-                    names.add(os.path.basename(first).lower())
-                    added = True
+            os.write(self._wake_w, b"x")
         except OSError:
             pass
 
-        if not added:
-            continue
-
-    return names
+    def _refresh_locked(self) -> bool:
+        """Rescan /proc and update pidfds. Returns True if running_names changed."""
+        table = self._table.scan() if self._watched else {}
+        self._exited = {pid: start for pid, start in self._exited.items()
+                        if pid in table and self._table.start_time(pid) == start}
+        matched = {
+            pid: names & self._watched
+            for pid, names in table.items()
+            if pid not in self._exited and names & self._watched
+        }
+        open_pids = set(self._pidfds.values())
+        for fd, pid in list(self._pidfds.items()):
+            if pid not in matched:
+                os.close(fd)
+                del self._pidfds[fd]
+        if self._use_pidfd:
+            for pid in set(matched) - open_pids:
+                try:
+                    self._pidfds[os.pidfd_open(pid)] = pid
+                except ProcessLookupError:
+                    matched.pop(pid)
+                except OSError as e:
+                    logging.debug(f"process_watch_utils: pidfd_open({pid}) failed, polling instead: {e}")
+                    self._use_pidfd = False
+        running = set().union(*matched.values()) if matched else set()
+        changed = running != self._running
+        self._running = running
+        return changed
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                fds = list(self._pidfds)
+                timeout = self._scan_interval if self._watched else None
+            # poll() rather than select(): pidfds can be above FD_SETSIZE (1024)
+            # in a long-running GUI with many open files.
+            poller = select.poll()
+            for fd in fds + [self._wake_r]:
+                poller.register(fd, select.POLLIN)
+            try:
+                events = poller.poll(None if timeout is None else timeout * 1000)
+            except OSError:
+                events = []
+            # POLLNVAL: a pidfd closed by set_watched_names() meanwhile.
+            readable = [fd for fd, mask in events if not mask & select.POLLNVAL]
+            if self._wake_r in readable:
+                try:
+                    os.read(self._wake_r, 4096)
+                except OSError:
+                    pass
+            with self._lock:
+                if self._closed:
+                    return
+                for fd in readable:
+                    pid = self._pidfds.pop(fd, None)
+                    if pid is not None:
+                        os.close(fd)
+                        self._exited[pid] = self._table.start_time(pid)
+                try:
+                    changed = self._refresh_locked()
+                except Exception as e:
+                    logging.error(f"process_watch_utils: process watcher scan failed: {e}", exc_info=True)
+                    changed = False
+            if changed:
+                try:
+                    self._on_change()
+                except Exception as e:
+                    logging.debug(f"process_watch_utils: process change callback failed: {e}")
 
 
 # ---------------------------------------------------------------------------
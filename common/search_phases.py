@@ -0,0 +1,87 @@
+"""
+search_phases.py
+
+Runs the independent phases of a save path search on a thread pool.
+
+The finders search several unrelated roots (Steam userdata, Proton prefixes,
+XDG dirs, the install directory...), often on different disks, and most of
+the time goes to waiting on directory listings. Each phase runs against its
+own fork of the search state; ``run_search_phases`` returns the forks in
+phase order so the caller merges them exactly as the sequential search would
+have added them, and the ranking does not depend on thread scheduling.
+
+Cancellation: every phase receives a ``PhaseCancellation`` that reports the
+caller's cancellation manager and is also tripped when another phase fails,
+so the remaining crawls stop at their next check.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_WORKERS = max(2, min(4, os.cpu_count() or 1))
+
+
+class PhaseCancellation:
+    """Cancellation manager handed to phases: parent cancellation or local abort."""
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self._aborted = threading.Event()
+
+    def check_cancelled(self) -> bool:
+        if self._aborted.is_set():
+            return True
+        try:
+            return bool(self._parent and self._parent.check_cancelled())
+        except Exception:
+            return False
+
+    def cancel(self):
+        self._aborted.set()
+
+
+def run_search_phases(
+    phases: Sequence[Tuple[str, Callable[[Any], Any]]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cancellation_manager=None,
+    thread_name_prefix: str = "save-search",
+) -> Optional[List[Any]]:
+    """Run ``(name, func)`` phases concurrently; ``func`` gets a PhaseCancellation.
+
+    Returns the phase results in input order, or None if the search was
+    cancelled. The first exception (in phase order) is re-raised after the
+    other phases have been told to stop.
+    """
+    cancellation = PhaseCancellation(cancellation_manager)
+    if not phases:
+        return []
+    if cancellation.check_cancelled():
+        return None
+
+    def _run(name, func):
+        try:
+            return func(cancellation)
+        except Exception:
+            logging.exception(f"Save search phase '{name}' failed; stopping the other phases")
+            cancellation.cancel()
+            raise
+
+    workers = max(1, min(int(max_workers), len(phases)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as pool:
+        futures = [pool.submit(_run, name, func) for name, func in phases]
+        results = []
+        error = None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if error is None:
+                    error = e
+    if error is not None:
+        raise error
+    if cancellation.check_cancelled():
+        return None
+    return results
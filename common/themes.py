@@ -20,7 +20,7 @@ QLabel {
 QLabel#StatusLabel { /* Etichetta di stato specifica */
     color: #A0A0A0;
 }
-QLineEdit, QTextEdit, QListWidget, QTableWidget, QComboBox, QSpinBox {
+QLineEdit, QTextEdit, QListWidget, QTableWidget, QTableView#ProfileTable, QComboBox, QSpinBox {
     background-color: #3C3C3C; /* Grigio leggermente più chiaro per input/liste */
     color: #F0F0F0;
     border: 1px solid #555555;
@@ -225,7 +225,7 @@ QMessageBox QPushButton {
 }
 
 /* Stile specifico per gli item/celle */
-QTableWidget::item {
+QTableWidget::item, QTableView#ProfileTable::item {
     padding: 4px;           /* Un po' di spazio interno */
     color: #F0F0F0;         /* Colore testo chiaro (conferma) */
     border-bottom: 1px solid #4A4A4A; /* Separa righe se vuoi (alternativa a gridline) */
@@ -233,7 +233,7 @@ QTableWidget::item {
 }
 
 /* Stile per item selezionati */
-QTableWidget::item:selected {
+QTableWidget::item:selected, QTableView#ProfileTable::item:selected {
     background-color: transparent; /* Sfondo trasparente per pennello personalizzato (linea rossa laterale) */
     color: #FFFFFF;          /* Testo bianco su selezione */
     border: none;
@@ -578,7 +578,7 @@ QListWidget, QTableWidget, QTreeWidget, QTreeView, QListView, QTableView {
     alternate-background-color: #F8F9FB;
     gridline-color: #ECEDF0;
 }
-QListWidget::item, QTableWidget::item, QTreeWidget::item {
+QListWidget::item, QTableWidget::item, QTableView#ProfileTable::item, QTreeWidget::item {
     padding: 5px;
     color: #1F2024;
     border-bottom: 1px solid #ECEDF0;
@@ -589,11 +589,11 @@ QListWidget::item, QTableWidget::item, QTreeWidget::item {
 QListWidget::item:hover, QTreeWidget::item:hover {
     background-color: #F0F4F4;
 }
-QListWidget::item:selected, QTableWidget::item:selected, QTreeWidget::item:selected {
+QListWidget::item:selected, QTableWidget::item:selected, QTableView#ProfileTable::item:selected, QTreeWidget::item:selected {
     background-color: #EEF2FF;
     color: #3730A3;
 }
-QListWidget::item:selected:active, QTableWidget::item:selected:active {
+QListWidget::item:selected:active, QTableWidget::item:selected:active, QTableView#ProfileTable::item:selected:active {
     background-color: #DDE4FF;
     color: #312E81;
 }
@@ -124,6 +124,11 @@ MIN_FREE_SPACE_GB = 2
 MAX_SOURCE_SIZE_MB = 200  # Default max source size in MB for backups
 COMPRESSION_MODE = "standard"  # Default compression mode: standard, fast, best, none
 
+# Profile table icons are resolved by background workers; resolved icons are
+# kept in a bounded in-memory cache (entries) and a small index on disk.
+PROFILE_ICON_WORKERS = 2
+PROFILE_ICON_MEMORY_CACHE_SIZE = 512
+
 # List of common subdirectories SPECIFICALLY used to contain save files
 # within the main game or publisher folder.
 COMMON_SAVE_SUBDIRS = [
@@ -727,8 +732,20 @@ LINUX_SKIP_KNOWN_LOCATIONS_COMPAT_RECURSE_IF_PROTON_ENABLED = True  # Avoid doub
 LINUX_ENABLE_SNAP_SEARCH = True
 LINUX_ENABLE_FUZZY_FILTER_OTHER_GAMES = True
 LINUX_MAX_DIRECTORIES_TO_EXPLORE = 200    # Per-root traversal cap (relevance matches are visited first)
+LINUX_MAX_DIRECTORIES_PER_SEARCH = 5000   # Whole-search cap, shared by the parallel phases
 LINUX_MAX_RESULTS = 20                    # Keep the selection dialog focused on high-confidence candidates
 
+# Save path searches run their independent phases (Steam userdata, Proton,
+# XDG, install dir...) on a small thread pool. Results are merged in phase
+# order, so the ranking is the same as with the sequential search.
+SAVE_SEARCH_PARALLEL_PHASES = True
+SAVE_SEARCH_MAX_WORKERS = 4
+
+# Confirmed save locations are remembered per AppID/title/executable. An
+# AppID hit is checked with a single stat and skips the heuristic search;
+# title and executable hits are merged into the search results.
+SAVE_LOCATION_CACHE_ENABLED = True
+
 # Default directories to skip during Linux recursive search (basenames, lowercased match)
 LINUX_SKIP_DIRECTORIES = {
     # Desktop/user clutter
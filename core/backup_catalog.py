@@ -0,0 +1,486 @@
+"""
+backup_catalog.py
+
+Persistent index of the backup archives stored under ``backup_base_dir``.
+
+Why this exists
+---------------
+The profile table, the automatic backup change checks and the cloud panel all
+need the same two facts for every profile: how many backups exist and when the
+newest one was written. Answering that by ``os.listdir`` + ``os.path.getmtime``
+on every archive costs O(archives) per refresh, which becomes seconds when the
+backup root lives on a NAS and holds thousands of ZIPs.
+
+The catalog is a small SQLite database in ``<backup_base_dir>/.savestate/``
+that records, for every ``Backup_*.zip``: name, size, mtime, SHA-256 and the
+embedded ``savestate/manifest.json``. It is kept up to date incrementally by
+``perform_backup``, ``manage_backups`` and ``delete_single_backup_file``.
+Recording an archive never reads it back in full: the SHA-256 is stored only
+when the writer already knows it (or the hash cache does) and is otherwise
+computed on first request by ``get_archive_info(..., with_sha256=True)``.
+Each folder row also keeps the number of other ``.zip`` files, so the cloud
+panel can keep counting every ZIP as it did before the catalog.
+
+Staying correct when files change behind our back
+-------------------------------------------------
+Archives can also be added or removed outside SaveState (cloud download, file
+manager, another machine sharing the same backup root). Adding or removing a
+file always bumps the *directory* mtime, so every folder row stores the
+directory ``st_mtime_ns`` observed at the last scan. A read first does a single
+``stat`` of the profile folder: if the mtime matches, the cached rows are
+returned as-is; otherwise that folder alone is rescanned (hash and manifest are
+preserved for files whose size/mtime did not change).
+
+Directory mtimes are coarse on some filesystems (2 s on FAT, whatever the
+server keeps on SMB), so two changes within one tick leave the mtime equal.
+Each folder row therefore also stores when it was scanned, and a matching
+mtime is trusted only once that scan happened at least
+``MTIME_RACY_WINDOW_NS`` after the mtime; a folder changed more recently is
+rescanned on the next read.
+
+Every public function is best-effort: if the catalog cannot be opened (read-only
+media, locked database, ...) it returns ``None`` and callers fall back to the
+plain directory scan they used before.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+from core import hash_cache
+
+CATALOG_DIRNAME = ".savestate"
+CATALOG_FILENAME = "backup_catalog.db"
+SCHEMA_VERSION = 3
+# Directory mtimes closer than this to the scan time may hide a later change.
+MTIME_RACY_WINDOW_NS = 2_000_000_000
+
+BACKUP_PREFIX = "Backup_"
+BACKUP_SUFFIX = ".zip"
+MANIFEST_MEMBER = "savestate/manifest.json"
+
+# One connection per catalog file, shared across threads and serialized by a
+# single lock (backups may run on WorkerThreads while the GUI thread reads).
+_lock = threading.RLock()
+_connections: dict[str, sqlite3.Connection] = {}
+
+
+def is_backup_archive_name(filename: str) -> bool:
+    """True for file names produced by perform_backup (``Backup_*.zip``)."""
+    return (
+        isinstance(filename, str)
+        and filename.startswith(BACKUP_PREFIX)
+        and filename.endswith(BACKUP_SUFFIX)
+    )
+
+
+def get_catalog_path(backup_base_dir: str) -> str:
+    """Return the path of the catalog database for a backup root."""
+    return os.path.join(backup_base_dir, CATALOG_DIRNAME, CATALOG_FILENAME)
+
+
+def _connect(backup_base_dir: str):
+    """Return an open connection for ``backup_base_dir`` or None if unavailable."""
+    if not backup_base_dir or not os.path.isdir(backup_base_dir):
+        return None
+    db_path = os.path.normcase(os.path.abspath(get_catalog_path(backup_base_dir)))
+    conn = _connections.get(db_path)
+    if conn is not None:
+        return conn
+    try:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            " key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            # Unknown/older layout: the catalog is only a cache, rebuild it.
+            conn.execute("DROP TABLE IF EXISTS folders")
+            conn.execute("DROP TABLE IF EXISTS archives")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            " folder TEXT PRIMARY KEY,"
+            " dir_mtime_ns INTEGER NOT NULL,"
+            " scanned_ns INTEGER NOT NULL DEFAULT 0,"
+            " other_zips INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS archives ("
+            " folder TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " sha256 TEXT,"
+            " manifest TEXT,"
+            " PRIMARY KEY (folder, name))"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_archives_folder_mtime"
+            " ON archives (folder, mtime DESC)"
+        )
+        conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"Backup catalog unavailable at '{db_path}': {e}")
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
+        return None
+    _connections[db_path] = conn
+    logging.debug(f"Backup catalog opened: {db_path}")
+    return conn
+
+
+def close_all() -> None:
+    """Close every open catalog connection (e.g. when the backup root changes)."""
+    with _lock:
+        for conn in _connections.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        _connections.clear()
+
+
+def _split_archive_path(archive_path: str):
+    """Return (backup_base_dir, folder_name, file_name) for an archive path."""
+    archive_path = os.path.abspath(archive_path)
+    folder_path, file_name = os.path.split(archive_path)
+    backup_base_dir, folder_name = os.path.split(folder_path)
+    return backup_base_dir, folder_name, file_name
+
+
+def _dir_mtime_ns(folder_path: str):
+    try:
+        return os.stat(folder_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_manifest_text(archive_path: str):
+    """Return the raw manifest JSON stored inside an archive, or None."""
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            if MANIFEST_MEMBER not in zipf.NameToInfo:
+                return None
+            data = zipf.read(MANIFEST_MEMBER)
+        return data.decode("utf-8")
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, KeyError):
+        return None
+
+
+def hash_file(file_path: str) -> str | None:
+    """Return the SHA-256 hex digest of a file, or None on error.
+
+    Goes through hash_cache, so the digests of a new archive are computed once
+    here and reused by the cloud providers.
+    """
+    digest = hash_cache.get_sha256(file_path)
+    if digest is None:
+        logging.debug(f"Backup catalog: unable to hash '{file_path}'")
+    return digest
+
+
+def _peek_sha256(file_path: str) -> str | None:
+    """SHA-256 already known to the hash cache, without reading the file."""
+    digests = hash_cache.peek(file_path)
+    return digests.get("sha256") if digests else None
+
+
+def _reconcile_folder(conn, backup_base_dir: str, folder_name: str) -> bool:
+    """Make the rows of one folder match the disk. Returns False if the folder is gone."""
+    folder_path = os.path.join(backup_base_dir, folder_name)
+    dir_mtime = _dir_mtime_ns(folder_path)
+    if dir_mtime is None:
+        conn.execute("DELETE FROM archives WHERE folder = ?", (folder_name,))
+        conn.execute("DELETE FROM folders WHERE folder = ?", (folder_name,))
+        conn.commit()
+        return False
+
+    row = conn.execute(
+        "SELECT dir_mtime_ns, scanned_ns FROM folders WHERE folder = ?", (folder_name,)
+    ).fetchone()
+    if row is not None and row[0] == dir_mtime and row[1] - dir_mtime >= MTIME_RACY_WINDOW_NS:
+        return True
+
+    logging.debug(f"Backup catalog: rescanning '{folder_path}'")
+    scanned_ns = time.time_ns()
+    known = {
+        name: (size, mtime)
+        for name, size, mtime in conn.execute(
+            "SELECT name, size, mtime FROM archives WHERE folder = ?", (folder_name,)
+        )
+    }
+    seen = set()
+    other_zips = 0
+    try:
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if not is_backup_archive_name(entry.name):
+                    if entry.name.endswith(BACKUP_SUFFIX):
+                        other_zips += 1
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                seen.add(entry.name)
+                if known.get(entry.name) == (st.st_size, st.st_mtime):
+                    continue
+                # New or rewritten archive: hash/manifest are filled lazily.
+                conn.execute(
+                    "INSERT OR REPLACE INTO archives (folder, name, size, mtime, sha256, manifest)"
+                    " VALUES (?, ?, ?, ?, NULL, NULL)",
+                    (folder_name, entry.name, st.st_size, st.st_mtime),
+                )
+    except OSError as e:
+        logging.warning(f"Backup catalog: unable to scan '{folder_path}': {e}")
+        conn.rollback()
+        return False
+
+    for stale in set(known) - seen:
+        conn.execute(
+            "DELETE FROM archives WHERE folder = ? AND name = ?", (folder_name, stale)
+        )
+    conn.execute(
+        "INSERT OR REPLACE INTO folders (folder, dir_mtime_ns, scanned_ns, other_zips)"
+        " VALUES (?, ?, ?, ?)",
+        (folder_name, dir_mtime, scanned_ns, other_zips),
+    )
+    conn.commit()
+    return True
+
+
+def list_backups(backup_base_dir: str, folder_name: str):
+    """Return ``[(file_name, full_path, datetime)]`` newest first, or None if unavailable."""
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return None
+        try:
+            if not _reconcile_folder(conn, backup_base_dir, folder_name):
+                return []
+            rows = conn.execute(
+                "SELECT name, mtime FROM archives WHERE folder = ? ORDER BY mtime DESC",
+                (folder_name,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog query failed for '{folder_name}': {e}")
+            return None
+    folder_path = os.path.join(backup_base_dir, folder_name)
+    return [
+        (name, os.path.join(folder_path, name), datetime.fromtimestamp(mtime))
+        for name, mtime in rows
+    ]
+
+
+def get_summary(backup_base_dir: str, folder_name: str):
+    """Return ``(count, last_backup_datetime | None)`` or None if unavailable."""
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return None
+        try:
+            if not _reconcile_folder(conn, backup_base_dir, folder_name):
+                return 0, None
+            count, last_mtime = conn.execute(
+                "SELECT COUNT(*), MAX(mtime) FROM archives WHERE folder = ?",
+                (folder_name,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog summary failed for '{folder_name}': {e}")
+            return None
+    last_dt = datetime.fromtimestamp(last_mtime) if last_mtime is not None else None
+    return int(count or 0), last_dt
+
+
+def get_zip_count(backup_base_dir: str, folder_name: str):
+    """Return the number of ``.zip`` files of a folder (backups or not), or None if unavailable."""
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return None
+        try:
+            if not _reconcile_folder(conn, backup_base_dir, folder_name):
+                return 0
+            row = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM archives WHERE folder = ?), other_zips"
+                " FROM folders WHERE folder = ?",
+                (folder_name, folder_name),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog zip count failed for '{folder_name}': {e}")
+            return None
+    return int(row[0] or 0) + int(row[1] or 0) if row else 0
+
+
+def get_latest_size(backup_base_dir: str, folder_name: str):
+    """Return the size in bytes of the newest archive, 0 if there is none, or None if unavailable."""
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return None
+        try:
+            if not _reconcile_folder(conn, backup_base_dir, folder_name):
+                return 0
+            row = conn.execute(
+                "SELECT size FROM archives WHERE folder = ? ORDER BY mtime DESC LIMIT 1",
+                (folder_name,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog size lookup failed for '{folder_name}': {e}")
+            return None
+    return int(row[0] or 0) if row else 0
+
+
+def get_archive_info(archive_path: str, with_sha256: bool = False):
+    """Return the catalog record of one archive as a dict, or None.
+
+    The manifest is read and stored on first request if the archive was
+    discovered by a rescan. The SHA-256 needs a full read of the archive, so
+    it is only computed when ``with_sha256`` is set (otherwise it may be None).
+    """
+    backup_base_dir, folder_name, file_name = _split_archive_path(archive_path)
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return None
+        try:
+            _reconcile_folder(conn, backup_base_dir, folder_name)
+            row = conn.execute(
+                "SELECT size, mtime, sha256, manifest FROM archives"
+                " WHERE folder = ? AND name = ?",
+                (folder_name, file_name),
+            ).fetchone()
+            if row is None:
+                return None
+            size, mtime, sha256, manifest_text = row
+            if (sha256 is None and with_sha256) or manifest_text is None:
+                if sha256 is None:
+                    sha256 = hash_file(archive_path) if with_sha256 else _peek_sha256(archive_path)
+                manifest_text = manifest_text or _read_manifest_text(archive_path)
+                conn.execute(
+                    "UPDATE archives SET sha256 = ?, manifest = ? WHERE folder = ? AND name = ?",
+                    (sha256, manifest_text, folder_name, file_name),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog lookup failed for '{archive_path}': {e}")
+            return None
+    manifest = None
+    if manifest_text:
+        try:
+            manifest = json.loads(manifest_text)
+        except ValueError:
+            manifest = None
+    return {
+        "name": file_name,
+        "path": os.path.join(backup_base_dir, folder_name, file_name),
+        "size": size,
+        "mtime": mtime,
+        "sha256": sha256,
+        "manifest": manifest,
+    }
+
+
+def get_folder_state(folder_path: str):
+    """Return an opaque token describing a backup folder before it is modified.
+
+    Pass it to ``record_archive`` / ``forget_archive`` so they can tell whether
+    the catalog was in sync right before SaveState touched the folder. If it
+    was, the new directory mtime is stamped directly and no rescan is needed.
+    """
+    return _dir_mtime_ns(folder_path)
+
+
+def _stamp_folder_after_change(conn, folder_name: str, folder_path: str, folder_state) -> None:
+    """Advance the stored directory mtime if the folder was in sync before our change."""
+    if folder_state is None:
+        return
+    row = conn.execute(
+        "SELECT dir_mtime_ns FROM folders WHERE folder = ?", (folder_name,)
+    ).fetchone()
+    if row is None or row[0] != folder_state:
+        # Out of sync already (or never scanned): the next read reconciles.
+        return
+    dir_mtime = _dir_mtime_ns(folder_path)
+    if dir_mtime is not None:
+        # Stamped right after the change, so it stays "racy" until one more scan
+        conn.execute(
+            "UPDATE folders SET dir_mtime_ns = ?, scanned_ns = ? WHERE folder = ?",
+            (dir_mtime, time.time_ns(), folder_name),
+        )
+
+
+def record_archive(archive_path: str, sha256: str | None = None, folder_state=None) -> bool:
+    """Add or refresh one archive right after it has been written.
+
+    Pass ``sha256`` when the writer hashed the archive while producing it;
+    the archive itself is never read back here.
+    """
+    backup_base_dir, folder_name, file_name = _split_archive_path(archive_path)
+    if not is_backup_archive_name(file_name):
+        return False
+    try:
+        st = os.stat(archive_path)
+    except OSError as e:
+        logging.debug(f"Backup catalog: cannot record missing archive '{archive_path}': {e}")
+        return False
+    if sha256 is None:
+        sha256 = _peek_sha256(archive_path)
+    manifest_text = _read_manifest_text(archive_path)
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return False
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO archives (folder, name, size, mtime, sha256, manifest)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (folder_name, file_name, st.st_size, st.st_mtime, sha256, manifest_text),
+            )
+            _stamp_folder_after_change(
+                conn, folder_name, os.path.join(backup_base_dir, folder_name), folder_state
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog: failed to record '{archive_path}': {e}")
+            return False
+    logging.debug(f"Backup catalog: recorded '{file_name}' in '{folder_name}'")
+    return True
+
+
+def forget_archive(archive_path: str, folder_state=None) -> bool:
+    """Drop one archive from the catalog after it has been deleted from disk."""
+    backup_base_dir, folder_name, file_name = _split_archive_path(archive_path)
+    with _lock:
+        conn = _connect(backup_base_dir)
+        if conn is None:
+            return False
+        try:
+            conn.execute(
+                "DELETE FROM archives WHERE folder = ? AND name = ?",
+                (folder_name, file_name),
+            )
+            _stamp_folder_after_change(
+                conn, folder_name, os.path.join(backup_base_dir, folder_name), folder_state
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Backup catalog: failed to forget '{archive_path}': {e}")
+            return False
+    return True
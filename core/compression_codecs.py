@@ -0,0 +1,201 @@
+"""
+compression_codecs.py
+
+Compression codecs for backup archives beyond zipfile's Deflate levels.
+
+Codecs (stored as ``"codec"`` in savestate/manifest.json):
+
+- ``deflate`` / ``store``: the classic modes, read natively by zipfile.
+- ``lzma``: ZIP_LZMA members, read natively by zipfile (needs the stdlib
+  ``lzma`` module, missing on some minimal Python builds).
+- ``adaptive``: Deflate, except for members that look incompressible
+  (already-compressed formats by extension, or a sample that does not
+  shrink), which are stored instead of burning CPU on them.
+- ``zstd``: zstd-in-container. zipfile cannot read Zstandard members before
+  Python 3.14, so every file is zstd-compressed into a STORED member named
+  ``<arcname>.zst``. The archive stays a valid ZIP (any tool can list it and
+  ``zstd -d`` the members), and restore converts it back to a standard ZIP
+  first via ``export_zstd_to_zip``. Requires the optional ``zstandard``
+  package; without it backups fall back to Deflate.
+
+The incremental chains (``incremental_backup``) support every codec but
+``zstd``, and the deduplicating store (``dedup_store``) only zlib/raw
+chunks; both fall back to Deflate and record the codec they actually used.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import zipfile
+import zlib
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# zipfile needs the _lzma extension for ZIP_LZMA; minimal Python builds lack it.
+LZMA_AVAILABLE = importlib.util.find_spec("_lzma") is not None
+
+CODEC_DEFLATE = "deflate"
+CODEC_STORE = "store"
+CODEC_LZMA = "lzma"
+CODEC_ADAPTIVE = "adaptive"
+CODEC_ZSTD = "zstd"
+
+ZSTD_MEMBER_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
+MANIFEST_MEMBER = "savestate/manifest.json"
+
+# Formats that are already compressed or encrypted: Deflate cannot gain anything.
+INCOMPRESSIBLE_EXTENSIONS = {
+    ".7z", ".apk", ".avif", ".br", ".bz2", ".cab", ".cso", ".chd", ".flac", ".gif",
+    ".gz", ".heic", ".jpeg", ".jpg", ".lz4", ".lzma", ".m4a", ".mkv", ".mp3", ".mp4",
+    ".nsp", ".ogg", ".opus", ".pak", ".png", ".rar", ".tgz", ".webm", ".webp",
+    ".xz", ".zip", ".zst",
+}
+
+_SAMPLE_SIZE = 64 * 1024
+_MIN_SAMPLE_SIZE = 4096
+_INCOMPRESSIBLE_RATIO = 0.97
+_COPY_BLOCK = 1024 * 1024
+
+
+def resolve_codec(compression_mode: str) -> str:
+    """Map a ``compression_mode`` setting value to the codec actually used."""
+    if compression_mode in ("stored", "none"):
+        return CODEC_STORE
+    if compression_mode == "lzma":
+        if LZMA_AVAILABLE:
+            return CODEC_LZMA
+        logging.warning("LZMA compression requested but the 'lzma' module is unavailable, using Deflate.")
+    elif compression_mode == "zstd":
+        if ZSTD_AVAILABLE:
+            return CODEC_ZSTD
+        logging.warning("Zstandard compression requested but 'zstandard' is not installed, using Deflate.")
+    elif compression_mode == "adaptive":
+        return CODEC_ADAPTIVE
+    return CODEC_DEFLATE
+
+
+def is_probably_incompressible(file_path: str) -> bool:
+    """Cheap guess whether Deflate would be wasted on a file.
+
+    Known compressed extensions are trusted; otherwise a sample from the start
+    of the file is compressed at level 1 and checked for any real gain.
+    """
+    if os.path.splitext(file_path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+        return True
+    try:
+        with open(file_path, "rb") as f:
+            sample = f.read(_SAMPLE_SIZE)
+    except OSError:
+        return False
+    if len(sample) < _MIN_SAMPLE_SIZE:
+        return False
+    return len(zlib.compress(sample, 1)) >= len(sample) * _INCOMPRESSIBLE_RATIO
+
+
+def read_archive_codec(archive_path: str) -> str:
+    """Codec recorded in an archive's manifest (``deflate`` for older backups)."""
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            if MANIFEST_MEMBER not in zipf.NameToInfo:
+                return CODEC_DEFLATE
+            manifest = json.loads(zipf.read(MANIFEST_MEMBER).decode("utf-8"))
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, ValueError):
+        return CODEC_DEFLATE
+    return manifest.get("codec") or CODEC_DEFLATE
+
+
+def check_codec_supported(codec: str) -> tuple:
+    """
+    Check whether archives written with ``codec`` can be restored here.
+
+    Returns:
+        Tuple (supported: bool, error_message: str or None)
+    """
+    if codec == CODEC_ZSTD and not ZSTD_AVAILABLE:
+        return False, ("ERROR: This backup uses Zstandard compression. "
+                       "Install the 'zstandard' package to restore it.")
+    if codec == CODEC_LZMA and not LZMA_AVAILABLE:
+        return False, "ERROR: This backup uses LZMA compression, which this Python build does not support."
+    if codec not in (CODEC_DEFLATE, CODEC_STORE, CODEC_LZMA, CODEC_ADAPTIVE, CODEC_ZSTD):
+        return False, f"ERROR: Unknown compression codec '{codec}' in backup manifest."
+    return True, None
+
+
+def write_zstd_entries(zipf: zipfile.ZipFile, entries: list, level: int = ZSTD_LEVEL) -> int:
+    """
+    Add files as zstd-compressed STORED members named ``<arcname>.zst``.
+
+    Returns:
+        Number of members written; missing/unreadable files are logged and skipped.
+
+    Raises:
+        OSError: if Zstandard fails on a file, so the backup ends with the usual
+            archive-creation error instead of a truncated member.
+    """
+    compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+    written = 0
+    for source_path, arcname in entries:
+        logging.debug(f"  Adding file (zstd): '{source_path}' as '{arcname}{ZSTD_MEMBER_SUFFIX}'")
+        try:
+            zinfo = zipfile.ZipInfo.from_file(source_path, arcname + ZSTD_MEMBER_SUFFIX)
+            zinfo.compress_type = zipfile.ZIP_STORED
+            with open(source_path, "rb") as src, zipf.open(zinfo, "w") as dest:
+                compressor.copy_stream(src, dest, size=zinfo.file_size)
+            written += 1
+        except FileNotFoundError:
+            logging.warning(f"  Skipped file (not found during walk): '{source_path}'")
+        except zstandard.ZstdError as e:
+            raise OSError(f"Zstandard compression failed for '{source_path}': {e}") from e
+        except OSError as e:
+            logging.error(f"  Error adding file '{source_path}' to zip: {e}")
+    return written
+
+
+def export_zstd_to_zip(archive_path: str, output_path: str,
+                       compression=zipfile.ZIP_DEFLATED, compresslevel=6) -> tuple:
+    """
+    Write a standard ZIP from a zstd-in-container archive.
+
+    Returns:
+        Tuple (success: bool, error_message: str or None)
+    """
+    supported, error = check_codec_supported(CODEC_ZSTD)
+    if not supported:
+        return False, error
+    decompressor = zstandard.ZstdDecompressor()
+    try:
+        with zipfile.ZipFile(archive_path, "r") as src, \
+                zipfile.ZipFile(output_path, "w", compression=compression, compresslevel=compresslevel) as dst:
+            for info in src.infolist():
+                if info.is_dir():
+                    continue
+                is_zstd = info.filename.endswith(ZSTD_MEMBER_SUFFIX) and info.filename != MANIFEST_MEMBER
+                name = info.filename[:-len(ZSTD_MEMBER_SUFFIX)] if is_zstd else info.filename
+                zinfo = zipfile.ZipInfo(name, date_time=info.date_time)
+                zinfo.external_attr = info.external_attr
+                zinfo.compress_type = compression
+                zinfo._compresslevel = compresslevel
+                with src.open(info) as fin, dst.open(zinfo, "w", force_zip64=True) as fout:
+                    if is_zstd:
+                        decompressor.copy_stream(fin, fout)
+                    else:
+                        shutil.copyfileobj(fin, fout, _COPY_BLOCK)
+    except (OSError, zipfile.BadZipFile, zstandard.ZstdError) as e:
+        msg = f"ERROR decoding Zstandard backup '{archive_path}': {e}"
+        logging.error(msg)
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        except OSError:
+            pass
+        return False, msg
+    logging.info(f"Zstandard backup decoded to standard ZIP: '{output_path}'")
+    return True, None
@@ -10,15 +10,61 @@ import platform
 import glob
 import zipfile
 import shutil
+import tempfile
+import zlib
+
+from core import backup_catalog
+from core import compression_codecs
+from core import dedup_store
+from core import hash_cache
+from core import incremental_backup
+from core import mirror_writer
+from core import parallel_zip
+
+from core import save_location_cache
+from core import state_store
 
 # Import the appropriate guess_save_path function based on platform
 if platform.system() == "Linux":
-    from save_path_finder_linux import guess_save_path
+    from save_path_finder_linux import guess_save_path as _heuristic_guess_save_path
     logging.info("core_logic: Using Linux-specific implementation of guess_save_path")
 else:
-    from save_path_finder import guess_save_path
+    from save_path_finder import guess_save_path as _heuristic_guess_save_path
     logging.info(f"core_logic: Using default implementation of guess_save_path for {platform.system()}")
 
+
+def guess_save_path(game_name, game_install_dir=None, appid=None, steam_userdata_path=None,
+                    steam_id3_to_use=None, is_steam_game=True, installed_steam_games_dict=None,
+                    cancellation_manager=None, game_executable=None):
+    """Return ``[(path, score, has_saves_hint)]`` candidates for a game's saves.
+
+    Locations confirmed before on this machine (see save_location_cache) for
+    the same Steam AppID are returned after a single stat each, without the
+    heuristic crawl. Title and executable hits are only merged into the
+    crawl results: those keys can be shared by unrelated games.
+    """
+    cached = []
+    if getattr(config, 'SAVE_LOCATION_CACHE_ENABLED', True):
+        known = save_location_cache.lookup(
+            game_name, appid=appid, game_install_dir=game_install_dir, appid_only=True,
+        )
+        if known:
+            return known
+        cached = save_location_cache.lookup(
+            game_name, executable=game_executable, game_install_dir=game_install_dir,
+        )
+    searched = _heuristic_guess_save_path(
+        game_name=game_name,
+        game_install_dir=game_install_dir,
+        appid=appid,
+        steam_userdata_path=steam_userdata_path,
+        steam_id3_to_use=steam_id3_to_use,
+        is_steam_game=is_steam_game,
+        installed_steam_games_dict=installed_steam_games_dict,
+        cancellation_manager=cancellation_manager,
+    )
+    return save_location_cache.merge_with_search(cached, searched)
+
 try:
     from thefuzz import fuzz
     THEFUZZ_AVAILABLE = True
@@ -57,44 +103,48 @@ def _get_backup_root_from_settings() -> str:
         backup_root = getattr(config, "BACKUP_BASE_DIR", None)
     return backup_root
 
-def _mirror_json_to_backup_root(filename: str, json_obj: dict, rotation: int = 10) -> None:
-    """Write a mirror copy of json_obj into backup_root/.savestate/filename and keep N rotated snapshots.
+def _get_setting_from_settings(key: str, default=None):
+    """Best-effort retrieval of a single settings value, with default fallback."""
+    try:
+        from . import settings_manager
+        settings, _ = settings_manager.load_settings()
+        return settings.get(key, default)
+    except Exception:
+        return default
+
+def _mirror_json_to_backup_root(filename: str, json_obj, rotation: int = 10) -> None:
+    """Queue a mirror copy of json_obj for backup_root/.savestate/filename, keeping N rotated snapshots.
+
+    json_obj may also be the already serialized bytes of the file.
 
     If rotation <= 0, only the primary mirror file is written (no timestamped snapshots).
+    The write happens in the background (see core.mirror_writer) and is skipped
+    when the mirror already holds the same content.
     """
     backup_root = _get_backup_root_from_settings()
     if not backup_root:
         return
-    mirror_dir = os.path.join(backup_root, ".savestate")
-    os.makedirs(mirror_dir, exist_ok=True)
-
-    # Write primary mirror
-    mirror_path = os.path.join(mirror_dir, filename)
-    with open(mirror_path, "w", encoding="utf-8") as mf:
-        json.dump(json_obj, mf, indent=4, ensure_ascii=False)
-    logging.info(f"Mirror saved: {mirror_path}")
-
-    # Write timestamped snapshot only if rotation is enabled (> 0)
-    if rotation and rotation > 0:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        snapshot_path = os.path.join(mirror_dir, f"{os.path.splitext(filename)[0]}-{ts}.json")
-        try:
-            with open(snapshot_path, "w", encoding="utf-8") as sf:
-                json.dump(json_obj, sf, indent=2, ensure_ascii=False)
-        except Exception:
-            logging.warning(f"Failed to write snapshot mirror for {filename}")
+    mirror_writer.submit(filename, json_obj, backup_root, rotation=rotation)
 
-        # Rotate old snapshots
-        try:
-            candidates = [f for f in os.listdir(mirror_dir) if f.startswith(os.path.splitext(filename)[0] + "-") and f.endswith(".json")]
-            candidates.sort(reverse=True)
-            for old in candidates[rotation:]:
-                try:
-                    os.remove(os.path.join(mirror_dir, old))
-                except Exception:
-                    pass
-        except Exception:
-            pass
+def mirror_config_json(filename: str, json_obj) -> None:
+    """Mirror a config JSON (object or serialized bytes) into the backup root unless portable mode is active.
+
+    Reads the ``mirror_rotation_keep`` setting; failures are only logged.
+    """
+    try:
+        from . import settings_manager as _smirror
+        if _smirror.is_portable_mode():
+            return  # portable config already lives in the backup root
+    except Exception:
+        pass
+    try:
+        rotation = int(_get_setting_from_settings("mirror_rotation_keep", 0) or 0)
+    except (TypeError, ValueError):
+        rotation = 0
+    try:
+        _mirror_json_to_backup_root(filename, json_obj, rotation=rotation)
+    except Exception as e_mirror:
+        logging.warning(f"Unable to mirror {filename} to backup root: {e_mirror}")
 
 # <<< Function to sanitize folder names >>>
 def sanitize_foldername(name):
@@ -722,7 +772,13 @@ def get_profile_backup_summary(profile_name, backup_base_dir, profile_data=None)
     Returns a summary of backups for a profile.
     Returns: tuple (count: int, last_backup_datetime: datetime | None)
     """
-    # Use the existing function that already sorts by date (newest first)
+    # Fast path: answer from the persistent catalog (one stat per profile folder)
+    folder_name = get_backup_folder_name(profile_name, profile_data)
+    summary = backup_catalog.get_summary(backup_base_dir, folder_name)
+    if summary is not None:
+        return summary
+
+    # Fallback: the existing function that already sorts by date (newest first)
     backups = list_available_backups(profile_name, backup_base_dir, profile_data=profile_data)
     count = len(backups)
     last_backup_dt = None
@@ -741,22 +797,16 @@ def get_profile_backup_summary(profile_name, backup_base_dir, profile_data=None)
 # Loads profiles from the profile file, ensuring they are valid
 def load_profiles():
     """
-    Loads profiles from PROFILES_FILE_PATH, ensuring that values are
-    dictionaries containing at least the 'path' key.
+    Loads profiles from the state store (re-importing PROFILES_FILE_PATH if it
+    changed on disk), ensuring that values are dictionaries containing at
+    least the 'path' key.
     """
-    profiles_data = {} # Inizializza vuoto
-    # Prima prova a caricare il contenuto grezzo del file JSON
-    if os.path.exists(PROFILES_FILE_PATH):
-        try:
-            with open(PROFILES_FILE_PATH, 'r', encoding='utf-8') as f:
-                profiles_data = json.load(f)
-            logging.debug(f"File '{PROFILES_FILE_PATH}' caricato.")
-        except json.JSONDecodeError:
-            logging.warning(f"File profili '{PROFILES_FILE_PATH}' corrotto o vuoto. Sarà sovrascritto al prossimo salvataggio.")
-            profiles_data = {} # Tratta come vuoto se corrotto
-        except Exception as e:
-            logging.error(f"Errore imprevisto durante la lettura iniziale di '{PROFILES_FILE_PATH}': {e}")
-            profiles_data = {} # Tratta come vuoto per altri errori
+    # Il file JSON viene reimportato nello store solo se e' cambiato su disco
+    try:
+        profiles_data = _profiles_state().load(check_json=True)
+    except Exception as e:
+        logging.error(f"Errore imprevisto durante la lettura dei profili '{PROFILES_FILE_PATH}': {e}")
+        profiles_data = {}
 
     # Ora processa i dati caricati (profiles_data)
     loaded_profiles = {} # Dizionario per i profili processati e validati
@@ -764,18 +814,8 @@ def load_profiles():
 
     try:
         if isinstance(profiles_data, dict):
-            # Controlla se è il nuovo formato con metadati o il vecchio formato
-            if "__metadata__" in profiles_data and "profiles" in profiles_data:
-                profiles_dict_source = profiles_data.get("profiles", {}) # Nuovo formato
-                logging.debug("Processing profiles from new format (with metadata).")
-            elif "__metadata__" not in profiles_data:
-                # Se non ci sono metadati, assumi sia il vecchio formato (dict nome->path)
-                profiles_dict_source = profiles_data
-                logging.debug("Processing profiles assuming old format (name -> path string).")
-            else:
-                # Formato con metadata ma senza chiave 'profiles'? Strano.
-                logging.warning("Profile file has '__metadata__' but missing 'profiles' key. Treating as empty.")
-                profiles_dict_source = {}
+            # Formato con metadati o vecchio formato: gia' normalizzato da _profiles_from_json
+            profiles_dict_source = profiles_data
 
             # --- Ciclo di Conversione e Validazione ---
             for name, path_or_data in profiles_dict_source.items():
@@ -857,47 +897,63 @@ def load_profiles():
         cleanup_orphaned_icons(loaded_profiles)
     except Exception as e:
         logging.debug(f"Could not cleanup orphaned icons: {e}")
+
+    # Seed the save location cache with the paths of existing profiles
+    save_location_cache.remember_profiles(loaded_profiles)
     
     return loaded_profiles # Restituisci i profili processati
 
-# Saves the profiles to the profile file
-def save_profiles(profiles):
-    """ 
-    Save profiles in PROFILES_FILE_PATH. 
-    """
-    data_to_save = {
+def _profiles_from_json(data):
+    """Profile mapping of a profiles JSON, old (name -> path) or new (with metadata) format."""
+    if not isinstance(data, dict):
+        return None
+    if "__metadata__" in data:
+        profiles = data.get("profiles")
+        if not isinstance(profiles, dict):
+            # Formato con metadata ma senza chiave 'profiles'? Strano.
+            logging.warning("Profile file has '__metadata__' but missing 'profiles' key. Treating as empty.")
+            return {}
+        return profiles
+    return data
+
+
+def _profiles_to_json(profiles):
+    return {
         "__metadata__": {
             "version": 1, # Esempio
             "saved_at": datetime.now().isoformat()
         },
         "profiles": profiles
     }
+
+
+def _profiles_state():
+    """Profiles namespace of the state store, exported to PROFILES_FILE_PATH."""
+    return state_store.namespace(
+        "profiles", PROFILES_FILE_PATH,
+        from_json=_profiles_from_json, to_json=_profiles_to_json,
+    )
+
+
+def get_profile_names() -> set:
+    """Names of the stored profiles, without loading and validating them."""
     try:
-        # Assicura che la directory esista
-        os.makedirs(os.path.dirname(PROFILES_FILE_PATH), exist_ok=True)
-        with open(PROFILES_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, indent=4, ensure_ascii=False)
-        logging.info(f"Saved {len(profiles)} profiles in '{PROFILES_FILE_PATH}'.")
-        # Mirror only when NOT in portable mode (portable is already in backup root)
-        try:
-            do_mirror = True
-            try:
-                from . import settings_manager as _sm2
-                if _sm2.is_portable_mode():
-                    do_mirror = False
-            except Exception:
-                pass
-            if do_mirror:
-                rotation = 0
-                try:
-                    from . import settings_manager as _sm3
-                    settings, _ = _sm3.load_settings()
-                    rotation = int(settings.get("mirror_rotation_keep", 0))
-                except Exception:
-                    rotation = 0
-                _mirror_json_to_backup_root("game_save_profiles.json", data_to_save, rotation=rotation)
-        except Exception as e_mirror:
-            logging.warning(f"Unable to mirror profiles JSON to backup root: {e_mirror}")
+        return set(_profiles_state().keys())
+    except Exception as e:
+        logging.debug(f"Unable to read profile names: {e}")
+        return set()
+
+
+# Saves the profiles to the profile file
+def save_profiles(profiles):
+    """ 
+    Save profiles in the state store; only changed profiles are written.
+    PROFILES_FILE_PATH and its mirror are exported shortly after.
+    """
+    try:
+        changed = _profiles_state().replace(profiles)
+        logging.info(f"Saved {len(profiles)} profiles in '{PROFILES_FILE_PATH}'" + ("." if changed else " (unchanged)."))
+        save_location_cache.remember_profiles(profiles)
         return True
     except Exception as e:
         logging.error(f"Error saving profiles in '{PROFILES_FILE_PATH}': {e}")
@@ -957,7 +1013,16 @@ def manage_backups(profile_name, backup_base_dir, max_backups, profile_data=None
         if not os.path.isdir(profile_backup_dir): return deleted_files
 
         logging.info(f"Checking outdated (.zip) backups in: {profile_backup_dir}")
-        all_backup_files = [f for f in os.listdir(profile_backup_dir) if f.startswith("Backup_") and f.endswith(".zip")]
+        cataloged = backup_catalog.list_backups(backup_base_dir, folder_name)
+        if cataloged is not None:
+            backup_mtimes = {name: dt.timestamp() for name, _path, dt in cataloged}
+        else:
+            backup_mtimes = {
+                f: os.path.getmtime(os.path.join(profile_backup_dir, f))
+                for f in os.listdir(profile_backup_dir)
+                if f.startswith("Backup_") and f.endswith(".zip")
+            }
+        all_backup_files = list(backup_mtimes)
         
         # Separate locked and unlocked backups
         unlocked_backup_files = []
@@ -976,19 +1041,28 @@ def manage_backups(profile_name, backup_base_dir, max_backups, profile_data=None
 
         num_to_delete = len(unlocked_backup_files) - max_backups
         # Sort unlocked backups by modification time (oldest first)
-        unlocked_backup_files.sort(key=lambda f: os.path.getmtime(os.path.join(profile_backup_dir, f)))
+        unlocked_backup_files.sort(key=lambda f: backup_mtimes[f])
 
         logging.info(f"Deleting {num_to_delete} older (.zip) backup(s)...")
+        # Incremental backups that depend on a doomed archive become full ones first;
+        # archives still needed by a delta that could not be rebased are kept.
+        doomed_files = unlocked_backup_files[:num_to_delete]
+        still_needed = incremental_backup.rebase_dependents(profile_backup_dir, doomed_files)
         deleted_count = 0
-        for i in range(num_to_delete):
-            file_to_delete = os.path.join(profile_backup_dir, unlocked_backup_files[i])
+        for backup_file in doomed_files:
+            if backup_file in still_needed:
+                logging.warning(f"  Keeping {backup_file}: an incremental backup still depends on it.")
+                continue
+            file_to_delete = os.path.join(profile_backup_dir, backup_file)
             try:
-                logging.info(f"  Deleting: {unlocked_backup_files[i]}")
-                os.remove(file_to_delete)
-                deleted_files.append(unlocked_backup_files[i])
+                logging.info(f"  Deleting: {backup_file}")
+                folder_state = backup_catalog.get_folder_state(profile_backup_dir)
+                dedup_store.delete_archive(file_to_delete)
+                backup_catalog.forget_archive(file_to_delete, folder_state=folder_state)
+                deleted_files.append(backup_file)
                 deleted_count += 1
             except Exception as e:
-                logging.error(f"  Error deleting {unlocked_backup_files[i]}: {e}")
+                logging.error(f"  Error deleting {backup_file}: {e}")
         logging.info(f"Deleted {deleted_count} outdated (.zip) backup(s).")
 
     except Exception as e:
@@ -1070,20 +1144,32 @@ def _get_compression_settings(compression_mode: str) -> tuple:
     Get ZIP compression settings based on mode.
     
     Args:
-        compression_mode: One of 'standard', 'best', 'fast', 'none'
+        compression_mode: One of 'standard', 'maximum' ('best'), 'fast',
+            'stored' ('none'), 'lzma', 'adaptive', 'zstd'
         
     Returns:
-        Tuple (compression_type, compression_level)
+        Tuple (compression_type, compression_level). For 'zstd' this is the
+        Deflate fallback used by writers that cannot produce zstd members.
     """
-    if compression_mode == "best":
+    codec = compression_codecs.resolve_codec(compression_mode)
+    if compression_mode in ("best", "maximum"):
         logging.info("Compression Mode: Maximum (Deflate Level 9)")
         return zipfile.ZIP_DEFLATED, 9
     elif compression_mode == "fast":
         logging.info("Compression Mode: Fast (Deflate Level 1)")
         return zipfile.ZIP_DEFLATED, 1
-    elif compression_mode == "none":
+    elif codec == compression_codecs.CODEC_STORE:
         logging.info("Compression Mode: None (Store)")
         return zipfile.ZIP_STORED, None
+    elif codec == compression_codecs.CODEC_LZMA:
+        logging.info("Compression Mode: LZMA")
+        return zipfile.ZIP_LZMA, None
+    elif codec == compression_codecs.CODEC_ADAPTIVE:
+        logging.info("Compression Mode: Adaptive (Deflate Level 6, incompressible files stored)")
+        return zipfile.ZIP_DEFLATED, 6
+    elif codec == compression_codecs.CODEC_ZSTD:
+        logging.info(f"Compression Mode: Zstandard (level {compression_codecs.ZSTD_LEVEL}, in ZIP container)")
+        return zipfile.ZIP_DEFLATED, 6
     else:  # "standard" or default
         logging.info("Compression Mode: Standard (Deflate Level 6)")
         return zipfile.ZIP_DEFLATED, 6
@@ -1590,57 +1676,165 @@ def _perform_xemu_restore(profile_name: str, profile_data: dict, archive_path: s
             pass
 
 
-def _add_directory_to_zip(zipf: zipfile.ZipFile, source_path: str) -> None:
+def _iter_directory_entries(source_path: str):
     """
-    Add all files from a directory to a ZIP archive, preserving structure.
+    Yield (absolute_path, arcname) for every file below a directory.
     
-    Args:
-        zipf: Open ZipFile object in write mode
-        source_path: Path to the directory to add
+    The arcname preserves the base folder name, e.g. ``SaveFolder/slot1.sav``.
     """
-    base_folder_name = os.path.basename(source_path)
     len_source_path_parent = len(os.path.dirname(source_path)) + len(os.sep)
     
     for foldername, subfolders, filenames in os.walk(source_path):
         for filename in filenames:
             file_path_absolute = os.path.join(foldername, filename)
-            # arcname preserves the base folder in the archive
-            arcname = file_path_absolute[len_source_path_parent:]
-            
-            logging.debug(f"  Adding file: '{file_path_absolute}' as '{arcname}'")
-            try:
-                zipf.write(file_path_absolute, arcname=arcname)
-            except FileNotFoundError:
-                logging.warning(f"  Skipped file (not found during walk): '{file_path_absolute}'")
-            except Exception as e:
-                logging.error(f"  Error adding file '{file_path_absolute}' to zip: {e}")
+            yield file_path_absolute, file_path_absolute[len_source_path_parent:]
+
+
+def _member_compress_type(source_path: str, adaptive: bool):
+    """ZIP_STORED for incompressible files in adaptive mode, else the archive default."""
+    if adaptive and compression_codecs.is_probably_incompressible(source_path):
+        logging.debug(f"  Storing incompressible file uncompressed: '{source_path}'")
+        return zipfile.ZIP_STORED
+    return None
 
 
-def _add_single_file_to_zip(zipf: zipfile.ZipFile, source_path: str) -> None:
+def _add_directory_to_zip(zipf: zipfile.ZipFile, source_path: str, adaptive: bool = False) -> None:
+    """
+    Add all files from a directory to a ZIP archive, preserving structure.
+    
+    Args:
+        zipf: Open ZipFile object in write mode
+        source_path: Path to the directory to add
+        adaptive: Store files that look incompressible instead of deflating them
+    """
+    for file_path_absolute, arcname in _iter_directory_entries(source_path):
+        logging.debug(f"  Adding file: '{file_path_absolute}' as '{arcname}'")
+        try:
+            zipf.write(file_path_absolute, arcname=arcname,
+                       compress_type=_member_compress_type(file_path_absolute, adaptive))
+        except FileNotFoundError:
+            logging.warning(f"  Skipped file (not found during walk): '{file_path_absolute}'")
+        except Exception as e:
+            logging.error(f"  Error adding file '{file_path_absolute}' to zip: {e}")
+
+
+def _single_file_arcname(source_path: str) -> str:
+    """Return the arcname of a single-file source: parent_folder/file_name."""
+    source_base_dir = os.path.dirname(os.path.dirname(source_path))
+    return source_path[len(source_base_dir) + len(os.sep):]
+
+
+def _add_single_file_to_zip(zipf: zipfile.ZipFile, source_path: str, adaptive: bool = False) -> None:
     """
     Add a single file to a ZIP archive, preserving its parent directory structure.
     
     Args:
         zipf: Open ZipFile object in write mode
         source_path: Path to the file to add
+        adaptive: Store the file if it looks incompressible
         
     Raises:
         FileNotFoundError: If the source file doesn't exist
         Exception: For other errors during archiving
     """
-    source_dir = os.path.dirname(source_path)
-    source_base_dir = os.path.dirname(source_dir)
-    len_source_base_dir = len(source_base_dir) + len(os.sep)
-    
-    # arcname will be: parent_folder/file_name
-    arcname = source_path[len_source_base_dir:]
+    arcname = _single_file_arcname(source_path)
     
     logging.debug(f"Adding file: '{source_path}' as '{arcname}'")
-    zipf.write(source_path, arcname=arcname)
+    zipf.write(source_path, arcname=arcname, compress_type=_member_compress_type(source_path, adaptive))
+
+
+def _build_backup_manifest(profile_name: str, paths_to_process: list,
+                           is_multiple_paths: bool, codec: str = None) -> dict:
+    """Return the manifest dict stored as savestate/manifest.json in every backup."""
+    manifest_data = {
+        "schema": 1,
+        "app_version": getattr(config, "APP_VERSION", "unknown"),
+        "created_at": datetime.now().isoformat(),
+        "profile_name": profile_name,
+        "paths": paths_to_process,
+        "multiple_paths": is_multiple_paths,
+        "platform": platform.system(),
+    }
+    if codec:
+        manifest_data["codec"] = codec
+    return manifest_data
+
+
+def _collect_backup_entries(profile_name: str, paths_to_process: list,
+                            is_multiple_paths: bool) -> list:
+    """
+    Return the (absolute_path, arcname) list a standard backup would archive.
+    
+    Mirrors the ZIP writer: DuckStation single .mcd, otherwise every file of
+    every source path.
+    """
+    if not is_multiple_paths:
+        duckstation_mcd_file = _detect_duckstation_single_file(profile_name, paths_to_process[0])
+        if duckstation_mcd_file:
+            return [(duckstation_mcd_file, os.path.basename(duckstation_mcd_file))]
+    entries = []
+    for source_path in paths_to_process:
+        if os.path.isdir(source_path):
+            entries.extend(_iter_directory_entries(source_path))
+        elif os.path.isfile(source_path):
+            entries.append((source_path, _single_file_arcname(source_path)))
+    return entries
+
+
+def _perform_dedup_backup(profile_name: str, archive_path: str, paths_to_process: list,
+                          is_multiple_paths: bool, zip_compresslevel, codec: str) -> tuple:
+    """
+    Write the backup as a snapshot in the shared content-addressed store.
+    
+    Returns:
+        Tuple (success: bool, message: str)
+    """
+    logging.info(f"Using deduplicating store for '{profile_name}'")
+    try:
+        entries = _collect_backup_entries(profile_name, paths_to_process, is_multiple_paths)
+    except OSError as e:
+        msg = f"ERROR while collecting files for '{profile_name}': {e}"
+        logging.error(msg)
+        return False, msg
+    manifest_data = _build_backup_manifest(profile_name, paths_to_process, is_multiple_paths)
+    success, message = dedup_store.write_snapshot(
+        archive_path, entries, manifest_data, compresslevel=zip_compresslevel, codec=codec
+    )
+    if not success:
+        try:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+        except Exception:
+            pass
+    return success, message
+
+
+def _perform_incremental_backup(profile_name: str, archive_path: str, paths_to_process: list,
+                                is_multiple_paths: bool, zip_compression, zip_compresslevel,
+                                codec: str) -> tuple:
+    """
+    Write the backup as a delta of the newest archive when possible, else as a full one.
+    
+    Returns:
+        Tuple (success: bool, message: str)
+    """
+    try:
+        entries = _collect_backup_entries(profile_name, paths_to_process, is_multiple_paths)
+    except OSError as e:
+        msg = f"ERROR while collecting files for '{profile_name}': {e}"
+        logging.error(msg)
+        return False, msg
+    manifest_data = _build_backup_manifest(profile_name, paths_to_process, is_multiple_paths)
+    max_chain = _get_setting_from_settings("incremental_max_chain", 10)
+    return incremental_backup.write_backup(
+        archive_path, entries, manifest_data, zip_compression, zip_compresslevel,
+        max_chain=max_chain, codec=codec
+    )
 
 
 def _write_backup_manifest(zipf: zipfile.ZipFile, profile_name: str, 
-                           paths_to_process: list, is_multiple_paths: bool) -> None:
+                           paths_to_process: list, is_multiple_paths: bool,
+                           codec: str = None) -> None:
     """
     Write a manifest.json file to the ZIP archive for self-description.
     
@@ -1649,17 +1843,10 @@ def _write_backup_manifest(zipf: zipfile.ZipFile, profile_name: str,
         profile_name: Name of the profile being backed up
         paths_to_process: List of source paths
         is_multiple_paths: Whether this is a multi-path profile
+        codec: Compression codec recorded for the restore path
     """
     try:
-        manifest_data = {
-            "schema": 1,
-            "app_version": getattr(config, "APP_VERSION", "unknown"),
-            "created_at": datetime.now().isoformat(),
-            "profile_name": profile_name,
-            "paths": paths_to_process,
-            "multiple_paths": is_multiple_paths,
-            "platform": platform.system(),
-        }
+        manifest_data = _build_backup_manifest(profile_name, paths_to_process, is_multiple_paths, codec)
         zipf.writestr("savestate/manifest.json", json.dumps(manifest_data, indent=2, ensure_ascii=False))
         logging.debug("Added savestate/manifest.json to the backup archive")
     except Exception as e:
@@ -1720,11 +1907,19 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
         msg = f"ERROR: Unable to create backup directory '{profile_backup_dir}': {e}"
         logging.error(msg, exc_info=True)
         return False, msg
+    folder_state = backup_catalog.get_folder_state(profile_backup_dir)
 
     # --- Prepare ZIP archive ---
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     archive_name = f"Backup_{sanitized_folder_name}_{timestamp}.zip"
     archive_path = os.path.join(profile_backup_dir, archive_name)
+    # Two backups within the same second must not overwrite each other
+    # (an incremental one would truncate its own parent)
+    suffix = 0
+    while os.path.exists(archive_path):
+        suffix += 1
+        archive_name = f"Backup_{sanitized_folder_name}_{timestamp}_{suffix}.zip"
+        archive_path = os.path.join(profile_backup_dir, archive_name)
 
     logging.info(f"Creating backup for '{profile_name}': {len(paths_to_process)} source(s) -> '{archive_path}'")
 
@@ -1742,6 +1937,7 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
             fallback_paths=paths_to_process,
         )
         if success:
+            backup_catalog.record_archive(archive_path, folder_state=folder_state)
             deleted_files = manage_backups(
                 profile_name, backup_base_dir, max_backups, profile_data=profile_data
             )
@@ -1762,6 +1958,7 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
             success, message = _perform_ymir_backup(profile_name, profile_data, archive_path, 
                                                     zip_compression, zip_compresslevel)
             if success:
+                backup_catalog.record_archive(archive_path, folder_state=folder_state)
                 # Manage old backups
                 deleted_files = manage_backups(profile_name, backup_base_dir, max_backups, profile_data=profile_data)
                 deleted_msg = f" Deleted {len(deleted_files)} obsolete backups." if deleted_files else ""
@@ -1775,10 +1972,45 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
                     pass
                 return False, message
 
+    # --- Optional deduplicating store (hidden setting "storage_engine": "dedup") ---
+    if _get_setting_from_settings("storage_engine", "zip") == "dedup":
+        success, message = _perform_dedup_backup(
+            profile_name, archive_path, paths_to_process, is_multiple_paths, zip_compresslevel,
+            compression_codecs.resolve_codec(compression_mode)
+        )
+        if not success:
+            return False, message
+        backup_catalog.record_archive(archive_path, folder_state=folder_state)
+        deleted_files = manage_backups(profile_name, backup_base_dir, max_backups, profile_data=profile_data)
+        # Sweep chunks leaked by snapshots deleted outside SaveState (throttled)
+        dedup_store.maybe_collect_garbage(backup_base_dir)
+        deleted_msg = f" Deleted {len(deleted_files)} obsolete backups." if deleted_files else ""
+        return True, f"Backup completed successfully:\n'{archive_name}'" + deleted_msg
+
+    # --- Optional incremental chains (hidden setting "incremental_backups") ---
+    if _get_setting_from_settings("incremental_backups", False):
+        success, message = _perform_incremental_backup(
+            profile_name, archive_path, paths_to_process, is_multiple_paths,
+            zip_compression, zip_compresslevel, compression_codecs.resolve_codec(compression_mode)
+        )
+        if not success:
+            return False, message
+        backup_catalog.record_archive(archive_path, folder_state=folder_state)
+        deleted_files = manage_backups(profile_name, backup_base_dir, max_backups, profile_data=profile_data)
+        deleted_msg = f" Deleted {len(deleted_files)} obsolete backups." if deleted_files else ""
+        return True, f"Backup completed successfully:\n'{archive_name}'" + deleted_msg
+
+    compression_workers = parallel_zip.get_worker_count(_get_setting_from_settings("compression_workers", 0))
+    codec = compression_codecs.resolve_codec(compression_mode)
+    adaptive = codec == compression_codecs.CODEC_ADAPTIVE
+
+    archive_digests = None
     try:
-        with zipfile.ZipFile(archive_path, 'w', compression=zip_compression, compresslevel=zip_compresslevel) as zipf:
+        # Hashed on the way out, so the catalog and the cloud providers never read it back
+        with hash_cache.HashingWriter(archive_path) as archive_file, \
+                zipfile.ZipFile(archive_file, 'w', compression=zip_compression, compresslevel=zip_compresslevel) as zipf:
             # Write manifest for self-describing backup
-            _write_backup_manifest(zipf, profile_name, paths_to_process, is_multiple_paths)
+            _write_backup_manifest(zipf, profile_name, paths_to_process, is_multiple_paths, codec)
 
             # Check for DuckStation single-file backup (only for single-path profiles)
             duckstation_mcd_file = None
@@ -1792,15 +2024,28 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
                 logging.debug(f"Adding DuckStation file: '{duckstation_mcd_file}' as '{mcd_arcname}'")
                 zipf.write(duckstation_mcd_file, arcname=mcd_arcname)
                 logging.info(f"DuckStation file '{mcd_arcname}' added to archive.")
+            elif codec == compression_codecs.CODEC_ZSTD:
+                # zstd-in-container: every file becomes a STORED '<arcname>.zst' member
+                entries = _collect_backup_entries(profile_name, paths_to_process, is_multiple_paths)
+                compression_codecs.write_zstd_entries(zipf, entries)
+            elif compression_workers > 1 and zip_compression == zipfile.ZIP_DEFLATED:
+                # Standard backup, members deflated in parallel and written in order
+                logging.info(f"Executing standard backup with {compression_workers} compression worker(s).")
+                entries = _collect_backup_entries(profile_name, paths_to_process, is_multiple_paths)
+                parallel_zip.write_entries(
+                    zipf, entries, zip_compresslevel, compression_workers,
+                    store_predicate=compression_codecs.is_probably_incompressible if adaptive else None,
+                )
             else:
                 # Standard backup: process all paths
                 logging.debug(f"Executing standard backup for {len(paths_to_process)} path(s).")
                 for source_path in paths_to_process:
                     logging.debug(f"Processing source path: {source_path}")
                     if os.path.isdir(source_path):
-                        _add_directory_to_zip(zipf, source_path)
+                        _add_directory_to_zip(zipf, source_path, adaptive)
                     elif os.path.isfile(source_path):
-                        _add_single_file_to_zip(zipf, source_path)
+                        _add_single_file_to_zip(zipf, source_path, adaptive)
+        archive_digests = archive_file.digests()
 
         logging.info(f"Backup archive created successfully: '{archive_path}'")
 
@@ -1824,6 +2069,14 @@ def perform_backup(profile_name, source_paths, backup_base_dir, max_backups, max
          return False, msg
     # --- END ZIP Archive Creation ---
 
+    if archive_digests:
+        hash_cache.remember(archive_path, archive_digests)
+    backup_catalog.record_archive(
+        archive_path,
+        sha256=archive_digests.get("sha256") if archive_digests else None,
+        folder_state=folder_state,
+    )
+
     # --- Gestione Vecchi Backup ---
     deleted_files = manage_backups(profile_name, backup_base_dir, max_backups, profile_data=profile_data)
     deleted_msg = f" Deleted {len(deleted_files)} obsolete backups." if deleted_files else ""
@@ -1843,6 +2096,10 @@ def list_available_backups(profile_name, backup_base_dir, profile_data=None):
     if not os.path.isdir(profile_backup_dir):
         return backups # Nessuna cartella = nessun backup
 
+    cataloged = backup_catalog.list_backups(backup_base_dir, folder_name)
+    if cataloged is not None:
+        return cataloged
+
     try:
         backup_files = [f for f in os.listdir(profile_backup_dir) if f.startswith("Backup_") and f.endswith(".zip")]
         # Ordina dal più recente
@@ -1880,6 +2137,12 @@ def _validate_restore_archive(archive_path: str) -> tuple:
     if not zipfile.is_zipfile(archive_path):
         return False, f"ERROR: The selected file is not a valid ZIP archive: '{archive_path}'"
     
+    codec_ok, codec_error = compression_codecs.check_codec_supported(
+        compression_codecs.read_archive_codec(archive_path)
+    )
+    if not codec_ok:
+        return False, codec_error
+    
     return True, None
 
 
@@ -2114,7 +2377,213 @@ def _extract_member_to_destination(zipf: zipfile.ZipFile, member_path: str,
         return False
 
 
+def _plan_differential_restore(zipf: zipfile.ZipFile, paths_to_process: list,
+                               is_multiple_paths: bool) -> tuple:
+    """
+    Map every file member of the ZIP to its absolute destination path.
+    
+    Uses the same layout rules as the backup: a destination that is a single
+    file maps to its ``parent_folder/file_name`` member, multi-path restores
+    map the first path component to the folder with that basename and
+    single-path restores extract everything below the destination.
+    
+    Returns:
+        Tuple (plan: dict {dest_path: ZipInfo} or None if the archive needs the
+        classic extraction, blocked: list of unsafe member names)
+    """
+    plan = {}
+    blocked = []
+    folder_paths = []
+    for dest_path in paths_to_process:
+        arcname = _single_file_arcname(dest_path).replace(os.sep, '/')
+        if not os.path.isdir(dest_path) and arcname in zipf.NameToInfo:
+            plan[dest_path] = zipf.NameToInfo[arcname]
+        elif os.path.isfile(dest_path):
+            return None, blocked
+        else:
+            folder_paths.append(dest_path)
+    file_members = {info.filename for info in plan.values()}
+
+    dest_map = {os.path.basename(p): p for p in folder_paths}
+    if is_multiple_paths and dest_map and not _find_zip_base_folders(zipf, dest_map):
+        return None, blocked
+
+    for info in zipf.infolist():
+        if not folder_paths or info.filename in file_members:
+            continue
+        normalized_member_path = info.filename.replace('/', os.sep)
+        if is_multiple_paths:
+            base_folder, _, relative_path = normalized_member_path.partition(os.sep)
+            if base_folder not in dest_map:
+                continue
+            dest_root = dest_map[base_folder]
+        else:
+            dest_root = folder_paths[0]
+            relative_path = normalized_member_path
+        if not _is_safe_zip_path(relative_path, dest_root):
+            blocked.append(info.filename)
+            logging.error(f"SECURITY: Blocked unsafe ZIP path: '{info.filename}'")
+            continue
+        if info.is_dir() or not relative_path:
+            continue
+        plan[os.path.normpath(os.path.join(dest_root, relative_path))] = info
+    return plan, blocked
+
+
+def _file_matches_member(file_path: str, info: zipfile.ZipInfo) -> bool:
+    """True if the file on disk has the member's size and CRC32 (from the central directory)."""
+    try:
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) != info.file_size:
+            return False
+        crc = 0
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                crc = zlib.crc32(block, crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
+
+def _write_member_atomically(zipf: zipfile.ZipFile, info: zipfile.ZipInfo, target_path: str) -> None:
+    """Extract one member to a temp file next to the target, then rename it over the target."""
+    target_dir = os.path.dirname(target_path)
+    os.makedirs(target_dir, exist_ok=True)
+    if os.path.isdir(target_path):
+        shutil.rmtree(target_path)
+    fd, temp_path = tempfile.mkstemp(prefix=".savestate-restore-", dir=target_dir)
+    try:
+        with os.fdopen(fd, 'wb') as target, zipf.open(info) as source:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _remove_extraneous_files(dest_root: str, planned: set, error_messages: list) -> int:
+    """Delete files below ``dest_root`` that are not in the restore plan, then prune empty folders."""
+    removed = 0
+    if not os.path.isdir(dest_root):
+        return removed
+    for dirpath, dirnames, filenames in os.walk(dest_root, topdown=False):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            if os.path.normcase(os.path.normpath(file_path)) in planned:
+                continue
+            try:
+                os.remove(file_path)
+                removed += 1
+                logging.debug(f"  Removed file not in archive: {file_path}")
+            except OSError as e:
+                error_messages.append(f"ERROR removing '{file_path}': {e}")
+        for dirname in dirnames:
+            dir_path = os.path.join(dirpath, dirname)
+            try:
+                if not os.path.islink(dir_path) and not os.listdir(dir_path):
+                    os.rmdir(dir_path)
+            except OSError:
+                pass
+    return removed
+
+
+def _perform_differential_restore(profile_name: str, paths_to_process: list,
+                                  is_multiple_paths: bool, archive_path: str):
+    """
+    Restore by writing only what differs from the archive.
+    
+    Identical files (same size and CRC32) are left untouched, changed files are
+    replaced atomically through a temp file, so the save folder is never empty
+    during the restore. Files missing from the archive are deleted last, and
+    only if every planned write succeeded.
+    
+    Returns:
+        Tuple (success: bool, message: str), or None if the archive layout
+        requires the classic cleanup-and-extract path.
+    """
+    error_messages = []
+    written = skipped = removed = 0
+    try:
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            plan, blocked = _plan_differential_restore(zipf, paths_to_process, is_multiple_paths)
+            if plan is None:
+                return None
+            logging.info(f"Differential restore: {len(plan)} file(s) in archive for {len(paths_to_process)} destination(s).")
+            if blocked:
+                error_messages.append(f"SECURITY: Blocked {len(blocked)} potentially malicious paths")
+
+            for target_path, info in plan.items():
+                if _file_matches_member(target_path, info):
+                    skipped += 1
+                    continue
+                try:
+                    _write_member_atomically(zipf, info, target_path)
+                    written += 1
+                    logging.debug(f"  Restored file {info.filename} -> {target_path}")
+                except (OSError, zipfile.BadZipFile, zlib.error) as e:
+                    msg = f"ERROR extracting file '{info.filename}' to '{target_path}': {e}"
+                    logging.error(msg)
+                    error_messages.append(msg)
+    except zipfile.BadZipFile:
+        msg = f"ERROR: The file is not a valid ZIP archive or is corrupted: '{archive_path}'"
+        logging.error(msg)
+        return False, msg
+
+    # Delete only once the archive content is fully in place: a failed write
+    # must not leave the destination with fewer files than before.
+    if not error_messages:
+        planned = {os.path.normcase(p) for p in plan}
+        for dest_root in paths_to_process:
+            removed += _remove_extraneous_files(dest_root, planned, error_messages)
+    else:
+        logging.warning("Differential restore: some files could not be written, extraneous files are kept.")
+
+    logging.info(f"Differential restore: {written} file(s) written, {skipped} unchanged, {removed} removed.")
+    if error_messages:
+        msg = f"Restore for profile '{profile_name}' failed or completed with errors."
+        logging.error(msg)
+        return False, msg + "\n\nDettaglio errori:\n" + "\n".join(error_messages)
+    msg = f"Restore completed successfully for profile '{profile_name}'."
+    logging.info(msg)
+    return True, msg
+
+
 # --- Restore Function ---
+def _materialize_restore_archive(archive_path: str, temp_dir: str) -> tuple:
+    """
+    Return a standard ZIP to restore from for ``archive_path``.
+    
+    Regular backups are returned unchanged; archives that depend on external
+    data or on codecs zipfile cannot read (dedup snapshots, incremental deltas,
+    zstd-in-container) are exported to a self-contained ZIP in ``temp_dir``.
+    
+    Returns:
+        Tuple (zip_path or None, error_message or None)
+    """
+    if dedup_store.is_snapshot_archive(archive_path):
+        output_path = os.path.join(temp_dir, os.path.basename(archive_path))
+        # Temporary file, extracted right away: no point compressing it.
+        ok, error = dedup_store.export_snapshot_to_zip(
+            archive_path, output_path, compression=zipfile.ZIP_STORED, compresslevel=None
+        )
+        return (output_path, None) if ok else (None, error)
+    if compression_codecs.read_archive_codec(archive_path) == compression_codecs.CODEC_ZSTD:
+        output_path = os.path.join(temp_dir, os.path.basename(archive_path))
+        ok, error = compression_codecs.export_zstd_to_zip(
+            archive_path, output_path, compression=zipfile.ZIP_STORED, compresslevel=None
+        )
+        return (output_path, None) if ok else (None, error)
+    if incremental_backup.is_incremental_archive(archive_path):
+        output_path = os.path.join(temp_dir, os.path.basename(archive_path))
+        ok, error = incremental_backup.export_chain_to_zip(
+            archive_path, output_path, compression=zipfile.ZIP_STORED, compresslevel=None
+        )
+        return (output_path, None) if ok else (None, error)
+    return archive_path, None
+
+
 def perform_restore(profile_name, destination_paths, archive_to_restore_path, profile_data=None):
     """
     Perform restoration from a ZIP archive. Handles a single path (str) or multiple paths (list).
@@ -2128,6 +2597,23 @@ def perform_restore(profile_name, destination_paths, archive_to_restore_path, pr
     Returns:
         Tuple (success: bool, message: str)
     """
+    archive_ok, archive_error = _validate_restore_archive(archive_to_restore_path)
+    if not archive_ok:
+        logging.error(archive_error)
+        return False, archive_error
+
+    temp_dir = tempfile.mkdtemp(prefix="savestate_restore_")
+    try:
+        zip_path, error = _materialize_restore_archive(archive_to_restore_path, temp_dir)
+        if zip_path is None:
+            return False, error
+        return _perform_restore_archive(profile_name, destination_paths, zip_path, profile_data)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _perform_restore_archive(profile_name, destination_paths, archive_to_restore_path, profile_data=None):
+    """Restore body of ``perform_restore``; ``archive_to_restore_path`` is a standard ZIP."""
     logging.info(f"Starting perform_restore for profile: '{profile_name}'")
     logging.info(f"Archive selected for restoration: '{archive_to_restore_path}'")
 
@@ -2158,6 +2644,15 @@ def perform_restore(profile_name, destination_paths, archive_to_restore_path, pr
             logging.info(f"Using Ymir specialized restore for '{profile_name}'")
             return _perform_ymir_restore(profile_name, profile_data, archive_to_restore_path)
 
+    # --- Differential restore (only rewrite what changed) ---
+    if _get_setting_from_settings("restore_mode", "clean") == "differential":
+        result = _perform_differential_restore(
+            profile_name, paths_to_process, is_multiple_paths, archive_to_restore_path
+        )
+        if result is not None:
+            return result
+        logging.info("Archive layout needs filename matching, using full cleanup and extraction.")
+
     # --- Clean destination paths ---
     cleanup_ok, cleanup_error = _cleanup_all_destination_paths(paths_to_process)
     if not cleanup_ok:
@@ -2311,7 +2806,14 @@ def delete_single_backup_file(file_path):
     logging.warning(f"Attempting permanent deletion of file: {file_path}")
 
     try:
-        os.remove(file_path)
+        if incremental_backup.rebase_dependents(os.path.dirname(os.path.abspath(file_path)), [backup_name]):
+            msg = (f"Cannot delete '{backup_name}': newer incremental backups depend on it "
+                   f"and could not be converted to full backups.")
+            logging.error(msg)
+            return False, msg
+        folder_state = backup_catalog.get_folder_state(os.path.dirname(os.path.abspath(file_path)))
+        dedup_store.delete_archive(file_path)
+        backup_catalog.forget_archive(file_path, folder_state=folder_state)
         # Best-effort: drop any per-backup note attached to this file.
         try:
             from gui_components import backup_notes_manager
@@ -2366,12 +2868,13 @@ def get_display_name_from_backup_filename(filename):
     for a cleaner display.
 
     Ex: "Backup_ProfiloX_20250422_030000.zip" -> "Backup_ProfiloX"
+        "Backup_ProfiloX_20250422_030000_1.zip" -> "Backup_ProfiloX"
     """
     if isinstance(filename, str) and filename.endswith(".zip"):
         # Tenta di rimuovere il pattern specifico _8cifre_6cifre.zip
         # Usiamo re.sub per sostituire il pattern con '' (stringa vuota)
         # Il pattern: _ seguita da 8 cifre (\d{8}), _ seguita da 6 cifre (\d{6}), seguito da .zip alla fine ($)
-        display_name = re.sub(r'_\d{8}_\d{6}\.zip$', '.zip', filename)
+        display_name = re.sub(r'_\d{8}_\d{6}(?:_\d+)?\.zip$', '.zip', filename)
         # Se la sostituzione ha funzionato, rimuoviamo anche l'estensione .zip finale per la visualizzazione
         if display_name != filename: # Verifica se la sostituzione è avvenuta
              return display_name[:-4] # Rimuovi ".zip"
@@ -2394,6 +2897,13 @@ def restore_json_from_backup_root() -> bool:
         logging.warning(f"Mirror directory does not exist: {mirror_dir}")
         return False
     
+    # Write pending store exports first, so ".before_restore" copies are current,
+    # then let the queued mirror writes land before the mirror is read
+    state_store.flush_all()
+    if not mirror_writer.flush(mirror_writer.EXIT_FLUSH_TIMEOUT_SECONDS):
+        logging.error(f"Cannot restore JSONs: mirror writes to '{mirror_dir}' are still pending")
+        return False
+
     # Files to restore (match mirror filenames)
     files_to_restore = ["game_save_profiles.json", "settings.json", "favorites_status.json", "cloud_settings.json"]
     restored_count = 0
@@ -0,0 +1,508 @@
+"""
+dedup_store.py
+
+Optional content-addressed storage engine for SaveState backups.
+
+With the default ``zip`` engine every backup is a complete, independently
+compressed ``Backup_<name>_<timestamp>.zip``. With the ``dedup`` engine
+(``"storage_engine": "dedup"`` in settings.json) file contents are split into
+fixed-size chunks that are stored once, keyed by their SHA-256, in a store
+shared by every profile:
+
+    <backup_base_dir>/.savestate/store/objects/<2 hex>/<sha256>
+
+A backup then only needs a tiny snapshot: a regular ``Backup_*.zip`` that holds
+``savestate/manifest.json`` and ``savestate/snapshot.json`` (file list + chunk
+digests). Keeping the snapshot a ZIP with the usual name means listing,
+rotation, locking, notes and the backup catalog keep working unchanged.
+
+Unchanged files and chunks are written once across all backups and profiles,
+and re-backing up an unchanged save only costs hashing, not recompression.
+
+Chunks are zlib-compressed (or stored raw when that does not shrink them,
+which already makes every chunk "adaptive"). The ``store`` codec keeps them
+raw; ``lzma`` and ``zstd`` are not available for the store and fall back to
+zlib. The codec actually used is recorded in the manifest.
+
+Lifetime of chunks
+------------------
+``refs.db`` counts how many snapshots reference each chunk. Writing a snapshot
+increments the counters of its (unique) chunks, ``release_snapshot`` decrements
+them once the snapshot ZIP has been deleted and removes chunks that reach
+zero; ``delete_archive`` does the read, the delete and the release under the
+store lock. Snapshots deleted outside the app, or a crash between writing
+chunks and committing counters, can only leak chunks, never lose referenced
+ones; ``collect_garbage`` rebuilds the counters from the live snapshots and
+sweeps everything unreferenced. ``perform_backup`` runs it at most once every
+``GC_INTERVAL_SECONDS`` per backup root, and it never runs while a snapshot
+is being written (its chunk references are not on disk yet).
+
+Portability
+-----------
+A snapshot is useless without its store, so ``export_snapshot_to_zip`` writes a
+standard self-contained backup ZIP from it. ``perform_restore`` uses the same
+export transparently before extracting. Cloud uploads skip snapshots (see
+``storage_provider.select_zip_files_for_upload``): the chunks are not
+uploaded, so a snapshot could not be restored on another machine.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime
+
+from core import backup_catalog, compression_codecs
+
+STORE_RELATIVE_DIR = os.path.join(".savestate", "store")
+OBJECTS_DIRNAME = "objects"
+REFS_DB_FILENAME = "refs.db"
+SNAPSHOT_MEMBER = "savestate/snapshot.json"
+MANIFEST_MEMBER = "savestate/manifest.json"
+SNAPSHOT_SCHEMA = 1
+
+CHUNK_SIZE = 1024 * 1024
+# Minimum interval between two automatic garbage collections of a store.
+GC_INTERVAL_SECONDS = 7 * 24 * 3600
+
+# One-byte object header: zlib-compressed payload or raw bytes (incompressible).
+_OBJ_ZLIB = b"Z"
+_OBJ_RAW = b"R"
+
+_lock = threading.RLock()
+_connections: dict[str, sqlite3.Connection] = {}
+# Snapshots being written: their references are not on disk yet (guarded by _lock).
+_active_writers = 0
+
+
+def get_store_dir(backup_base_dir: str) -> str:
+    """Return the shared chunk store directory of a backup root."""
+    return os.path.join(backup_base_dir, STORE_RELATIVE_DIR)
+
+
+def _backup_root_of(archive_path: str) -> str:
+    """Backups live in <backup_base_dir>/<profile folder>/<archive>."""
+    return os.path.dirname(os.path.dirname(os.path.abspath(archive_path)))
+
+
+def _object_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, OBJECTS_DIRNAME, digest[:2], digest)
+
+
+def is_snapshot_archive(archive_path: str) -> bool:
+    """True if ``archive_path`` is a dedup snapshot rather than a full backup ZIP."""
+    # Only ask an existing catalog: an archive outside a backup root must not create one
+    if os.path.exists(backup_catalog.get_catalog_path(_backup_root_of(archive_path))):
+        info = backup_catalog.get_archive_info(archive_path)
+        if info is not None and info.get("manifest") is not None:
+            return info["manifest"].get("storage") == "dedup"
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            return SNAPSHOT_MEMBER in zipf.NameToInfo
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def read_snapshot(archive_path: str) -> dict | None:
+    """Return the parsed snapshot.json of a snapshot archive, or None."""
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            if SNAPSHOT_MEMBER not in zipf.NameToInfo:
+                return None
+            return json.loads(zipf.read(SNAPSHOT_MEMBER).decode("utf-8"))
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, ValueError) as e:
+        logging.error(f"Unable to read dedup snapshot '{archive_path}': {e}")
+        return None
+
+
+def _snapshot_digests(snapshot: dict) -> set:
+    digests = set()
+    for entry in snapshot.get("files", []):
+        digests.update(entry.get("chunks", []))
+    return digests
+
+
+# --- Reference counters ---------------------------------------------------
+
+def _iter_snapshot_archives(backup_base_dir: str):
+    """Yield every snapshot archive below the backup root."""
+    try:
+        folders = [e for e in os.scandir(backup_base_dir) if e.is_dir() and not e.name.startswith(".")]
+    except OSError:
+        return
+    for folder in folders:
+        try:
+            names = [n for n in os.listdir(folder.path) if n.startswith("Backup_") and n.endswith(".zip")]
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(folder.path, name)
+            if is_snapshot_archive(path):
+                yield path
+
+
+def _rebuild_refs(conn, backup_base_dir: str) -> None:
+    """Recompute every counter from the snapshots currently on disk."""
+    counts: dict[str, int] = {}
+    for path in _iter_snapshot_archives(backup_base_dir):
+        snapshot = read_snapshot(path)
+        if snapshot is None:
+            continue
+        for digest in _snapshot_digests(snapshot):
+            counts[digest] = counts.get(digest, 0) + 1
+    conn.execute("DELETE FROM chunks")
+    conn.executemany(
+        "INSERT INTO chunks (digest, refs) VALUES (?, ?)", counts.items()
+    )
+    conn.commit()
+    logging.info(f"Dedup store: reference counts rebuilt ({len(counts)} live chunk(s)).")
+
+
+def _connect(backup_base_dir: str):
+    store_dir = get_store_dir(backup_base_dir)
+    db_path = os.path.normcase(os.path.abspath(os.path.join(store_dir, REFS_DB_FILENAME)))
+    conn = _connections.get(db_path)
+    if conn is not None:
+        return conn
+    os.makedirs(os.path.join(store_dir, OBJECTS_DIRNAME), exist_ok=True)
+    is_new = not os.path.exists(db_path)
+    conn = sqlite3.connect(db_path, timeout=10.0, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS chunks ("
+        " digest TEXT PRIMARY KEY,"
+        " refs INTEGER NOT NULL)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.commit()
+    if is_new:
+        # The counters may have been lost while snapshots still exist.
+        _rebuild_refs(conn, backup_base_dir)
+    _connections[db_path] = conn
+    return conn
+
+
+# --- Chunk objects --------------------------------------------------------
+
+def _encode_object(data: bytes, compresslevel) -> bytes:
+    """Return the on-disk representation of a chunk."""
+    if compresslevel is not None:
+        packed = zlib.compress(data, compresslevel)
+        if len(packed) < len(data):
+            return _OBJ_ZLIB + packed
+    return _OBJ_RAW + data
+
+
+def _store_payload(store_dir: str, digest: str, payload: bytes) -> None:
+    obj_path = _object_path(store_dir, digest)
+    os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(obj_path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, obj_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _add_reference(conn, store_dir: str, digest: str, data: bytes, compresslevel) -> int:
+    """Take one reference on a chunk, storing it first if needed. Returns bytes written.
+
+    Only the counter increment happens under the lock. Once it is counted a
+    concurrent ``release_snapshot`` can no longer delete the chunk, so the
+    existence check, the compression and the write of a missing object run
+    outside it (``_store_payload`` renames a complete temporary file into
+    place, and two writers of the same chunk write the same bytes).
+    """
+    with _lock:
+        conn.execute(
+            "INSERT INTO chunks (digest, refs) VALUES (?, 1)"
+            " ON CONFLICT(digest) DO UPDATE SET refs = refs + 1",
+            (digest,),
+        )
+    if os.path.exists(_object_path(store_dir, digest)):
+        return 0
+    try:
+        payload = _encode_object(data, compresslevel)
+        _store_payload(store_dir, digest, payload)
+    except BaseException:
+        with _lock:
+            conn.execute("UPDATE chunks SET refs = refs - 1 WHERE digest = ?", (digest,))
+        raise
+    return len(payload)
+
+
+def _read_object(store_dir: str, digest: str) -> bytes:
+    with open(_object_path(store_dir, digest), "rb") as f:
+        payload = f.read()
+    kind, body = payload[:1], payload[1:]
+    if kind == _OBJ_ZLIB:
+        data = zlib.decompress(body)
+    elif kind == _OBJ_RAW:
+        data = body
+    else:
+        raise ValueError(f"Corrupted chunk object {digest}")
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"Chunk object {digest} failed verification")
+    return data
+
+
+# --- Public API -----------------------------------------------------------
+
+def _chunk_codec(codec: str, compresslevel) -> tuple:
+    """Map the configured codec to (codec recorded, zlib level or None for raw chunks)."""
+    if codec == compression_codecs.CODEC_STORE:
+        return compression_codecs.CODEC_STORE, None
+    if codec not in (compression_codecs.CODEC_DEFLATE, compression_codecs.CODEC_ADAPTIVE):
+        logging.info(f"Dedup store: '{codec}' is not available for chunks, using zlib.")
+        codec = compression_codecs.CODEC_DEFLATE
+    return codec, compresslevel if compresslevel is not None else 6
+
+
+def write_snapshot(archive_path: str, entries: list, manifest_data: dict,
+                   compresslevel=6, codec: str = compression_codecs.CODEC_DEFLATE) -> tuple:
+    """Store ``entries`` in the chunk store and write the snapshot ZIP.
+
+    Args:
+        archive_path: Destination ``Backup_*.zip`` path of the snapshot
+        entries: List of (absolute_source_path, arcname) tuples
+        manifest_data: Manifest dict, written as savestate/manifest.json
+        compresslevel: zlib level for new chunks
+        codec: Codec from ``compression_codecs.resolve_codec``; ``store`` keeps
+            chunks raw, anything but deflate/adaptive falls back to zlib
+
+    Returns:
+        Tuple (success: bool, message: str)
+    """
+    global _active_writers
+    codec, compresslevel = _chunk_codec(codec, compresslevel)
+    manifest_data = dict(manifest_data, codec=codec)
+    backup_base_dir = _backup_root_of(archive_path)
+    store_dir = get_store_dir(backup_base_dir)
+    with _lock:
+        conn = _connect(backup_base_dir)
+        _active_writers += 1
+    try:
+        return _write_snapshot(conn, archive_path, store_dir, entries, manifest_data, compresslevel)
+    finally:
+        with _lock:
+            _active_writers -= 1
+
+
+def _write_snapshot(conn, archive_path: str, store_dir: str, entries: list,
+                    manifest_data: dict, compresslevel) -> tuple:
+    files = []
+    referenced = set()
+    new_bytes = 0
+    total_bytes = 0
+
+    def _rollback(message):
+        # Give back the references taken so far; the chunks stay for reuse
+        # until a later release or garbage collection frees them.
+        with _lock:
+            conn.executemany(
+                "UPDATE chunks SET refs = refs - 1 WHERE digest = ?", ((d,) for d in referenced)
+            )
+            conn.commit()
+        logging.error(message)
+        return False, message
+
+    for source_path, arcname in entries:
+        chunks = []
+        try:
+            st = os.stat(source_path)
+            with open(source_path, "rb") as f:
+                for data in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest = hashlib.sha256(data).hexdigest()
+                    if digest not in referenced:
+                        new_bytes += _add_reference(conn, store_dir, digest, data, compresslevel)
+                        referenced.add(digest)
+                    total_bytes += len(data)
+                    chunks.append(digest)
+        except FileNotFoundError:
+            logging.warning(f"  Skipped file (not found during walk): '{source_path}'")
+            continue
+        except OSError as e:
+            return _rollback(f"ERROR storing '{source_path}' in dedup store: {e}")
+        files.append({
+            "arcname": arcname.replace(os.sep, "/"),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "chunks": chunks,
+        })
+
+    snapshot = {
+        "schema": SNAPSHOT_SCHEMA,
+        "chunk_size": CHUNK_SIZE,
+        "files": files,
+    }
+    manifest = dict(manifest_data)
+    manifest["storage"] = "dedup"
+
+    try:
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr(MANIFEST_MEMBER, json.dumps(manifest, indent=2, ensure_ascii=False))
+            zipf.writestr(SNAPSHOT_MEMBER, json.dumps(snapshot, ensure_ascii=False))
+    except (OSError, zipfile.LargeZipFile) as e:
+        return _rollback(f"ERROR writing dedup snapshot '{archive_path}': {e}")
+    with _lock:
+        conn.commit()
+
+    logging.info(
+        f"Dedup snapshot written: {len(files)} file(s), {total_bytes} bytes scanned, "
+        f"{new_bytes} new bytes stored."
+    )
+    return True, f"{len(files)} file(s), {new_bytes} new bytes stored"
+
+
+def release_snapshot(archive_path: str, snapshot: dict | None) -> int:
+    """Drop the references of a deleted snapshot and free unreferenced chunks.
+
+    ``snapshot`` is the result of ``read_snapshot`` taken BEFORE the ZIP was
+    removed (None for regular backups, which makes this a no-op). Releasing
+    only after a successful delete keeps a snapshot that failed to delete
+    fully restorable. Returns the number of chunk objects freed.
+    """
+    if snapshot is None:
+        return 0
+    backup_base_dir = _backup_root_of(archive_path)
+    store_dir = get_store_dir(backup_base_dir)
+    digests = _snapshot_digests(snapshot)
+    freed = 0
+    with _lock:
+        conn = _connect(backup_base_dir)
+        conn.executemany(
+            "UPDATE chunks SET refs = refs - 1 WHERE digest = ?", ((d,) for d in digests)
+        )
+        dead = [row[0] for row in conn.execute("SELECT digest FROM chunks WHERE refs <= 0")]
+        for digest in dead:
+            try:
+                os.remove(_object_path(store_dir, digest))
+                freed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Dedup store: unable to delete chunk {digest}: {e}")
+                continue
+            conn.execute("DELETE FROM chunks WHERE digest = ?", (digest,))
+        conn.commit()
+    if freed:
+        logging.info(f"Dedup store: freed {freed} unreferenced chunk(s).")
+    return freed
+
+
+def delete_archive(archive_path: str) -> int:
+    """Delete a backup archive and, for a snapshot, release its chunks.
+
+    Read, delete and release happen under the store lock, so a concurrent
+    ``collect_garbage`` never counts a snapshot that is half deleted. Raises
+    OSError if the archive cannot be removed (nothing is released then).
+    Returns the number of chunk objects freed.
+    """
+    with _lock:
+        snapshot = read_snapshot(archive_path)
+        os.remove(archive_path)
+        return release_snapshot(archive_path, snapshot)
+
+
+def collect_garbage(backup_base_dir: str) -> int:
+    """Rebuild reference counts from live snapshots and sweep orphan chunks.
+
+    Skipped (returns 0) while a snapshot is being written. Returns the number
+    of chunk objects deleted.
+    """
+    store_dir = get_store_dir(backup_base_dir)
+    objects_dir = os.path.join(store_dir, OBJECTS_DIRNAME)
+    if not os.path.isdir(objects_dir):
+        return 0
+    removed = 0
+    with _lock:
+        if _active_writers:
+            logging.info("Dedup store: snapshot write in progress, garbage collection postponed.")
+            return 0
+        conn = _connect(backup_base_dir)
+        _rebuild_refs(conn, backup_base_dir)
+        live = {row[0] for row in conn.execute("SELECT digest FROM chunks")}
+        for root, _dirs, names in os.walk(objects_dir):
+            for name in names:
+                if name in live:
+                    continue
+                try:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+                except OSError as e:
+                    logging.warning(f"Dedup store: unable to delete orphan '{name}': {e}")
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_gc', ?)", (str(time.time()),)
+        )
+        conn.commit()
+    logging.info(f"Dedup store garbage collection removed {removed} object(s).")
+    return removed
+
+
+def maybe_collect_garbage(backup_base_dir: str) -> int:
+    """Run ``collect_garbage`` if the last run is older than ``GC_INTERVAL_SECONDS``."""
+    if not os.path.isdir(get_store_dir(backup_base_dir)):
+        return 0
+    try:
+        with _lock:
+            conn = _connect(backup_base_dir)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'last_gc'").fetchone()
+        if row is not None and time.time() - float(row[0]) < GC_INTERVAL_SECONDS:
+            return 0
+        return collect_garbage(backup_base_dir)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logging.warning(f"Dedup store garbage collection failed: {e}")
+        return 0
+
+
+def export_snapshot_to_zip(snapshot_path: str, output_path: str,
+                           compression=zipfile.ZIP_DEFLATED, compresslevel=6) -> tuple:
+    """Write a standard, self-contained backup ZIP from a dedup snapshot.
+
+    Returns:
+        Tuple (success: bool, error_message: str or None)
+    """
+    snapshot = read_snapshot(snapshot_path)
+    if snapshot is None:
+        return False, f"ERROR: '{snapshot_path}' is not a valid dedup snapshot."
+    store_dir = get_store_dir(_backup_root_of(snapshot_path))
+    try:
+        with zipfile.ZipFile(snapshot_path, "r") as src:
+            manifest_raw = src.read(MANIFEST_MEMBER) if MANIFEST_MEMBER in src.NameToInfo else None
+        with zipfile.ZipFile(output_path, "w", compression=compression, compresslevel=compresslevel) as zipf:
+            if manifest_raw is not None:
+                manifest = json.loads(manifest_raw.decode("utf-8"))
+                manifest.pop("storage", None)
+                zipf.writestr(MANIFEST_MEMBER, json.dumps(manifest, indent=2, ensure_ascii=False))
+            for entry in snapshot.get("files", []):
+                date_time = datetime.fromtimestamp(entry.get("mtime", 0) or 0).timetuple()[:6]
+                if date_time[0] < 1980:
+                    date_time = (1980, 1, 1, 0, 0, 0)
+                zinfo = zipfile.ZipInfo(entry["arcname"], date_time=date_time)
+                zinfo.compress_type = compression
+                zinfo._compresslevel = compresslevel
+                zinfo.external_attr = 0o644 << 16
+                with zipf.open(zinfo, "w") as dest:
+                    for digest in entry.get("chunks", []):
+                        dest.write(_read_object(store_dir, digest))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile, zlib.error) as e:
+        msg = f"ERROR exporting dedup snapshot '{snapshot_path}': {e}"
+        logging.error(msg)
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        except OSError:
+            pass
+        return False, msg
+    logging.info(f"Dedup snapshot exported to standard ZIP: '{output_path}'")
+    return True, None
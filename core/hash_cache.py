@@ -0,0 +1,312 @@
+"""
+hash_cache.py
+
+Persistent cache of file digests (MD5, SHA-256 and, when the optional
+``xxhash`` package is installed, XXH64), shared by every cloud provider.
+
+Why this exists
+---------------
+The skip-if-identical checks of the providers (Google Drive, network
+folders) and the xemu copy safety checks hashed whole archives on every
+sync, and the network-folder provider even hashed the remote copy over the
+network. Backup ZIPs are never modified after they are written, so those
+digests never change: syncing an unchanged backup tree re-read all of it
+for nothing.
+
+Digests are stored in a small SQLite database in the app data folder,
+keyed by the normalized path and validated against ``(size, mtime_ns,
+inode)`` from a single ``stat``. Any change of the file
+invalidates the entry. All algorithms are computed in one read, so asking
+for the MD5 after the SHA-256 is free.
+
+``perform_backup`` writes standard archives through a ``HashingWriter``
+and registers the digests computed on the way out, so a new backup is never
+read back just to hash it. ``remember`` does the same for a provider that
+just wrote a copy (the source digests are still valid for it).
+
+Like ``backup_catalog`` every function is best-effort: without the database
+the digests are simply computed on each call.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
+CACHE_FILENAME = "hash_cache.db"
+SCHEMA_VERSION = 1
+# Entries kept; the least recently used ones are dropped beyond this.
+MAX_ENTRIES = 50000
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_ALGORITHMS = ("md5", "sha256", "xxh64")
+
+_lock = threading.RLock()
+_conn = None
+_conn_path = None
+_inserts_since_prune = 0
+
+
+def get_cache_path() -> str | None:
+    """Return the path of the cache database.
+
+    It lives in the per-machine app data folder even in portable mode: the
+    keys are absolute paths of this machine.
+    """
+    try:
+        import config
+        config_dir = config.get_app_data_folder()
+    except Exception:
+        config_dir = None
+    if not config_dir:
+        return None
+    return os.path.join(config_dir, CACHE_FILENAME)
+
+
+def _connect():
+    """Return the shared connection or None if unavailable (lock held)."""
+    global _conn, _conn_path
+    if _conn is not None or _conn_path is not None:
+        return _conn
+    path = get_cache_path()
+    _conn_path = path or ""
+    if not path:
+        return None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            # Only a cache: rebuild on any other layout
+            conn.execute("DROP TABLE IF EXISTS hashes")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL,"
+            " md5 TEXT, sha256 TEXT, xxh64 TEXT,"
+            " used_at REAL NOT NULL)"
+        )
+        conn.commit()
+        _conn = conn
+    except (sqlite3.Error, OSError) as e:
+        logging.debug(f"Hash cache unavailable at '{path}': {e}")
+        _conn = None
+    return _conn
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _identity(st) -> tuple:
+    return (st.st_size, st.st_mtime_ns, st.st_ino or 0)
+
+
+def _new_hashers() -> dict:
+    hashers = {"md5": hashlib.md5(), "sha256": hashlib.sha256()}
+    if XXHASH_AVAILABLE:
+        hashers["xxh64"] = xxhash.xxh64()
+    return hashers
+
+
+def _compute(path: str) -> dict:
+    """Read the file once and return every available digest."""
+    hashers = _new_hashers()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
+def _lookup(key: str, identity: tuple) -> dict | None:
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT size, mtime_ns, inode, md5, sha256, xxh64 FROM hashes WHERE path = ?", (key,)
+            ).fetchone()
+            if row is None or tuple(row[:3]) != identity:
+                return None
+            # Refresh the LRU stamp at most once a day per entry
+            now = time.time()
+            if conn.execute("UPDATE hashes SET used_at = ? WHERE path = ? AND used_at < ?",
+                            (now, key, now - 86400)).rowcount:
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.debug(f"Hash cache lookup failed for '{key}': {e}")
+            return None
+    return {name: value for name, value in zip(_ALGORITHMS, row[3:]) if value}
+
+
+def _store(key: str, identity: tuple, digests: dict):
+    global _inserts_since_prune
+    with _lock:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, inode, md5, sha256, xxh64, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, *identity, digests.get("md5"), digests.get("sha256"), digests.get("xxh64"), time.time()),
+            )
+            _inserts_since_prune += 1
+            if _inserts_since_prune >= 1000:
+                _inserts_since_prune = 0
+                conn.execute(
+                    "DELETE FROM hashes WHERE path NOT IN"
+                    " (SELECT path FROM hashes ORDER BY used_at DESC LIMIT ?)",
+                    (MAX_ENTRIES,),
+                )
+            conn.commit()
+        except sqlite3.Error as e:
+            logging.debug(f"Hash cache update failed for '{key}': {e}")
+
+
+def get_hashes(path: str) -> dict | None:
+    """Return ``{"md5", "sha256"[, "xxh64"]}`` for a file, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        logging.debug(f"Hash cache: cannot stat '{path}': {e}")
+        return None
+    key, identity = _key(path), _identity(st)
+    cached = _lookup(key, identity)
+    if cached and "md5" in cached and "sha256" in cached and (not XXHASH_AVAILABLE or "xxh64" in cached):
+        return cached
+    try:
+        digests = _compute(path)
+        st_after = os.stat(path)
+    except OSError as e:
+        logging.debug(f"Hash cache: unable to hash '{path}': {e}")
+        return None
+    # Only cache if the file did not change while it was being read
+    if _identity(st_after) == identity:
+        _store(key, identity, digests)
+    return digests
+
+
+def get_md5(path: str) -> str | None:
+    digests = get_hashes(path)
+    return digests.get("md5") if digests else None
+
+
+def get_sha256(path: str) -> str | None:
+    digests = get_hashes(path)
+    return digests.get("sha256") if digests else None
+
+
+def peek(path: str) -> dict | None:
+    """Cached digests of ``path`` if still valid; never reads the file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _lookup(_key(path), _identity(st))
+
+
+def remember(path: str, digests: dict) -> bool:
+    """Record known digests for ``path`` as it is now (e.g. a verified copy)."""
+    if not digests or "md5" not in digests or "sha256" not in digests:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    _store(_key(path), _identity(st), digests)
+    return True
+
+
+class HashingWriter:
+    """Write-only file that digests everything written to it.
+
+    It is deliberately not seekable: ``zipfile`` then streams each member
+    followed by a data descriptor instead of seeking back to patch its
+    header, so the bytes seen here are exactly the bytes of the file.
+    """
+
+    def __init__(self, path: str):
+        self.name = path
+        self._file = open(path, "wb")
+        self._hashers = _new_hashers()
+        self._position = 0
+        self._valid = True
+
+    def write(self, data) -> int:
+        self._file.write(data)
+        if self._valid:
+            for hasher in self._hashers.values():
+                hasher.update(data)
+        size = memoryview(data).nbytes
+        self._position += size
+        return size
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("HashingWriter is not seekable")
+
+    def truncate(self, size: int) -> int:
+        """Drop everything after ``size``; the digests are lost from then on."""
+        self._file.truncate(size)
+        self._file.seek(size)
+        self._position = size
+        self._valid = False
+        return size
+
+    def flush(self):
+        self._file.flush()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def digests(self) -> dict | None:
+        """Digests of everything written, or None after a truncate."""
+        if not self._valid:
+            return None
+        return {name: hasher.hexdigest() for name, hasher in self._hashers.items()}
+
+
+def forget_all() -> None:
+    """Close the connection; the next call opens it again."""
+    global _conn, _conn_path
+    with _lock:
+        if _conn is not None:
+            try:
+                _conn.close()
+            except sqlite3.Error:
+                pass
+        _conn = None
+        _conn_path = None
@@ -0,0 +1,438 @@
+"""
+incremental_backup.py
+
+Incremental backup chains for SaveState.
+
+When ``"incremental_backups": true`` is set in settings.json every standard
+backup also stores its file-state table in ``savestate/file_state.json``::
+
+    {"<arcname>": [size, mtime_ns, "<sha256>"], ...}
+
+The next backup of the same profile compares the current files against the
+table of the newest archive: files whose size and mtime are unchanged are not
+read at all, files whose stat changed are re-hashed, and only files whose
+content really changed are written. The resulting delta archive is still a
+``Backup_*.zip`` whose manifest carries::
+
+    "backup_type": "incremental", "parent": "<previous archive name>",
+    "chain_depth": <n>, "deleted": [<arcnames removed since the parent>]
+
+A full archive is written again every ``incremental_max_chain`` backups, when
+the source paths change, or when the newest archive cannot act as a parent.
+
+Members use the configured codec (``store``, ``deflate``, ``lzma`` or
+``adaptive``, recorded as ``"codec"`` in the manifest). ``zstd`` is not
+available for chains: rebuilding a chain copies members between archives,
+so zstd-in-container members would need a different layout. Those backups
+fall back to Deflate and record ``deflate``.
+
+Restore and rotation go through ``export_chain_to_zip``, which rebuilds the
+complete archive of any chain member: the member's own file-state table lists
+every file, and each one is taken from the newest archive of the chain that
+contains it. Before an archive is deleted, ``rebase_dependents`` turns the
+deltas that depend on it into full archives and returns the archives that
+must be kept because a rebase failed, so rotation never breaks a chain.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+from core import backup_catalog, compression_codecs
+
+FILE_STATE_MEMBER = "savestate/file_state.json"
+MANIFEST_MEMBER = "savestate/manifest.json"
+
+_CHAIN_KEYS = ("parent", "chain_depth", "deleted")
+_HASH_BLOCK = 1024 * 1024
+
+
+def _read_manifest(archive_path: str) -> dict | None:
+    """Manifest of an archive, from the backup catalog when possible."""
+    backup_base_dir = os.path.dirname(os.path.dirname(os.path.abspath(archive_path)))
+    # Only ask an existing catalog: an archive outside a backup root must not create one
+    if os.path.exists(backup_catalog.get_catalog_path(backup_base_dir)):
+        info = backup_catalog.get_archive_info(archive_path)
+        if info is not None and info.get("manifest") is not None:
+            return info["manifest"]
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            if MANIFEST_MEMBER not in zipf.NameToInfo:
+                return None
+            return json.loads(zipf.read(MANIFEST_MEMBER).decode("utf-8"))
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, ValueError):
+        return None
+
+
+def read_file_state(archive_path: str) -> dict | None:
+    """Return the file-state table stored in an archive, or None."""
+    try:
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            if FILE_STATE_MEMBER not in zipf.NameToInfo:
+                return None
+            return json.loads(zipf.read(FILE_STATE_MEMBER).decode("utf-8"))
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, ValueError) as e:
+        logging.warning(f"Unable to read file state from '{archive_path}': {e}")
+        return None
+
+
+def is_incremental_archive(archive_path: str) -> bool:
+    """True if the archive is a delta that needs its parents to be restored."""
+    manifest = _read_manifest(archive_path)
+    return bool(manifest and manifest.get("backup_type") == "incremental")
+
+
+def _list_archives(folder_path: str) -> list:
+    """Archive paths of a backup folder, newest first."""
+    backup_base_dir = os.path.dirname(os.path.abspath(folder_path))
+    cataloged = backup_catalog.list_backups(backup_base_dir, os.path.basename(folder_path))
+    if cataloged is not None:
+        return [path for _name, path, _dt in cataloged]
+    try:
+        names = [n for n in os.listdir(folder_path) if backup_catalog.is_backup_archive_name(n)]
+    except OSError:
+        return []
+    paths = [os.path.join(folder_path, n) for n in names]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    return paths
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_member(zipf: zipfile.ZipFile, source_path: str, arcname: str,
+                  compression, compresslevel, codec: str) -> str:
+    """Stream a file into the archive and return its SHA-256."""
+    zinfo = zipfile.ZipInfo.from_file(source_path, arcname)
+    if codec == compression_codecs.CODEC_ADAPTIVE and compression_codecs.is_probably_incompressible(source_path):
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = compression
+        zinfo._compresslevel = compresslevel
+    h = hashlib.sha256()
+    with open(source_path, "rb") as src, zipf.open(zinfo, "w") as dest:
+        for block in iter(lambda: src.read(_HASH_BLOCK), b""):
+            h.update(block)
+            dest.write(block)
+    return h.hexdigest()
+
+
+def find_parent(folder_path: str, paths: list, max_chain: int, exclude: str = None) -> tuple:
+    """
+    Pick the archive the next backup can be a delta of.
+
+    ``exclude`` is the archive about to be written, which can never be its
+    own parent.
+
+    Returns:
+        Tuple (parent_path, parent_manifest, parent_state), all None when the
+        next backup must be a full one.
+    """
+    archives = _list_archives(folder_path)
+    if exclude:
+        excluded = os.path.normcase(os.path.abspath(exclude))
+        archives = [p for p in archives if os.path.normcase(os.path.abspath(p)) != excluded]
+    if not archives:
+        return None, None, None
+    latest = archives[0]
+    manifest = _read_manifest(latest)
+    if not manifest or manifest.get("storage") == "dedup":
+        return None, None, None
+    if [os.path.normpath(p) for p in manifest.get("paths", [])] != [os.path.normpath(p) for p in paths]:
+        logging.info("Incremental backup: source paths changed, writing a full backup.")
+        return None, None, None
+    depth = manifest.get("chain_depth", 0) if manifest.get("backup_type") == "incremental" else 0
+    if depth >= max_chain:
+        logging.info(f"Incremental backup: chain length {depth} reached, writing a full backup.")
+        return None, None, None
+    state = read_file_state(latest)
+    if state is None:
+        return None, None, None
+    return latest, manifest, state
+
+
+def write_backup(archive_path: str, entries: list, manifest_data: dict,
+                 compression, compresslevel, max_chain: int = 10,
+                 codec: str = compression_codecs.CODEC_DEFLATE) -> tuple:
+    """
+    Write a full or incremental archive for ``entries``.
+
+    Args:
+        archive_path: Destination ``Backup_*.zip`` path
+        entries: List of (absolute_source_path, arcname) tuples
+        manifest_data: Base manifest dict (chain keys are added here)
+        compression: zipfile compression constant
+        compresslevel: Compression level or None
+        max_chain: Maximum number of consecutive deltas before a new full backup
+        codec: Codec from ``compression_codecs.resolve_codec`` (zstd falls back to Deflate)
+
+    Returns:
+        Tuple (success: bool, message: str)
+    """
+    if os.path.exists(archive_path):
+        # Could be the parent of this very backup: never overwrite an archive
+        msg = f"ERROR: backup archive '{archive_path}' already exists."
+        logging.error(msg)
+        return False, msg
+    if codec == compression_codecs.CODEC_ZSTD:
+        logging.info("Incremental backup: Zstandard is not supported in chains, using Deflate.")
+        codec = compression_codecs.CODEC_DEFLATE
+    folder_path = os.path.dirname(os.path.abspath(archive_path))
+    parent_path, parent_manifest, parent_state = find_parent(
+        folder_path, manifest_data.get("paths", []), max_chain, exclude=archive_path
+    )
+    is_delta = parent_path is not None
+    parent_state = parent_state or {}
+
+    state = {}
+    written = 0
+    manifest = dict(manifest_data)
+    manifest["codec"] = codec
+    try:
+        with zipfile.ZipFile(archive_path, "w", compression=compression, compresslevel=compresslevel) as zipf:
+            for source_path, arcname in entries:
+                arcname = arcname.replace(os.sep, "/")
+                try:
+                    st = os.stat(source_path)
+                    previous = parent_state.get(arcname)
+                    if previous and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+                        state[arcname] = previous
+                        continue
+                    if previous and previous[0] == st.st_size and _hash_file(source_path) == previous[2]:
+                        # Touched but identical: keep it out of the delta.
+                        state[arcname] = [st.st_size, st.st_mtime_ns, previous[2]]
+                        continue
+                    logging.debug(f"  Adding file: '{source_path}' as '{arcname}'")
+                    digest = _write_member(zipf, source_path, arcname, compression, compresslevel, codec)
+                    state[arcname] = [st.st_size, st.st_mtime_ns, digest]
+                    written += 1
+                except FileNotFoundError:
+                    logging.warning(f"  Skipped file (not found during walk): '{source_path}'")
+                except OSError as e:
+                    logging.error(f"  Error adding file '{source_path}' to zip: {e}")
+
+            if is_delta:
+                manifest["backup_type"] = "incremental"
+                manifest["parent"] = os.path.basename(parent_path)
+                manifest["chain_depth"] = parent_manifest.get("chain_depth", 0) + 1 \
+                    if parent_manifest.get("backup_type") == "incremental" else 1
+                manifest["deleted"] = sorted(set(parent_state) - set(state))
+            else:
+                manifest["backup_type"] = "full"
+            zipf.writestr(MANIFEST_MEMBER, json.dumps(manifest, indent=2, ensure_ascii=False))
+            zipf.writestr(FILE_STATE_MEMBER, json.dumps(state, ensure_ascii=False))
+    except (OSError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        msg = f"ERROR during ZIP archive creation '{archive_path}': {e}"
+        logging.error(msg, exc_info=True)
+        try:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+        except OSError:
+            pass
+        return False, msg
+
+    if is_delta:
+        logging.info(
+            f"Incremental backup written: {written} changed file(s) of {len(state)}, "
+            f"parent '{manifest['parent']}' (chain depth {manifest['chain_depth']})."
+        )
+    else:
+        logging.info(f"Full backup written with file state ({written} file(s)).")
+    return True, f"{written} file(s) written"
+
+
+def resolve_chain(archive_path: str) -> tuple:
+    """
+    Return the archives needed to rebuild ``archive_path``, newest first.
+
+    Returns:
+        Tuple (chain: list of paths or None, error_message or None)
+    """
+    folder_path = os.path.dirname(os.path.abspath(archive_path))
+    chain = [archive_path]
+    seen = {os.path.basename(archive_path)}
+    manifest = _read_manifest(archive_path)
+    while manifest and manifest.get("backup_type") == "incremental":
+        parent_name = manifest.get("parent")
+        parent_path = os.path.join(folder_path, parent_name or "")
+        if not parent_name or parent_name in seen or not os.path.isfile(parent_path):
+            return None, (f"ERROR: Incremental backup '{os.path.basename(archive_path)}' "
+                          f"depends on missing archive '{parent_name}'.")
+        seen.add(parent_name)
+        chain.append(parent_path)
+        manifest = _read_manifest(parent_path)
+    return chain, None
+
+
+def _copy_raw_member(src: zipfile.ZipFile, src_info: zipfile.ZipInfo, zipf: zipfile.ZipFile) -> None:
+    """Append a member of ``src`` to ``zipf`` without decompressing it (CRC and sizes are known)."""
+    zinfo = zipfile.ZipInfo(src_info.filename, date_time=src_info.date_time)
+    zinfo.external_attr = src_info.external_attr
+    zinfo.compress_type = src_info.compress_type
+    zinfo.CRC = src_info.CRC
+    zinfo.compress_size = src_info.compress_size
+    zinfo.file_size = src_info.file_size
+    # Sizes go in the local header, so no data descriptor; the LZMA EOS bit stays
+    zinfo.flag_bits = src_info.flag_bits & zipfile._MASK_COMPRESS_OPTION_1
+
+    src.fp.seek(src_info.header_offset)
+    header = src.fp.read(zipfile.sizeFileHeader)
+    fields = struct.unpack(zipfile.structFileHeader, header) if len(header) == zipfile.sizeFileHeader else None
+    if fields is None or fields[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for '{src_info.filename}'")
+    src.fp.seek(fields[zipfile._FH_FILENAME_LENGTH] + fields[zipfile._FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+
+    if zipf._seekable:
+        zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader())
+    remaining = src_info.compress_size
+    while remaining > 0:
+        block = src.fp.read(min(remaining, _HASH_BLOCK))
+        if not block:
+            raise zipfile.BadZipFile(f"Truncated data for '{src_info.filename}'")
+        zipf.fp.write(block)
+        remaining -= len(block)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+
+def export_chain_to_zip(archive_path: str, output_path: str,
+                        compression=zipfile.ZIP_DEFLATED, compresslevel=6) -> tuple:
+    """
+    Write the complete, self-contained archive of a chain member.
+
+    The result is a full backup (manifest ``backup_type`` "full" plus the file
+    state), usable both for restore and to replace the member in place. With
+    ``compression=None`` every member is copied exactly as stored in the
+    chain, compressed bytes included (used when rebasing: rotation must not
+    re-deflate every unchanged file at each auto-backup).
+
+    Returns:
+        Tuple (success: bool, error_message: str or None)
+    """
+    chain, error = resolve_chain(archive_path)
+    if chain is None:
+        logging.error(error)
+        return False, error
+    state = read_file_state(archive_path)
+    if state is None:
+        msg = f"ERROR: '{archive_path}' has no file state, cannot rebuild it."
+        logging.error(msg)
+        return False, msg
+
+    sources = []
+    try:
+        sources = [zipfile.ZipFile(p, "r") for p in chain]
+        manifest = json.loads(sources[0].read(MANIFEST_MEMBER).decode("utf-8"))
+        for key in _CHAIN_KEYS:
+            manifest.pop(key, None)
+        manifest["backup_type"] = "full"
+        with zipfile.ZipFile(output_path, "w", compression=compression or zipfile.ZIP_DEFLATED,
+                             compresslevel=compresslevel) as zipf:
+            for arcname in state:
+                src = next((z for z in sources if arcname in z.NameToInfo), None)
+                if src is None:
+                    raise KeyError(f"'{arcname}' not found in any archive of the chain")
+                src_info = src.getinfo(arcname)
+                if compression is None:
+                    _copy_raw_member(src, src_info, zipf)
+                    continue
+                zinfo = zipfile.ZipInfo(arcname, date_time=src_info.date_time)
+                zinfo.external_attr = src_info.external_attr
+                zinfo.compress_type = compression
+                with src.open(src_info) as fin, zipf.open(zinfo, "w") as fout:
+                    shutil.copyfileobj(fin, fout, _HASH_BLOCK)
+            zipf.writestr(MANIFEST_MEMBER, json.dumps(manifest, indent=2, ensure_ascii=False))
+            zipf.writestr(FILE_STATE_MEMBER, json.dumps(state, ensure_ascii=False))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        msg = f"ERROR rebuilding incremental backup '{archive_path}': {e}"
+        logging.error(msg)
+        try:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        except OSError:
+            pass
+        return False, msg
+    finally:
+        for z in sources:
+            z.close()
+    logging.info(f"Incremental chain of '{os.path.basename(archive_path)}' "
+                 f"({len(chain)} archive(s)) rebuilt into '{output_path}'")
+    return True, None
+
+
+def rebase_dependents(folder_path: str, doomed_names) -> set:
+    """
+    Turn every surviving delta whose parent is about to be deleted into a full archive.
+
+    Must be called BEFORE the archives in ``doomed_names`` are removed. The
+    rebuilt archive keeps its name and modification time, so rotation order
+    and locks are unaffected.
+
+    Returns:
+        Names from ``doomed_names`` that must NOT be deleted: a delta that
+        could not be rebased still needs them (its parent and, if doomed too,
+        the rest of its chain).
+    """
+    doomed = set(doomed_names)
+    parents = {}   # doomed archive -> its parent, to keep whole chains
+    blocked = set()
+    for path in reversed(_list_archives(folder_path)):
+        name = os.path.basename(path)
+        manifest = _read_manifest(path)
+        if not manifest or manifest.get("backup_type") != "incremental":
+            continue
+        if name in doomed:
+            parents[name] = manifest.get("parent")
+            continue
+        if manifest.get("parent") not in doomed:
+            continue
+        fd, tmp_path = tempfile.mkstemp(prefix=".rebase-", suffix=".zip", dir=folder_path)
+        os.close(fd)
+        ok, _error = export_chain_to_zip(path, tmp_path, compression=None)
+        if not ok:
+            logging.error(f"Incremental backup '{name}' could not be rebased; "
+                          f"keeping '{manifest.get('parent')}' it depends on.")
+            blocked.add(manifest.get("parent"))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            continue
+        try:
+            st = os.stat(path)
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            folder_state = backup_catalog.get_folder_state(folder_path)
+            os.replace(tmp_path, path)
+            backup_catalog.record_archive(path, folder_state=folder_state)
+            logging.info(f"Incremental backup '{name}' rebased into a full archive.")
+        except OSError as e:
+            logging.error(f"Unable to rebase incremental backup '{name}': {e}")
+            blocked.add(manifest.get("parent"))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    # A kept doomed delta still needs its own (doomed) parents
+    pending = list(blocked)
+    while pending:
+        parent = parents.get(pending.pop())
+        if parent in doomed and parent not in blocked:
+            blocked.add(parent)
+            pending.append(parent)
+    return blocked
@@ -0,0 +1,307 @@
+"""
+mirror_writer.py
+
+Background writer for the config mirror in ``<backup root>/.savestate``.
+
+Why this exists
+---------------
+Every save of a config JSON used to write its mirror copy (and, with
+``mirror_rotation_keep``, a timestamped snapshot plus a ``listdir`` of the
+mirror folder to rotate old snapshots) synchronously. The backup root is
+often a NAS or a USB drive, so each profile edit blocked on slow remote I/O,
+and the startup check re-read and re-parsed every mirrored file.
+
+``submit`` now only serializes the content and queues it; a single worker
+thread writes it after a short delay, so a burst of saves of the same file
+ends up as one write of the last version. Each write:
+
+* is skipped when the content hash matches what the mirror already holds
+  (known from a small local index, validated with one ``stat`` of the
+  mirror file, so nothing is read back from the remote drive);
+* goes through a temporary file and ``os.replace``;
+* adds a snapshot only when the content changed, rotating old snapshots from
+  an in-memory list (the mirror folder is scanned once per session).
+
+``flush`` waits for queued writes; ``flush_on_exit`` is the bounded variant
+called when the application quits (and from ``atexit``).
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+MIRROR_DIRNAME = ".savestate"
+INDEX_FILENAME = "mirror_index.json"
+INDEX_VERSION = 1
+# Delay used to coalesce bursts of writes of the same file (seconds).
+COALESCE_DELAY_SECONDS = 1.0
+# Upper bound for the exit flush, so a dead network drive cannot hang the exit.
+EXIT_FLUSH_TIMEOUT_SECONDS = 10.0
+
+_SNAPSHOT_RE = re.compile(r"^(?P<stem>.+)-\d{8}_\d{6}\.json$")
+
+
+def _index_path():
+    """Local index of mirror hashes, in the active config directory."""
+    try:
+        from core import settings_manager
+        config_dir = settings_manager.get_active_config_dir()
+    except Exception:
+        try:
+            import config
+            config_dir = config.get_app_data_folder()
+        except Exception:
+            config_dir = None
+    return os.path.join(config_dir, INDEX_FILENAME) if config_dir else None
+
+
+def _serialize(json_obj) -> bytes:
+    return json.dumps(json_obj, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class _Job:
+    __slots__ = ("data", "rotation")
+
+    def __init__(self, data: bytes, rotation: int):
+        self.data = data
+        self.rotation = rotation
+
+
+class MirrorWriter:
+    """Queue of mirror writes served by one background thread."""
+
+    def __init__(self, delay: float = COALESCE_DELAY_SECONDS):
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending = {}        # mirror path -> _Job (latest content wins)
+        self._first_queued = None  # monotonic time of the oldest pending job
+        self._busy = False
+        self._flush_requested = False
+        self._thread = None
+        self._index = None        # mirror path -> {"sha256", "size", "mtime_ns"}
+        self._index_dirty = False
+        self._snapshots = {}      # mirror dir -> {stem: [snapshot names, oldest first]}
+
+    # --- Public API ---
+
+    def submit(self, filename: str, json_obj, backup_root: str, rotation: int = 0):
+        """Queue ``json_obj`` (or its already serialized bytes) for ``<backup_root>/.savestate/<filename>``."""
+        if not backup_root:
+            return
+        data = json_obj if isinstance(json_obj, bytes) else _serialize(json_obj)
+        self.submit_bytes(filename, data, backup_root, rotation)
+
+    def submit_file(self, source_path: str, backup_root: str, rotation: int = 0) -> bool:
+        """Queue a copy of a local file; False if it cannot be read."""
+        try:
+            with open(source_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logging.debug(f"Mirror source unreadable '{source_path}': {e}")
+            return False
+        self.submit_bytes(os.path.basename(source_path), data, backup_root, rotation)
+        return True
+
+    def submit_bytes(self, filename: str, data: bytes, backup_root: str, rotation: int = 0):
+        if not backup_root:
+            return
+        mirror_path = os.path.join(backup_root, MIRROR_DIRNAME, filename)
+        with self._cond:
+            if not self._pending:
+                self._first_queued = time.monotonic()
+            self._pending[mirror_path] = _Job(data, max(0, int(rotation or 0)))
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Write everything queued now; True if the queue drained within ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if not self._pending and not self._busy:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def flush_on_exit(self):
+        if not self.flush(EXIT_FLUSH_TIMEOUT_SECONDS):
+            logging.warning("Mirror writes still pending at exit; the backup root may be unreachable.")
+
+    # --- Worker ---
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="config-mirror", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Coalesce: give further saves of the same files a moment to arrive
+                while not self._flush_requested:
+                    remaining = self._first_queued + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                jobs, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                for mirror_path, job in jobs.items():
+                    try:
+                        self._write(mirror_path, job)
+                    except Exception as e:
+                        logging.warning(f"Unable to write mirror '{mirror_path}': {e}")
+                self._save_index()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if not self._pending:
+                        self._flush_requested = False
+                    self._cond.notify_all()
+
+    def _write(self, mirror_path: str, job: _Job):
+        digest = hashlib.sha256(job.data).hexdigest()
+        index = self._load_index()
+        try:
+            st = os.stat(mirror_path)
+        except OSError:
+            st = None
+
+        if st is not None:
+            known = index.get(mirror_path)
+            if known is None and st.st_size == len(job.data):
+                # Unknown mirror of the right size: compare once by content
+                try:
+                    with open(mirror_path, "rb") as f:
+                        if hashlib.sha256(f.read()).hexdigest() == digest:
+                            self._remember(mirror_path, digest, st)
+                            return
+                except OSError:
+                    pass
+            elif (known and known.get("sha256") == digest and known.get("size") == st.st_size
+                  and known.get("mtime_ns") == st.st_mtime_ns):
+                logging.debug(f"Mirror unchanged, skipped: {mirror_path}")
+                return
+
+        mirror_dir = os.path.dirname(mirror_path)
+        os.makedirs(mirror_dir, exist_ok=True)
+        _write_atomic(mirror_path, job.data)
+        self._remember(mirror_path, digest, os.stat(mirror_path))
+        logging.info(f"Mirror saved: {mirror_path}")
+
+        if job.rotation > 0:
+            self._snapshot(mirror_dir, os.path.basename(mirror_path), job)
+
+    def _snapshot(self, mirror_dir: str, filename: str, job: _Job):
+        stem = os.path.splitext(filename)[0]
+        name = f"{stem}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            _write_atomic(os.path.join(mirror_dir, name), job.data)
+        except OSError:
+            logging.warning(f"Failed to write snapshot mirror for {filename}")
+            return
+        names = self._snapshot_names(mirror_dir, stem)
+        if name not in names:
+            names.append(name)
+            names.sort()
+        while len(names) > job.rotation:
+            old = names.pop(0)
+            try:
+                os.remove(os.path.join(mirror_dir, old))
+            except OSError:
+                pass
+
+    def _snapshot_names(self, mirror_dir: str, stem: str) -> list:
+        """Snapshots of ``stem`` (oldest first); the folder is scanned once per session."""
+        by_stem = self._snapshots.get(mirror_dir)
+        if by_stem is None:
+            by_stem = {}
+            try:
+                with os.scandir(mirror_dir) as entries:
+                    for entry in entries:
+                        match = _SNAPSHOT_RE.match(entry.name)
+                        if match:
+                            by_stem.setdefault(match.group("stem"), []).append(entry.name)
+            except OSError:
+                pass
+            for names in by_stem.values():
+                names.sort()
+            self._snapshots[mirror_dir] = by_stem
+        return by_stem.setdefault(stem, [])
+
+    # --- Hash index ---
+
+    def _remember(self, mirror_path, digest, st):
+        self._index[mirror_path] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self._index_dirty = True
+
+    def _load_index(self) -> dict:
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        path = _index_path()
+        if path and os.path.isfile(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == INDEX_VERSION and isinstance(data.get("entries"), dict):
+                    self._index = data["entries"]
+            except (OSError, ValueError) as e:
+                logging.debug(f"Mirror index unreadable, starting a new one: {e}")
+        return self._index
+
+    def _save_index(self):
+        if not self._index_dirty:
+            return
+        path = _index_path()
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, json.dumps({"version": INDEX_VERSION, "entries": self._index}).encode("utf-8"))
+            self._index_dirty = False
+        except OSError as e:
+            logging.debug(f"Unable to write mirror index '{path}': {e}")
+
+
+_writer = MirrorWriter()
+
+
+def submit(filename: str, json_obj, backup_root: str, rotation: int = 0):
+    _writer.submit(filename, json_obj, backup_root, rotation)
+
+
+def submit_file(source_path: str, backup_root: str, rotation: int = 0) -> bool:
+    return _writer.submit_file(source_path, backup_root, rotation)
+
+
+def flush(timeout: float = None) -> bool:
+    return _writer.flush(timeout)
+
+
+def flush_on_exit():
+    """Exit hook: wait (bounded) for queued mirror writes."""
+    _writer.flush_on_exit()
+
+
+atexit.register(flush_on_exit)
@@ -0,0 +1,380 @@
+"""
+save_location_cache.py
+
+Local knowledge cache of confirmed save locations.
+
+Why this exists
+---------------
+Creating a profile runs the full heuristic search of ``guess_save_path``
+(Steam userdata, Proton prefixes, AppData/XDG crawls, install dir...) even for
+games whose saves SaveState already located on this machine. Re-adding a
+library of a few hundred games then takes minutes of directory crawling.
+
+Every confirmed profile path is recorded here as a *pattern* relative to a
+known root, e.g. ``{APPDATA}/Team Cherry/Hollow Knight`` or
+``{COMPATDATA}/367520/pfx/drive_c/users/steamuser/AppData/LocalLow/Team
+Cherry/Hollow Knight``. Patterns are keyed by Steam AppID, by executable
+name qualified with its install directory (``Game.exe`` or ``start`` alone
+would match unrelated games) and by normalized game title, so they still
+apply on another Steam library or for another user account.
+
+A lookup expands the patterns against the current roots and validates each
+candidate with a single ``stat``. Only an AppID hit identifies the game for
+sure and lets the caller skip the crawl; title and executable hits are
+merged into the crawl results (``merge_with_search``).
+
+The cache is a small versioned JSON file in the active config directory. It
+is seeded from the existing profiles (``remember_profiles``; profile names
+can be renamed by the user, so they are never used as a title key) and,
+like ``backup_catalog``, every public function is best-effort: on any error
+it behaves as an empty cache.
+"""
+
+import json
+import logging
+import os
+import platform
+import re
+import threading
+import unicodedata
+
+CACHE_FILENAME = "save_location_cache.json"
+SCHEMA_VERSION = 2  # v2: executable keys carry the install directory
+
+# Patterns kept per key (most recently confirmed first).
+MAX_PATTERNS_PER_KEY = 8
+# Score given to cached locations, above anything the heuristics produce.
+CACHE_HIT_SCORE = 5000
+
+_lock = threading.RLock()
+_cache: dict | None = None
+_cache_path: str | None = None
+
+_COMPATDATA_RE = re.compile(r"^(?P<root>.*/steamapps/compatdata)/(?P<rest>\d+/pfx(?:/.*)?)$", re.IGNORECASE)
+
+
+def get_cache_path() -> str | None:
+    """Return the path of the cache file in the active config directory."""
+    try:
+        from core import settings_manager
+        config_dir = settings_manager.get_active_config_dir()
+    except Exception:
+        try:
+            import config
+            config_dir = config.get_app_data_folder()
+        except Exception:
+            config_dir = None
+    if not config_dir:
+        return None
+    return os.path.join(config_dir, CACHE_FILENAME)
+
+
+def _normalize_title(name: str) -> str:
+    text = re.sub(r"[\u2122\u00ae\u00a9]", "", str(name or ""))
+    text = unicodedata.normalize("NFKD", text).casefold()
+    return "".join(ch for ch in text if ch.isalnum())
+
+
+def _executable_key(executable: str, game_install_dir=None) -> str:
+    """``<install dir>|<exe stem>``; empty without an install directory."""
+    if not executable or not game_install_dir:
+        return ""
+    stem = os.path.splitext(os.path.basename(str(executable).replace("\\", "/")))[0]
+    if not stem:
+        return ""
+    try:
+        install_dir = _as_posix(os.path.abspath(game_install_dir))
+    except (TypeError, ValueError):
+        return ""
+    return f"{install_dir.casefold()}|{stem.casefold()}"
+
+
+def _cache_keys(game_name=None, appid=None, executable=None, game_install_dir=None) -> list:
+    """Keys for a game, in lookup priority order."""
+    keys = []
+    if appid is not None and str(appid).strip().isdigit():
+        keys.append(f"appid:{str(appid).strip()}")
+    exe_key = _executable_key(executable, game_install_dir)
+    if exe_key:
+        keys.append(f"exe:{exe_key}")
+    title_key = _normalize_title(game_name)
+    if title_key:
+        keys.append(f"title:{title_key}")
+    return keys
+
+
+def _as_posix(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
+
+
+def _steam_base_candidates() -> list:
+    home = os.path.expanduser("~")
+    xdg_data_home = os.getenv("XDG_DATA_HOME") or os.path.join(home, ".local", "share")
+    if platform.system() == "Windows":
+        program_files_x86 = os.getenv("ProgramFiles(x86)") or "C:\\Program Files (x86)"
+        return [os.path.join(program_files_x86, "Steam")]
+    return [
+        os.path.join(home, ".steam", "steam"),
+        os.path.join(home, ".local", "share", "Steam"),
+        os.path.join(xdg_data_home, "Steam"),
+        os.path.join(home, ".steam", "root"),
+        os.path.join(home, ".var", "app", "com.valvesoftware.Steam", ".local", "share", "Steam"),
+        os.path.join(home, ".var", "app", "com.valvesoftware.Steam", "data", "Steam"),
+        os.path.join(home, "snap", "steam", "common", ".local", "share", "Steam"),
+    ]
+
+
+def _known_roots(game_install_dir=None) -> list:
+    """``(token, path)`` pairs for the current user; most specific roots win."""
+    home = os.path.expanduser("~")
+    roots = []
+    if game_install_dir:
+        roots.append(("INSTALL_DIR", game_install_dir))
+    if platform.system() == "Windows":
+        appdata = os.getenv("APPDATA")
+        localappdata = os.getenv("LOCALAPPDATA")
+        roots += [
+            ("APPDATA", appdata),
+            ("LOCALAPPDATA", localappdata),
+            ("LOCALLOW", os.path.join(localappdata, "..", "LocalLow") if localappdata else None),
+            ("SAVED_GAMES", os.path.join(home, "Saved Games")),
+            ("DOCUMENTS", os.path.join(home, "Documents")),
+            ("PUBLIC", os.getenv("PUBLIC")),
+            ("PROGRAMDATA", os.getenv("ProgramData")),
+        ]
+    else:
+        roots += [
+            ("XDG_DATA_HOME", os.getenv("XDG_DATA_HOME") or os.path.join(home, ".local", "share")),
+            ("XDG_CONFIG_HOME", os.getenv("XDG_CONFIG_HOME") or os.path.join(home, ".config")),
+        ]
+    roots.append(("HOME", home))
+    return [(token, _as_posix(path)) for token, path in roots if path]
+
+
+def _root_candidates(token: str, game_install_dir=None) -> list:
+    if token == "COMPATDATA":
+        return [
+            _as_posix(os.path.join(base, "steamapps", "compatdata"))
+            for base in _steam_base_candidates()
+        ]
+    return [path for name, path in _known_roots(game_install_dir) if name == token]
+
+
+def to_pattern(path: str, game_install_dir=None) -> str | None:
+    """Express ``path`` relative to the most specific known root, or None."""
+    try:
+        posix = _as_posix(os.path.abspath(path))
+    except (TypeError, ValueError):
+        return None
+    match = _COMPATDATA_RE.match(posix)
+    if match:
+        return "{COMPATDATA}/" + match.group("rest")
+    best = None
+    compare = posix.casefold() if platform.system() == "Windows" else posix
+    for token, root in _known_roots(game_install_dir):
+        root_cmp = root.casefold() if platform.system() == "Windows" else root
+        if compare == root_cmp or compare.startswith(root_cmp.rstrip("/") + "/"):
+            if best is None or len(root) > len(best[1]):
+                best = (token, root)
+    if best is None:
+        return None
+    token, root = best
+    relative = posix[len(root.rstrip("/")):].lstrip("/")
+    return "{" + token + "}" + ("/" + relative if relative else "")
+
+
+def expand_pattern(pattern: str, game_install_dir=None) -> list:
+    """Candidate absolute paths for a stored pattern on this machine."""
+    match = re.match(r"^\{(?P<token>[A-Z_]+)\}(?P<rest>/.*)?$", pattern or "")
+    if not match:
+        return []
+    rest = (match.group("rest") or "").lstrip("/")
+    candidates = []
+    for root in _root_candidates(match.group("token"), game_install_dir):
+        candidates.append(os.path.normpath(os.path.join(root, rest) if rest else root))
+    return candidates
+
+
+def _empty_cache() -> dict:
+    return {"version": SCHEMA_VERSION, "entries": {}}
+
+
+def _load() -> dict:
+    """Return the in-memory cache, reading the file on first use (lock held)."""
+    global _cache, _cache_path
+    path = get_cache_path()
+    if _cache is not None and path == _cache_path:
+        return _cache
+    _cache_path = path
+    _cache = _empty_cache()
+    if path and os.path.isfile(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                isinstance(data, dict)
+                and data.get("version") == SCHEMA_VERSION
+                and isinstance(data.get("entries"), dict)
+            ):
+                _cache = data
+            else:
+                logging.info("Save location cache has an unknown layout; starting a new one.")
+        except (OSError, ValueError) as e:
+            logging.warning(f"Save location cache unreadable at '{path}': {e}")
+    return _cache
+
+
+def _store(cache: dict) -> None:
+    if not _cache_path:
+        return
+    tmp_path = _cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(_cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, _cache_path)
+    except OSError as e:
+        logging.warning(f"Unable to write save location cache '{_cache_path}': {e}")
+
+
+def _record(entries: dict, keys: list, patterns: list) -> bool:
+    changed = False
+    for key in keys:
+        current = list(entries.get(key, []))
+        updated = list(dict.fromkeys(patterns + current))[:MAX_PATTERNS_PER_KEY]
+        if updated != current:
+            entries[key] = updated
+            changed = True
+    return changed
+
+
+def lookup(game_name: str, appid=None, executable=None, game_install_dir=None,
+           appid_only: bool = False) -> list:
+    """Return ``[(path, score, has_saves_hint)]`` for cached locations that exist.
+
+    AppID matches come first, then executable, then title. With
+    ``appid_only`` only the AppID entry is consulted. Empty when the game is
+    unknown or none of its remembered locations exists any more.
+    """
+    keys = _cache_keys(game_name, appid, executable, game_install_dir)
+    if appid_only:
+        keys = [key for key in keys if key.startswith("appid:")]
+    if not keys:
+        return []
+    try:
+        with _lock:
+            entries = _load().get("entries", {})
+            patterns = [pattern for key in keys for pattern in entries.get(key, [])]
+    except Exception as e:
+        logging.debug(f"Save location cache lookup failed: {e}")
+        return []
+
+    results = []
+    seen = set()
+    for pattern in dict.fromkeys(patterns):
+        for candidate in expand_pattern(pattern, game_install_dir):
+            key = os.path.normcase(candidate)
+            if key in seen:
+                continue
+            seen.add(key)
+            if os.path.exists(candidate):
+                results.append((candidate, CACHE_HIT_SCORE - len(results), True))
+                break
+    if results:
+        logging.info(f"Save location cache: {len(results)} known location(s) for '{game_name}'")
+    return results
+
+
+def merge_with_search(cached: list, searched: list) -> list:
+    """Combine cache hits that do not identify the game with crawl results.
+
+    A cached location the crawl found as well keeps its cache score and
+    ranks first; the others follow the crawl results, so a title or
+    executable shared with another game never hides what the search found.
+    """
+    if not cached:
+        return list(searched or [])
+    cached_keys = {os.path.normcase(os.path.normpath(entry[0])): entry for entry in cached}
+    confirmed = []
+    rest = []
+    for entry in searched or []:
+        hit = cached_keys.pop(os.path.normcase(os.path.normpath(entry[0])), None)
+        if hit is not None:
+            confirmed.append((entry[0], hit[1], True))
+        else:
+            rest.append(entry)
+    lowest = min((entry[1] for entry in rest), default=CACHE_HIT_SCORE - len(cached))
+    unconfirmed = [
+        (path, lowest - index - 1, has_saves)
+        for index, (path, _score, has_saves) in enumerate(cached_keys.values())
+    ]
+    return confirmed + rest + unconfirmed
+
+
+def remember(game_name: str, paths: list, appid=None, executable=None, game_install_dir=None) -> bool:
+    """Record confirmed save ``paths`` for a game. Returns True if the cache changed."""
+    keys = _cache_keys(game_name, appid, executable, game_install_dir)
+    patterns = [
+        pattern for pattern in (to_pattern(p, game_install_dir) for p in paths or [] if p)
+        if pattern
+    ]
+    if not keys or not patterns:
+        return False
+    try:
+        with _lock:
+            cache = _load()
+            changed = _record(cache.setdefault("entries", {}), keys, list(dict.fromkeys(patterns)))
+            if changed:
+                _store(cache)
+            return changed
+    except Exception as e:
+        logging.debug(f"Save location cache update failed: {e}")
+        return False
+
+
+def remember_profiles(profiles: dict) -> int:
+    """Seed the cache from profile dictionaries; returns how many profiles added knowledge."""
+    if not isinstance(profiles, dict):
+        return 0
+    updated = 0
+    try:
+        with _lock:
+            cache = _load()
+            entries = cache.setdefault("entries", {})
+            for data in profiles.values():
+                if isinstance(data, str):
+                    data = {"path": data}
+                if not isinstance(data, dict) or data.get("type") == "group":
+                    continue
+                paths = data.get("paths") if isinstance(data.get("paths"), list) else [data.get("path")]
+                install_dir = data.get("game_install_dir")
+                patterns = [
+                    pattern for pattern in (
+                        to_pattern(p, install_dir) for p in paths if isinstance(p, str) and p
+                    ) if pattern
+                ]
+                # Profile names are user-editable: only a recorded game name is a title key
+                keys = _cache_keys(
+                    data.get("game_name"),
+                    data.get("steam_appid") or data.get("appid"),
+                    data.get("game_executable"),
+                    install_dir,
+                )
+                if keys and patterns and _record(entries, keys, list(dict.fromkeys(patterns))):
+                    updated += 1
+            if updated:
+                _store(cache)
+    except Exception as e:
+        logging.debug(f"Save location cache seeding failed: {e}")
+        return 0
+    if updated:
+        logging.info(f"Save location cache: learned locations from {updated} profile(s)")
+    return updated
+
+
+def forget_all() -> None:
+    """Drop the in-memory copy (e.g. after the config directory changes)."""
+    global _cache, _cache_path
+    with _lock:
+        _cache = None
+        _cache_path = None
@@ -324,6 +324,27 @@ def load_settings():
         "max_source_size_mb": 200, # Default limit 500 MB for the source
         "theme": "dark", # Possible values: 'dark', 'light'
         "compression_mode": "standard",
+        # Backup storage: 'zip' (one self-contained archive per backup) or
+        # 'dedup' (snapshots in a shared content-addressed chunk store).
+        "storage_engine": "zip",
+        # Incremental backups: write only changed files, chained to the
+        # previous archive; a full archive is forced every N deltas.
+        "incremental_backups": False,
+        "incremental_max_chain": 10,
+        # Threads used to deflate standard backups: 0 = one per CPU core,
+        # 1 = previous single-threaded zipfile path.
+        "compression_workers": 0,
+        # Restore: 'clean' wipes the destination first; 'differential' (opt-in)
+        # rewrites only changed files and then deletes the ones missing from
+        # the archive.
+        "restore_mode": "clean",
+        # Profiles backed up concurrently by groups / Backup All: 0 = automatic.
+        "batch_backup_workers": 0,
+        # Auto-backup change detection: 'auto' uses filesystem events where
+        # available (inotify on Linux), 'polling' always scans the save folders.
+        "auto_backup_watcher": "auto",
+        # Automatic backups run concurrently: 0 = automatic (up to 2).
+        "auto_backup_workers": 0,
         "check_free_space_enabled": True,
         "enable_global_drag_effect": False, # ADDED: For the pynput global mouse drag detection overlay
         # UI: shorten long save paths in selection dialogs
@@ -390,11 +411,45 @@ def load_settings():
             settings["theme"] = defaults["theme"]
 
         # --- VALIDATION COMPRESSION MODE ---
-        valid_modes = ["standard", "maximum", "stored"]
+        valid_modes = ["standard", "maximum", "stored", "adaptive", "lzma", "zstd"]
         if settings.get("compression_mode") not in valid_modes:
             logging.warning(f"Invalid compression_mode value ('{settings.get('compression_mode')}'), using default '{defaults['compression_mode']}'.")
             settings["compression_mode"] = defaults["compression_mode"]
 
+        # --- VALIDATION STORAGE ENGINE ---
+        if settings.get("storage_engine") not in ["zip", "dedup"]:
+            logging.warning(f"Invalid storage_engine value ('{settings.get('storage_engine')}'), using default '{defaults['storage_engine']}'.")
+            settings["storage_engine"] = defaults["storage_engine"]
+
+        # --- VALIDATION INCREMENTAL BACKUPS ---
+        if not isinstance(settings.get("incremental_backups"), bool):
+            logging.warning(f"Invalid value for incremental_backups ('{settings.get('incremental_backups')}'), using default {defaults['incremental_backups']}.")
+            settings["incremental_backups"] = defaults["incremental_backups"]
+        max_chain = settings.get("incremental_max_chain")
+        if not isinstance(max_chain, int) or isinstance(max_chain, bool) or max_chain < 1:
+            logging.warning(f"Invalid incremental_max_chain value ('{max_chain}'), using default {defaults['incremental_max_chain']}.")
+            settings["incremental_max_chain"] = defaults["incremental_max_chain"]
+        workers = settings.get("compression_workers")
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers < 0:
+            logging.warning(f"Invalid compression_workers value ('{workers}'), using default {defaults['compression_workers']}.")
+            settings["compression_workers"] = defaults["compression_workers"]
+
+        # --- VALIDATION RESTORE MODE ---
+        if settings.get("restore_mode") not in ["differential", "clean"]:
+            logging.warning(f"Invalid restore_mode value ('{settings.get('restore_mode')}'), using default '{defaults['restore_mode']}'.")
+            settings["restore_mode"] = defaults["restore_mode"]
+        batch_workers = settings.get("batch_backup_workers")
+        if not isinstance(batch_workers, int) or isinstance(batch_workers, bool) or batch_workers < 0:
+            logging.warning(f"Invalid batch_backup_workers value ('{batch_workers}'), using default {defaults['batch_backup_workers']}.")
+            settings["batch_backup_workers"] = defaults["batch_backup_workers"]
+        if settings.get("auto_backup_watcher") not in ["auto", "polling"]:
+            logging.warning(f"Invalid auto_backup_watcher value ('{settings.get('auto_backup_watcher')}'), using default '{defaults['auto_backup_watcher']}'.")
+            settings["auto_backup_watcher"] = defaults["auto_backup_watcher"]
+        auto_workers = settings.get("auto_backup_workers")
+        if not isinstance(auto_workers, int) or isinstance(auto_workers, bool) or auto_workers < 0:
+            logging.warning(f"Invalid auto_backup_workers value ('{auto_workers}'), using default {defaults['auto_backup_workers']}.")
+            settings["auto_backup_workers"] = defaults["auto_backup_workers"]
+
         # Simple validation (optional but recommended)
         if not isinstance(settings["max_backups"], int) or settings["max_backups"] < 1:
             logging.warning(f"Invalid max_backups value ('{settings['max_backups']}'), using default {defaults['max_backups']}.")
@@ -480,6 +535,12 @@ def save_settings(settings_dict):
         # If enabling portable mode, migrate other JSONs from AppData to the portable directory
         if portable_flag and backup_root:
             try:
+                # Pending state store exports must reach the JSON files before they are copied
+                try:
+                    from core import state_store
+                    state_store.flush_all()
+                except Exception:
+                    pass
                 appdata_dir = config.get_app_data_folder()
                 # If we are switching portable→portable (backup dir changed), migrate data
                 try:
@@ -583,11 +644,8 @@ def save_settings(settings_dict):
             try:
                 backup_root_effective = backup_root
                 if backup_root_effective:
-                    mirror_dir = os.path.join(backup_root_effective, ".savestate")
-                    os.makedirs(mirror_dir, exist_ok=True)
-                    mirror_path = os.path.join(mirror_dir, "settings.json")
-                    with open(mirror_path, 'w', encoding='utf-8') as mf:
-                        json.dump(settings_dict, mf, indent=4)
+                    from core import mirror_writer
+                    mirror_writer.submit_file(target_settings_path, backup_root_effective)
             except Exception:
                 logging.warning("Unable to mirror settings.json to backup root")
 
@@ -600,6 +658,11 @@ def save_settings(settings_dict):
             # Additionally, when LEAVING portable mode, copy other JSONs from the portable
             # directory into AppData so runtime reload has complete data (profiles/favorites).
             try:
+                try:
+                    from core import state_store
+                    state_store.flush_all()
+                except Exception:
+                    pass
                 portable_source_dir = None
                 if backup_root:
                     candidate = os.path.join(backup_root, ".savestate")
@@ -699,12 +762,6 @@ def sync_secondary_config_mirror(current_settings: dict | None = None) -> None:
                 backup_root = getattr(config, "BACKUP_BASE_DIR", None)
         if not (primary_dir and backup_root):
             return
-        secondary_dir = os.path.join(backup_root, ".savestate")
-        try:
-            os.makedirs(secondary_dir, exist_ok=True)
-        except Exception:
-            pass
-
         filenames = [
             "settings.json",
             "game_save_profiles.json",
@@ -713,18 +770,12 @@ def sync_secondary_config_mirror(current_settings: dict | None = None) -> None:
             "locked_backups.json",
         ]
 
+        # Queued to the background mirror writer: unchanged files are skipped
+        # by hash without reading the mirror copies back.
+        from core import mirror_writer
         for name in filenames:
             src = os.path.join(primary_dir, name)
-            dst = os.path.join(secondary_dir, name)
-            try:
-                if not os.path.isfile(src):
-                    continue
-                needs_copy = not os.path.isfile(dst) or not _json_like_equal(src, dst)
-                if needs_copy:
-                    import shutil
-                    shutil.copy2(src, dst)
-                    logging.info(f"Synchronized mirror file to backup: {name}")
-            except Exception as e_sync:
-                logging.warning(f"Unable to synchronize mirror for '{name}': {e_sync}")
+            if os.path.isfile(src):
+                mirror_writer.submit_file(src, backup_root)
     except Exception as e_out:
         logging.debug(f"Startup mirror sync skipped/failed: {e_out}")
\ No newline at end of file
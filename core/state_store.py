@@ -0,0 +1,505 @@
+"""
+state_store.py
+
+Embedded store for profiles, favorites, notes and backup locks.
+
+Why this exists
+---------------
+Each of these used to live only in its own JSON file, fully rewritten with
+``json.dump(indent=4)`` (plus a mirror copy and optional snapshots in the
+backup root) on every change. Toggling one favorite rewrote the favorites
+file, re-parsed the whole profile file to prune stale entries and wrote the
+mirror. With large libraries every click cost megabytes of JSON I/O on the
+GUI thread.
+
+Now every file is a *namespace* of a small SQLite database (WAL mode) in the
+same config directory, one row per key:
+
+* point updates (``set`` / ``delete``) write a single row in a transaction;
+  ``replace`` writes only the rows that differ from what is stored;
+* reads come from an in-process cache, loaded once per namespace;
+* the JSON files are still written, as exports, by a background timer that
+  coalesces bursts of changes (``EXPORT_DELAY_SECONDS``), together with the
+  ``.savestate`` mirror. ``flush`` forces pending exports (also at exit);
+* listeners registered with ``subscribe`` are told which keys changed.
+
+The JSON files remain the interchange format: a namespace imports its file
+on first run, and again whenever the file on disk no longer matches the last
+import/export (restore from mirror, portable migration, manual edit). The
+file wins over the database in that case, except for the keys changed since
+the last export, which are applied again on top of it.
+
+If the database cannot be opened the store keeps working from memory and
+writes the JSON files immediately, i.e. exactly the old behaviour.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Iterable
+
+DB_FILENAME = "savestate_state.db"
+SCHEMA_VERSION = 1
+# Delay used to coalesce JSON exports (seconds).
+EXPORT_DELAY_SECONDS = 2.0
+
+_stores = {}  # normalized config dir -> StateStore
+_stores_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> str:
+    """Cheap identity of a file on disk; "" when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _encode(value) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _mirror_enabled() -> bool:
+    try:
+        from core import settings_manager
+        return not settings_manager.is_portable_mode()
+    except Exception:
+        return True
+
+
+class _NamespaceSpec:
+    def __init__(self, name, json_path, from_json=None, to_json=None,
+                 sort_keys=False, mirror=True):
+        self.name = name
+        self.json_path = json_path
+        self.from_json = from_json
+        self.to_json = to_json
+        self.sort_keys = sort_keys
+        self.mirror = mirror
+
+
+class StateStore:
+    """SQLite-backed key/value namespaces of one config directory."""
+
+    def __init__(self, config_dir: str):
+        self.config_dir = config_dir
+        self.db_path = os.path.join(config_dir, DB_FILENAME)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_failed = False
+        self._specs = {}        # namespace -> _NamespaceSpec
+        self._values = {}       # namespace -> {key: value}
+        self._encoded = {}      # namespace -> {key: json text}, used to diff
+        self._pending = set()   # namespaces whose JSON export is due
+        self._dirty = {}        # namespace -> {key: json text or None if deleted} not exported yet
+        self._timer = None
+        self._listeners = []
+
+    # --- Setup ---
+
+    def register(self, name: str, json_path: str, from_json: Callable = None,
+                 to_json: Callable = None, sort_keys: bool = False, mirror: bool = True) -> "Namespace":
+        """Declare (or update) a namespace backed by ``json_path``.
+
+        ``from_json`` turns the parsed file into ``{key: value}``; ``to_json``
+        builds the object written to the file from that mapping.
+        """
+        with self._lock:
+            self._specs[name] = _NamespaceSpec(name, json_path, from_json, to_json, sort_keys, mirror)
+        return Namespace(self, name)
+
+    def _connection(self):
+        """Open the database on first use; None if it is unavailable (lock held)."""
+        if self._conn is not None or self._conn_failed:
+            return self._conn
+        try:
+            os.makedirs(self.config_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS entries (
+                    ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+                    UNIQUE (ns, key)
+                );
+                CREATE TABLE IF NOT EXISTS json_sources (ns TEXT PRIMARY KEY, signature TEXT NOT NULL);
+                """
+            )
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None:
+                conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+            elif row[0] != str(SCHEMA_VERSION):
+                logging.warning(f"State store '{self.db_path}' has schema {row[0]}; rebuilding it from the JSON files.")
+                conn.executescript("DELETE FROM entries; DELETE FROM json_sources;")
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),))
+            conn.commit()
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"State store unavailable at '{self.db_path}', using the JSON files only: {e}")
+            self._conn_failed = True
+        return self._conn
+
+    # --- Loading / JSON import ---
+
+    def _recorded_signature(self, name):
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT signature FROM json_sources WHERE ns = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def _record_signature(self, name, signature):
+        conn = self._connection()
+        if conn is not None:
+            conn.execute(
+                "INSERT INTO json_sources (ns, signature) VALUES (?, ?) "
+                "ON CONFLICT(ns) DO UPDATE SET signature = excluded.signature",
+                (name, signature),
+            )
+
+    def _read_json(self, spec):
+        """Parse the namespace file; None if missing or unreadable."""
+        if not os.path.isfile(spec.json_path):
+            return None
+        try:
+            with open(spec.json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"'{spec.json_path}' is corrupted or unreadable: {e}")
+            return None
+        try:
+            mapping = spec.from_json(data) if spec.from_json else data
+        except Exception as e:
+            logging.warning(f"Unexpected content in '{spec.json_path}': {e}")
+            return None
+        return mapping if isinstance(mapping, dict) else None
+
+    def _ensure_loaded(self, name, check_json=False):
+        """Fill the cache of ``name``, importing its JSON when needed (lock held)."""
+        spec = self._specs[name]
+        loaded = name in self._values
+        if loaded and not check_json:
+            return
+        signature = _file_signature(spec.json_path)
+        recorded = self._recorded_signature(name)
+        if loaded and signature == recorded:
+            return
+
+        if recorded is not None and signature == recorded:
+            # Database is current: read the rows
+            values, encoded = {}, {}
+            for key, text in self._conn.execute(
+                    "SELECT key, value FROM entries WHERE ns = ? ORDER BY rowid", (name,)):
+                try:
+                    values[key] = json.loads(text)
+                    encoded[key] = text
+                except ValueError:
+                    logging.warning(f"Dropping unreadable state entry {name}/{key}")
+            self._values[name], self._encoded[name] = values, encoded
+            return
+
+        mapping = self._read_json(spec) if signature else None
+        if mapping is None:
+            if recorded or loaded:
+                # File deleted or corrupted after we wrote it: keep our data and write it again
+                if not loaded:
+                    self._values[name], self._encoded[name] = {}, {}
+                    self._ensure_rows_loaded(name)
+                self._schedule_export(name)
+                return
+            mapping = {}
+        if recorded is None:
+            logging.info(f"State store: importing {len(mapping)} '{name}' entries from '{spec.json_path}'.")
+        else:
+            logging.info(f"State store: '{spec.json_path}' changed on disk, reloading '{name}'.")
+        self._values.setdefault(name, {})
+        self._encoded.setdefault(name, {})
+        self._write(name, mapping, replace=True)
+        # Changes made after the last export are newer than the file: keep them
+        dirty = self._dirty.pop(name, None) if recorded is not None else None
+        if dirty:
+            self._write(
+                name,
+                {key: json.loads(text) for key, text in dirty.items() if text is not None},
+                [key for key, text in dirty.items() if text is None],
+            )
+        self._record_signature(name, signature)
+        if self._conn is not None:
+            self._conn.commit()
+        if dirty:
+            self._dirty[name] = dirty
+            self._schedule_export(name)
+        else:
+            self._pending.discard(name)
+
+    def _ensure_rows_loaded(self, name):
+        if self._conn is None:
+            return
+        for key, text in self._conn.execute(
+                "SELECT key, value FROM entries WHERE ns = ? ORDER BY rowid", (name,)):
+            try:
+                self._values[name][key] = json.loads(text)
+                self._encoded[name][key] = text
+            except ValueError:
+                pass
+
+    # --- Writes ---
+
+    def _write(self, name, upserts: dict, deletes: Iterable = (), replace=False):
+        """Apply changes to cache and database; returns the changed keys (lock held, no commit)."""
+        values, encoded = self._values[name], self._encoded[name]
+        if replace:
+            deletes = [key for key in values if key not in upserts]
+        changed = []
+        rows = []
+        for key, value in upserts.items():
+            key = str(key)
+            text = _encode(value)
+            if encoded.get(key) != text:
+                rows.append((name, key, text))
+                values[key], encoded[key] = json.loads(text), text
+                changed.append(key)
+        removed = [str(key) for key in deletes if str(key) in values]
+        for key in removed:
+            del values[key]
+            del encoded[key]
+        changed.extend(removed)
+        conn = self._conn
+        if conn is not None and changed:
+            if rows:
+                conn.executemany(
+                    "INSERT INTO entries (ns, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(ns, key) DO UPDATE SET value = excluded.value",
+                    rows,
+                )
+            if removed:
+                conn.executemany("DELETE FROM entries WHERE ns = ? AND key = ?", [(name, key) for key in removed])
+        return changed
+
+    def apply(self, name: str, upserts: dict = None, deletes: Iterable = (), replace: bool = False) -> bool:
+        """Set/delete keys of a namespace in one transaction.
+
+        Returns True if anything changed; database errors are raised.
+        """
+        with self._lock:
+            self._connection()
+            self._ensure_loaded(name)
+            try:
+                changed = self._write(name, dict(upserts or {}), list(deletes), replace=replace)
+                if self._conn is not None:
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logging.error(f"State store write failed for '{name}': {e}")
+                try:
+                    self._conn.rollback()
+                except sqlite3.Error:
+                    pass
+                # Cache may be ahead of the database now: reload it from there
+                self._values.pop(name, None)
+                self._encoded.pop(name, None)
+                raise
+            if not changed:
+                return False
+            dirty = self._dirty.setdefault(name, {})
+            for key in changed:
+                dirty[key] = self._encoded[name].get(key)
+            self._schedule_export(name)
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(name, changed)
+            except Exception as e:
+                logging.debug(f"State store listener failed: {e}")
+        return True
+
+    # --- Reads ---
+
+    def snapshot(self, name: str, check_json: bool = False) -> dict:
+        with self._lock:
+            self._connection()
+            self._ensure_loaded(name, check_json=check_json)
+            return {key: json.loads(text) for key, text in self._encoded[name].items()}
+
+    def get(self, name: str, key: str, default=None):
+        with self._lock:
+            self._connection()
+            self._ensure_loaded(name)
+            if key not in self._encoded[name]:
+                return default
+            return json.loads(self._encoded[name][key])
+
+    def keys(self, name: str) -> list:
+        with self._lock:
+            self._connection()
+            self._ensure_loaded(name)
+            return list(self._values[name])
+
+    # --- Notifications ---
+
+    def subscribe(self, callback: Callable[[str, list], None]):
+        """``callback(namespace, changed_keys)``, called from the writing thread."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # --- JSON export ---
+
+    def _schedule_export(self, name):
+        self._pending.add(name)
+        if self._conn is None:
+            # No database: the JSON file is the only durable copy
+            self._export_pending()
+            return
+        if self._timer is None:
+            self._timer = threading.Timer(EXPORT_DELAY_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write every pending JSON export now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._export_pending()
+
+    def _export_pending(self):
+        mirrors = []
+        with self._lock:
+            for name in sorted(self._pending):
+                spec = self._specs[name]
+                recorded = self._recorded_signature(name)
+                current = _file_signature(spec.json_path)
+                if recorded and current and current != recorded:
+                    # Someone replaced the file since our last export: it wins,
+                    # then the changes made since that export are applied again
+                    self._ensure_loaded(name, check_json=True)
+                    if not self._dirty.get(name):
+                        continue
+                mapping = {key: json.loads(text) for key, text in self._encoded[name].items()}
+                obj = spec.to_json(mapping) if spec.to_json else mapping
+                data = json.dumps(obj, indent=4, ensure_ascii=False, sort_keys=spec.sort_keys).encode("utf-8")
+                tmp_path = spec.json_path + ".tmp"
+                try:
+                    os.makedirs(os.path.dirname(spec.json_path) or ".", exist_ok=True)
+                    with open(tmp_path, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_path, spec.json_path)
+                except OSError as e:
+                    logging.error(f"Error writing '{spec.json_path}': {e}")
+                    continue
+                self._record_signature(name, _file_signature(spec.json_path))
+                if self._conn is not None:
+                    self._conn.commit()
+                self._dirty.pop(name, None)
+                logging.info(f"Saved {len(mapping)} '{name}' entries to '{spec.json_path}'.")
+                if spec.mirror:
+                    mirrors.append((os.path.basename(spec.json_path), data))
+            self._pending.clear()
+        # Mirror copies may be on a slow drive: outside the lock
+        if mirrors and _mirror_enabled():
+            try:
+                from core import core_logic
+            except Exception as e:
+                logging.warning(f"Unable to mirror state files to backup root: {e}")
+                return
+            for filename, data in mirrors:
+                # Same bytes as the primary file, so the mirror writer can skip it by hash
+                core_logic.mirror_config_json(filename, data)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None
+
+
+class Namespace:
+    """Handle on one namespace of a StateStore."""
+
+    def __init__(self, store: StateStore, name: str):
+        self.store = store
+        self.name = name
+
+    def load(self, check_json: bool = False) -> dict:
+        """Copy of the whole namespace; ``check_json`` re-imports a file changed on disk."""
+        return self.store.snapshot(self.name, check_json=check_json)
+
+    def get(self, key, default=None):
+        return self.store.get(self.name, key, default)
+
+    def keys(self) -> list:
+        return self.store.keys(self.name)
+
+    def set(self, key, value) -> bool:
+        return self.store.apply(self.name, {key: value})
+
+    def delete(self, *keys) -> bool:
+        return self.store.apply(self.name, deletes=keys)
+
+    def replace(self, mapping: dict) -> bool:
+        """Make the namespace equal to ``mapping``; only differing rows are written."""
+        return self.store.apply(self.name, mapping, replace=True)
+
+
+def get_store(config_dir: str) -> StateStore:
+    """Return the (shared) store of a config directory."""
+    key = os.path.normcase(os.path.abspath(config_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = StateStore(config_dir)
+            _stores[key] = store
+        return store
+
+
+def namespace(name: str, json_path: str, **options) -> Namespace:
+    """Namespace ``name`` backed by ``json_path``, in the store of the file's directory."""
+    config_dir = os.path.dirname(os.path.abspath(json_path))
+    return get_store(config_dir).register(name, json_path, **options)
+
+
+def flush_all():
+    """Write the pending JSON exports of every store (before copying config files, at exit)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.flush()
+        except Exception as e:
+            logging.warning(f"State store flush failed for '{store.config_dir}': {e}")
+
+
+def close_all():
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        try:
+            store.close()
+        except Exception as e:
+            logging.debug(f"State store close failed: {e}")
+    # The last exports queued mirror copies: wait for them too
+    try:
+        from core import mirror_writer
+        mirror_writer.flush_on_exit()
+    except Exception as e:
+        logging.debug(f"Mirror flush at exit failed: {e}")
+
+
+atexit.register(close_all)
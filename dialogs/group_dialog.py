@@ -47,7 +47,10 @@ SIZE_OPTIONS = [
 COMPRESSION_OPTIONS = {
     "standard": "Standard (Recommended)",
     "maximum": "Maximum (Slower)",
-    "stored": "None (Faster)"
+    "stored": "None (Faster)",
+    "adaptive": "Adaptive (Skip Compressed Files)",
+    "lzma": "LZMA (Smallest, Slowest)",
+    "zstd": "Zstandard (Fast, needs zstandard)"
 }
 
 
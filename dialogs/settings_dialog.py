@@ -241,7 +241,10 @@ class SettingsDialog(QDialog):
         self.compression_options = { # Recreate map with translated texts
              "standard": "Standard (Recommended)",
              "maximum": "Maximum (Slower)",
-             "stored": "None (Faster)"
+             "stored": "None (Faster)",
+             "adaptive": "Adaptive (Skip Compressed Files)",
+             "lzma": "LZMA (Smallest, Slowest)",
+             "zstd": "Zstandard (Fast, needs zstandard)"
         }
         for key, text in self.compression_options.items(): # Repopulate
             self.comp_combobox.addItem(text, key)
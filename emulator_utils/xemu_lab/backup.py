@@ -11,8 +11,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Sequence, Set, Tuple, Union
 
-from .fatx import DirectoryEntry, FATXVolume
+from .fatx import DirectoryEntry, FATXVolume, consecutive_runs
 from .qcow2 import BlockDevice, QCOW2BlockDevice
+from .safety import sha256_file
 from .titles import game_display_name
 
 
@@ -115,15 +116,18 @@ def backup_title_id(
     sorted_clusters = sorted(clusters)
     fat_runs = _build_fat_runs(volume, sorted_clusters)
     data_chunks: List[Tuple[int, int, bytes]] = []
-    for cluster in sorted_clusters:
-        guest_offset = volume.cluster_offset(cluster)
-        data_chunks.append(
-            (
-                cluster,
-                guest_offset,
-                volume.read_cluster(cluster),
+    cluster_size = volume.header.cluster_size
+    for run_start, run_length in consecutive_runs(sorted_clusters):
+        run_data = memoryview(volume.read_clusters(run_start, run_length))
+        for index in range(run_length):
+            cluster = run_start + index
+            data_chunks.append(
+                (
+                    cluster,
+                    volume.cluster_offset(cluster),
+                    bytes(run_data[index * cluster_size : (index + 1) * cluster_size]),
+                )
             )
-        )
 
     ranges: List[Tuple[int, int]] = []
     for guest_offset, raw in directory_entries:
@@ -143,7 +147,7 @@ def backup_title_id(
         title_id=normalized,
         partition=partition.upper(),
         source_path=source,
-        source_sha256=_sha256_file(source) if source.is_file() else "",
+        source_sha256=sha256_file(source) if source.is_file() else "",
         created_at=datetime.now(timezone.utc),
         fat_entry_size=volume.header.fat_entry_size,
         fatx_cluster_size=volume.header.cluster_size,
@@ -562,11 +566,3 @@ def _build_fat_runs(
     return runs
 
 
-def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        while True:
-            chunk = handle.read(1024 * 1024)
-            if not chunk:
-                return digest.hexdigest()
-            digest.update(chunk)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import re
 import struct
+import sys
+from array import array
 from dataclasses import dataclass
 from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
@@ -24,6 +26,12 @@ FATX_DIRECTORY_ATTRIBUTE = 0x10
 
 TITLE_ID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}$")
 
+# array typecodes holding one little-endian FAT16 / FAT32 entry.
+_FAT_TYPECODES = {
+    2: "H",
+    4: "I" if array("I").itemsize == 4 else "L",
+}
+
 
 class FATXError(Exception):
     """Base FATX parser error."""
@@ -166,6 +174,11 @@ class FATXVolume:
         self.device = device
         self.partition = partition
         self.header = self._read_header()
+        # Whole FAT loaded on first use, plus a byte-per-cluster free map
+        # (1 = free). Both are dropped when the device reports a write.
+        self._fat: Optional[array] = None
+        self._free_map: Optional[bytearray] = None
+        self._fat_generation = -1
 
     @classmethod
     def open_partition(
@@ -244,10 +257,58 @@ class FATXVolume:
         if cluster < 0 or cluster >= self.header.max_clusters:
             raise FATXBoundsError(f"FAT cluster out of range: {cluster}")
 
+        table = self._fat_table()
+        if table is not None:
+            return table[cluster]
         offset = self.header.fat_offset + cluster * self.header.fat_entry_size
         raw = self.device.read_at(offset, self.header.fat_entry_size)
         return int.from_bytes(raw, "little")
 
+    def invalidate_fat_cache(self) -> None:
+        """Forget the cached FAT (call after writing FAT entries)."""
+
+        self._fat = None
+        self._free_map = None
+        self._fat_generation = -1
+
+    def _fat_table(self) -> Optional[array]:
+        """The whole FAT as an array, read in one go; None if unreadable."""
+
+        generation = getattr(self.device, "write_generation", 0)
+        if self._fat is not None and generation == self._fat_generation:
+            return self._fat
+
+        self.invalidate_fat_cache()
+        typecode = _FAT_TYPECODES.get(self.header.fat_entry_size)
+        if typecode is None:
+            return None
+        try:
+            raw = self.device.read_at(
+                self.header.fat_offset,
+                self.header.max_clusters * self.header.fat_entry_size,
+            )
+        except UnsupportedQCOW2Feature:
+            # e.g. a compressed cluster inside the FAT: read entries one by one
+            return None
+        table = array(typecode)
+        table.frombytes(raw)
+        if sys.byteorder != "little":
+            table.byteswap()
+        self._fat = table
+        self._fat_generation = generation
+        return table
+
+    def _free_cluster_map(self) -> Optional[bytearray]:
+        table = self._fat_table()
+        if table is None:
+            return None
+        if self._free_map is None:
+            count = self.header.data_cluster_count
+            free_map = bytearray(value == 0 for value in table[: count + 1])
+            free_map[0] = 0
+            self._free_map = free_map
+        return self._free_map
+
     def cluster_offset(self, cluster: int) -> int:
         if not isinstance(cluster, int):
             raise TypeError("Cluster must be an integer")
@@ -325,6 +386,24 @@ class FATXVolume:
             self.header.cluster_size,
         )
 
+    def read_clusters(self, first_cluster: int, count: int) -> bytes:
+        """Read ``count`` consecutive data clusters with one device read."""
+
+        if count <= 0:
+            raise ValueError("count must be > 0")
+        self.cluster_offset(first_cluster + count - 1)
+        return self.device.read_at(
+            self.cluster_offset(first_cluster),
+            count * self.header.cluster_size,
+        )
+
+    def _read_into(self, guest_offset: int, view: memoryview) -> None:
+        readinto = getattr(self.device, "readinto", None)
+        if readinto is not None:
+            readinto(guest_offset, view)
+        else:
+            view[:] = self.device.read_at(guest_offset, len(view))
+
     def get_chain(
         self,
         first_cluster: int,
@@ -568,35 +647,88 @@ class FATXVolume:
         return games
 
     def read_file(self, entry: DirectoryEntry) -> bytes:
+        if entry.is_directory:
+            raise IsADirectoryError(entry.name)
+        data = bytearray(entry.file_size)
+        self.read_file_into(entry, data)
+        return bytes(data)
+
+    def read_file_into(self, entry: DirectoryEntry, buffer) -> int:
+        """Read a file into a writable buffer of at least ``file_size`` bytes.
+
+        Consecutive clusters of the chain are read with one device call.
+        Returns the number of bytes written.
+        """
+
         if entry.is_directory:
             raise IsADirectoryError(entry.name)
         if entry.file_size == 0:
-            return b""
+            return 0
         if entry.first_cluster == 0:
             raise FATXFormatError(
                 f"Non-empty file {entry.name} has no first cluster"
             )
 
-        remaining = entry.file_size
-        data = bytearray()
-        for cluster in self.get_chain(entry.first_cluster):
-            chunk = self.read_cluster(cluster)
-            take = min(remaining, len(chunk))
-            data.extend(chunk[:take])
-            remaining -= take
-            if remaining == 0:
+        view = memoryview(buffer).cast("B")
+        if view.nbytes < entry.file_size:
+            raise ValueError(
+                f"Buffer too small for {entry.name}: "
+                f"{view.nbytes} < {entry.file_size}"
+            )
+
+        cluster_size = self.header.cluster_size
+        position = 0
+        for run_start, run_length in consecutive_runs(
+            self.get_chain(entry.first_cluster)
+        ):
+            take = min(entry.file_size - position, run_length * cluster_size)
+            self._read_into(
+                self.cluster_offset(run_start),
+                view[position : position + take],
+            )
+            position += take
+            if position == entry.file_size:
                 break
-        if remaining:
+        if position < entry.file_size:
             raise FATXFormatError(
                 f"File {entry.name} larger than FAT chain"
             )
-        return bytes(data)
+        return position
 
     def is_cluster_free(self, cluster: int) -> bool:
         if cluster < 1 or cluster > self.header.data_cluster_count:
             return False
+        free_map = self._free_cluster_map()
+        if free_map is not None:
+            return bool(free_map[cluster])
         return self.read_fat_entry(cluster) == 0
 
+    def iter_free_runs(self) -> Iterator[Tuple[int, int]]:
+        """Yield ``(first_cluster, length)`` for each run of free clusters."""
+
+        free_map = self._free_cluster_map()
+        if free_map is None:
+            run_start = None
+            for cluster in range(1, self.header.data_cluster_count + 1):
+                if self.read_fat_entry(cluster) == 0:
+                    if run_start is None:
+                        run_start = cluster
+                elif run_start is not None:
+                    yield run_start, cluster - run_start
+                    run_start = None
+            if run_start is not None:
+                yield run_start, self.header.data_cluster_count + 1 - run_start
+            return
+
+        end = len(free_map)
+        start = free_map.find(1, 1)
+        while start != -1:
+            stop = free_map.find(0, start)
+            if stop == -1:
+                stop = end
+            yield start, stop - start
+            start = free_map.find(1, stop)
+
     def iter_free_clusters(
         self,
         *,
@@ -605,11 +737,10 @@ class FATXVolume:
         """Yield data clusters with FAT=0 (free)."""
 
         blocked = exclude or set()
-        for cluster in range(1, self.header.data_cluster_count + 1):
-            if cluster in blocked:
-                continue
-            if self.read_fat_entry(cluster) == 0:
-                yield cluster
+        for run_start, run_length in self.iter_free_runs():
+            for cluster in range(run_start, run_start + run_length):
+                if cluster not in blocked:
+                    yield cluster
 
     def find_free_clusters(
         self,
@@ -631,6 +762,31 @@ class FATXVolume:
             f"found {len(found)}"
         )
 
+    def find_free_run(
+        self,
+        count: int,
+        *,
+        exclude: Optional[Set[int]] = None,
+    ) -> Optional[int]:
+        """First cluster of ``count`` contiguous free clusters, or None."""
+
+        if count <= 0:
+            raise ValueError("count must be > 0")
+        blocked = exclude or set()
+        for run_start, run_length in self.iter_free_runs():
+            cursor = run_start
+            run_end = run_start + run_length
+            while run_end - cursor >= count:
+                hits = [
+                    cluster
+                    for cluster in blocked
+                    if cursor <= cluster < cursor + count
+                ]
+                if not hits:
+                    return cursor
+                cursor = max(hits) + 1
+        return None
+
     def fat_entry_offset(self, cluster: int) -> int:
         if cluster < 0 or cluster >= self.header.max_clusters:
             raise FATXBoundsError(f"FAT cluster out of range: {cluster}")
@@ -711,6 +867,22 @@ def discover_fatx_volumes(
     return volumes
 
 
+def consecutive_runs(clusters: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """Group clusters into ``(first, length)`` runs of consecutive numbers."""
+
+    run_start: Optional[int] = None
+    run_length = 0
+    for cluster in clusters:
+        if run_start is not None and cluster == run_start + run_length:
+            run_length += 1
+            continue
+        if run_start is not None:
+            yield run_start, run_length
+        run_start, run_length = cluster, 1
+    if run_start is not None:
+        yield run_start, run_length
+
+
 def _is_valid_fatx_name(name: bytes) -> bool:
     if not name or name in (b".", b".."):
         return False
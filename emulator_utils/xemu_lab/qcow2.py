@@ -7,6 +7,7 @@ QCOW2 container. Allocate-on-write (L2/refcount) is opt-in and QEMU-free.
 
 from __future__ import annotations
 
+import mmap
 import os
 import struct
 import zlib
@@ -141,13 +142,17 @@ class HostCheckpoint:
 class QCOW2BlockDevice:
     """QCOW2 block device with no write API."""
 
-    def __init__(self, path: PathLike):
+    def __init__(self, path: PathLike, *, use_mmap: bool = True):
         self.path = Path(path)
+        self.use_mmap = use_mmap
         self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mmap_view: Optional[memoryview] = None
         self._host_size = 0
         self._header: Optional[QCOW2Header] = None
         self._l1_table: Tuple[int, ...] = ()
         self._l2_cache: "OrderedDict[int, Tuple[int, ...]]" = OrderedDict()
+        self._write_generation = 0
 
     def __enter__(self) -> "QCOW2BlockDevice":
         return self.open()
@@ -165,12 +170,43 @@ class QCOW2BlockDevice:
             self._header = self._read_header()
             self._l1_table = self._read_l1_table()
             self._validate_l1_coverage()
+            if self.use_mmap:
+                self._map_host_file()
         except Exception:
             self.close()
             raise
         return self
 
+    def _map_host_file(self) -> None:
+        """Map the image read-only; plain reads are used if that fails."""
+
+        assert self._file is not None
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except (OSError, ValueError, OverflowError):
+            self._mmap = None
+            return
+        self._mmap_view = memoryview(self._mmap)
+
+    def _unmap_host_file(self) -> None:
+        if self._mmap_view is not None:
+            try:
+                self._mmap_view.release()
+            except BufferError:
+                pass
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a read_view(); the map goes with it.
+                pass
+        self._mmap_view = None
+        self._mmap = None
+
     def close(self) -> None:
+        self._unmap_host_file()
         if self._file is not None:
             self._file.close()
         self._file = None
@@ -202,33 +238,138 @@ class QCOW2BlockDevice:
         self._require_open()
         return self._host_size
 
+    @property
+    def write_generation(self) -> int:
+        """Bumped on every guest write; lets parsers drop cached metadata."""
+
+        return self._write_generation
+
     def read_at(self, offset: int, size: int) -> bytes:
-        """Read a guest range, correctly walking L1/L2."""
+        """Read a guest range, correctly walking L1/L2.
+
+        Runs of guest clusters that are also contiguous in the host file are
+        read with a single host read.
+        """
 
         self._validate_guest_range(offset, size)
         if size == 0:
             return b""
 
+        runs = self._host_runs(offset, size)
+        if len(runs) == 1:
+            _position, length, host_offset = runs[0]
+            if host_offset is None:
+                return bytes(length)
+            return self._read_exact_host(host_offset, length)
+
         result = bytearray(size)
-        result_offset = 0
-        while result_offset < size:
-            guest_offset = offset + result_offset
+        self._read_runs_into(runs, memoryview(result), zero_fill=False)
+        return bytes(result)
+
+    def readinto(self, offset: int, buffer) -> int:
+        """Fill a writable buffer with the guest range starting at ``offset``.
+
+        Returns the number of bytes written (the buffer length).
+        """
+
+        with memoryview(buffer) as raw_view, raw_view.cast("B") as view:
+            size = view.nbytes
+            self._validate_guest_range(offset, size)
+            if size:
+                self._read_runs_into(
+                    self._host_runs(offset, size), view, zero_fill=True
+                )
+            return size
+
+    def read_view(self, offset: int, size: int) -> memoryview:
+        """Read-only view of a guest range, zero-copy when it is one mapped run.
+
+        Views into the memory map stay valid only while the device is open.
+        """
+
+        self._validate_guest_range(offset, size)
+        runs = self._host_runs(offset, size) if size else []
+        if (
+            len(runs) == 1
+            and runs[0][2] is not None
+            and self._mmap_view is not None
+        ):
+            host_offset = runs[0][2]
+            self._check_host_range(host_offset, size)
+            return self._mmap_view[host_offset : host_offset + size]
+        return memoryview(self.read_at(offset, size))
+
+    def _host_runs(
+        self,
+        offset: int,
+        size: int,
+    ) -> List[Tuple[int, int, Optional[int]]]:
+        """Split a guest range into ``(buffer_pos, length, host_offset)`` runs.
+
+        ``host_offset`` is None for ranges that read as zero. Adjacent
+        clusters are merged when their host data is contiguous.
+        """
+
+        runs: List[Tuple[int, int, Optional[int]]] = []
+        position = 0
+        while position < size:
+            guest_offset = offset + position
             guest_cluster = guest_offset // self.cluster_size
             in_cluster = guest_offset % self.cluster_size
-            chunk_size = min(size - result_offset, self.cluster_size - in_cluster)
+            chunk_size = min(size - position, self.cluster_size - in_cluster)
             mapping = self.map_cluster(guest_cluster)
 
+            host_offset: Optional[int] = None
             if mapping.allocated and not mapping.reads_as_zero:
                 assert mapping.host_offset is not None
-                chunk = self._read_exact_host(
-                    mapping.host_offset + in_cluster,
-                    chunk_size,
-                )
-                result[result_offset : result_offset + chunk_size] = chunk
+                host_offset = mapping.host_offset + in_cluster
+
+            if runs:
+                last_position, last_length, last_host = runs[-1]
+                if (
+                    (last_host is None and host_offset is None)
+                    or (
+                        last_host is not None
+                        and host_offset is not None
+                        and last_host + last_length == host_offset
+                    )
+                ):
+                    runs[-1] = (last_position, last_length + chunk_size, last_host)
+                    position += chunk_size
+                    continue
+            runs.append((position, chunk_size, host_offset))
+            position += chunk_size
+        return runs
+
+    def _read_runs_into(
+        self,
+        runs: List[Tuple[int, int, Optional[int]]],
+        view: memoryview,
+        *,
+        zero_fill: bool,
+    ) -> None:
+        for position, length, host_offset in runs:
+            target = view[position : position + length]
+            if host_offset is None:
+                if zero_fill:
+                    target[:] = bytes(length)
+                continue
+            self._readinto_host(host_offset, target)
 
-            result_offset += chunk_size
+    def _readinto_host(self, offset: int, target: memoryview) -> None:
+        size = target.nbytes
+        self._check_host_range(offset, size)
+        if self._mmap_view is not None:
+            target[:] = self._mmap_view[offset : offset + size]
+            return
 
-        return bytes(result)
+        assert self._file is not None
+        self._file.seek(offset)
+        read = self._file.readinto(target)
+        if read != size:
+            raise QCOW2FormatError(
+                f"Truncated host read: requested {size}, got {read}"
+            )
 
     def read_cluster(self, guest_cluster: int) -> bytes:
         if not isinstance(guest_cluster, int) or guest_cluster < 0:
@@ -549,13 +690,18 @@ class QCOW2BlockDevice:
         if offset > self.size or size > self.size - offset:
             raise ValueError("Read beyond guest disk size")
 
-    def _read_exact_host(self, offset: int, size: int) -> bytes:
+    def _check_host_range(self, offset: int, size: int) -> None:
         self._require_open()
         if offset < 0 or size < 0 or offset > self._host_size:
             raise QCOW2FormatError("Invalid host range")
         if size > self._host_size - offset:
             raise QCOW2FormatError("Read beyond end of host file")
 
+    def _read_exact_host(self, offset: int, size: int) -> bytes:
+        self._check_host_range(offset, size)
+        if self._mmap is not None:
+            return self._mmap[offset : offset + size]
+
         assert self._file is not None
         self._file.seek(offset)
         data = self._file.read(size)
@@ -597,7 +743,8 @@ class QCOW2WritableBlockDevice(QCOW2BlockDevice):
     """
 
     def __init__(self, path: PathLike):
-        super().__init__(path)
+        # The host file grows and is rewritten in place: no memory map.
+        super().__init__(path, use_mmap=False)
         self._writable = False
         self._refcount_table: List[int] = []
         self._clusters_allocated = 0
@@ -665,6 +812,7 @@ class QCOW2WritableBlockDevice(QCOW2BlockDevice):
         self._require_writable()
         if not payload:
             return
+        self._write_generation += 1
 
         guest_clusters: List[int] = []
         cursor = 0
@@ -870,6 +1018,7 @@ class QCOW2WritableBlockDevice(QCOW2BlockDevice):
 
         self._require_writable()
         assert self._file is not None
+        self._write_generation += 1
         self._file.flush()
         self._file.truncate(checkpoint.host_size)
         self._host_size = checkpoint.host_size
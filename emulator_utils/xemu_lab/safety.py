@@ -130,7 +130,21 @@ def assert_xemu_closed() -> None:
         )
 
 
-def sha256_file(path: PathLike) -> str:
+def _cached_sha256(path: PathLike) -> Optional[str]:
+    """SHA-256 from SaveState's shared hash cache (None when used standalone)."""
+    try:
+        from core import hash_cache
+    except ImportError:
+        return None
+    return hash_cache.get_sha256(str(path))
+
+
+def sha256_file(path: PathLike, use_cache: bool = True) -> str:
+    """SHA-256 of a file; ``use_cache=False`` always reads the bytes (copy verification)."""
+    if use_cache:
+        cached = _cached_sha256(path)
+        if cached:
+            return cached
     digest = hashlib.sha256()
     with Path(path).open("rb") as handle:
         while True:
@@ -173,7 +187,7 @@ def atomic_copy_qcow2(
     temp_path = Path(temp_name)
     try:
         shutil.copyfile(src, temp_path, follow_symlinks=True)
-        temp_hash = sha256_file(temp_path)
+        temp_hash = sha256_file(temp_path, use_cache=False)
         if temp_hash != src_hash:
             raise SafetyError(
                 "Temporary copy hash does not match source"
@@ -184,7 +198,7 @@ def atomic_copy_qcow2(
             temp_path.unlink(missing_ok=True)
         raise
 
-    dst_hash = sha256_file(dst)
+    dst_hash = sha256_file(dst, use_cache=False)
     if dst_hash != src_hash:
         raise SafetyError(
             "Destination hash does not match after replace"
@@ -17,6 +17,7 @@ from PySide6.QtGui import QDesktopServices, QIcon
 # Import core logic, utils, managers
 from core import core_logic
 from core import settings_manager
+from backup import batch_backup
 import config
 from gui.gui_utils import WorkerThread, SteamSearchWorkerThread, open_folder_in_file_manager, NotificationPopup
 from common.utils import sanitize_filename, resource_path
@@ -167,6 +168,23 @@ class MainWindowHandlers:
             "cloud_settings.json": (os.path.join(settings_manager.get_active_config_dir(), "cloud_settings.json"), "cloud settings"),
         }
 
+        # Write pending store exports first, so the ".bak" copies are current,
+        # then wait for the queued mirror writes so we read what they hold
+        try:
+            from core import state_store
+            state_store.flush_all()
+        except Exception:
+            pass
+        try:
+            from core import mirror_writer
+            mirror_flushed = mirror_writer.flush(mirror_writer.EXIT_FLUSH_TIMEOUT_SECONDS)
+        except Exception:
+            mirror_flushed = True
+        if not mirror_flushed:
+            QMessageBox.warning(self.main_window, "Import Error",
+                                f"Mirror files are still being written to:\n{mirror_dir}\n\nPlease try again in a moment.")
+            return
+
         imported = []
         for fname, (dest_path, label) in candidates.items():
             src_path = os.path.join(mirror_dir, fname)
@@ -1009,10 +1027,10 @@ class MainWindowHandlers:
         self.main_window.update_action_button_states()
         logging.debug("Backup button exited cancel mode, original state restored.")
 
-    # Starts backup process for ALL profiles sequentially.
+    # Starts backup process for ALL profiles through the batch backup engine.
     @Slot()
     def handle_backup_all(self, skip_confirmation: bool = False):
-        """Backup all profiles sequentially."""
+        """Backup all profiles concurrently (bounded pool, per-disk limits)."""
         profiles = self.main_window.profiles
         if not profiles:
             if not skip_confirmation:
@@ -1050,6 +1068,7 @@ class MainWindowHandlers:
         # Get global settings for backup
         global_settings = self.main_window.current_settings
         backup_base_dir = global_settings.get('backup_base_dir', config.BACKUP_BASE_DIR)
+        batch_settings = dict(global_settings, backup_base_dir=backup_base_dir)
         
         # Reset cancel flag and show cancel button
         self._cancel_backup_event.clear()
@@ -1068,102 +1087,21 @@ class MainWindowHandlers:
             skipped = []
             was_cancelled = False
             
-            for idx, (profile_name, profile_data) in enumerate(profiles.items(), 1):
-                # --- CANCEL CHECK: Between profiles (safe point) ---
-                if cancel_event.is_set():
-                    remaining = profile_count - idx + 1
-                    logging.info(f"[Backup All] Cancelled by user at profile {idx}/{profile_count}. "
-                                 f"{len(results)} completed, {remaining} not started.")
-                    was_cancelled = True
-                    break
-                
-                logging.info(f"[Backup All] Processing {idx}/{profile_count}: '{profile_name}'")
-                
-                if not isinstance(profile_data, dict):
-                    skipped.append(f"{profile_name} (invalid data)")
-                    logging.warning(f"[Backup All] Skipping '{profile_name}': invalid profile data")
-                    continue
-                
-                # Get effective settings using helper (respects group > profile > global priority)
-                try:
-                    profile_effective = core_logic.get_effective_profile_settings(
-                        profile_name, profile_data, profiles, global_settings
-                    )
-                    profile_effective['backup_base_dir'] = backup_base_dir
-                except Exception as e:
-                    logging.warning(f"[Backup All] Error getting effective settings for '{profile_name}': {e}")
-                    profile_effective = {
-                        'backup_base_dir': backup_base_dir,
-                        'max_backups': global_settings.get('max_backups', config.MAX_BACKUPS),
-                        'max_source_size_mb': global_settings.get('max_source_size_mb', 200),
-                        'compression_mode': global_settings.get('compression_mode', 'standard'),
-                    }
-                
-                # Get source paths
-                source_paths = []
-                paths_data = profile_data.get('paths')
-                path_data = profile_data.get('path')
-                
-                if isinstance(paths_data, list) and paths_data and all(isinstance(p, str) for p in paths_data):
-                    source_paths = paths_data
-                elif isinstance(path_data, str) and path_data:
-                    source_paths = [path_data]
+            batch_results = batch_backup.run_batch_backup(
+                list(profiles.keys()), profiles, batch_settings, cancel_event=cancel_event
+            )
+            for r in batch_results:
+                if r.status == batch_backup.STATUS_SUCCESS:
+                    results.append(r.profile_name)
+                elif r.status == batch_backup.STATUS_SKIPPED:
+                    skipped.append(f"{r.profile_name} ({r.message})")
+                elif r.status == batch_backup.STATUS_FAILED:
+                    failed.append(f"{r.profile_name}: {r.message}")
                 else:
-                    skipped.append(f"{profile_name} (no valid path)")
-                    logging.warning(f"[Backup All] Skipping '{profile_name}': no valid source path")
-                    continue
-                
-                # SAFETY CHECK 1: Verify source paths exist
-                valid_paths = []
-                for sp in source_paths:
-                    if os.path.exists(sp):
-                        valid_paths.append(sp)
-                    else:
-                        logging.warning(f"[Backup All] Path does not exist for '{profile_name}': {sp}")
-                
-                if not valid_paths:
-                    skipped.append(f"{profile_name} (path not found)")
-                    logging.warning(f"[Backup All] Skipping '{profile_name}': all source paths are missing")
-                    continue
-                
-                source_paths = valid_paths
-                
-                # SAFETY CHECK 2: Prevent recursive backup (source path inside backup folder)
-                backup_base = os.path.normpath(profile_effective['backup_base_dir']).lower()
-                is_recursive = False
-                for sp in source_paths:
-                    norm_sp = os.path.normpath(sp).lower()
-                    if norm_sp.startswith(backup_base):
-                        logging.error(f"[Backup All] BLOCKED: '{profile_name}' source path is INSIDE backup folder! Path: {sp}")
-                        is_recursive = True
-                        break
-                
-                if is_recursive:
-                    failed.append(f"{profile_name}: Source path is inside backup folder (would cause recursive backup)")
-                    continue
-                
-                # Perform the backup
-                try:
-                    success, message = core_logic.perform_backup(
-                        profile_name,
-                        source_paths,
-                        profile_effective['backup_base_dir'],
-                        profile_effective['max_backups'],
-                        profile_effective['max_source_size_mb'],
-                        profile_effective['compression_mode'],
-                        profile_data
-                    )
-                    
-                    if success:
-                        results.append(profile_name)
-                        logging.info(f"[Backup All] Success: '{profile_name}'")
-                    else:
-                        failed.append(f"{profile_name}: {message}")
-                        logging.error(f"[Backup All] Failed: '{profile_name}' - {message}")
-                        
-                except Exception as e:
-                    failed.append(f"{profile_name}: {str(e)}")
-                    logging.error(f"[Backup All] Exception for '{profile_name}': {e}", exc_info=True)
+                    was_cancelled = True
+            if was_cancelled:
+                logging.info(f"[Backup All] Cancelled by user. {len(results)} completed, "
+                             f"{profile_count - len(results) - len(failed) - len(skipped)} not started.")
             
             # Build summary
             if was_cancelled:
@@ -1321,6 +1259,7 @@ class MainWindowHandlers:
         backup_base_dir = global_settings.get('backup_base_dir', config.BACKUP_BASE_DIR)
         
         profiles = self.main_window.profiles
+        batch_settings = dict(global_settings, backup_base_dir=backup_base_dir)
         
         # Reset cancel flag and show cancel button (only for multi-profile)
         self._cancel_backup_event.clear()
@@ -1341,78 +1280,21 @@ class MainWindowHandlers:
             skipped = []
             was_cancelled = False
             
-            for idx, profile_name in enumerate(selected_profile_names, 1):
-                # --- CANCEL CHECK: Between profiles (safe point) ---
-                if cancel_event.is_set():
-                    remaining = profile_count - idx + 1
-                    logging.info(f"[Backup Selected] Cancelled by user at profile {idx}/{profile_count}. "
-                                 f"{len(results)} completed, {remaining} not started.")
+            batch_results = batch_backup.run_batch_backup(
+                selected_profile_names, profiles, batch_settings, cancel_event=cancel_event
+            )
+            for r in batch_results:
+                if r.status == batch_backup.STATUS_SUCCESS:
+                    results.append(r.profile_name)
+                elif r.status == batch_backup.STATUS_SKIPPED:
+                    skipped.append(f"{r.profile_name} ({r.message})")
+                elif r.status == batch_backup.STATUS_FAILED:
+                    failed.append(f"{r.profile_name}: {r.message}")
+                else:
                     was_cancelled = True
-                    break
-                
-                logging.info(f"[Backup Selected] Processing {idx}/{profile_count}: '{profile_name}'")
-                
-                profile_data = profiles.get(profile_name)
-                if not profile_data or not isinstance(profile_data, dict):
-                    skipped.append(f"{profile_name} (invalid data)")
-                    logging.warning(f"[Backup Selected] Skipping '{profile_name}': invalid profile data")
-                    continue
-                
-                # Get effective settings using helper (respects group > profile > global priority)
-                try:
-                    profile_effective = core_logic.get_effective_profile_settings(
-                        profile_name, profile_data, profiles, global_settings
-                    )
-                    profile_effective['backup_base_dir'] = backup_base_dir
-                except Exception as e:
-                    logging.warning(f"[Backup Selected] Error getting effective settings for '{profile_name}': {e}")
-                    profile_effective = {
-                        'backup_base_dir': backup_base_dir,
-                        'max_backups': global_settings.get('max_backups', config.MAX_BACKUPS),
-                        'max_source_size_mb': global_settings.get('max_source_size_mb', 200),
-                        'compression_mode': global_settings.get('compression_mode', 'standard'),
-                    }
-                
-                # Get source paths
-                source_paths = []
-                if isinstance(profile_data.get('paths'), list) and profile_data['paths']:
-                    source_paths = [p for p in profile_data['paths'] if isinstance(p, str) and p]
-                elif isinstance(profile_data.get('path'), str) and profile_data['path']:
-                    source_paths = [profile_data['path']]
-                
-                if not source_paths:
-                    skipped.append(f"{profile_name} (no valid path)")
-                    logging.warning(f"[Backup Selected] Skipping '{profile_name}': no valid source path")
-                    continue
-                
-                # Check paths exist
-                valid_paths = [p for p in source_paths if os.path.exists(p)]
-                if not valid_paths:
-                    skipped.append(f"{profile_name} (path not found)")
-                    logging.warning(f"[Backup Selected] Skipping '{profile_name}': paths do not exist")
-                    continue
-                
-                try:
-                    success, message = core_logic.perform_backup(
-                        profile_name,
-                        valid_paths,
-                        profile_effective['backup_base_dir'],
-                        profile_effective['max_backups'],
-                        profile_effective['max_source_size_mb'],
-                        profile_effective['compression_mode'],
-                        profile_data
-                    )
-                    
-                    if success:
-                        results.append(profile_name)
-                        logging.info(f"[Backup Selected] Success: '{profile_name}'")
-                    else:
-                        failed.append(f"{profile_name}: {message}")
-                        logging.error(f"[Backup Selected] Failed: '{profile_name}' - {message}")
-                        
-                except Exception as e:
-                    failed.append(f"{profile_name}: {str(e)}")
-                    logging.error(f"[Backup Selected] Exception for '{profile_name}': {e}", exc_info=True)
+            if was_cancelled:
+                logging.info(f"[Backup Selected] Cancelled by user. {len(results)} completed, "
+                             f"{profile_count - len(results) - len(failed) - len(skipped)} not started.")
             
             # Build summary
             if was_cancelled:
@@ -325,7 +325,8 @@ class DetectionWorkerThread(QThread):
                         is_steam_game=is_steam_game, # Usa il flag basato su steam_app_id
                         installed_steam_games_dict=self.installed_steam_games_dict,
                         appid=self.steam_app_id, # Passa l'AppID di Steam quando disponibile
-                        cancellation_manager=c_manager
+                        cancellation_manager=c_manager,
+                        game_executable=self.game_executable
                     )
                     
                     logging.info(f"Heuristic save search for '{profile_name}' (AppID: {self.steam_app_id})")
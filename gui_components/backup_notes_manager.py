@@ -10,9 +10,9 @@ attached to the specific backup even if the parent profile is renamed.
 """
 
 import os
-import json
 import logging
 import config
+from core import state_store
 
 # --- Backup notes file name and path (dynamic using settings_manager) ---
 BACKUP_NOTES_FILENAME = "backup_notes.json"
@@ -31,8 +31,7 @@ else:
 logging.info(f"Backup notes file path in use: {BACKUP_NOTES_FILE_PATH}")
 # --- End of backup notes file path definition ---
 
-_notes_cache = {}
-_cache_loaded = False
+_cache_loaded = False  # False until the store has been synced with the JSON file
 
 
 def _normalize_path(backup_path: str) -> str:
@@ -70,90 +69,49 @@ def _prune_stale_notes(notes_dict: dict) -> dict:
     return cleaned
 
 
+def _notes_state():
+    """Backup notes namespace of the state store, exported to BACKUP_NOTES_FILE_PATH."""
+    return state_store.namespace("backup_notes", BACKUP_NOTES_FILE_PATH, sort_keys=True)
+
+
 def load_notes() -> dict:
-    """Load backup notes from BACKUP_NOTES_FILE_PATH.
+    """Load backup notes from the state store (BACKUP_NOTES_FILE_PATH is
+    re-imported the first time, or after invalidate_cache()).
     Returns a dictionary {normalized_backup_path: note_text}.
     """
-    global _notes_cache, _cache_loaded
-    if _cache_loaded:
-        return _notes_cache.copy()
+    global _cache_loaded
+    try:
+        store = _notes_state()
+        if _cache_loaded:
+            return store.load()
+
+        notes = store.load(check_json=True)
+        # Auto-prune stale entries
+        cleaned = _prune_stale_notes(notes)
+        if cleaned != notes:
+            store.replace(cleaned)
+            logging.info(f"Pruned backup notes: removed {len(notes) - len(cleaned)} stale entries.")
+            notes = cleaned
+        logging.info(f"Loaded {len(notes)} backup notes from '{BACKUP_NOTES_FILE_PATH}'.")
+    except Exception as e:
+        logging.error(f"Error loading backup notes from '{BACKUP_NOTES_FILE_PATH}': {e}")
+        notes = {}
 
-    notes = {}
-    if os.path.exists(BACKUP_NOTES_FILE_PATH):
-        try:
-            with open(BACKUP_NOTES_FILE_PATH, 'r', encoding='utf-8') as f:
-                notes = json.load(f)
-            if not isinstance(notes, dict):
-                logging.warning(f"Backup notes file '{BACKUP_NOTES_FILE_PATH}' does not contain a valid dictionary. Reset.")
-                notes = {}
-
-            # Auto-prune stale entries and rewrite if necessary
-            cleaned = _prune_stale_notes(notes)
-            if cleaned != notes:
-                try:
-                    os.makedirs(os.path.dirname(BACKUP_NOTES_FILE_PATH), exist_ok=True)
-                    with open(BACKUP_NOTES_FILE_PATH, 'w', encoding='utf-8') as wf:
-                        json.dump(cleaned, wf, indent=4, ensure_ascii=False, sort_keys=True)
-                    logging.info(f"Pruned backup notes file: removed {len(notes) - len(cleaned)} stale entries.")
-                    notes = cleaned
-                except Exception as e_rewrite:
-                    logging.warning(f"Unable to rewrite pruned backup notes file: {e_rewrite}")
-
-            logging.info(f"Loaded {len(notes)} backup notes from '{BACKUP_NOTES_FILE_PATH}'.")
-        except json.JSONDecodeError:
-            logging.warning(f"Backup notes file '{BACKUP_NOTES_FILE_PATH}' is corrupted or empty. Reset.")
-            notes = {}
-        except Exception as e:
-            logging.error(f"Error loading backup notes from '{BACKUP_NOTES_FILE_PATH}': {e}")
-            notes = {}
-    else:
-        logging.info(f"Backup notes file '{BACKUP_NOTES_FILE_PATH}' not found. Starting with empty notes.")
-
-    _notes_cache = notes.copy()
     _cache_loaded = True
-    return notes
+    return dict(notes)
 
 
 def save_notes(notes_dict: dict) -> bool:
-    """Save the backup notes dictionary to disk.
+    """Save the backup notes dictionary (only changed notes are written).
     Returns True if saving succeeds, False otherwise.
     """
-    global _notes_cache
     if not isinstance(notes_dict, dict):
         logging.error("Attempt to save invalid backup notes (not a dictionary).")
         return False
     try:
         notes_to_write = _prune_stale_notes(notes_dict)
-        os.makedirs(os.path.dirname(BACKUP_NOTES_FILE_PATH), exist_ok=True)
-        with open(BACKUP_NOTES_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(notes_to_write, f, indent=4, ensure_ascii=False, sort_keys=True)
+        _notes_state().replace(notes_to_write)
         logging.info(f"Saved {len(notes_to_write)} backup notes to '{BACKUP_NOTES_FILE_PATH}'.")
-        _notes_cache = notes_to_write.copy()
-
-        # Mirror only when NOT in portable mode (same pattern as notes_manager)
-        try:
-            do_mirror = True
-            try:
-                from core import settings_manager as _smirror
-                if _smirror.is_portable_mode():
-                    do_mirror = False
-            except Exception:
-                pass
-            if do_mirror:
-                rotation = 0
-                try:
-                    from core import settings_manager as _sm4
-                    settings, _ = _sm4.load_settings()
-                    rotation = int(settings.get("mirror_rotation_keep", 0))
-                except Exception:
-                    rotation = 0
-                try:
-                    from core import core_logic
-                    core_logic._mirror_json_to_backup_root("backup_notes.json", notes_to_write, rotation=rotation)
-                except Exception as e_core:
-                    logging.warning(f"Mirror backup notes to backup root failed: {e_core}")
-        except Exception as e_mirror:
-            logging.warning(f"Unable to mirror backup notes to backup root: {e_mirror}")
         return True
     except Exception as e:
         logging.error(f"Error saving backup notes to '{BACKUP_NOTES_FILE_PATH}': {e}")
@@ -164,8 +122,12 @@ def get_note(backup_path: str) -> str:
     """Return the note text for a backup path, or empty string if none."""
     if not backup_path:
         return ""
-    notes = load_notes()
-    return notes.get(_normalize_path(backup_path), "")
+    if not _cache_loaded:
+        load_notes()
+    try:
+        return _notes_state().get(_normalize_path(backup_path), "") or ""
+    except Exception:
+        return ""
 
 
 def has_note(backup_path: str) -> bool:
@@ -177,33 +139,40 @@ def set_note(backup_path: str, text: str) -> bool:
     """Set or remove a note for a backup. Empty text removes the note."""
     if not backup_path:
         return False
-    notes = load_notes()
+    if not _cache_loaded:
+        load_notes()
     key = _normalize_path(backup_path)
     text = text.strip() if text else ""
-    if text:
-        notes[key] = text
-    elif key in notes:
-        del notes[key]
+    try:
+        store = _notes_state()
+        if text:
+            store.set(key, text)
+        else:
+            store.delete(key)
+    except Exception as e:
+        logging.error(f"Error saving note for backup '{os.path.basename(backup_path)}': {e}")
+        return False
     logging.info(f"{'Set' if text else 'Removed'} note for backup '{os.path.basename(backup_path)}'.")
-    return save_notes(notes)
+    return True
 
 
 def remove_note(backup_path: str) -> bool:
     """Remove the note for a specific backup (e.g. when the backup is deleted)."""
     if not backup_path:
         return True
-    notes = load_notes()
-    key = _normalize_path(backup_path)
-    if key in notes:
-        del notes[key]
-        logging.info(f"Removed note for deleted backup '{os.path.basename(backup_path)}'.")
-        return save_notes(notes)
-    return True
+    if not _cache_loaded:
+        load_notes()
+    try:
+        if _notes_state().delete(_normalize_path(backup_path)):
+            logging.info(f"Removed note for deleted backup '{os.path.basename(backup_path)}'.")
+        return True
+    except Exception as e:
+        logging.error(f"Error removing note for backup '{os.path.basename(backup_path)}': {e}")
+        return False
 
 
 def invalidate_cache():
     """Force reload of backup notes data from disk on next access."""
-    global _notes_cache, _cache_loaded
-    _notes_cache = {}
+    global _cache_loaded
     _cache_loaded = False
     logging.debug("Backup notes cache invalidated.")
@@ -1,3 +1,4 @@
+import collections
 import os
 import logging
 import platform
@@ -8,7 +9,7 @@ import shlex
 import shutil
 
 from PySide6.QtWidgets import QMessageBox, QApplication
-from PySide6.QtCore import Qt, Slot, QObject, QTimer, QThread
+from PySide6.QtCore import Qt, Slot, QObject, QTimer
 
 # Importa utility e logica
 from gui.gui_utils import DetectionWorkerThread
@@ -17,6 +18,11 @@ from common import shortcut_utils
 # Setup logging per questo modulo
 logger = logging.getLogger(__name__)
 
+# Detection threads running at the same time during a multi-file drop; the
+# rest wait in a queue. The searches share common.fs_cache, so a few workers
+# are enough to keep the disk busy.
+MAX_CONCURRENT_DETECTIONS = max(2, min(4, os.cpu_count() or 1))
+
 from gui_components.drop_event_logic import DropEventMixin  # Import the mixin (absolute to avoid relative import issues)
 
 class DragDropHandler(QObject, DropEventMixin):  # Add mixin to inheritance
@@ -259,6 +265,9 @@ class DragDropHandler(QObject, DropEventMixin):  # Add mixin to inheritance
             
             # Dizionario per tenere traccia dei thread attivi
             self.active_threads = {}
+            # Threads created but not started yet (bounded detection pool)
+            self._pending_detections = collections.deque()
+            self._running_detections = 0
             
             # Prepara i dati per ogni file
             for i, (profile_name, file_path) in enumerate(files_to_analyze):
@@ -484,17 +493,30 @@ class DragDropHandler(QObject, DropEventMixin):  # Add mixin to inheritance
                 # Colleghiamo il segnale progress per aggiornare la UI
                 detection_thread.progress.connect(self.on_detection_progress)
             
-                # Avvia il thread in modo asincrono
-                detection_thread.start()
-            
-                # Breve pausa per evitare di sovraccaricare il sistema
-                QThread.msleep(100)
-        
+                # Accoda il thread: ne girano al massimo MAX_CONCURRENT_DETECTIONS alla volta
+                self._pending_detections.append(detection_thread)
+                self._start_pending_detections()
+
         # Imposta un timer per controllare periodicamente lo stato dei thread
         self.check_threads_timer = QTimer()
         self.check_threads_timer.timeout.connect(self._check_detection_threads_status)
         self.check_threads_timer.start(500)  # Controlla ogni 500ms
 
+    def _start_pending_detections(self):
+        """Start queued detection threads while fewer than MAX_CONCURRENT_DETECTIONS are running."""
+        pending = getattr(self, '_pending_detections', None)
+        if not pending:
+            return
+        if (getattr(self, 'processing_cancelled', False)
+                or getattr(self.main_window, 'processing_cancelled', False)):
+            logging.info(f"Detection cancelled: dropping {len(pending)} queued detection thread(s)")
+            pending.clear()
+            return
+        while pending and self._running_detections < MAX_CONCURRENT_DETECTIONS:
+            thread = pending.popleft()
+            self._running_detections += 1
+            thread.start()
+
     def _on_detection_thread_finished(self, success: bool, results: dict, thread_id: str):
         """
         Handles the completion of a detection thread.
@@ -503,6 +525,8 @@ class DragDropHandler(QObject, DropEventMixin):  # Add mixin to inheritance
             results: Dictionary with detection results
             thread_id: ID of the thread that finished
         """
+        self._running_detections = max(0, getattr(self, '_running_detections', 1) - 1)
+        self._start_pending_detections()
         if thread_id not in self.active_threads:
             logging.warning(f"Thread ID {thread_id} not found in active_threads")
             return
@@ -17,7 +17,7 @@ import warnings
 from contextlib import contextmanager
 from typing import Optional
 
-from PySide6.QtGui import QIcon, QPixmap, QImage
+from PySide6.QtGui import QIcon, QPixmap, QImage, QImageReader
 from PySide6.QtCore import QSize, Qt
 
 import config
@@ -413,6 +413,11 @@ def _cached_icon_has_resolution(cache_path: str, requested_size: int) -> bool:
     )
 
 
+def _image_is_readable(path: str) -> bool:
+    """Return whether Qt can decode ``path``; unlike QIcon this is safe off the GUI thread."""
+    return QImageReader(path).canRead()
+
+
 def _unpremultiply_rgba(image):
     """Convert premultiplied RGBA pixels to straight alpha for PNG storage.
 
@@ -1949,7 +1954,7 @@ def get_profile_icon_path(profile_data: dict, profile_name: str,
     custom_icon = get_custom_icon_path(profile_data)
     if custom_icon:
         try:
-            if not QIcon(custom_icon).isNull():
+            if _image_is_readable(custom_icon):
                 return custom_icon
         except Exception as e:
             logger.debug(
@@ -1972,7 +1977,7 @@ def get_profile_icon_path(profile_data: dict, profile_name: str,
                 minecraft_icon_path = resource_path("icons/minecraft.png")
                 if (
                     os.path.isfile(minecraft_icon_path)
-                    and not QIcon(minecraft_icon_path).isNull()
+                    and _image_is_readable(minecraft_icon_path)
                 ):
                     logger.debug(f"Using Minecraft icon for profile '{profile_name}'")
                     return minecraft_icon_path
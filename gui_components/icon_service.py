@@ -0,0 +1,287 @@
+# gui_components/icon_service.py
+# -*- coding: utf-8 -*-
+"""
+Background icon resolution for the profile table.
+
+``icon_extractor.get_profile_icon`` may walk the game install directory,
+parse PE resources, search icon themes and run Pillow conversions. Doing that
+for every row on the GUI thread froze the window with large libraries.
+
+``ProfileIconService`` splits the work in two:
+
+* ``icon_for`` (GUI thread) answers from a bounded in-memory ``QIcon`` LRU
+  keyed by (profile, size, image mtime), or from a small persisted index that
+  maps the icon sources of a profile to the image file resolved last time.
+  Either way it costs at most a couple of ``stat`` calls.
+* Everything else is resolved by a few worker QThreads. They only look up image
+  *paths* (``get_profile_icon_path``); the ``QIcon`` is built back on the GUI
+  thread and ``icon_ready`` tells the table which row to refresh.
+
+The index lives next to the cached PNGs (``icon_index.json``); entries whose
+image disappeared (``clear_icon_cache``, orphan cleanup) are simply resolved
+again.
+"""
+import hashlib
+import json
+import logging
+import os
+import platform
+from collections import OrderedDict
+import queue
+from typing import Optional
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot, QCoreApplication
+from PySide6.QtGui import QIcon
+
+import config
+from gui_components import icon_extractor
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "icon_index.json"
+INDEX_VERSION = 1
+INDEX_SAVE_DELAY_MS = 1000
+SHUTDOWN_WAIT_MS = 3000
+DEFAULT_MEMORY_CACHE_SIZE = 512
+DEFAULT_WORKERS = 2
+
+# Profile fields that decide which image get_profile_icon_path picks.
+_ICON_SOURCE_FIELDS = (
+    'custom_icon_path', 'icon', 'path', 'type', 'game_name', 'game_executable',
+    'game_install_dir', 'emulator_executable', 'steam_appid', 'appid',
+)
+
+
+def _source_fingerprint(profile_name: str, profile_data: dict, size: int) -> str:
+    """Stable key for the inputs of an icon resolution."""
+    data = profile_data if isinstance(profile_data, dict) else {}
+    sources = {field: data.get(field) for field in _ICON_SOURCE_FIELDS if data.get(field)}
+    payload = json.dumps(
+        [icon_extractor.ICON_CACHE_VERSION, profile_name, int(size), sources],
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:20]
+
+
+def _init_worker_thread():
+    """Shortcut resolution (winshell) needs COM on the worker threads too."""
+    if platform.system() != "Windows":
+        return
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except Exception as e:
+        logger.debug(f"COM initialization skipped for icon worker: {e}")
+
+
+def _image_mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class _IconWorker(QThread):
+    """Takes jobs from the shared queue until it gets ``None``."""
+
+    resolved = Signal(str, str, str)  # fingerprint, profile name, image path or ""
+
+    def __init__(self, jobs: "queue.Queue"):
+        super().__init__()
+        self._jobs = jobs
+
+    def run(self):
+        _init_worker_thread()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            fingerprint, profile_name, profile_data, size = job
+            # Only the image path is looked up here: no QPixmap/QIcon off the GUI thread.
+            try:
+                image_path = icon_extractor.get_profile_icon_path(profile_data, profile_name, size)
+            except Exception as e:
+                logger.debug(f"Icon resolution failed for '{profile_name}': {e}")
+                image_path = None
+            self.resolved.emit(fingerprint, profile_name, image_path or "")
+
+
+class ProfileIconService(QObject):
+    """Resolves profile icons off the GUI thread and caches the results."""
+
+    # Emitted (GUI thread) with the profile name once its icon lookup finished.
+    icon_ready = Signal(str)
+
+    def __init__(self, parent=None, max_workers: int = None, memory_cache_size: int = None):
+        super().__init__(parent)
+        if max_workers is None:
+            max_workers = getattr(config, 'PROFILE_ICON_WORKERS', DEFAULT_WORKERS)
+        if memory_cache_size is None:
+            memory_cache_size = getattr(config, 'PROFILE_ICON_MEMORY_CACHE_SIZE', DEFAULT_MEMORY_CACHE_SIZE)
+        self._max_workers = max(1, int(max_workers))
+        self._memory_cache_size = max(1, int(memory_cache_size))
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._icons = OrderedDict()  # (profile, size, mtime) -> QIcon
+        self._index = None           # fingerprint -> image path (persisted)
+        self._index_path = None
+        self._pending = set()        # fingerprints being resolved
+        self._missing = set()        # fingerprints without an icon (this session)
+        self._closed = False
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(INDEX_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_index)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    # --- Public API (GUI thread) ---
+
+    def icon_for(self, profile_name: str, profile_data: dict,
+                 size: int = icon_extractor.DEFAULT_ICON_SIZE) -> Optional[QIcon]:
+        """Return the icon if it is already known, otherwise queue its resolution.
+
+        None means either "still resolving" (see ``is_pending``) or "this
+        profile has no icon"; ``icon_ready`` is emitted when a queued lookup
+        completes.
+        """
+        fingerprint = _source_fingerprint(profile_name, profile_data, size)
+        if fingerprint in self._missing:
+            return None
+
+        image_path = self._load_index().get(fingerprint)
+        if image_path:
+            icon = self._icon_from_path(profile_name, size, image_path)
+            if icon is not None:
+                return icon
+            # Image deleted or unreadable: forget it and resolve again.
+            self._index.pop(fingerprint, None)
+            self._schedule_index_save()
+
+        self._submit(fingerprint, profile_name, profile_data, size)
+        return None
+
+    def is_pending(self, profile_name: str, profile_data: dict,
+                   size: int = icon_extractor.DEFAULT_ICON_SIZE) -> bool:
+        """True while the icon of this profile is being resolved."""
+        return _source_fingerprint(profile_name, profile_data, size) in self._pending
+
+    def invalidate(self):
+        """Forget in-memory results (e.g. after the icon cache was cleared)."""
+        self._icons.clear()
+        self._missing.clear()
+
+    @Slot()
+    def shutdown(self):
+        """Stop accepting work and flush the index."""
+        if self._closed:
+            return
+        self._closed = True
+        # Drop queued jobs, then let each worker finish its current lookup.
+        try:
+            while True:
+                self._jobs.get_nowait()
+        except queue.Empty:
+            pass
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            if not worker.wait(SHUTDOWN_WAIT_MS):
+                logger.warning("Icon worker still busy at shutdown")
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_index()
+
+    # --- Internals ---
+
+    def _icon_from_path(self, profile_name: str, size: int, image_path: str) -> Optional[QIcon]:
+        mtime = _image_mtime(image_path)
+        if mtime is None:
+            return None
+        key = (profile_name, int(size), mtime)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            return icon
+        icon = QIcon(image_path)
+        if icon.isNull():
+            return None
+        self._icons[key] = icon
+        while len(self._icons) > self._memory_cache_size:
+            self._icons.popitem(last=False)
+        return icon
+
+    def _submit(self, fingerprint: str, profile_name: str, profile_data: dict, size: int):
+        if self._closed or fingerprint in self._pending:
+            return
+        if not self._workers:
+            for _ in range(self._max_workers):
+                worker = _IconWorker(self._jobs)
+                worker.resolved.connect(self._on_resolved)
+                worker.start(QThread.Priority.LowPriority)
+                self._workers.append(worker)
+        self._pending.add(fingerprint)
+        snapshot = dict(profile_data) if isinstance(profile_data, dict) else {}
+        self._jobs.put((fingerprint, profile_name, snapshot, int(size)))
+
+    @Slot(str, str, str)
+    def _on_resolved(self, fingerprint: str, profile_name: str, image_path: str):
+        self._pending.discard(fingerprint)
+        if self._closed:
+            return
+        if image_path:
+            index = self._load_index()
+            if index.get(fingerprint) != image_path:
+                index.pop(fingerprint, None)
+                index[fingerprint] = image_path
+                self._schedule_index_save()
+        else:
+            self._missing.add(fingerprint)
+        self.icon_ready.emit(profile_name)
+
+    def _load_index(self) -> dict:
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        try:
+            self._index_path = os.path.join(icon_extractor.get_icon_cache_dir(), INDEX_FILENAME)
+        except Exception as e:
+            logger.debug(f"Icon index disabled, no cache directory: {e}")
+            return self._index
+        if os.path.isfile(self._index_path):
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+                    entries = data.get('entries')
+                    if isinstance(entries, dict):
+                        self._index = {
+                            k: v for k, v in entries.items()
+                            if isinstance(k, str) and isinstance(v, str)
+                        }
+            except (OSError, ValueError) as e:
+                logger.debug(f"Icon index unreadable, starting a new one: {e}")
+        return self._index
+
+    def _schedule_index_save(self):
+        if not self._closed:
+            self._save_timer.start()
+
+    @Slot()
+    def _save_index(self):
+        if self._index is None or not self._index_path:
+            return
+        # Keep the index small: newest entries are at the end.
+        limit = self._memory_cache_size * 4
+        while len(self._index) > limit:
+            self._index.pop(next(iter(self._index)))
+        tmp_path = self._index_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'entries': self._index}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            logger.debug(f"Unable to write icon index '{self._index_path}': {e}")
@@ -10,10 +10,10 @@ Each profile can have at most ONE locked backup. Locked backups:
 """
 
 import os
-import json
 import stat
 import logging
 import config
+from core import state_store
 
 # --- Locked Backups File Name and Path (dynamic using settings_manager) ---
 LOCKED_BACKUPS_FILENAME = "locked_backups.json"
@@ -32,8 +32,7 @@ else:
 logging.info(f"Locked backups file path in use: {LOCKED_BACKUPS_FILE_PATH}")
 # --- End of Locked Backups File Path Definition ---
 
-_locked_cache = {}  # Internal cache to avoid continuous disk reads
-_cache_loaded = False  # Flag to know if cache has been loaded
+_cache_loaded = False  # False until the store has been synced with the JSON file
 
 
 def _set_file_readonly(file_path: str, readonly: bool = True) -> bool:
@@ -98,65 +97,63 @@ def _prune_stale_locks(locked_dict: dict) -> dict:
     return {"locked": cleaned}
 
 
+def _locks_from_json(data):
+    if not isinstance(data, dict):
+        return None
+    locked = data.get("locked", {})
+    return locked if isinstance(locked, dict) else {}
+
+
+def _locks_to_json(locked):
+    return {"locked": locked}
+
+
+def _locks_state():
+    """Locked backups namespace of the state store, exported to LOCKED_BACKUPS_FILE_PATH."""
+    return state_store.namespace(
+        "locked_backups", LOCKED_BACKUPS_FILE_PATH,
+        from_json=_locks_from_json, to_json=_locks_to_json,
+    )
+
+
 def load_locked_backups() -> dict:
     """
-    Load locked backups status from LOCKED_BACKUPS_FILE_PATH.
+    Load locked backups status from the state store (LOCKED_BACKUPS_FILE_PATH
+    is re-imported the first time it is needed).
     
     Returns:
         Dictionary with structure {"locked": {"profile_name": "backup_path"}}
     """
-    global _locked_cache, _cache_loaded
-    
-    if _cache_loaded:
-        return _locked_cache.copy()
-    
-    locked_data = {"locked": {}}
-    
-    if os.path.exists(LOCKED_BACKUPS_FILE_PATH):
-        try:
-            with open(LOCKED_BACKUPS_FILE_PATH, 'r', encoding='utf-8') as f:
-                locked_data = json.load(f)
-            
-            if not isinstance(locked_data, dict):
-                logging.warning(f"Locked backups file '{LOCKED_BACKUPS_FILE_PATH}' does not contain a valid dictionary. Reset.")
-                locked_data = {"locked": {}}
-            
-            # Ensure "locked" key exists
-            if "locked" not in locked_data:
-                locked_data["locked"] = {}
-            
-            # Auto-prune stale entries and rewrite if necessary
-            cleaned = _prune_stale_locks(locked_data)
-            if cleaned != locked_data:
-                try:
-                    os.makedirs(os.path.dirname(LOCKED_BACKUPS_FILE_PATH), exist_ok=True)
-                    with open(LOCKED_BACKUPS_FILE_PATH, 'w', encoding='utf-8') as wf:
-                        json.dump(cleaned, wf, indent=4, ensure_ascii=False)
-                    removed_count = len(locked_data.get("locked", {})) - len(cleaned.get("locked", {}))
-                    logging.info(f"Pruned locked backups file: removed {removed_count} stale entries.")
-                    locked_data = cleaned
-                except Exception as e_rewrite:
-                    logging.warning(f"Unable to rewrite pruned locked backups file: {e_rewrite}")
-            
-            logging.info(f"Loaded {len(locked_data.get('locked', {}))} locked backups from '{LOCKED_BACKUPS_FILE_PATH}'.")
-            
-        except json.JSONDecodeError:
-            logging.warning(f"Locked backups file '{LOCKED_BACKUPS_FILE_PATH}' is corrupted or empty. Reset.")
-            locked_data = {"locked": {}}
-        except Exception as e:
-            logging.error(f"Error loading locked backups from '{LOCKED_BACKUPS_FILE_PATH}': {e}")
-            locked_data = {"locked": {}}
-    else:
-        logging.info(f"Locked backups file '{LOCKED_BACKUPS_FILE_PATH}' not found. Starting with empty list.")
+    global _cache_loaded
+    
+    try:
+        store = _locks_state()
+        if _cache_loaded:
+            return {"locked": store.load()}
+        
+        locked_data = {"locked": store.load(check_json=True)}
+        
+        # Auto-prune stale entries
+        cleaned = _prune_stale_locks(locked_data)
+        if cleaned != locked_data:
+            store.replace(cleaned["locked"])
+            removed_count = len(locked_data.get("locked", {})) - len(cleaned.get("locked", {}))
+            logging.info(f"Pruned locked backups: removed {removed_count} stale entries.")
+            locked_data = cleaned
+        
+        logging.info(f"Loaded {len(locked_data.get('locked', {}))} locked backups from '{LOCKED_BACKUPS_FILE_PATH}'.")
+    except Exception as e:
+        logging.error(f"Error loading locked backups from '{LOCKED_BACKUPS_FILE_PATH}': {e}")
+        locked_data = {"locked": {}}
     
-    _locked_cache = locked_data.copy()
     _cache_loaded = True
     return locked_data
 
 
 def save_locked_backups(locked_dict: dict) -> bool:
     """
-    Save the locked backups dictionary to LOCKED_BACKUPS_FILE_PATH.
+    Save the locked backups dictionary; only changed entries are written and
+    LOCKED_BACKUPS_FILE_PATH (plus its mirror) is exported shortly after.
     
     Args:
         locked_dict: Dictionary with structure {"locked": {"profile_name": "backup_path"}}
@@ -164,8 +161,6 @@ def save_locked_backups(locked_dict: dict) -> bool:
     Returns:
         True if saving succeeds, False otherwise
     """
-    global _locked_cache
-    
     if not isinstance(locked_dict, dict):
         logging.error("Attempt to save invalid locked backups data (not a dictionary).")
         return False
@@ -173,44 +168,8 @@ def save_locked_backups(locked_dict: dict) -> bool:
     try:
         # Clean before saving
         data_to_write = _prune_stale_locks(locked_dict)
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(LOCKED_BACKUPS_FILE_PATH), exist_ok=True)
-        
-        with open(LOCKED_BACKUPS_FILE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data_to_write, f, indent=4, ensure_ascii=False)
-        
+        _locks_state().replace(data_to_write["locked"])
         logging.info(f"Saved {len(data_to_write.get('locked', {}))} locked backups to '{LOCKED_BACKUPS_FILE_PATH}'.")
-        _locked_cache = data_to_write.copy()
-        
-        # Mirror only when NOT in portable mode
-        try:
-            do_mirror = True
-            try:
-                from core import settings_manager as _smirror
-                if _smirror.is_portable_mode():
-                    do_mirror = False
-            except Exception:
-                pass
-            
-            if do_mirror:
-                rotation = 0
-                try:
-                    from core import settings_manager as _sm4
-                    settings, _ = _sm4.load_settings()
-                    rotation = int(settings.get("mirror_rotation_keep", 0))
-                except Exception:
-                    rotation = 0
-                
-                # Use core_logic helper to mirror into backup root
-                try:
-                    from core import core_logic
-                    core_logic._mirror_json_to_backup_root("locked_backups.json", data_to_write, rotation=rotation)
-                except Exception as e_core:
-                    logging.warning(f"Mirror locked backups to backup root failed: {e_core}")
-        except Exception as e_mirror:
-            logging.warning(f"Unable to mirror locked backups to backup root: {e_mirror}")
-        
         return True
     except Exception as e:
         logging.error(f"Error saving locked backups to '{LOCKED_BACKUPS_FILE_PATH}': {e}")
@@ -400,7 +359,6 @@ def remove_profile_locks(profile_name: str) -> bool:
 
 def invalidate_cache():
     """Force reload of locked backups data from disk on next access."""
-    global _locked_cache, _cache_loaded
-    _locked_cache = {}
+    global _cache_loaded
     _cache_loaded = False
     logging.debug("Locked backups cache invalidated.")
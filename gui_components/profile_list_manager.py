@@ -2,11 +2,11 @@
 # -*- coding: utf-8 -*-
 import logging
 import os
-from PySide6.QtWidgets import (QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, 
+from PySide6.QtWidgets import (QAbstractItemView, QHeaderView, QMessageBox, QToolTip,
                                QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QStyledItemDelegate,
                                QStyleOptionViewItem, QStyle, QTextEdit, QLabel, QApplication)
-from PySide6.QtCore import Qt, QLocale, Slot, QSize, Signal, QTimer, QPoint, QEvent, QObject
-from PySide6.QtGui import QIcon, QColor, QPalette, QPainter
+from PySide6.QtCore import Qt, QLocale, Slot, QSize, Signal, QTimer, QPoint, QRect, QEvent, QObject
+from PySide6.QtGui import QIcon, QColor, QPalette, QPainter, QPixmap
 from core import core_logic
 import config
 
@@ -15,6 +15,10 @@ from gui_components import favorites_manager # Assuming it's in gui_components
 from gui_components import notes_manager  # For profile notes
 from gui_components.empty_state_widget import EmptyStateWidget
 from gui_components import icon_extractor  # For game icon extraction
+from gui_components.icon_service import ProfileIconService  # Background icon resolution
+from gui_components.profile_table_model import (ProfileTableModel, ProfileFilterProxyModel, ProfileTableView,
+                                                make_row, COLUMN_FAVORITE, COLUMN_NAME, COLUMN_DELETE,
+                                                GroupRole, HasNoteRole, CloudWarningRole)
 from common.utils import resource_path # <--- Import from utils
 from gui.gui_utils import open_folder_in_file_manager  # For opening folders cross-platform
 
@@ -39,26 +43,6 @@ class NoteOverlayButton(QPushButton):
         super().leaveEvent(event)
 
 
-class CloudSyncWarningIndicator(QLabel):
-    """Cloud-desync icon shown when online sync is enabled but cloud is offline."""
-
-    _ICON_SIZE = QSize(18, 18)
-
-    def __init__(self, icon_path, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(20, 20)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setStyleSheet("background: transparent; border: none; padding: 0px;")
-        if icon_path and os.path.exists(icon_path):
-            self.setPixmap(QIcon(icon_path).pixmap(self._ICON_SIZE))
-        else:
-            self.setText("\u26a0")
-            self.setStyleSheet(
-                "color: #FFC107; font-size: 14px; font-weight: bold; "
-                "background: transparent; border: none; padding: 0px;"
-            )
-
-
 class NotePopupWidget(QWidget):
     """Speech-bubble style popup for displaying and editing notes.
 
@@ -530,29 +514,188 @@ class ProfileSelectionDelegate(QStyledItemDelegate):
         painter.restore()
 
 
-class _NoteOverlayViewportFilter(QObject):
-    """Repositions profile note overlays after the viewport is shown or resized.
+class ProfileTableDelegate(ProfileSelectionDelegate):
+    """Delegate of the main profile table.
+
+    On top of the selection style it paints what used to be per-row widgets:
+    the delete button (column 3, selected rows only), the note button and the
+    cloud-desync warning (right edge of the name column). The geometry helpers
+    are shared with ``_ProfileTableMouseFilter`` for hit-testing.
+    """
+
+    DELETE_BUTTON_SIZE = 24
+    NOTE_BUTTON_SIZE = 26
+    CLOUD_ICON_SIZE = 20
+
+    def __init__(self, parent=None, is_dark_mode=True, table_widget=None):
+        super().__init__(parent, is_dark_mode=is_dark_mode, table_widget=table_widget)
+        self.trash_icon = None
+        self.note_icon = None
+        self.cloud_desync_icon = None
+        self.hover_pos = None  # Viewport position of the mouse, set by the mouse filter
+
+    # --- Geometry ---
+
+    def delete_button_rect(self, cell_rect):
+        size = self.DELETE_BUTTON_SIZE
+        return QRect(cell_rect.center().x() - size // 2 + 1, cell_rect.center().y() - size // 2 + 1, size, size)
+
+    def note_button_rect(self, cell_rect):
+        size = self.NOTE_BUTTON_SIZE
+        return QRect(cell_rect.right() - size - 4, cell_rect.top() + (cell_rect.height() - size) // 2, size, size)
+
+    def cloud_icon_rect(self, cell_rect, has_note):
+        size = self.CLOUD_ICON_SIZE
+        # Leave room for the note button if present
+        note_pad = 30 if has_note else 0
+        return QRect(cell_rect.right() - size - 4 - note_pad,
+                     cell_rect.top() + (cell_rect.height() - size) // 2, size, size)
+
+    def _is_hovered(self, rect):
+        return self.hover_pos is not None and rect.contains(self.hover_pos)
+
+    # --- Painting ---
 
-    On first paint, ``visualItemRect`` can still reflect a stale column width until
-    layout completes; Resize/Show on the viewport plus deferred reposition fixes the
-    few-pixel left offset until the user interacts with the UI.
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        column = index.column()
+        if column == COLUMN_DELETE:
+            if option.state & QStyle.State_Selected:
+                self._paint_button(painter, self.delete_button_rect(option.rect), self.trash_icon,
+                                   QSize(16, 16), fallback_text="")
+        elif column == COLUMN_NAME:
+            has_note = bool(index.data(HasNoteRole))
+            if index.data(CloudWarningRole):
+                rect = self.cloud_icon_rect(option.rect, has_note)
+                if self.cloud_desync_icon is not None:
+                    self.cloud_desync_icon.paint(painter, rect.adjusted(1, 1, -1, -1))
+                else:
+                    painter.save()
+                    painter.setPen(QColor("#FFC107"))
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "\u26a0")
+                    painter.restore()
+            if has_note:
+                self._paint_button(painter, self.note_button_rect(option.rect), self.note_icon,
+                                   QSize(18, 18), fallback_text="\U0001f4dd")
+
+    def _paint_button(self, painter, rect, icon, icon_size, fallback_text):
+        """Flat square button: transparent, hover background like the old QPushButtons."""
+        painter.save()
+        if self._is_hovered(rect):
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#353535") if self._is_dark_mode else QColor("#D0D0D0"))
+            painter.drawRoundedRect(rect, 4, 4)
+        if icon is not None and not icon.isNull():
+            icon_rect = QRect(0, 0, icon_size.width(), icon_size.height())
+            icon_rect.moveCenter(rect.center())
+            icon.paint(painter, icon_rect)
+        elif fallback_text:
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, fallback_text)
+        painter.restore()
+
+    def helpEvent(self, event, view, option, index):
+        """Tooltips of the painted buttons."""
+        if event.type() == QEvent.Type.ToolTip and index.isValid():
+            pos = event.pos()
+            if index.column() == COLUMN_NAME:
+                tip = index.data(CloudWarningRole)
+                if tip and self.cloud_icon_rect(option.rect, bool(index.data(HasNoteRole))).contains(pos):
+                    QToolTip.showText(event.globalPos(), tip, view)
+                    return True
+            elif index.column() == COLUMN_DELETE:
+                if self.delete_button_rect(option.rect).contains(pos) and view.selectionModel().isSelected(index):
+                    QToolTip.showText(event.globalPos(), f"Delete profile '{index.data(Qt.ItemDataRole.UserRole)}'", view)
+                    return True
+            QToolTip.hideText()
+            if index.column() != COLUMN_FAVORITE:
+                return True
+        return super().helpEvent(event, view, option, index)
+
+
+class _ProfileTableMouseFilter(QObject):
+    """Mouse handling for the buttons painted by ``ProfileTableDelegate``.
+
+    Presses on the delete/note buttons are consumed so they do not change the
+    selection (like the old button widgets); the action runs on release over
+    the same button. Mouse moves drive the hover highlight and the note
+    preview popup.
     """
+
     def __init__(self, profile_list_manager):
         super().__init__(profile_list_manager.table_widget.viewport())
         self._plm = profile_list_manager
+        self._pressed = None   # ("delete" | "note", profile_name)
+        self._hover_note = None
+
+    def _hit(self, pos):
+        """Return ("delete" | "note", profile_name, rect) for a viewport position, or None."""
+        table = self._plm.table_widget
+        delegate = self._plm.delegate
+        index = table.indexAt(pos)
+        if not index.isValid():
+            return None
+        profile_name = index.data(Qt.ItemDataRole.UserRole)
+        cell_rect = table.visualRect(index)
+        if index.column() == COLUMN_DELETE and table.selectionModel().isSelected(index):
+            rect = delegate.delete_button_rect(cell_rect)
+            if rect.contains(pos):
+                return ("delete", profile_name, rect)
+        elif index.column() == COLUMN_NAME and index.data(HasNoteRole):
+            rect = delegate.note_button_rect(cell_rect)
+            if rect.contains(pos):
+                return ("note", profile_name, rect)
+        return None
+
+    def _set_hover(self, pos):
+        delegate = self._plm.delegate
+        viewport = self._plm.table_widget.viewport()
+        if delegate.hover_pos != pos:
+            delegate.hover_pos = pos
+            viewport.update()
+        hit = self._hit(pos) if pos is not None else None
+        if hit:
+            viewport.setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            viewport.unsetCursor()
+        note_name = hit[1] if hit and hit[0] == "note" else None
+        if note_name != self._hover_note:
+            if self._hover_note is not None:
+                self._plm._on_note_hover_leave()
+            self._hover_note = note_name
+            if note_name is not None:
+                self._plm._on_note_hover_enter(note_name)
 
     def eventFilter(self, watched, event):
-        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
-            self._plm._reposition_note_overlays()
-            if hasattr(self._plm, '_reposition_cloud_sync_warning_dots'):
-                self._plm._reposition_cloud_sync_warning_dots()
+        event_type = event.type()
+        if event_type == QEvent.Type.MouseMove:
+            self._set_hover(event.position().toPoint())
+        elif event_type == QEvent.Type.Leave:
+            self._set_hover(None)
+        elif event_type == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            hit = self._hit(event.position().toPoint())
+            if hit:
+                self._pressed = hit[:2]
+                return True
+        elif event_type == QEvent.Type.MouseButtonRelease and self._pressed is not None:
+            pressed, self._pressed = self._pressed, None
+            hit = self._hit(event.position().toPoint())
+            if hit and hit[:2] == pressed:
+                kind, profile_name = pressed
+                if kind == "delete":
+                    self._plm._on_delete_button_clicked(profile_name)
+                else:
+                    self._plm._on_note_button_clicked(profile_name)
+            return True
+        elif event_type == QEvent.Type.MouseButtonDblClick and self._hit(event.position().toPoint()):
+            return True
         return False
 
 
 class ProfileListManager:
-    """Handles the QTableWidget of profiles and related action buttons."""
+    """Handles the profile table view (model, proxy, delegate) and related action buttons."""
 
-    def __init__(self, table_widget: QTableWidget, main_window):
+    def __init__(self, table_widget: ProfileTableView, main_window):
         self.table_widget = table_widget
         self.main_window = main_window # Reference to the main window
         self.profiles = main_window.profiles # Access the profiles through main_window
@@ -566,7 +709,7 @@ class ProfileListManager:
             logging.warning(f"Favorite icon 'star.png' not found in {star_icon_path}")
         if not self.empty_star_icon:
             logging.warning(f"Non-favorite icon 'emptystar.png' not found in {empty_star_icon_path}")
-        
+
         # --- Loading Trash Icon ---
         trash_icon_path = resource_path("icons/trash.png")
         self.trash_icon_path = trash_icon_path if os.path.exists(trash_icon_path) else None
@@ -590,15 +733,13 @@ class ProfileListManager:
             )
         # --- End Cloud desync icon ---
 
-        # --- Note Overlay System ---
-        self._note_overlay_buttons = []  # List of active NoteOverlayButton instances
-        self._cloud_sync_warning_dots = []  # cloud-desync icons: sync enabled but cloud offline
+        # --- Note Popup ---
         current_theme = self.main_window.current_settings.get('theme', 'dark')
         is_dark = (current_theme == 'dark')
         # Create the shared note popup widget (child of main window for proper positioning)
         self.note_popup = NotePopupWidget(parent=self.main_window, is_dark_mode=is_dark)
         self.note_popup.note_saved.connect(self._on_note_saved)
-        # --- End Note Overlay System ---
+        # --- End Note Popup ---
 
         # --- Create Empty State Widget ---
         self.empty_state_widget = EmptyStateWidget()
@@ -614,14 +755,23 @@ class ProfileListManager:
         self.empty_state_widget.hide()  # Start hidden, will be shown if no profiles
         # --- End Empty State Widget ---
 
+        # --- Model / proxy: rows are updated in place, sorting and search run in the proxy ---
+        self.model = ProfileTableModel(self.table_widget)
+        self.model.star_icon = self.star_icon
+        self.model.empty_star_icon = self.empty_star_icon
+        self.proxy_model = ProfileFilterProxyModel(self.table_widget)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.sort(COLUMN_NAME, Qt.SortOrder.AscendingOrder)
+        self.table_widget.setModel(self.proxy_model)
+
         # Configure the table
         self.table_widget.setObjectName("ProfileTable")
-        self.table_widget.setColumnCount(4)  # Added column for delete button
-        self.table_widget.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         # ExtendedSelection allows: Click=single, Ctrl+Click=toggle, Shift+Click=range
-        self.table_widget.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.table_widget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.table_widget.verticalHeader().setVisible(False)
-        self.table_widget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table_widget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_widget.setMouseTracking(True)  # Hover state of the painted buttons
 
         # Header settings
         header = self.table_widget.horizontalHeader()
@@ -640,28 +790,37 @@ class ProfileListManager:
         self.table_widget.cellClicked.connect(self.handle_favorite_toggle)
         # Double-click to open save folder
         self.table_widget.cellDoubleClicked.connect(self.handle_double_click)
-        self.table_widget.itemSelectionChanged.connect(self._update_delete_buttons_state)
-        # Repaint when selection changes (to switch between horizontal/vertical selection indicator)
+        # Repaint when selection changes (selection indicator style and delete buttons)
         self.table_widget.itemSelectionChanged.connect(self._on_selection_changed)
-        
-        # Scroll: reposition note overlays and hide popup
-        self.table_widget.verticalScrollBar().valueChanged.connect(self._reposition_note_overlays)
-        self.table_widget.verticalScrollBar().valueChanged.connect(self._reposition_cloud_sync_warning_dots)
+
+        # Scroll: hide the note preview
         self.table_widget.verticalScrollBar().valueChanged.connect(lambda: self._dismiss_note_popup_if_preview())
-        # Resize: reposition buttons when columns are resized
-        self.table_widget.horizontalHeader().sectionResized.connect(self._reposition_note_overlays)
-        self.table_widget.horizontalHeader().sectionResized.connect(self._reposition_cloud_sync_warning_dots)
-        # Fires when header geometry settles (e.g. after stretch column gets final width at startup)
-        self.table_widget.horizontalHeader().geometriesChanged.connect(self._reposition_note_overlays)
-        self.table_widget.horizontalHeader().geometriesChanged.connect(self._reposition_cloud_sync_warning_dots)
-        self._note_overlay_viewport_filter = _NoteOverlayViewportFilter(self)
-        self.table_widget.viewport().installEventFilter(self._note_overlay_viewport_filter)
+        self._mouse_filter = _ProfileTableMouseFilter(self)
+        self.table_widget.viewport().installEventFilter(self._mouse_filter)
 
         # Set Custom Delegate with current theme and table reference for multi-selection
         is_dark = (current_theme == 'dark')
-        self.delegate = ProfileSelectionDelegate(self.table_widget, is_dark_mode=is_dark, table_widget=self.table_widget)
+        self.delegate = ProfileTableDelegate(self.table_widget, is_dark_mode=is_dark, table_widget=self.table_widget)
+        self.delegate.note_icon = QIcon(self.note_icon_path) if self.note_icon_path else None
+        self.delegate.cloud_desync_icon = (
+            QIcon(self.cloud_desync_icon_path) if self.cloud_desync_icon_path else None
+        )
+        trash_icon = QIcon(self.trash_icon_path) if self.trash_icon_path else None
+        if trash_icon is None or trash_icon.isNull():
+            # Fallback to system trash icon
+            style = QApplication.instance().style()
+            trash_icon = style.standardIcon(QStyle.StandardPixmap.SP_TrashIcon) if style else None
+        self.delegate.trash_icon = trash_icon
         self.table_widget.setItemDelegate(self.delegate)
 
+        # --- Game icons are resolved in background, rows get a placeholder first ---
+        self.icon_service = ProfileIconService(parent=self.table_widget)
+        self.icon_service.icon_ready.connect(self._on_profile_icon_ready)
+        placeholder = QPixmap(icon_extractor.DEFAULT_ICON_SIZE, icon_extractor.DEFAULT_ICON_SIZE)
+        placeholder.fill(Qt.GlobalColor.transparent)
+        self.icon_placeholder = QIcon(placeholder)
+        # --- End Game Icons ---
+
         self.retranslate_headers() # Set initial headers
         # self.update_profile_table() # Will be called by MainWindow after __init__
 
@@ -673,124 +832,115 @@ class ProfileListManager:
         # Update note popup theme
         if hasattr(self, 'note_popup'):
             self.note_popup.set_dark_mode(is_dark)
-        # Rebuild note overlays with updated theme
-        if hasattr(self, '_note_overlay_buttons'):
-            self._create_note_overlays()
-        if hasattr(self, '_cloud_sync_warning_dots'):
-            self._create_cloud_sync_warning_dots()
         # Force a repaint of the table to apply the new colors
         self.table_widget.viewport().update()
 
     def _on_selection_changed(self):
         """Force repaint when selection changes to update the selection indicator style."""
         # This ensures the delegate repaints with correct style (horizontal vs vertical bar)
+        # and shows the delete button on the selected rows only.
         self.table_widget.viewport().update()
 
     def retranslate_headers(self):
         """Update the table header labels."""
-        self.table_widget.setHorizontalHeaderLabels([
+        self.model.set_header_labels([
             "", # Empty header for favorite column
             "Profile",
             "Backup Info",
             ""  # Empty header for delete column
         ])
 
+    def _profile_name_at(self, row):
+        """Profile name shown at a (proxy) row of the view, or None."""
+        index = self.proxy_model.index(row, COLUMN_NAME)
+        return index.data(Qt.ItemDataRole.UserRole) if index.isValid() else None
+
+    def _proxy_row_of(self, profile_name):
+        """View row showing ``profile_name``, or -1 (unknown or filtered out)."""
+        source_row = self.model.row_for(profile_name)
+        if source_row < 0:
+            return -1
+        proxy_index = self.proxy_model.mapFromSource(self.model.index(source_row, COLUMN_NAME))
+        return proxy_index.row() if proxy_index.isValid() else -1
+
+    def _selected_rows(self):
+        """Selected view rows, in display order."""
+        selection_model = self.table_widget.selectionModel()
+        if selection_model is None:
+            return []
+        return sorted(index.row() for index in selection_model.selectedRows())
+
     def get_selected_profile_name(self):
-        """Returns the name of the first selected profile in the table (reads from the NAME column, now index 1)."""
-        selected_rows = self.table_widget.selectionModel().selectedRows()
+        """Returns the name of the first selected profile in the table."""
+        selected_rows = self._selected_rows()
         if selected_rows:
-            first_row_index = selected_rows[0].row()
-            name_item = self.table_widget.item(first_row_index, 1) # <-- Index 1 for the name
-            if name_item and name_item.data(Qt.ItemDataRole.UserRole):
-                return name_item.data(Qt.ItemDataRole.UserRole)
+            return self._profile_name_at(selected_rows[0])
         return None
 
     def get_selected_profile_names(self) -> list:
         """Returns a list of all selected profile names (for multi-selection backup)."""
-        selected_rows = self.table_widget.selectionModel().selectedRows()
-        profile_names = []
-        for row_index in selected_rows:
-            name_item = self.table_widget.item(row_index.row(), 1)  # Column 1 = name
-            if name_item and name_item.data(Qt.ItemDataRole.UserRole):
-                profile_names.append(name_item.data(Qt.ItemDataRole.UserRole))
-        return profile_names
-    
+        return [name for name in (self._profile_name_at(row) for row in self._selected_rows()) if name]
+
     def get_selection_count(self) -> int:
         """Returns the number of selected profiles."""
-        return len(self.table_widget.selectionModel().selectedRows())
+        return len(self._selected_rows())
 
     def has_selection(self) -> bool:
         """Checks if any row is currently selected in the table."""
-        return bool(self.table_widget.selectionModel().selectedRows())
-    
+        return bool(self._selected_rows())
+
     def is_selected_profile_group(self) -> bool:
         """Check if the first selected profile is a group profile."""
-        selected_rows = self.table_widget.selectionModel().selectedRows()
+        selected_rows = self._selected_rows()
         if not selected_rows:
             return False
-        
-        first_row_index = selected_rows[0].row()
-        name_item = self.table_widget.item(first_row_index, 1)
-        if name_item:
-            # Check the stored group flag
-            return name_item.data(Qt.ItemDataRole.UserRole + 1) == "group"
-        return False
-    
+        # Check the stored group flag
+        return self.proxy_model.index(selected_rows[0], COLUMN_NAME).data(GroupRole) == "group"
+
     def get_selected_group_members(self) -> list:
         """Get the list of member profile names if a group is selected."""
         profile_name = self.get_selected_profile_name()
         if not profile_name:
             return []
-        
+
         profile_data = self.profiles.get(profile_name, {})
         if core_logic.is_group_profile(profile_data):
             return core_logic.get_group_member_profiles(profile_name, self.profiles)
         return []
 
     def select_profile_in_table(self, profile_name_to_select):
-        """Select the row corresponding to the profile name (searches in column 1)."""
+        """Select the row showing the given profile name."""
         if not profile_name_to_select:
             return
-        for row in range(self.table_widget.rowCount()):
-            item = self.table_widget.item(row, 1) # <-- Search for name in column 1
-            if item and item.data(Qt.ItemDataRole.UserRole) == profile_name_to_select:
-                self.table_widget.selectRow(row)
-                logging.debug(f"Profile '{profile_name_to_select}' selected in table at row {row}.")
-                return
+        row = self._proxy_row_of(profile_name_to_select)
+        if row >= 0:
+            self.table_widget.selectRow(row)
+            self.table_widget.scrollTo(self.proxy_model.index(row, 0))
+            logging.debug(f"Profile '{profile_name_to_select}' selected in table at row {row}.")
+            return
         logging.warning(f"Tried to select profile '{profile_name_to_select}', but not found in table.")
 
+    def set_filter_text(self, text):
+        """Show only profiles whose name contains ``text`` (case-insensitive)."""
+        self.proxy_model.setFilterFixedString(text or "")
 
     def update_profile_table(self):
-        """Update QTableWidget with profiles (sorted by favorites) and backup info.
-        
+        """Sync the table with the current profiles, favorites, notes and backup info.
+
         Uses get_visible_profiles() to filter out profiles that are members of groups,
-        showing only standalone profiles and groups themselves.
+        showing only standalone profiles and groups themselves. Rows are updated in
+        place: only profiles whose displayed values changed are repainted, and the
+        selection is kept by the view.
         """
         self.profiles = self.main_window.profiles # Reload profiles from main_window
-        selected_profile_name = self.get_selected_profile_name() # Save current selection
-        logging.debug(f"Updating profile table. Previously selected: {selected_profile_name}")
-
-        # --- Load favorites status ---
-        favorites_status = favorites_manager.load_favorites()
-        # --- End Loading ---
-
-        self.table_widget.setRowCount(0) # Clear the table
+        logging.debug("Updating profile table.")
 
         # --- Get visible profiles (filters out grouped profiles) ---
         visible_profiles = core_logic.get_visible_profiles(self.profiles)
-        
-        # --- Sorting (Favorites first, then alphabetical) ---
-        profile_names = list(visible_profiles.keys())
-        sorted_profiles = sorted(
-            profile_names,
-            key=lambda name: (not favorites_status.get(name, False), name.lower())
-        )
-        logging.debug(f"Profile list sorted for display (favorites first): {sorted_profiles}")
-        # --- End Sorting ---
 
-        if not sorted_profiles:
+        if not visible_profiles:
             # Show empty state widget instead of the table
-            self.table_widget.setRowCount(0)
+            self.model.clear()
             self.table_widget.hide()
             self.empty_state_widget.show()
             self.table_widget.setEnabled(False)
@@ -798,158 +948,163 @@ class ProfileListManager:
             # Hide empty state and show table
             self.empty_state_widget.hide()
             self.table_widget.show()
-            # Populate table with sorted profiles
             self.table_widget.setEnabled(True)
-            row_to_reselect = -1
-            for row_index, profile_name in enumerate(sorted_profiles):
-                profile_data = self.profiles.get(profile_name, {})
-                is_favorite = favorites_status.get(profile_name, False)
-                is_group = core_logic.is_group_profile(profile_data)
-                save_path = profile_data.get('path', '') # Get path (empty for groups)
-
-                # Retrieve backup info - different for groups vs regular profiles
-                current_backup_base_dir = self.main_window.current_settings.get("backup_base_dir", config.BACKUP_BASE_DIR)
-                
-                if is_group:
-                    # For groups, show aggregated info from all member profiles
-                    member_profiles = core_logic.get_group_member_profiles(profile_name, self.profiles)
-                    total_count = 0
-                    latest_backup_dt = None
-                    for member_name in member_profiles:
-                        member_data = self.profiles.get(member_name, {})
-                        m_count, m_last_dt = core_logic.get_profile_backup_summary(member_name, current_backup_base_dir, profile_data=member_data)
-                        total_count += m_count
-                        if m_last_dt and (latest_backup_dt is None or m_last_dt > latest_backup_dt):
-                            latest_backup_dt = m_last_dt
-                    count = total_count
-                    last_backup_dt = latest_backup_dt
-                else:
-                    count, last_backup_dt = core_logic.get_profile_backup_summary(profile_name, current_backup_base_dir, profile_data=profile_data)
-
-                info_str = ""
-                if is_group:
-                    # Show profile count in group + backup info
-                    member_count = len(core_logic.get_group_member_profiles(profile_name, self.profiles))
-                    if count > 0:
-                        date_str = "N/D"
-                        if last_backup_dt:
-                            try:
-                                system_locale = QLocale.system()
-                                date_str = system_locale.toString(last_backup_dt, QLocale.FormatType.ShortFormat)
-                            except Exception:
-                                date_str = "???"
-                        info_str = f"Group ({member_count}) | Last: {date_str}"
-                    else:
-                        info_str = f"Group ({member_count} profiles)"
-                elif count > 0:
-                    date_str = "N/D"
-                    if last_backup_dt:
-                        try:
-                            # Use system locale for date formatting instead of app language setting
-                            system_locale = QLocale.system()
-                            date_str = system_locale.toString(last_backup_dt, QLocale.FormatType.ShortFormat)
-                            logging.debug(f"Using system locale for date formatting: {system_locale.name()}")
-                        except Exception as e:
-                            logging.error(f"Error formatting last backup date for {profile_name}: {e}", exc_info=True)
-                            date_str = "???"
-
-                    backup_label_singular = "Backup"
-                    backup_label_plural = "Backups"
-                    last_label = "Last"
-                    backup_label = backup_label_singular if count == 1 else backup_label_plural
-                    info_str = f"{backup_label}: {count} | {last_label}: {date_str}"
-                else:
-                     info_str = "No backups"
-
-                # --- Create Favorite Item (Column 0) ---
-                fav_item = QTableWidgetItem()
-                fav_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                if is_favorite and self.star_icon:
-                    fav_item.setIcon(self.star_icon)
-                    fav_item.setToolTip("Remove from favorites")
-                elif self.empty_star_icon: # Use empty star if available
-                    fav_item.setIcon(self.empty_star_icon)
-                    fav_item.setToolTip("Add to favorites")
-                else: # Fallback without empty star icon
-                    fav_item.setToolTip("Add/Remove favorite") # Fallback
-
-                fav_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
-                fav_item.setData(Qt.ItemDataRole.UserRole, profile_name) # Save name for toggle
-                fav_item.setSizeHint(QSize(32, 32))
-                # --- End Creating Favorite Item ---
-
-                # --- Create Name Item (Column 1) ---
-                name_item = QTableWidgetItem(profile_name)
-                name_item.setData(Qt.ItemDataRole.UserRole, profile_name) # Save name for row selection
-                
-                # --- Add Icon (custom icon > game icon > folder icon for groups) ---
-                show_icons = self.main_window.current_settings.get("show_profile_icons", True)
-                if is_group:
-                    # Store group flag for context menu handling
-                    name_item.setData(Qt.ItemDataRole.UserRole + 1, "group")
-                    # Try custom icon first (works also when show_icons is on)
-                    group_icon = None
-                    if show_icons:
-                        group_icon = icon_extractor.get_profile_icon(profile_data, profile_name)
-                    if group_icon and not group_icon.isNull():
-                        name_item.setIcon(group_icon)
-                    else:
-                        # Default: folder icon for groups
-                        from PySide6.QtWidgets import QApplication, QStyle
-                        style = QApplication.instance().style()
-                        if style:
-                            folder_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
-                            name_item.setIcon(folder_icon)
-                elif show_icons:
-                    game_icon = icon_extractor.get_profile_icon(profile_data, profile_name)
-                    if game_icon and not game_icon.isNull():
-                        name_item.setIcon(game_icon)
-                # --- End Game Icon ---
-
-                # --- Create Info Item (Column 2) ---
-                info_item = QTableWidgetItem(info_str)
-                info_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-                # Insert row and items in the correct columns
-                self.table_widget.insertRow(row_index)
-                self.table_widget.setItem(row_index, 0, fav_item)
-                self.table_widget.setItem(row_index, 1, name_item)
-                self.table_widget.setItem(row_index, 2, info_item)
-
-                # --- Create Delete Button (Column 3) ---
-                delete_widget = self._create_delete_button(profile_name)
-                self.table_widget.setCellWidget(row_index, 3, delete_widget)
-
-                # Check if we need to reselect the row
-                if profile_name == selected_profile_name:
-                    row_to_reselect = row_index
-
-            # Reselect the row
-            if row_to_reselect != -1:
-                logging.debug(f"Reselecting row {row_to_reselect} for profile '{selected_profile_name}'")
-                self.table_widget.selectRow(row_to_reselect)
-            elif selected_profile_name:
-                 logging.debug(f"Previously selected profile '{selected_profile_name}' not found after update.")
+            context = self._row_context()
+            rows = [self._build_row(name, context) for name in visible_profiles]
+            self.model.set_rows(rows)
 
         # Update button states AFTER populating the table
         self.main_window.update_action_button_states()
-        
-        # --- Create note overlay buttons for profiles with notes ---
-        self._create_note_overlays()
-        # --- Yellow dots: online sync enabled but cloud currently unavailable ---
-        self._create_cloud_sync_warning_dots()
-        # --- End note overlays ---
-
         logging.debug("Profile table update finished.")
 
+    def refresh_profile(self, profile_name):
+        """Update the single row showing ``profile_name`` (e.g. after one backup).
+
+        Group members are shown through their group, so the group row is
+        refreshed instead. Falls back to a full update for unknown profiles.
+        """
+        self.profiles = self.main_window.profiles
+        profile_data = self.profiles.get(profile_name)
+        if isinstance(profile_data, dict) and profile_data.get('member_of_group'):
+            profile_name = profile_data.get('member_of_group')
+        if self.model.row_for(profile_name) < 0 or profile_name not in self.profiles:
+            self.update_profile_table()
+            return
+        self.model.update_row(self._build_row(profile_name, self._row_context()))
+
+    def _row_context(self) -> dict:
+        """State shared by all rows of one refresh (read once, not per row)."""
+        try:
+            from cloud_utils.cloud_sync_availability import profile_wants_online_sync
+        except Exception:
+            profile_wants_online_sync = None
+
+        cloud_warning = ""
+        panel = getattr(self.main_window, "cloud_panel", None)
+        if profile_wants_online_sync is not None and panel is not None and hasattr(panel, "is_online_sync_available"):
+            available, reason = panel.is_online_sync_available()
+            if not available:
+                cloud_warning = (
+                    f"Online sync is enabled for this profile but paused:\n"
+                    f"{reason or 'cloud unavailable'}.\n\n"
+                    f"Local automatic backups still run; open the Cloud panel to connect."
+                )
+
+        return {
+            'favorites': favorites_manager.load_favorites(),
+            'notes': notes_manager.load_notes() or {},
+            'backup_base_dir': self.main_window.current_settings.get("backup_base_dir", config.BACKUP_BASE_DIR),
+            'show_icons': self.main_window.current_settings.get("show_profile_icons", True),
+            'cloud_warning': cloud_warning,
+            'wants_online_sync': profile_wants_online_sync,
+        }
+
+    def _build_row(self, profile_name, context) -> dict:
+        """Compute the displayed values of one profile row."""
+        profile_data = self.profiles.get(profile_name, {})
+        is_group = core_logic.is_group_profile(profile_data)
+        current_backup_base_dir = context['backup_base_dir']
+
+        # Retrieve backup info - different for groups vs regular profiles
+        if is_group:
+            # For groups, show aggregated info from all member profiles
+            member_profiles = core_logic.get_group_member_profiles(profile_name, self.profiles)
+            total_count = 0
+            latest_backup_dt = None
+            for member_name in member_profiles:
+                member_data = self.profiles.get(member_name, {})
+                m_count, m_last_dt = core_logic.get_profile_backup_summary(member_name, current_backup_base_dir, profile_data=member_data)
+                total_count += m_count
+                if m_last_dt and (latest_backup_dt is None or m_last_dt > latest_backup_dt):
+                    latest_backup_dt = m_last_dt
+            count = total_count
+            last_backup_dt = latest_backup_dt
+        else:
+            count, last_backup_dt = core_logic.get_profile_backup_summary(profile_name, current_backup_base_dir, profile_data=profile_data)
+
+        info_str = ""
+        if is_group:
+            # Show profile count in group + backup info
+            member_count = len(member_profiles)
+            if count > 0:
+                date_str = "N/D"
+                if last_backup_dt:
+                    try:
+                        system_locale = QLocale.system()
+                        date_str = system_locale.toString(last_backup_dt, QLocale.FormatType.ShortFormat)
+                    except Exception:
+                        date_str = "???"
+                info_str = f"Group ({member_count}) | Last: {date_str}"
+            else:
+                info_str = f"Group ({member_count} profiles)"
+        elif count > 0:
+            date_str = "N/D"
+            if last_backup_dt:
+                try:
+                    # Use system locale for date formatting instead of app language setting
+                    system_locale = QLocale.system()
+                    date_str = system_locale.toString(last_backup_dt, QLocale.FormatType.ShortFormat)
+                except Exception as e:
+                    logging.error(f"Error formatting last backup date for {profile_name}: {e}", exc_info=True)
+                    date_str = "???"
+
+            backup_label_singular = "Backup"
+            backup_label_plural = "Backups"
+            last_label = "Last"
+            backup_label = backup_label_singular if count == 1 else backup_label_plural
+            info_str = f"{backup_label}: {count} | {last_label}: {date_str}"
+        else:
+            info_str = "No backups"
+
+        # Yellow warning: online sync enabled but cloud currently unavailable
+        cloud_warning = ""
+        wants_online_sync = context['wants_online_sync']
+        if context['cloud_warning'] and wants_online_sync is not None and wants_online_sync(profile_data):
+            cloud_warning = context['cloud_warning']
+
+        return make_row(
+            profile_name,
+            is_favorite=context['favorites'].get(profile_name, False),
+            is_group=is_group,
+            info=info_str,
+            icon=self._profile_icon(profile_name, profile_data, is_group, context['show_icons']),
+            has_note=profile_name in context['notes'],
+            cloud_warning=cloud_warning,
+        )
+
+    def _profile_icon(self, profile_name, profile_data, is_group, show_icons):
+        """Icon of a row (custom icon > game icon > folder icon for groups); placeholder while resolving."""
+        icon = None
+        if show_icons:
+            icon = self.icon_service.icon_for(profile_name, profile_data)
+            if icon is None and self.icon_service.is_pending(profile_name, profile_data):
+                icon = self.icon_placeholder
+        if icon is None and is_group:
+            # Default: folder icon for groups
+            style = QApplication.instance().style()
+            if style:
+                icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        return icon
+
+    @Slot(str)
+    def _on_profile_icon_ready(self, profile_name):
+        """Update the row of a profile once its icon has been resolved."""
+        row = self.model.get_row(profile_name)
+        if row is None:
+            return  # Row removed by a later table refresh
+        profile_data = self.profiles.get(profile_name, {})
+        show_icons = self.main_window.current_settings.get("show_profile_icons", True)
+        updated = dict(row)
+        updated['icon'] = self._profile_icon(
+            profile_name, profile_data, core_logic.is_group_profile(profile_data), show_icons,
+        )
+        self.model.update_row(updated)
+
     @Slot(int, int)
     def handle_favorite_toggle(self, row, column):
         """Handles the click on the cell to change the favorite status."""
         if column == 0: # Only if clicking on the first column (Favorites)
-            item = self.table_widget.item(row, 0)
-            if not item: return # Security check
-
-            profile_name = item.data(Qt.ItemDataRole.UserRole)
+            profile_name = self._profile_name_at(row)
             # Additional check that the name is valid in the current profiles
             if not profile_name or profile_name not in self.profiles:
                  logging.warning(f"Favorite toggle requested for invalid or non-existent profile: row {row}, name '{profile_name}'")
@@ -961,32 +1116,17 @@ class ProfileListManager:
             success = favorites_manager.toggle_favorite(profile_name)
 
             if success:
-                # Read the status *just saved* for security
-                new_status = favorites_manager.is_favorite(profile_name)
-
-                # Update the icon and tooltip in the clicked cell
-                if new_status and self.star_icon:
-                    item.setIcon(self.star_icon)
-                    item.setToolTip("Remove from favorites")
-                elif self.empty_star_icon: # Use empty star if available
-                    item.setIcon(self.empty_star_icon)
-                    item.setToolTip("Add to favorites")
-                else: # Fallback without empty star icon
-                    item.setIcon(QIcon()) # Remove icon
-                    item.setToolTip("Add/Remove favorite")
-
-                # --- Update the table to apply favorites sorting ---
-                logging.debug("Update table to apply favorites sorting...")
-                self.update_profile_table()
-                # Note: update_profile_table() will attempt to reselect the last selected row
-
+                # Read the status *just saved* for security; the proxy re-sorts the row
+                updated = dict(self.model.get_row(profile_name) or make_row(profile_name))
+                updated['is_favorite'] = favorites_manager.is_favorite(profile_name)
+                self.model.update_row(updated)
             else:
                 # The saving failed (manager has already logged the error)
                 QMessageBox.warning(self.main_window,
                                     "Error",
                                     f"Unable to save favorite status for '{profile_name}'.")
                 # We don't update the icon in the GUI if the saving fails
-                
+
     @Slot(int, int)
     def handle_double_click(self, row, column):
         """Handles double-click on a profile row to open the save folder.
@@ -998,10 +1138,7 @@ class ProfileListManager:
             return
             
         # Get the profile name from the clicked row
-        profile_name = None
-        item = self.table_widget.item(row, 1)  # Get item from name column (index 1)
-        if item:
-            profile_name = item.data(Qt.ItemDataRole.UserRole)
+        profile_name = self._profile_name_at(row)
         
         if not profile_name or profile_name not in self.profiles:
             logging.warning(f"Double-click on invalid or non-existent profile: row {row}, name '{profile_name}'")
@@ -1069,333 +1206,41 @@ class ProfileListManager:
                     logging.error(f"Error opening parent folder: {message_parent}")
                     self.main_window.status_label.setText(f"Error opening parent folder: {message_parent}")
 
-    def _create_delete_button(self, profile_name: str) -> QWidget:
-        """Create a styled delete button widget for the profile row.
-        
-        Styled to match the Lock checkbox in Manage Backups dialog exactly.
-        """
-        # Container widget with transparent background (like lock checkbox)
-        button_widget = QWidget()
-        button_widget.setStyleSheet("background-color: transparent;")
-        button_layout = QHBoxLayout(button_widget)
-        button_layout.setContentsMargins(0, 0, 0, 0)
-        button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        button = QPushButton()
-        button.setProperty("profile_name", profile_name)
-        button.setEnabled(False)  # Start disabled, will be enabled for selected row
-        button.setVisible(False)  # Start hidden, will be shown only for selected row
-        button.setFlat(True)  # Flat button for cleaner look
-        button.setToolTip(f"Delete profile '{profile_name}'")
-        
-        # Set trash icon - try custom icon first, then fallback to system icon
-        icon_set = False
-        if self.trash_icon_path and os.path.exists(self.trash_icon_path):
-            trash_icon = QIcon(self.trash_icon_path)
-            if not trash_icon.isNull():
-                button.setIcon(trash_icon)
-                icon_set = True
-                logging.debug(f"Loaded trash icon from: {self.trash_icon_path}")
-        
-        if not icon_set:
-            # Fallback to system trash icon
-            from PySide6.QtWidgets import QApplication, QStyle
-            style = QApplication.instance().style()
-            if style:
-                system_icon = style.standardIcon(QStyle.StandardPixmap.SP_TrashIcon)
-                button.setIcon(system_icon)
-                logging.debug("Using system trash icon as fallback")
-        
-        # Custom button styling - Theme-aware colors
-        current_theme = self.main_window.current_settings.get('theme', 'dark')
-        if current_theme == 'dark':
-            hover_bg = "#353535"
-            pressed_bg = "#b00020"
-        else:
-            hover_bg = "#D0D0D0"
-            pressed_bg = "#D32F2F"
-        
-        button.setStyleSheet(f"""
-            QPushButton {{
-                width: 24px;
-                height: 24px;
-                min-width: 24px;
-                min-height: 24px;
-                max-width: 24px;
-                max-height: 24px;
-                border-radius: 4px;
-                border: none;
-                background-color: transparent;
-                padding: 0px;
-                margin: 0px;
-            }}
-            QPushButton:hover {{
-                border: 2px solid #888888;
-                background-color: {hover_bg};
-            }}
-            QPushButton:pressed {{
-                border: 2px solid {pressed_bg};
-                background-color: {pressed_bg};
-            }}
-        """)
-        
-        # Set icon size to fit nicely inside the 24x24 button (leaving room for border)
-        button.setIconSize(QSize(16, 16))
-        
-        # Connect to delete handler
-        button.clicked.connect(lambda: self._on_delete_button_clicked(profile_name))
-        
-        button_layout.addWidget(button)
-        return button_widget
-    
-    def _update_delete_buttons_state(self):
-        """Show delete button for all selected rows, hide for others."""
-        selected_rows = self.table_widget.selectionModel().selectedRows()
-        selected_row_indices = {row.row() for row in selected_rows}  # Use set for O(1) lookup
-        
-        for row in range(self.table_widget.rowCount()):
-            button_widget = self.table_widget.cellWidget(row, 3)  # Column 3 is the delete button
-            if button_widget:
-                button = button_widget.findChild(QPushButton)
-                if button:
-                    # Show button on ALL selected rows, hide on others
-                    is_selected = (row in selected_row_indices)
-                    button.setVisible(is_selected)
-                    button.setEnabled(is_selected)
-    
     def _on_delete_button_clicked(self, profile_name: str):
         """Handle delete button click by delegating to the main window's delete handler.
-        
+
         Preserves multi-selection: if multiple profiles are selected, all will be processed.
         Only selects the clicked profile if no row is currently selected.
         """
         if not profile_name or profile_name not in self.profiles:
             logging.warning(f"Delete button clicked for invalid profile: '{profile_name}'")
             return
-        
+
         logging.debug(f"Delete button clicked for profile: '{profile_name}'")
-        
+
         # Only select the profile if there's no current selection
         # This preserves multi-selection when user clicks delete on one of the selected profiles
-        selected_rows = self.table_widget.selectionModel().selectedRows()
-        if not selected_rows:
+        if not self.has_selection():
             self.select_profile_in_table(profile_name)
-        
+
         if hasattr(self.main_window, 'handlers') and self.main_window.handlers:
             self.main_window.handlers.handle_delete_profile()
 
 
     # ========================================================================
-    # NOTE OVERLAY SYSTEM
+    # NOTE POPUP
     # ========================================================================
 
-    def _clear_note_overlays(self):
-        """Remove all existing note overlay buttons from the viewport."""
-        for btn in self._note_overlay_buttons:
-            try:
-                btn.hover_entered.disconnect()
-                btn.hover_left.disconnect()
-                btn.clicked.disconnect()
-                btn.deleteLater()
-            except Exception:
-                pass
-        self._note_overlay_buttons.clear()
-
-    def _create_note_overlays(self):
-        """Create floating note buttons for all rows that have notes.
-        Buttons are children of the table viewport, positioned over column 1."""
-        self._clear_note_overlays()
-
-        all_notes = notes_manager.load_notes()
-        if not all_notes:
-            return
-
-        current_theme = self.main_window.current_settings.get('theme', 'dark')
-        is_dark = (current_theme == 'dark')
-        hover_bg = "#353535" if is_dark else "#D0D0D0"
-
-        viewport = self.table_widget.viewport()
-
-        for row in range(self.table_widget.rowCount()):
-            name_item = self.table_widget.item(row, 1)
-            if not name_item:
-                continue
-            profile_name = name_item.data(Qt.ItemDataRole.UserRole)
-            if not profile_name or profile_name not in all_notes:
-                continue
-
-            # Create the note button as a child of the viewport
-            btn = NoteOverlayButton(profile_name, parent=viewport)
-            btn.setFlat(True)
-
-            # Set icon or fallback text
-            if self.note_icon_path and os.path.exists(self.note_icon_path):
-                btn.setIcon(QIcon(self.note_icon_path))
-                btn.setIconSize(QSize(18, 18))
-            else:
-                btn.setText("\U0001f4dd")
-
-            btn.setFixedSize(26, 26)
-            #btn.setToolTip(f"Note for '{profile_name}'")
-
-            # Transparent square button styling (matching delete button pattern)
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    width: 26px;
-                    height: 26px;
-                    min-width: 26px;
-                    min-height: 26px;
-                    max-width: 26px;
-                    max-height: 26px;
-                    border-radius: 4px;
-                    border: none;
-                    background-color: transparent;
-                    padding: 0px;
-                    margin: 0px;
-                }}
-                QPushButton:hover {{
-                    background-color: {hover_bg};
-                }}
-            """)
-
-            # Connect signals
-            btn.hover_entered.connect(self._on_note_hover_enter)
-            btn.hover_left.connect(self._on_note_hover_leave)
-            btn.clicked.connect(lambda checked=False, pn=profile_name: self._on_note_button_clicked(pn))
-
-            # Store row index as a property for repositioning
-            btn.setProperty("row_index", row)
-            self._note_overlay_buttons.append(btn)
-            btn.show()
-
-        # Position all buttons correctly
-        self._reposition_note_overlays()
-        # Defer once: at startup ``visualItemRect`` may still be wrong until the event loop runs
-        QTimer.singleShot(0, self._reposition_note_overlays)
-
-    def _reposition_note_overlays(self):
-        """Reposition all note overlay buttons at the far right of the name column."""
-        viewport = self.table_widget.viewport()
-        if not viewport:
-            return
-        viewport_rect = viewport.rect()
-
-        for btn in self._note_overlay_buttons:
-            row = btn.property("row_index")
-            if row is None:
-                btn.hide()
-                continue
-
-            # Get the visual rect for the name cell (column 1)
-            name_item = self.table_widget.item(row, 1)
-            if not name_item:
-                btn.hide()
-                continue
-
-            item_rect = self.table_widget.visualItemRect(name_item)
-
-            # Check if the row is visible in the viewport
-            if not viewport_rect.intersects(item_rect):
-                btn.hide()
-                continue
-
-            # Position: always at the far right edge of the column 1
-            btn_x = item_rect.right() - btn.width() - 4
-            btn_y = item_rect.top() + (item_rect.height() - btn.height()) // 2
-            
-            btn.move(btn_x, btn_y)
-            btn.show()
-            btn.raise_()
-
-    def _clear_cloud_sync_warning_dots(self):
-        """Remove cloud-desync warning indicators from the viewport."""
-        for dot in getattr(self, "_cloud_sync_warning_dots", []):
-            try:
-                dot.deleteLater()
-            except Exception:
-                pass
-        self._cloud_sync_warning_dots = []
-
-    def _create_cloud_sync_warning_dots(self):
-        """Show cloud-desync icon when online sync is enabled but cloud is offline."""
-        self._clear_cloud_sync_warning_dots()
-
-        try:
-            from cloud_utils.cloud_sync_availability import profile_wants_online_sync
-        except Exception:
-            return
-
-        panel = getattr(self.main_window, "cloud_panel", None)
-        available, reason = True, ""
-        if panel is not None and hasattr(panel, "is_online_sync_available"):
-            available, reason = panel.is_online_sync_available()
-        if available:
-            return
-
-        viewport = self.table_widget.viewport()
-        if viewport is None:
-            return
-
-        all_notes = notes_manager.load_notes()
-        tip_reason = reason or "cloud unavailable"
-        for row in range(self.table_widget.rowCount()):
-            name_item = self.table_widget.item(row, 1)
-            if not name_item:
-                continue
-            profile_name = name_item.data(Qt.ItemDataRole.UserRole)
-            profile_data = self.profiles.get(profile_name, {})
-            if not profile_wants_online_sync(profile_data):
-                continue
-
-            dot = CloudSyncWarningIndicator(self.cloud_desync_icon_path, parent=viewport)
-            dot.setToolTip(
-                f"Online sync is enabled for this profile but paused:\n"
-                f"{tip_reason}.\n\n"
-                f"Local automatic backups still run; open the Cloud panel to connect."
-            )
-            dot.setProperty("row_index", row)
-            dot.setProperty("has_note", profile_name in all_notes)
-            self._cloud_sync_warning_dots.append(dot)
-            dot.show()
-
-        self._reposition_cloud_sync_warning_dots()
-        QTimer.singleShot(0, self._reposition_cloud_sync_warning_dots)
-
-    def _reposition_cloud_sync_warning_dots(self):
-        """Place cloud-desync icons at the right edge of the profile name cell."""
-        viewport = self.table_widget.viewport()
-        if not viewport:
-            return
-        viewport_rect = viewport.rect()
-
-        for dot in getattr(self, "_cloud_sync_warning_dots", []):
-            row = dot.property("row_index")
-            if row is None:
-                dot.hide()
-                continue
-            name_item = self.table_widget.item(row, 1)
-            if not name_item:
-                dot.hide()
-                continue
-            item_rect = self.table_widget.visualItemRect(name_item)
-            if not viewport_rect.intersects(item_rect):
-                dot.hide()
-                continue
-            # Right side of the name column; leave room for the note button if present.
-            note_pad = 30 if dot.property("has_note") else 0
-            dot_x = item_rect.right() - dot.width() - 4 - note_pad
-            dot_y = item_rect.top() + (item_rect.height() - dot.height()) // 2
-            dot.move(dot_x, dot_y)
-            dot.show()
-            dot.raise_()
-
     def _get_popup_position(self, profile_name):
         """Calculate the popup position in main window coordinates, below the note button."""
-        for btn in self._note_overlay_buttons:
-            if btn.profile_name == profile_name:
+        row = self._proxy_row_of(profile_name)
+        if row >= 0:
+            cell_rect = self.table_widget.visualRect(self.proxy_model.index(row, COLUMN_NAME))
+            if self.table_widget.viewport().rect().intersects(cell_rect):
+                note_rect = self.delegate.note_button_rect(cell_rect)
                 # Map button's bottom-left to main window coordinates
-                btn_bottom_left = btn.mapTo(self.main_window, QPoint(0, btn.height()))
-                return QPoint(btn_bottom_left.x() - 50, btn_bottom_left.y() + 4)
+                btn_bottom_left = self.table_widget.viewport().mapTo(self.main_window, note_rect.bottomLeft())
+                return QPoint(btn_bottom_left.x() - 50, btn_bottom_left.y() + 5)
         # Fallback: center of table mapped to main window
         table_center = self.table_widget.mapTo(self.main_window,
                                                 QPoint(self.table_widget.width() // 3,
@@ -1448,8 +1293,12 @@ class ProfileListManager:
         """Handle note_saved signal from the popup: persist and refresh overlays."""
         notes_manager.set_note(profile_name, note_text)
         logging.info(f"Note {'saved' if note_text.strip() else 'removed'} for profile '{profile_name}'.")
-        # Rebuild overlays to show/hide note icons
-        self._create_note_overlays()
+        # Show/hide the note button of that row
+        row = self.model.get_row(profile_name)
+        if row is not None:
+            updated = dict(row)
+            updated['has_note'] = bool(note_text.strip())
+            self.model.update_row(updated)
 
     def _dismiss_note_popup_if_preview(self):
         """Dismiss the note popup if it's showing in preview mode (e.g. on scroll)."""
@@ -0,0 +1,250 @@
+# gui_components/profile_table_model.py
+# -*- coding: utf-8 -*-
+"""
+Model/view pieces of the main profile table.
+
+``ProfileTableModel`` keeps one plain dict per visible profile (name,
+favorite, group flag, backup info, icon, note and cloud-warning flags) in
+insertion order; ``ProfileFilterProxyModel`` sorts it (favorites first, then
+alphabetical) and applies the search filter; ``ProfileTableView`` is the
+QTableView shown in the main window.
+
+Refreshes are incremental: ``set_rows`` inserts new profiles, removes
+deleted ones and emits ``dataChanged`` only for rows whose values changed,
+so selection and scroll position survive and unchanged rows are not
+repainted. Per-row widgets (delete button, note button, cloud warning) are
+painted by ``ProfileSelectionDelegate`` instead of being cell widgets.
+"""
+from PySide6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                            QSize, Signal)
+from PySide6.QtWidgets import QTableView
+
+# Column layout
+COLUMN_FAVORITE = 0
+COLUMN_NAME = 1
+COLUMN_INFO = 2
+COLUMN_DELETE = 3
+COLUMN_COUNT = 4
+
+# Custom roles
+GroupRole = Qt.ItemDataRole.UserRole + 1    # "group" for group profiles (as before)
+SortKeyRole = Qt.ItemDataRole.UserRole + 2  # (not favorite, lowercase name)
+HasNoteRole = Qt.ItemDataRole.UserRole + 3
+CloudWarningRole = Qt.ItemDataRole.UserRole + 4  # tooltip text, "" when sync is fine
+
+# Keys of a row dict that, when changed, need a repaint of the row
+_ROW_FIELDS = ('is_favorite', 'is_group', 'info', 'icon', 'has_note', 'cloud_warning')
+
+
+def make_row(name, is_favorite=False, is_group=False, info="", icon=None,
+             has_note=False, cloud_warning=""):
+    """Build the dict stored by ProfileTableModel for one profile."""
+    return {
+        'name': name,
+        'is_favorite': bool(is_favorite),
+        'is_group': bool(is_group),
+        'info': info,
+        'icon': icon,
+        'has_note': bool(has_note),
+        'cloud_warning': cloud_warning or "",
+    }
+
+
+def _same_value(a, b) -> bool:
+    if a is b:
+        return True
+    if hasattr(a, 'cacheKey') and hasattr(b, 'cacheKey'):
+        return a.cacheKey() == b.cacheKey()  # QIcon
+    if hasattr(a, 'cacheKey') or hasattr(b, 'cacheKey'):
+        return False
+    return a == b
+
+
+class ProfileTableModel(QAbstractTableModel):
+    """Flat list of profile rows; display order is up to the proxy model."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}  # profile name -> source row
+        self._headers = ["", "Profile", "Backup Info", ""]
+        self.star_icon = None
+        self.empty_star_icon = None
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.UserRole:
+            return row['name']  # Every column carries the profile name
+        if role == SortKeyRole:
+            return (not row['is_favorite'], row['name'].lower())
+
+        if column == COLUMN_FAVORITE:
+            if role == Qt.ItemDataRole.DecorationRole:
+                if row['is_favorite'] and self.star_icon:
+                    return self.star_icon
+                return self.empty_star_icon
+            if role == Qt.ItemDataRole.ToolTipRole:
+                if row['is_favorite'] and self.star_icon:
+                    return "Remove from favorites"
+                return "Add to favorites" if self.empty_star_icon else "Add/Remove favorite"
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return int(Qt.AlignmentFlag.AlignCenter)
+            if role == Qt.ItemDataRole.SizeHintRole:
+                return QSize(32, 32)
+        elif column == COLUMN_NAME:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return row['name']
+            if role == Qt.ItemDataRole.DecorationRole:
+                return row['icon']
+            if role == GroupRole:
+                return "group" if row['is_group'] else None
+            if role == HasNoteRole:
+                return row['has_note']
+            if role == CloudWarningRole:
+                return row['cloud_warning']
+        elif column == COLUMN_INFO:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return row['info']
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    # --- Updates ---
+
+    def set_header_labels(self, labels):
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, COLUMN_COUNT - 1)
+
+    def profile_names(self):
+        return [row['name'] for row in self._rows]
+
+    def row_for(self, profile_name):
+        """Source row of a profile, or -1."""
+        return self._row_of.get(profile_name, -1)
+
+    def get_row(self, profile_name):
+        row = self._row_of.get(profile_name)
+        return None if row is None else self._rows[row]
+
+    def set_rows(self, rows):
+        """Make the model contain exactly ``rows`` with minimal change signals."""
+        wanted = {row['name']: row for row in rows}
+
+        # Removals, bottom-up so the remaining indices stay valid
+        for source_row in range(len(self._rows) - 1, -1, -1):
+            if self._rows[source_row]['name'] not in wanted:
+                self.beginRemoveRows(QModelIndex(), source_row, source_row)
+                del self._rows[source_row]
+                self.endRemoveRows()
+        self._reindex()
+
+        # Updates of existing rows
+        for row in rows:
+            if row['name'] in self._row_of:
+                self.update_row(row)
+
+        # Additions, appended (sorting is the proxy's job)
+        new_rows = [row for row in rows if row['name'] not in self._row_of]
+        if new_rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._rows.extend(dict(row) for row in new_rows)
+            self._reindex()
+            self.endInsertRows()
+
+    def update_row(self, row):
+        """Replace the values of an existing row; emits dataChanged only if something differs."""
+        source_row = self._row_of.get(row['name'])
+        if source_row is None:
+            return False
+        current = self._rows[source_row]
+        changed = [field for field in _ROW_FIELDS
+                   if field in row and not _same_value(current.get(field), row[field])]
+        if not changed:
+            return False
+        for field in changed:
+            current[field] = row[field]
+        if changed == ['icon']:
+            first_column = last_column = COLUMN_NAME
+        else:
+            first_column, last_column = 0, COLUMN_COUNT - 1
+        self.dataChanged.emit(self.index(source_row, first_column), self.index(source_row, last_column))
+        return True
+
+    def clear(self):
+        if self._rows:
+            self.beginResetModel()
+            self._rows = []
+            self._row_of = {}
+            self.endResetModel()
+
+    def _reindex(self):
+        self._row_of = {row['name']: i for i, row in enumerate(self._rows)}
+
+
+class ProfileFilterProxyModel(QSortFilterProxyModel):
+    """Favorites first, then alphabetical; filters on the profile name."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SortKeyRole)
+        self.setFilterKeyColumn(COLUMN_NAME)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def lessThan(self, left, right):
+        left_key = self.sourceModel().data(left, SortKeyRole)
+        right_key = self.sourceModel().data(right, SortKeyRole)
+        if left_key is None or right_key is None:
+            return super().lessThan(left, right)
+        return left_key < right_key
+
+
+class ProfileTableView(QTableView):
+    """QTableView with the few QTableWidget-style helpers the main window uses."""
+
+    itemSelectionChanged = Signal()
+    cellClicked = Signal(int, int)
+    cellDoubleClicked = Signal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clicked.connect(lambda index: self.cellClicked.emit(index.row(), index.column()))
+        self.doubleClicked.connect(lambda index: self.cellDoubleClicked.emit(index.row(), index.column()))
+
+    def setModel(self, model):
+        super().setModel(model)
+        selection_model = self.selectionModel()
+        if selection_model is not None:
+            selection_model.selectionChanged.connect(lambda *_: self.itemSelectionChanged.emit())
+
+    def rowCount(self) -> int:
+        model = self.model()
+        return model.rowCount() if model is not None else 0
+
+    def currentRow(self) -> int:
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
@@ -26,6 +26,15 @@ except ImportError:
 # are deferred until after single-instance check to speed up second instance detection
 
 # --- Helper Function for Cleanup ---
+def _flush_config_writes():
+    """Writes pending state store exports and queued .savestate mirror copies (exit hook)."""
+    try:
+        from core import state_store, mirror_writer
+        state_store.flush_all()
+        mirror_writer.flush_on_exit()
+    except Exception as e:
+        logging.error(f"Error flushing pending config writes: {e}")
+
 def cleanup_instance_lock(local_server, shared_memory):
     """Closes the local server, releases the shared memory, and cleans up lock file on Linux."""
     logging.debug("Executing instance cleanup (detach shared memory, close server, remove lock file)...")
@@ -537,6 +546,8 @@ if __name__ == "__main__":
                 try:
                     # Connect cleanup to QApplication exit (DO THIS EARLY)
                     app.aboutToQuit.connect(lambda: cleanup_instance_lock(local_server, shared_memory))
+                    # Write pending config exports and their .savestate mirrors before exiting
+                    app.aboutToQuit.connect(_flush_config_writes)
 
                     # --- Caricamento Impostazioni (senza applicazione traduttore qui) ---
                     # if splash: # Aggiorna messaggio se lo splash è attivo
@@ -3,6 +3,7 @@ save_path_finder_improved.py
 Versione migliorata del modulo per la ricerca dei percorsi di salvataggio dei giochi.
 """
 
+import copy
 import platform
 import os
 import re
@@ -14,7 +15,7 @@ from enum import Enum
 
 
 import config
-from common import cancellation_utils
+from common import cancellation_utils, search_phases
 
 # Importa thefuzz se disponibile
 try:
@@ -1073,22 +1074,73 @@ class SavePathFinder:
         
         common_locations = self._get_common_locations()
         
-        # Esegui le ricerche in sequenza, interrompendo se cancellato
+        # Ogni fase riceve il finder su cui lavorare (self o una sua copia)
         search_steps = [
-            (self._check_steam_userdata, "Steam userdata check"),
-            (lambda: self._perform_direct_path_checks(common_locations), "direct path checks"),
-            (lambda: self._perform_exploratory_search(common_locations), "exploratory search"),
-            (self._search_install_directory, "install directory search"),
-            (self._search_parent_directories, "parent directories search"),
+            (lambda finder: finder._check_steam_userdata(), "Steam userdata check"),
+            (lambda finder: finder._perform_direct_path_checks(common_locations), "direct path checks"),
         ]
-        
+        # Una fase esplorativa per locazione: sono crawl indipendenti
+        for loc_name, base_folder in common_locations.items():
+            search_steps.append((
+                lambda finder, loc_name=loc_name, base_folder=base_folder:
+                    finder._explore_location(loc_name, base_folder),
+                f"exploratory search in {loc_name}",
+            ))
+        search_steps += [
+            (lambda finder: finder._search_install_directory(), "install directory search"),
+            (lambda finder: finder._search_parent_directories(), "parent directories search"),
+        ]
+
+        if getattr(config, 'SAVE_SEARCH_PARALLEL_PHASES', True):
+            if not self._run_steps_in_parallel(search_steps):
+                logging.info(f"SavePathFinder: Search cancelled for '{self.context.game_name}'")
+                return []
+            return self._finalize_results()
+
+        # Esegui le ricerche in sequenza, interrompendo se cancellato
         for step_func, step_name in search_steps:
-            step_func()
+            step_func(self)
             if self._is_cancelled():
                 logging.info(f"SavePathFinder: Search cancelled after {step_name} for '{self.context.game_name}'")
                 return []
         
         return self._finalize_results()
+
+    def _fork(self, cancellation_manager) -> 'SavePathFinder':
+        """Copia per una fase parallela: contesto condiviso, risultati vuoti."""
+        fork = copy.copy(self)
+        fork.cancellation_manager = cancellation_manager
+        fork.checked_paths = set()
+        fork.guesses_data = {}
+        return fork
+
+    def _run_steps_in_parallel(self, search_steps) -> bool:
+        """Esegue le fasi su un thread pool, ognuna su una copia del finder.
+
+        Le copie vengono unite nell'ordine delle fasi (vince il primo
+        inserimento, come in _add_guess), quindi il risultato coincide con
+        quello della ricerca sequenziale. Restituisce False se cancellata.
+        """
+        def make_phase(step_func):
+            def run(cancellation):
+                fork = self._fork(cancellation)
+                step_func(fork)
+                return fork
+            return run
+
+        forks = search_phases.run_search_phases(
+            [(step_name, make_phase(step_func)) for step_func, step_name in search_steps],
+            max_workers=getattr(config, 'SAVE_SEARCH_MAX_WORKERS', search_phases.DEFAULT_MAX_WORKERS),
+            cancellation_manager=self.cancellation_manager,
+            thread_name_prefix="save-search",
+        )
+        if forks is None:
+            return False
+        for fork in forks:
+            self.checked_paths.update(fork.checked_paths)
+            for key, candidate in fork.guesses_data.items():
+                self.guesses_data.setdefault(key, candidate)
+        return True
     
     def _get_common_locations(self) -> Dict[str, str]:
         """Ottiene le locazioni comuni per i salvataggi su Windows."""
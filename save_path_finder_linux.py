@@ -6,10 +6,11 @@ No more global variables or thread-local storage.
 import os
 import re
 import logging
+import threading
 import unicodedata
-from dataclasses import dataclass, field
-from typing import Dict, Optional, Any, Tuple, List, Set, Iterable
-from common import cancellation_utils
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Any, Tuple, List, Set, Iterable, Callable
+from common import cancellation_utils, fs_cache, search_phases
 import config
 
 # Importazione robusta di thefuzz
@@ -30,6 +31,7 @@ __all__ = [
     'generate_abbreviations',
     'matches_initial_sequence',
     'are_names_similar',
+    'GameNameMatcher',
     'clean_for_comparison',
     'final_sort_key',
     'guess_save_path',
@@ -40,6 +42,52 @@ __all__ = [
 # DATA CLASSES
 # =============================================================================
 
+class ExploredDirectories:
+    """Explored-directory set and directory budget shared by one search.
+
+    Every fork of a LinuxSearchState points at the same instance, so parallel
+    phases never crawl a directory twice. A directory belongs to the earliest
+    phase (in ranking order) that reaches it: later phases skip it, and an
+    earlier phase that arrives second explores it anyway, so the merged
+    guesses match the sequential search.
+    """
+
+    def __init__(self, max_directories: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._owners: Dict[str, int] = {}
+        self.max_directories = max_directories
+        self.directories_explored = 0
+
+    def __contains__(self, canonical_key: str) -> bool:
+        with self._lock:
+            return canonical_key in self._owners
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._owners)
+
+    def is_claimed(self, canonical_key: str, phase_index: int = 0) -> bool:
+        """True if this phase or an earlier one already explored the directory."""
+        with self._lock:
+            owner = self._owners.get(canonical_key)
+        return owner is not None and owner <= phase_index
+
+    def claim(self, canonical_key: str, phase_index: int = 0) -> bool:
+        """Reserve a directory for a phase, counting it against the search budget."""
+        with self._lock:
+            owner = self._owners.get(canonical_key)
+            if owner is not None and owner <= phase_index:
+                return False
+            if (
+                self.max_directories is not None
+                and self.directories_explored >= self.max_directories
+            ):
+                return False
+            self._owners[canonical_key] = phase_index
+            self.directories_explored += 1
+            return True
+
+
 @dataclass
 class LinuxSearchState:
     """Single source of truth for all search state and configuration."""
@@ -85,6 +133,7 @@ class LinuxSearchState:
     fuzzy_threshold_path_match: int = 75
     THEFUZZ_AVAILABLE: bool = False
     fuzz: Optional[Any] = None
+    name_matcher: Optional[Any] = None
     
     # Scoring caps
     MAX_USERDATA_SCORE: int = 1100
@@ -92,14 +141,54 @@ class LinuxSearchState:
     # Runtime state (mutable during search)
     is_exploring_install_dir: bool = False
     install_dir_root: Optional[str] = None
-    directories_explored: int = 0
-    explored_paths: Set[str] = field(default_factory=set)
+    directories_explored: int = 0  # current root only; reset by each phase
+    explored_paths: ExploredDirectories = field(default_factory=ExploredDirectories)
+    phase_index: int = 0
     
     # Results containers
     guesses_data: Dict[str, Dict] = field(default_factory=dict)
     checked_paths: Set[str] = field(default_factory=set)
     candidate_paths_by_key: Dict[str, str] = field(default_factory=dict)
 
+    def fork(self, phase_index: int = 0) -> 'LinuxSearchState':
+        """Copy for one parallel search phase.
+
+        Configuration, the name matcher (its memo writes are idempotent) and
+        the explored-directory set with its budget are shared; the per-root
+        counter and results start empty.
+        """
+        return replace(
+            self,
+            steam_userdata_roots=set(self.steam_userdata_roots),
+            is_exploring_install_dir=False,
+            install_dir_root=None,
+            directories_explored=0,
+            phase_index=phase_index,
+            guesses_data={},
+            checked_paths=set(),
+            candidate_paths_by_key={},
+        )
+
+    def merge(self, phase_state: 'LinuxSearchState') -> None:
+        """Fold a finished phase into this state like ``_add_guess`` would.
+
+        Phases must be merged in search order: a path found by several phases
+        keeps the source of the first one, which is what the ranking uses.
+        """
+        self.steam_userdata_roots.update(phase_state.steam_userdata_roots)
+        self.checked_paths.update(phase_state.checked_paths)
+        for path, data in phase_state.guesses_data.items():
+            canonical_key = data.get('canonical_key') or _path_key(path)
+            existing_path = self.candidate_paths_by_key.get(canonical_key)
+            if existing_path is None:
+                self.guesses_data[path] = data
+                self.candidate_paths_by_key[canonical_key] = path
+                continue
+            existing = self.guesses_data[existing_path]
+            existing.setdefault('sources', set()).update(data.get('sources', ()))
+            for flag in ('has_saves_hint', 'has_saves_direct'):
+                existing[flag] = bool(existing.get(flag) or data.get(flag))
+
 
 class LinuxGameContext:
     """Input context for a game search."""
@@ -399,7 +488,7 @@ def _iter_install_name_hints(
     """Yield a bounded set of useful directory/executable names."""
     if (
         not game_install_dir
-        or not os.path.isdir(game_install_dir)
+        or not fs_cache.isdir(game_install_dir)
         or _is_unsafe_install_root(game_install_dir)
     ):
         return
@@ -414,7 +503,7 @@ def _iter_install_name_hints(
     files_seen = 0
     executable_hints: Dict[str, int] = {}
     try:
-        for root, dirs, files in os.walk(game_install_dir, topdown=True):
+        for root, dirs, files in fs_cache.walk(game_install_dir):
             relative_depth = os.path.normpath(root).count(os.sep) - base_depth
             if relative_depth >= 2:
                 dirs[:] = []
@@ -565,49 +654,112 @@ def matches_initial_sequence(folder_name: str, game_title_words: List[str]) -> b
         return False
 
 
-def are_names_similar(name1_game_variant: str, name2_path_component: str,
-                      min_match_words: int = 2, fuzzy_threshold: int = 88,
-                      game_title_sig_words_for_seq: List[str] = None,
-                      fuzz_engine=None, thefuzz_available: bool = None,
-                      game_title_words_for_seq: List[str] = None) -> bool:
-    """Compare game and folder names without permissive substring matching."""
-    if game_title_sig_words_for_seq is None:
-        game_title_sig_words_for_seq = game_title_words_for_seq
-    if thefuzz_available is None:
-        thefuzz_available = (fuzz_engine is not None)
+class _NameProfile:
+    """Tokens and derived forms of one name, computed once per name."""
+
+    __slots__ = (
+        'raw', 'tokens', 'compact', 'versions', 'significant',
+        'grammatical', '_acronyms', '_fuzz_text', '_fuzz_counts',
+    )
 
-    tokens1 = _normalised_name_tokens(str(name1_game_variant))
-    tokens2 = _normalised_name_tokens(str(name2_path_component))
+    def __init__(self, name: str, ignore_words: Set[str]):
+        self.raw = str(name)
+        self.tokens = _normalised_name_tokens(self.raw)
+        self.compact = ''.join(self.tokens)
+        self.versions = _version_tokens(self.raw)
+        self.significant = [
+            token for token in self.tokens
+            if token not in ignore_words and (len(token) > 1 or token.isdigit())
+        ]
+        self.grammatical = [
+            token for token in self.tokens
+            if token not in GRAMMATICAL_TITLE_WORDS
+        ]
+        self._acronyms = None
+        self._fuzz_text = None
+        self._fuzz_counts = None
+
+    @property
+    def acronyms(self) -> Set[str]:
+        if self._acronyms is None:
+            self._acronyms = {
+                acronym.casefold()
+                for acronym in (
+                    _acronym_variants(_tokenize_name(self.raw))
+                    | _acronym_variants(self.significant)
+                )
+            }
+        return self._acronyms
+
+    @property
+    def fuzz_text(self) -> str:
+        if self._fuzz_text is None:
+            self._fuzz_text = ' '.join(self.tokens)
+        return self._fuzz_text
+
+    @property
+    def fuzz_counts(self) -> Dict[str, int]:
+        """Character counts of the string ``token_sort_ratio`` actually compares."""
+        if self._fuzz_counts is None:
+            self._fuzz_counts = _char_counts(_fuzz_sorted_text(self.fuzz_text))
+        return self._fuzz_counts
+
+
+def _fuzz_sorted_text(text: str) -> str:
+    """Mirror thefuzz's default processing (ASCII only) for the token ratios."""
+    text = ''.join(character for character in text if ord(character) < 128)
+    processed = re.sub(r'(?ui)\W', ' ', text).lower().strip()
+    return ' '.join(sorted(processed.split()))
+
+
+def _char_counts(text: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for character in text:
+        counts[character] = counts.get(character, 0) + 1
+    return counts
+
+
+def _ratio_upper_bound(counts1: Dict[str, int], counts2: Dict[str, int]) -> int:
+    """Upper bound of a Levenshtein ``ratio`` from character counts alone.
+
+    The ratio is ``2 * matches / (len1 + len2)`` and the matching characters
+    can never exceed the shared character counts, so a pair whose bound is
+    below a threshold can skip the real comparison.
+    """
+    total = sum(counts1.values()) + sum(counts2.values())
+    if not total:
+        return 0
+    if len(counts1) > len(counts2):
+        counts1, counts2 = counts2, counts1
+    shared = sum(
+        min(count, counts2.get(character, 0))
+        for character, count in counts1.items()
+    )
+    return int(round(100.0 * 2 * shared / total))
+
+
+def _profiles_similar(profile1: _NameProfile, profile2: _NameProfile,
+                      fuzzy_threshold: int,
+                      game_title_sig_words_for_seq: List[str],
+                      fuzz_engine, thefuzz_available: bool) -> bool:
+    tokens1, tokens2 = profile1.tokens, profile2.tokens
     if not tokens1 or not tokens2:
         return False
 
-    compact1 = ''.join(tokens1)
-    compact2 = ''.join(tokens2)
+    compact1 = profile1.compact
+    compact2 = profile2.compact
     if compact1 == compact2:
         return True
 
-    versions1 = _version_tokens(str(name1_game_variant))
-    versions2 = _version_tokens(str(name2_path_component))
+    versions1 = profile1.versions
+    versions2 = profile2.versions
     version_mismatch = versions1 != versions2 and bool(versions1 or versions2)
 
     ignore_words = _similarity_ignore_words()
-    significant1 = [
-        token for token in tokens1
-        if token not in ignore_words and (len(token) > 1 or token.isdigit())
-    ]
-    significant2 = [
-        token for token in tokens2
-        if token not in ignore_words and (len(token) > 1 or token.isdigit())
-    ]
-
-    grammatical1 = [
-        token for token in tokens1
-        if token not in GRAMMATICAL_TITLE_WORDS
-    ]
-    grammatical2 = [
-        token for token in tokens2
-        if token not in GRAMMATICAL_TITLE_WORDS
-    ]
+    significant1 = profile1.significant
+    significant2 = profile2.significant
+    grammatical1 = profile1.grammatical
+    grammatical2 = profile2.grammatical
 
     # Articles and conjunctions are frequently present only in the on-disk
     # title ("Witcher3" -> "The Witcher 3"). Edition qualifiers deliberately
@@ -664,42 +816,210 @@ def are_names_similar(name1_game_variant: str, name2_path_component: str,
         return True
 
     if game_title_sig_words_for_seq and len(compact2) <= 6:
-        if matches_initial_sequence(name2_path_component, game_title_sig_words_for_seq):
+        if matches_initial_sequence(profile2.raw, game_title_sig_words_for_seq):
             return True
 
     # Acronym support that keeps complete version tokens (FFXIV/FF14, DSII/DS2).
-    expected_for_folder = {
-        acronym.casefold()
-        for acronym in (
-            _acronym_variants(_tokenize_name(str(name1_game_variant)))
-            | _acronym_variants(significant1)
-        )
-    }
-    if compact2.casefold() in expected_for_folder:
+    if compact2.casefold() in profile1.acronyms:
         return True
-
-    expected_for_game = {
-        acronym.casefold()
-        for acronym in (
-            _acronym_variants(_tokenize_name(str(name2_path_component)))
-            | _acronym_variants(significant2)
-        )
-    }
-    if compact1.casefold() in expected_for_game:
+    if compact1.casefold() in profile2.acronyms:
         return True
 
     if thefuzz_available and fuzz_engine and not version_mismatch and 0 < fuzzy_threshold <= 100:
+        if _ratio_upper_bound(profile1.fuzz_counts, profile2.fuzz_counts) < fuzzy_threshold:
+            return False
         try:
-            clean1 = ' '.join(tokens1)
-            clean2 = ' '.join(tokens2)
-            if fuzz_engine.token_sort_ratio(clean1, clean2) >= fuzzy_threshold:
+            if fuzz_engine.token_sort_ratio(profile1.fuzz_text, profile2.fuzz_text) >= fuzzy_threshold:
                 return True
         except Exception as error:
-            logging.debug(f"Linux name matching failed for '{name1_game_variant}'/'{name2_path_component}': {error}")
+            logging.debug(f"Linux name matching failed for '{profile1.raw}'/'{profile2.raw}': {error}")
 
     return False
 
 
+def are_names_similar(name1_game_variant: str, name2_path_component: str,
+                      min_match_words: int = 2, fuzzy_threshold: int = 88,
+                      game_title_sig_words_for_seq: List[str] = None,
+                      fuzz_engine=None, thefuzz_available: bool = None,
+                      game_title_words_for_seq: List[str] = None) -> bool:
+    """Compare game and folder names without permissive substring matching."""
+    if game_title_sig_words_for_seq is None:
+        game_title_sig_words_for_seq = game_title_words_for_seq
+    if thefuzz_available is None:
+        thefuzz_available = (fuzz_engine is not None)
+
+    ignore_words = _similarity_ignore_words()
+    return _profiles_similar(
+        _NameProfile(name1_game_variant, ignore_words),
+        _NameProfile(name2_path_component, ignore_words),
+        fuzzy_threshold,
+        game_title_sig_words_for_seq,
+        fuzz_engine,
+        thefuzz_available,
+    )
+
+
+class GameNameMatcher:
+    """Title matching for one search, compiled once and memoized per name.
+
+    A search compares the same title against thousands of directory names
+    (and the same names again while ranking). The title's tokens, compact
+    forms, acronym/numeral variants and aliases are prepared here once; each
+    directory name is profiled once and its verdicts are cached. thefuzz only
+    runs for names whose character counts can still reach the threshold.
+    """
+
+    def __init__(self, game_name_raw: str, game_abbreviations: Iterable[str],
+                 game_title_sig_words_for_seq: List[str],
+                 fuzzy_threshold: int, fuzz_engine=None,
+                 thefuzz_available: bool = False,
+                 installed_steam_games_dict: Optional[Dict] = None,
+                 current_steam_app_id: Optional[str] = None):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzz = fuzz_engine if thefuzz_available else None
+        self.game_title_sig_words_for_seq = game_title_sig_words_for_seq
+        self._ignore_words = _similarity_ignore_words()
+        self._game = _NameProfile(game_name_raw, self._ignore_words)
+        self._game_cleaned = clean_for_comparison(game_name_raw)
+        self._game_cleaned_counts = _char_counts(self._game_cleaned)
+
+        self._alias_cleaned: Set[str] = set()
+        self._alias_compact: Set[str] = set()
+        for abbreviation in game_abbreviations:
+            self._alias_cleaned.add(clean_for_comparison(abbreviation))
+            self._alias_compact.add(_compact_name(abbreviation))
+
+        # Other installed games, prepared for the token_set_ratio filter.
+        self._other_games: List[Tuple[str, str, Set[str], Dict[str, int]]] = []
+        for other_appid, other_info in (installed_steam_games_dict or {}).items():
+            if str(other_appid) == str(current_steam_app_id):
+                continue
+            other_name = (other_info or {}).get('name', '')
+            if not other_name:
+                continue
+            cleaned = clean_for_comparison(other_name)
+            tokens = set(_fuzz_sorted_text(cleaned).split())
+            self._other_games.append(
+                (other_name, cleaned, tokens, _char_counts(' '.join(sorted(tokens))))
+            )
+
+        self._profiles: Dict[str, _NameProfile] = {}
+        self._component_verdicts: Dict[str, bool] = {}
+        self._similarity_bonus: Dict[str, int] = {}
+        self._other_game_conflicts: Dict[str, Optional[str]] = {}
+
+    def _profile(self, name: str) -> _NameProfile:
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = _NameProfile(name, self._ignore_words)
+            self._profiles[name] = profile
+        return profile
+
+    def matches_component(self, component: str) -> bool:
+        """Memoized ``_component_matches_game`` verdict."""
+        verdict = self._component_verdicts.get(component)
+        if verdict is None:
+            verdict = self._match_component(component)
+            self._component_verdicts[component] = verdict
+        return verdict
+
+    def _match_component(self, component: str) -> bool:
+        cleaned_component = clean_for_comparison(component)
+        stripped_component = cleaned_component.lstrip('.')
+        if not stripped_component or stripped_component in GENERIC_CONTAINER_FOLDERS:
+            return False
+
+        comparison_components = [component]
+        unity_product_match = re.match(
+            r'^(?P<game>.+?)\s+by\s+(?P<publisher>.+)$',
+            component,
+            flags=re.IGNORECASE,
+        )
+        if unity_product_match:
+            comparison_components.append(
+                unity_product_match.group('game').strip()
+            )
+
+        for comparison_component in comparison_components:
+            cleaned_comparison = clean_for_comparison(comparison_component)
+            profile = self._profile(comparison_component)
+            if (
+                cleaned_comparison in self._alias_cleaned
+                or cleaned_comparison.lstrip('.') in self._alias_cleaned
+                or profile.compact in self._alias_compact
+            ):
+                return True
+            if _profiles_similar(
+                self._game,
+                profile,
+                self.fuzzy_threshold,
+                self.game_title_sig_words_for_seq,
+                self.fuzz,
+                self.fuzz is not None,
+            ):
+                return True
+        return False
+
+    def similarity_bonus(self, basename: str) -> int:
+        """Memoized ranking bonus for a directory name resembling the title."""
+        bonus = self._similarity_bonus.get(basename)
+        if bonus is None:
+            bonus = self._compute_similarity_bonus(basename)
+            self._similarity_bonus[basename] = bonus
+        return bonus
+
+    def _compute_similarity_bonus(self, basename: str) -> int:
+        if self.matches_component(basename):
+            return 400
+        if self.fuzz is None:
+            return 0
+        versions = _version_tokens(basename)
+        if versions != self._game.versions and (versions or self._game.versions):
+            return 0
+        cleaned_folder = clean_for_comparison(basename)
+        if _ratio_upper_bound(self._game_cleaned_counts, _char_counts(cleaned_folder)) <= 70:
+            return 0
+        ratio = self.fuzz.ratio(self._game_cleaned, cleaned_folder)
+        if ratio > 85:
+            return 300
+        elif ratio > 70:
+            return 150
+        return 0
+
+    def other_game_conflict(self, basename: str) -> Optional[str]:
+        """Name of another installed game this folder belongs to, if any."""
+        if basename in self._other_game_conflicts:
+            return self._other_game_conflicts[basename]
+        conflict = None
+        if self.fuzz is not None and self._other_games:
+            cleaned_folder = clean_for_comparison(basename)
+            folder_tokens = set(_fuzz_sorted_text(cleaned_folder).split())
+            folder_counts = _char_counts(' '.join(sorted(folder_tokens)))
+            for other_name, other_cleaned, other_tokens, other_counts in self._other_games:
+                # With no shared token token_set_ratio reduces to comparing
+                # the sorted strings, so the character bound applies.
+                if (
+                    not (folder_tokens & other_tokens)
+                    and _ratio_upper_bound(folder_counts, other_counts) < 95
+                ):
+                    continue
+                if (
+                    self.fuzz.token_set_ratio(other_cleaned, cleaned_folder) >= 95
+                    and not _profiles_similar(
+                        self._game,
+                        self._profile(basename),
+                        88,
+                        None,
+                        self.fuzz,
+                        True,
+                    )
+                ):
+                    conflict = other_name
+                    break
+        self._other_game_conflicts[basename] = conflict
+        return conflict
+
+
 # =============================================================================
 # STATE INITIALIZATION
 # =============================================================================
@@ -803,7 +1123,7 @@ def _build_search_state(game_name_raw: str, game_install_dir_raw: str,
             if other_abbr_lower not in current_game_abbreviations_lower and other_abbr_lower != current_game_name_cleaned_lower:
                 other_game_abbreviations.add(other_abbr_lower)
 
-    return LinuxSearchState(
+    state = LinuxSearchState(
         game_name_raw=game_name_raw,
         game_name_cleaned=game_name_cleaned,
         game_install_dir=game_install_dir_raw,
@@ -822,6 +1142,9 @@ def _build_search_state(game_name_raw: str, game_install_dir_raw: str,
         installed_steam_games_dict=installed_steam_games_dict,
         other_cleaned_game_names=other_cleaned_game_names,
         other_game_abbreviations=other_game_abbreviations,
+        explored_paths=ExploredDirectories(
+            getattr(config, 'LINUX_MAX_DIRECTORIES_PER_SEARCH', None)
+        ),
         current_steam_app_id=steam_app_id_raw,
         steam_userdata_path=steam_userdata_path,
         steam_id3_to_use=steam_id3_to_use,
@@ -849,51 +1172,31 @@ def _build_search_state(game_name_raw: str, game_install_dir_raw: str,
         fuzz=_fuzz_module,
         MAX_USERDATA_SCORE=getattr(config, 'MAX_USERDATA_SCORE', 1100),
     )
+    _name_matcher(state)
+    return state
 
 
 def _component_matches_game(component: str, state: LinuxSearchState) -> bool:
     """Return True only for a complete component-level title/alias match."""
     if not component:
         return False
-    cleaned_component = clean_for_comparison(component)
-    stripped_component = cleaned_component.lstrip('.')
-    if not stripped_component or stripped_component in GENERIC_CONTAINER_FOLDERS:
-        return False
+    return _name_matcher(state).matches_component(component)
 
-    comparison_components = [component]
-    unity_product_match = re.match(
-        r'^(?P<game>.+?)\s+by\s+(?P<publisher>.+)$',
-        component,
-        flags=re.IGNORECASE,
-    )
-    if unity_product_match:
-        comparison_components.append(
-            unity_product_match.group('game').strip()
-        )
-
-    for comparison_component in comparison_components:
-        cleaned_comparison = clean_for_comparison(comparison_component)
-        stripped_comparison = cleaned_comparison.lstrip('.')
-        compact_component = _compact_name(comparison_component)
-        for abbreviation in state.game_abbreviations:
-            cleaned_abbreviation = clean_for_comparison(abbreviation)
-            if (
-                cleaned_comparison == cleaned_abbreviation
-                or stripped_comparison == cleaned_abbreviation
-                or compact_component == _compact_name(abbreviation)
-            ):
-                return True
 
-        if are_names_similar(
+def _name_matcher(state: LinuxSearchState) -> GameNameMatcher:
+    """The state's matcher, built on first use for hand-made states."""
+    if state.name_matcher is None:
+        state.name_matcher = GameNameMatcher(
             state.game_name_raw,
-            comparison_component,
-            game_title_sig_words_for_seq=state.game_title_original_sig_words_for_seq,
-            fuzzy_threshold=state.fuzzy_threshold_basename_match,
+            state.game_abbreviations,
+            state.game_title_original_sig_words_for_seq,
+            state.fuzzy_threshold_basename_match,
             fuzz_engine=state.fuzz,
             thefuzz_available=state.THEFUZZ_AVAILABLE,
-        ):
-            return True
-    return False
+            installed_steam_games_dict=state.installed_steam_games_dict,
+            current_steam_app_id=state.current_steam_app_id,
+        )
+    return state.name_matcher
 
 
 def _component_matches_company(component: str, state: LinuxSearchState) -> bool:
@@ -948,13 +1251,13 @@ def _contains_direct_game_child(
 ) -> bool:
     """Peek below an engine publisher folder for an exact game directory."""
     try:
-        child_names = sorted(os.listdir(directory), key=str.casefold)
+        child_names = sorted(fs_cache.listdir(directory), key=str.casefold)
     except OSError:
         return False
 
     for child_name in child_names[:max_children]:
         child_path = os.path.join(directory, child_name)
-        if not os.path.isdir(child_path):
+        if not fs_cache.isdir(child_path):
             continue
         if _component_matches_game(child_name, state):
             return True
@@ -1068,7 +1371,7 @@ def _has_named_save_subdir(path: str, max_depth: int = 2) -> bool:
     """Bounded structural evidence for roots whose save files are nested."""
     try:
         base_depth = os.path.normpath(path).count(os.sep)
-        for root, dirs, _ in os.walk(path, topdown=True):
+        for root, dirs, _ in fs_cache.walk(path):
             relative_depth = os.path.normpath(root).count(os.sep) - base_depth
             if relative_depth >= max_depth:
                 dirs[:] = []
@@ -1091,7 +1394,7 @@ def _deep_scan_save_evidence(
     found = 0
     try:
         base_depth = os.path.normpath(path).count(os.sep)
-        for root, dirs, _ in os.walk(path, topdown=True):
+        for root, dirs, _ in fs_cache.walk(path):
             if _is_cancelled(cancellation_manager):
                 return found > 0, found
             relative_depth = os.path.normpath(root).count(os.sep) - base_depth
@@ -1173,12 +1476,12 @@ def _scan_dir_for_save_evidence(dir_path: str, state: LinuxSearchState) -> Tuple
         return (0 if shaped_name else 1, item_lower)
 
     try:
-        for item_name in sorted(os.listdir(dir_path), key=evidence_priority):
+        for item_name in sorted(fs_cache.listdir(dir_path), key=evidence_priority):
             if files_scanned_count >= state.max_files_to_scan_linux_hint:
                 break
 
             item_path = os.path.join(dir_path, item_name)
-            if os.path.isfile(item_path):
+            if fs_cache.isfile(item_path):
                 files_scanned_count += 1
                 item_name_lower = item_name.lower()
                 _, ext_lower = os.path.splitext(item_name_lower)
@@ -1387,7 +1690,7 @@ def _add_guess(state: LinuxSearchState, path_found: str, source_description: str
     except (OSError, TypeError, ValueError):
         return False
 
-    if not os.path.isdir(normalized_path):
+    if not fs_cache.isdir(normalized_path):
         state.checked_paths.add(canonical_key)
         return False
 
@@ -1495,27 +1798,10 @@ def _add_guess(state: LinuxSearchState, path_found: str, source_description: str
         and not is_common_save_dir
         and getattr(config, 'LINUX_ENABLE_FUZZY_FILTER_OTHER_GAMES', True)
     ):
-        cleaned_folder = clean_for_comparison(basename)
-        for other_appid, other_info in state.installed_steam_games_dict.items():
-            if str(other_appid) == str(state.current_steam_app_id):
-                continue
-            other_name = (other_info or {}).get('name', '')
-            if not other_name:
-                continue
-            if (
-                state.fuzz.token_set_ratio(
-                    clean_for_comparison(other_name), cleaned_folder
-                ) >= 95
-                and not are_names_similar(
-                    state.game_name_raw,
-                    basename,
-                    fuzz_engine=state.fuzz,
-                    thefuzz_available=True,
-                )
-            ):
-                accepted = False
-                reason = f"Rejected: matches other game '{other_name}'"
-                break
+        other_name = _name_matcher(state).other_game_conflict(basename)
+        if other_name:
+            accepted = False
+            reason = f"Rejected: matches other game '{other_name}'"
 
     state.checked_paths.add(canonical_key)
     if not accepted:
@@ -1554,20 +1840,21 @@ def _search_recursive(start_dir: str, depth: int, state: LinuxSearchState,
         return
 
     try:
-        if not os.path.isdir(start_dir):
+        if not fs_cache.isdir(start_dir):
             return
     except OSError:
         return
 
     canonical_key = _path_key(start_dir)
-    if canonical_key in state.explored_paths:
+    if state.explored_paths.is_claimed(canonical_key, state.phase_index):
         return
     max_directories = getattr(config, 'LINUX_MAX_DIRECTORIES_TO_EXPLORE', 200)
     if state.directories_explored >= max_directories:
         logging.debug(f"Linux search root budget reached ({max_directories} directories)")
         return
+    if not state.explored_paths.claim(canonical_key, state.phase_index):
+        return
     state.directories_explored += 1
-    state.explored_paths.add(canonical_key)
 
     basename_current_path_raw = os.path.basename(os.path.normpath(start_dir))
     basename_current_path_lower = basename_current_path_raw.lower()
@@ -1625,7 +1912,7 @@ def _search_recursive(start_dir: str, depth: int, state: LinuxSearchState,
         _add_guess(state, start_dir, specific_source_desc, has_saves_hint_current)
 
     try:
-        dir_contents = os.listdir(start_dir)
+        dir_contents = fs_cache.listdir(start_dir)
     except OSError:
         return
 
@@ -1635,7 +1922,7 @@ def _search_recursive(start_dir: str, depth: int, state: LinuxSearchState,
     filtered_dir_contents = [
         name for name in dir_contents
         if name.lower() not in linux_skip_directories
-        and os.path.isdir(os.path.join(start_dir, name))
+        and fs_cache.isdir(os.path.join(start_dir, name))
     ]
     current_is_engine_container = (
         basename_current_path_lower in ENGINE_CONTAINER_FOLDERS
@@ -1686,7 +1973,7 @@ def _search_recursive(start_dir: str, depth: int, state: LinuxSearchState,
 
         item_path = os.path.join(start_dir, item_name)
         try:
-            if not os.path.isdir(item_path):
+            if not fs_cache.isdir(item_path):
                 continue
 
             item_name_lower = item_name.lower()
@@ -1768,11 +2055,11 @@ def _search_proton_prefix_deep(
         )
         users_root = os.path.join(compatdata_path, 'drive_c', 'users')
         user_dirs = []
-        if os.path.isdir(users_root):
+        if fs_cache.isdir(users_root):
             user_dirs = [
                 os.path.join(users_root, name)
-                for name in sorted(os.listdir(users_root), key=str.casefold)
-                if os.path.isdir(os.path.join(users_root, name))
+                for name in sorted(fs_cache.listdir(users_root), key=str.casefold)
+                if fs_cache.isdir(os.path.join(users_root, name))
                 and name.lower() not in {'public', 'all users'}
             ]
         for user_dir in user_dirs:
@@ -1793,7 +2080,7 @@ def _search_proton_prefix_deep(
                 if _is_cancelled(cancellation_manager):
                     return
                 save_root = os.path.join(user_dir, relative_root)
-                if not os.path.isdir(save_root):
+                if not fs_cache.isdir(save_root):
                     continue
 
                 source_root = (
@@ -1802,7 +2089,7 @@ def _search_proton_prefix_deep(
                 )
                 for alias in state.game_abbreviations:
                     direct_path = os.path.join(save_root, alias)
-                    if os.path.isdir(direct_path):
+                    if fs_cache.isdir(direct_path):
                         _add_guess(
                             state,
                             direct_path,
@@ -1830,11 +2117,11 @@ def _search_proton_prefix_deep(
         program_data_root = os.path.join(
             compatdata_path, 'drive_c', 'ProgramData'
         )
-        if os.path.isdir(program_data_root):
+        if fs_cache.isdir(program_data_root):
             source_root = f"{source_scope}/ProgramData"
             for alias in state.game_abbreviations:
                 direct_path = os.path.join(program_data_root, alias)
-                if os.path.isdir(direct_path):
+                if fs_cache.isdir(direct_path):
                     _add_guess(
                         state,
                         direct_path,
@@ -1866,12 +2153,12 @@ def _search_appdata_deep(appdata_path: str, path_variant: str, appid: str,
     try:
         # List all first-level folders in AppData. The prefix is already tied to
         # this AppID, but a folder still needs title/structure/file evidence.
-        for folder_name in sorted(os.listdir(appdata_path), key=str.casefold)[:250]:
+        for folder_name in sorted(fs_cache.listdir(appdata_path), key=str.casefold)[:250]:
             if _is_cancelled(cancellation_manager):
                 return
                 
             folder_path = os.path.join(appdata_path, folder_name)
-            if not os.path.isdir(folder_path):
+            if not fs_cache.isdir(folder_path):
                 continue
             
             folder_lower = folder_name.lower()
@@ -1891,9 +2178,9 @@ def _search_appdata_deep(appdata_path: str, path_variant: str, appid: str,
             # Many Unreal games use internal project names (e.g., FSD for Deep Rock Galactic)
             # Pattern: AppData/Local/[ProjectName]/Saved/SaveGames
             saved_path = os.path.join(folder_path, 'Saved')
-            if os.path.isdir(saved_path):
+            if fs_cache.isdir(saved_path):
                 savegames_path = os.path.join(saved_path, 'SaveGames')
-                if os.path.isdir(savegames_path):
+                if fs_cache.isdir(savegames_path):
                     savegames_has_saves, _ = _scan_dir_for_save_evidence(
                         savegames_path, state
                     )
@@ -1908,11 +2195,11 @@ def _search_appdata_deep(appdata_path: str, path_variant: str, appid: str,
             # search inside for game-named subfolders
             if is_known_publisher or not matches_game:
                 try:
-                    for subfolder in sorted(os.listdir(folder_path), key=str.casefold)[:100]:
+                    for subfolder in sorted(fs_cache.listdir(folder_path), key=str.casefold)[:100]:
                         if _is_cancelled(cancellation_manager):
                             return
                         subfolder_path = os.path.join(folder_path, subfolder)
-                        if not os.path.isdir(subfolder_path):
+                        if not fs_cache.isdir(subfolder_path):
                             continue
                         if _component_matches_game(subfolder, state):
                             _add_guess(
@@ -1937,14 +2224,14 @@ def _search_snap_games(state: LinuxSearchState, cancellation_manager=None) -> No
     try:
         user_home = os.path.expanduser('~')
         snap_base = os.path.join(user_home, 'snap')
-        if not os.path.isdir(snap_base):
+        if not fs_cache.isdir(snap_base):
             return
 
         try:
             snap_dirs = [
                 directory
-                for directory in sorted(os.listdir(snap_base), key=str.casefold)
-                if os.path.isdir(os.path.join(snap_base, directory))
+                for directory in sorted(fs_cache.listdir(snap_base), key=str.casefold)
+                if fs_cache.isdir(os.path.join(snap_base, directory))
             ]
             for snap_dir in snap_dirs:
                 if _is_cancelled(cancellation_manager):
@@ -1956,7 +2243,7 @@ def _search_snap_games(state: LinuxSearchState, cancellation_manager=None) -> No
                 snap_game_path = os.path.join(snap_base, snap_dir)
                 for scope_name in ('common', 'current'):
                     scope_path = os.path.join(snap_game_path, scope_name)
-                    if not os.path.isdir(scope_path):
+                    if not fs_cache.isdir(scope_path):
                         continue
                     search_roots = [
                         scope_path,
@@ -1965,7 +2252,7 @@ def _search_snap_games(state: LinuxSearchState, cancellation_manager=None) -> No
                         os.path.join(scope_path, 'data'),
                     ]
                     for search_root in search_roots:
-                        if not os.path.isdir(search_root):
+                        if not fs_cache.isdir(search_root):
                             continue
                         state.directories_explored = 0
                         _search_recursive(
@@ -1983,7 +2270,7 @@ def _discover_related_heroic_prefixes(
 ) -> List[str]:
     """Find title-matching Heroic prefixes beside a Heroic install."""
     install_dir = state.game_install_dir
-    if not install_dir or not os.path.isdir(install_dir):
+    if not install_dir or not fs_cache.isdir(install_dir):
         return []
 
     heroic_root = None
@@ -2002,9 +2289,9 @@ def _discover_related_heroic_prefixes(
     try:
         prefixes_name = next(
             (
-                name for name in os.listdir(heroic_root)
+                name for name in fs_cache.listdir(heroic_root)
                 if name.casefold() == 'prefixes'
-                and os.path.isdir(os.path.join(heroic_root, name))
+                and fs_cache.isdir(os.path.join(heroic_root, name))
             ),
             None,
         )
@@ -2018,7 +2305,7 @@ def _discover_related_heroic_prefixes(
     base_depth = os.path.normpath(prefixes_root).count(os.sep)
     visited = 0
     try:
-        for root, dirs, _ in os.walk(prefixes_root, topdown=True):
+        for root, dirs, _ in fs_cache.walk(prefixes_root):
             relative_depth = os.path.normpath(root).count(os.sep) - base_depth
             if relative_depth > 3 or visited >= 250:
                 dirs[:] = []
@@ -2041,9 +2328,9 @@ def _discover_related_heroic_prefixes(
                 )
             ):
                 prefix = None
-                if os.path.isdir(os.path.join(root, 'drive_c')):
+                if fs_cache.isdir(os.path.join(root, 'drive_c')):
                     prefix = root
-                elif os.path.isdir(os.path.join(root, 'pfx', 'drive_c')):
+                elif fs_cache.isdir(os.path.join(root, 'pfx', 'drive_c')):
                     prefix = os.path.join(root, 'pfx')
                 if prefix:
                     discovered[_path_key(prefix)] = prefix
@@ -2109,20 +2396,20 @@ def _discover_unowned_compatdata_prefixes(
 
     roots_by_key: Dict[str, str] = {}
     for root in compatdata_roots:
-        if os.path.isdir(root):
+        if fs_cache.isdir(root):
             roots_by_key[_path_key(root)] = root
 
     prefixes_by_key: Dict[str, Tuple[str, str]] = {}
     for root in roots_by_key.values():
         try:
-            appid_names = sorted(os.listdir(root), key=str.casefold)
+            appid_names = sorted(fs_cache.listdir(root), key=str.casefold)
         except OSError:
             continue
         for appid_name in appid_names:
             if not appid_name.isdigit():
                 continue
             prefix = os.path.join(root, appid_name, 'pfx')
-            if not os.path.isdir(os.path.join(prefix, 'drive_c')):
+            if not fs_cache.isdir(os.path.join(prefix, 'drive_c')):
                 continue
             prefixes_by_key[_path_key(prefix)] = (prefix, appid_name)
 
@@ -2130,7 +2417,7 @@ def _discover_unowned_compatdata_prefixes(
         """Prioritise prefixes with a title-shaped AppData/Documents path."""
         users_root = os.path.join(prefix, 'drive_c', 'users')
         try:
-            user_names = sorted(os.listdir(users_root), key=str.casefold)
+            user_names = sorted(fs_cache.listdir(users_root), key=str.casefold)
         except OSError:
             return False
 
@@ -2145,7 +2432,7 @@ def _discover_unowned_compatdata_prefixes(
         for user_name in user_names[:20]:
             user_dir = os.path.join(users_root, user_name)
             if (
-                not os.path.isdir(user_dir)
+                not fs_cache.isdir(user_dir)
                 or user_name.casefold() in {'public', 'all users'}
             ):
                 continue
@@ -2153,13 +2440,13 @@ def _discover_unowned_compatdata_prefixes(
                 search_root = os.path.join(user_dir, relative_root)
                 try:
                     first_level = sorted(
-                        os.listdir(search_root), key=str.casefold
+                        fs_cache.listdir(search_root), key=str.casefold
                     )[:250]
                 except OSError:
                     continue
                 for name in first_level:
                     path = os.path.join(search_root, name)
-                    if not os.path.isdir(path):
+                    if not fs_cache.isdir(path):
                         continue
                     if (
                         _component_matches_game(name, state)
@@ -2237,10 +2524,10 @@ def _search_proton_for_non_steam_games(state: LinuxSearchState, cancellation_man
             )
 
         install_dir = state.game_install_dir
-        if install_dir and os.path.isdir(install_dir):
+        if install_dir and fs_cache.isdir(install_dir):
             current = os.path.abspath(install_dir)
             for _ in range(8):
-                if os.path.isdir(os.path.join(current, 'drive_c')):
+                if fs_cache.isdir(os.path.join(current, 'drive_c')):
                     remember_prefix(
                         current, is_dedicated_prefix(current)
                     )
@@ -2258,7 +2545,7 @@ def _search_proton_for_non_steam_games(state: LinuxSearchState, cancellation_man
             remember_prefix(heroic_prefix, True)
 
         default_wine = os.path.join(os.path.expanduser('~'), '.wine')
-        if os.path.isdir(default_wine):
+        if fs_cache.isdir(default_wine):
             remember_prefix(default_wine, False)
 
         discovered_compatdata = _discover_unowned_compatdata_prefixes(state)
@@ -2354,26 +2641,7 @@ def _score_name_match_bonus(basename_lower: str, parent_basename_lower: str,
 
 def _score_fuzzy_similarity(basename: str, state: LinuxSearchState) -> int:
     """Calculate score bonus for fuzzy name similarity."""
-    cleaned_folder = clean_for_comparison(basename)
-
-    if _component_matches_game(basename, state):
-        return 400
-
-    if (
-        state.THEFUZZ_AVAILABLE
-        and state.fuzz
-        and not (
-            _version_tokens(state.game_name_raw)
-            != _version_tokens(basename)
-            and (_version_tokens(state.game_name_raw) or _version_tokens(basename))
-        )
-    ):
-        ratio = state.fuzz.ratio(state.game_name_cleaned, cleaned_folder)
-        if ratio > 85:
-            return 300
-        elif ratio > 70:
-            return 150
-    return 0
+    return _name_matcher(state).similarity_bonus(basename)
 
 
 def _score_proton_bonus(path_lower: str, source_description: str) -> int:
@@ -2521,19 +2789,19 @@ def _search_steam_userdata(state: LinuxSearchState, appid: str, steam_userdata_p
         )
         state.steam_userdata_roots.add(normalized_userdata)
         user_data_for_id = os.path.join(steam_userdata_path, steam_id3_to_use)
-        if not os.path.isdir(user_data_for_id):
+        if not fs_cache.isdir(user_data_for_id):
             return
             
         app_specific_userdata = os.path.join(user_data_for_id, appid)
-        if not os.path.isdir(app_specific_userdata):
+        if not fs_cache.isdir(app_specific_userdata):
             return
 
         remote_path = os.path.join(app_specific_userdata, 'remote')
-        if os.path.isdir(remote_path) and getattr(config, 'LINUX_ENABLE_STEAM_USERDATA_REMOTE_SCAN', True):
+        if fs_cache.isdir(remote_path) and getattr(config, 'LINUX_ENABLE_STEAM_USERDATA_REMOTE_SCAN', True):
             try:
                 remote_has_content = any(
                     name.lower() != 'remotecache.vdf'
-                    for name in os.listdir(remote_path)
+                    for name in fs_cache.listdir(remote_path)
                 )
             except OSError:
                 remote_has_content = False
@@ -2555,7 +2823,7 @@ def _search_steam_userdata(state: LinuxSearchState, appid: str, steam_userdata_p
         # that base when it only wraps remote/remotecache.vdf.
         try:
             base_entries = [
-                name for name in os.listdir(app_specific_userdata)
+                name for name in fs_cache.listdir(app_specific_userdata)
                 if name.lower() not in {'remote', 'remotecache.vdf'}
             ]
         except OSError:
@@ -2621,7 +2889,7 @@ def _search_proton_steam(state: LinuxSearchState, appid: str, cancellation_manag
 
     steam_bases: Dict[str, str] = {}
     for candidate in steam_base_candidates:
-        if os.path.isdir(candidate):
+        if fs_cache.isdir(candidate):
             steam_bases[_path_key(candidate)] = candidate
 
     for steam_base in steam_bases.values():
@@ -2629,19 +2897,19 @@ def _search_proton_steam(state: LinuxSearchState, appid: str, cancellation_manag
             return
 
         discovered_userdata = os.path.join(steam_base, 'userdata')
-        if os.path.isdir(discovered_userdata):
+        if fs_cache.isdir(discovered_userdata):
             try:
                 if state.steam_id3_to_use:
                     candidate_user_ids = [state.steam_id3_to_use]
                 else:
                     candidate_user_ids = sorted(
-                        os.listdir(discovered_userdata)
+                        fs_cache.listdir(discovered_userdata)
                     )
                 user_ids = [
                     str(name)
                     for name in candidate_user_ids
                     if str(name).isdigit()
-                    and os.path.isdir(
+                    and fs_cache.isdir(
                         os.path.join(
                             discovered_userdata, str(name), appid
                         )
@@ -2661,7 +2929,7 @@ def _search_proton_steam(state: LinuxSearchState, appid: str, cancellation_manag
                 )
 
         compatdata_path = os.path.join(steam_base, 'steamapps', 'compatdata', appid, 'pfx')
-        if not os.path.isdir(compatdata_path):
+        if not fs_cache.isdir(compatdata_path):
             continue
 
         if not getattr(config, 'LINUX_ENABLE_PROTON_DEEP_SCAN_STEAM', True):
@@ -2674,7 +2942,7 @@ def _search_proton_steam(state: LinuxSearchState, appid: str, cancellation_manag
 
 def _search_install_directory(state: LinuxSearchState, game_install_dir: str, cancellation_manager=None) -> None:
     """Search game installation directory for save paths."""
-    if not game_install_dir or not os.path.isdir(game_install_dir):
+    if not game_install_dir or not fs_cache.isdir(game_install_dir):
         return
     if _is_unsafe_install_root(game_install_dir):
         logging.info(
@@ -2705,7 +2973,7 @@ def _search_xdg_locations(state: LinuxSearchState, cancellation_manager=None) ->
     for loc_desc, base_path in state.linux_known_save_locations.items():
         if _is_cancelled(cancellation_manager):
             break
-        if not os.path.isdir(base_path):
+        if not fs_cache.isdir(base_path):
             continue
 
         root_key = _path_key(base_path)
@@ -2729,7 +2997,7 @@ def _search_xdg_locations(state: LinuxSearchState, cancellation_manager=None) ->
                 direct_names.add('.' + compact.casefold())
         for direct_name in sorted(direct_names, key=lambda value: (-len(value), value.casefold())):
             direct_game_path = os.path.join(base_path, direct_name)
-            if os.path.isdir(direct_game_path):
+            if fs_cache.isdir(direct_game_path):
                 _add_guess(
                     state,
                     direct_game_path,
@@ -2748,7 +3016,7 @@ def _search_home_fallback(state: LinuxSearchState, cancellation_manager=None) ->
 
     user_home = os.path.expanduser('~')
     try:
-        entries = sorted(os.listdir(user_home), key=str.casefold)
+        entries = sorted(fs_cache.listdir(user_home), key=str.casefold)
     except OSError:
         return
 
@@ -2756,7 +3024,7 @@ def _search_home_fallback(state: LinuxSearchState, cancellation_manager=None) ->
         if _is_cancelled(cancellation_manager):
             return
         path = os.path.join(user_home, entry)
-        if not os.path.isdir(path):
+        if not fs_cache.isdir(path):
             continue
         matches_game = _component_matches_game(entry, state)
         matches_company = _component_matches_company(entry, state)
@@ -2781,7 +3049,7 @@ def _rank_and_sort_results(
     for path, data in state.guesses_data.items():
         if _is_cancelled(cancellation_manager):
             return []
-        if not os.path.isdir(path):
+        if not fs_cache.isdir(path):
             continue
         canonical_key = _path_key(path)
         if canonical_key in seen_keys:
@@ -2893,6 +3161,50 @@ def final_sort_key(guess_tuple: Tuple, outer_scope_data: Dict) -> Tuple:
     return sort_key[:2]
 
 
+def _search_phases(game_install_dir: str, appid: str, steam_userdata_path: str,
+                   steam_id3_to_use: str, is_steam_game: bool
+                   ) -> List[Tuple[str, Callable[[LinuxSearchState, Any], None]]]:
+    """The enabled search phases, in ranking order, as ``(name, run)`` pairs."""
+    phases = []
+
+    # 1. Steam Userdata (High Priority)
+    if is_steam_game and appid and steam_userdata_path and steam_id3_to_use:
+        phases.append(("Steam userdata", lambda state, cancel: _search_steam_userdata(
+            state, appid, steam_userdata_path, steam_id3_to_use, cancel)))
+
+    # 2. Proton Compatdata (for Steam games)
+    if is_steam_game and appid:
+        phases.append(("Proton compatdata", lambda state, cancel: _search_proton_steam(
+            state, appid, cancel)))
+
+    # 3. Proton for non-Steam games
+    if (not is_steam_game or not appid) and getattr(config, 'LINUX_ENABLE_PROTON_SCAN_NONSTEAM', True):
+        phases.append(("non-Steam Proton prefixes", _search_proton_for_non_steam_games))
+
+    # 4. Snap games search
+    if getattr(config, 'LINUX_ENABLE_SNAP_SEARCH', True):
+        phases.append(("snap", _search_snap_games))
+
+    # 5. Game Install Directory
+    phases.append(("install directory", lambda state, cancel: _search_install_directory(
+        state, game_install_dir, cancel)))
+
+    # 6. XDG and Common Linux Paths
+    phases.append(("XDG locations", _search_xdg_locations))
+
+    # 7. User's Home Directory (fallback)
+    phases.append(("home fallback", _search_home_fallback))
+    return phases
+
+
+def _run_phase(state: LinuxSearchState, phase_index: int, run: Callable,
+               cancellation) -> LinuxSearchState:
+    phase_state = state.fork(phase_index)
+    if not _is_cancelled(cancellation):
+        run(phase_state, cancellation)
+    return phase_state
+
+
 def guess_save_path(game_name: str, game_install_dir: str = None, appid: str = None,
                     steam_userdata_path: str = None, steam_id3_to_use: str = None,
                     is_steam_game: bool = True, installed_steam_games_dict: Dict = None,
@@ -2923,43 +3235,34 @@ def guess_save_path(game_name: str, game_install_dir: str = None, appid: str = N
         is_steam_game=is_steam_game,
     )
 
-    # 1. Steam Userdata (High Priority)
-    if is_steam_game and appid and steam_userdata_path and steam_id3_to_use:
-        _search_steam_userdata(state, appid, steam_userdata_path, steam_id3_to_use, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 2. Proton Compatdata (for Steam games)
-    if is_steam_game and appid:
-        _search_proton_steam(state, appid, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 3. Proton for non-Steam games
-    if (not is_steam_game or not appid) and getattr(config, 'LINUX_ENABLE_PROTON_SCAN_NONSTEAM', True):
-        _search_proton_for_non_steam_games(state, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 4. Snap games search
-    if getattr(config, 'LINUX_ENABLE_SNAP_SEARCH', True):
-        if not _is_cancelled(cancellation_manager):
-            _search_snap_games(state, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 5. Game Install Directory
-    _search_install_directory(state, game_install_dir, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 6. XDG and Common Linux Paths
-    _search_xdg_locations(state, cancellation_manager)
-    if _is_cancelled(cancellation_manager):
-        return []
-
-    # 7. User's Home Directory (fallback)
-    _search_home_fallback(state, cancellation_manager)
+    phases = _search_phases(
+        game_install_dir, appid, steam_userdata_path, steam_id3_to_use,
+        is_steam_game,
+    )
+    if getattr(config, 'SAVE_SEARCH_PARALLEL_PHASES', True) and len(phases) > 1:
+        # Each phase crawls its own fork; merging in phase order keeps the
+        # ranking identical from run to run.
+        phase_states = search_phases.run_search_phases(
+            [
+                (name, lambda cancellation, index=index, run=run: _run_phase(
+                    state, index, run, cancellation))
+                for index, (name, run) in enumerate(phases)
+            ],
+            max_workers=getattr(
+                config, 'SAVE_SEARCH_MAX_WORKERS', search_phases.DEFAULT_MAX_WORKERS
+            ),
+            cancellation_manager=cancellation_manager,
+            thread_name_prefix="linux-save-search",
+        )
+        if phase_states is None:
+            return []
+        for phase_state in phase_states:
+            state.merge(phase_state)
+    else:
+        for _, run in phases:
+            run(state, cancellation_manager)
+            if _is_cancelled(cancellation_manager):
+                return []
 
     # Rank and return results
     return _rank_and_sort_results(state, game_name, cancellation_manager)
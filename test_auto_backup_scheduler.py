@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from backup import auto_backup_scheduler, batch_backup
+from backup.auto_backup_scheduler import RESULT_FAILED, RESULT_SUCCESS, AutoBackupScheduler
+
+HDD, SSD = 1, 2
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch):
+    # Paths name their device: "/hdd/..." is a rotational disk, anything else an SSD
+    monkeypatch.setattr(auto_backup_scheduler, "_devices_for",
+                        lambda paths: tuple(sorted({HDD if p.startswith("/hdd/") else SSD for p in paths})))
+    monkeypatch.setattr(batch_backup, "is_rotational", lambda device: device == HDD)
+    return AutoBackupScheduler(max_workers=3, queue_path=str(tmp_path / "queue.json"))
+
+
+def _drain(scheduler):
+    names = []
+    while (job := scheduler.pop_ready()) is not None:
+        names.append(job.profile_name)
+    return names
+
+
+def test_jobs_run_by_mode_then_staleness_then_size(scheduler):
+    scheduler.enqueue("Fixed", "interval_fixed", ["/ssd/fixed"], stale_seconds=10 * 86400)
+    scheduler.enqueue("Small", "interval_changed", ["/ssd/small"], stale_seconds=7200 + 5, size_bytes=10)
+    scheduler.enqueue("Big", "interval_changed", ["/ssd/big"], stale_seconds=7200 + 900, size_bytes=10_000)
+    scheduler.enqueue("Stale", "interval_changed", ["/ssd/stale"], stale_seconds=5 * 86400, size_bytes=10**9)
+    scheduler.enqueue("Closed", "process_close", ["/ssd/closed"])
+
+    assert scheduler.queued_names() == ["Closed", "Stale", "Small", "Big", "Fixed"]
+    assert _drain(scheduler) == ["Closed", "Stale", "Small"]
+    assert scheduler.metrics()["running"] == 3 and scheduler.metrics()["queue_depth"] == 2
+
+
+def test_requests_for_a_queued_profile_are_coalesced(scheduler):
+    assert scheduler.enqueue("Game", "interval_fixed", ["/ssd/old"], reason="timer")
+    assert not scheduler.enqueue("Game", "process_close", ["/ssd/new"], reason="game closed")
+    assert not scheduler.enqueue("Game", "interval_changed", ["/ssd/new"], reason="changed")
+
+    [job] = [scheduler.pop_ready()]
+    assert (job.mode, job.reason, job.paths) == ("process_close", "game closed", ["/ssd/new"])
+    assert scheduler.pop_ready() is None
+
+    # A request while the profile runs waits for that run to finish
+    assert scheduler.enqueue("Game", "interval_changed", ["/ssd/new"])
+    assert scheduler.is_pending("Game") and scheduler.pop_ready() is None
+    scheduler.finish("Game", RESULT_SUCCESS)
+    assert scheduler.pop_ready().profile_name == "Game"
+
+
+def test_busy_devices_and_workers_hold_jobs_back(scheduler):
+    scheduler.enqueue("Hdd1", "process_close", ["/hdd/one"])
+    scheduler.enqueue("Hdd2", "process_close", ["/hdd/two"])
+    scheduler.enqueue("Both", "interval_changed", ["/hdd/three", "/ssd/three"])
+    for index in range(3):
+        scheduler.enqueue(f"Ssd{index}", "interval_fixed", [f"/ssd/{index}"])
+
+    # One backup per rotational disk; the SSD jobs go around the waiting ones
+    assert _drain(scheduler) == ["Hdd1", "Ssd0", "Ssd1"]
+    assert scheduler.queued_names() == ["Hdd2", "Both", "Ssd2"]
+
+    scheduler.finish("Ssd0", RESULT_SUCCESS)
+    assert _drain(scheduler) == ["Ssd2"]
+    assert scheduler.pop_ready() is None  # all three workers busy
+    scheduler.finish("Hdd1", RESULT_FAILED)
+    assert _drain(scheduler) == ["Hdd2"]  # "Both" still waits for the disk
+    for name in ("Ssd1", "Ssd2", "Hdd2"):
+        scheduler.finish(name, RESULT_SUCCESS)
+    assert _drain(scheduler) == ["Both"]
+
+    metrics = scheduler.metrics()
+    assert metrics["completed"] == {"success": 4, "failed": 1, "skipped": 0}
+    assert metrics["queue_depth"] == 0 and metrics["running"] == 1
+
+
+def test_queued_and_running_jobs_survive_a_restart(scheduler, tmp_path):
+    scheduler.enqueue("Running", "process_close", ["/ssd/running"])
+    scheduler.enqueue("Queued", "interval_fixed", ["/ssd/queued"], reason="timer")
+    assert scheduler.pop_ready().profile_name == "Running"
+    saved = json.loads((tmp_path / "queue.json").read_text())
+    assert [e["profile_name"] for e in saved["queue"]] == ["Running", "Queued"]
+
+    restarted = AutoBackupScheduler(max_workers=1, queue_path=scheduler.queue_path)
+    entries = restarted.load_persisted()
+    for entry in entries:
+        restarted.restore(entry, [f"/ssd/{entry['profile_name'].lower()}"])
+    assert restarted.queued_names() == ["Running", "Queued"]
+    assert restarted._queued["Queued"].enqueued_at == entries[1]["enqueued_at"]
+
+    assert _drain(restarted) == ["Running"]
+    restarted.finish("Running", RESULT_SUCCESS)
+    assert _drain(restarted) == ["Queued"]
+    restarted.finish("Queued", RESULT_SUCCESS)
+    assert not (tmp_path / "queue.json").exists()
@@ -0,0 +1,108 @@
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+from core import backup_catalog, hash_cache
+
+
+@pytest.fixture
+def backup_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(hash_cache, "get_cache_path", lambda: str(tmp_path / "hash_cache.db"))
+    hash_cache.forget_all()
+    root = tmp_path / "backups"
+    (root / "Game").mkdir(parents=True)
+    yield root
+    backup_catalog.close_all()
+    hash_cache.forget_all()
+
+
+def _write_archive(path, mtime, profile="Game"):
+    with zipfile.ZipFile(path, "w") as zipf:
+        zipf.writestr("save.dat", b"data")
+        zipf.writestr("savestate/manifest.json", json.dumps({"profile_name": profile}))
+    os.utime(path, (mtime, mtime))
+
+
+def _bump_dir_mtime(folder):
+    # Coarse filesystem clocks can leave the directory mtime unchanged within a test
+    st = os.stat(folder)
+    os.utime(folder, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_catalog_reconciles_external_adds_renames_and_deletes(backup_root):
+    folder = backup_root / "Game"
+    _write_archive(folder / "Backup_Game_20240101_000000.zip", 1_700_000_000)
+    _write_archive(folder / "Backup_Game_20240102_000000.zip", 1_700_100_000)
+    (folder / "manual_copy.zip").write_bytes(b"not a SaveState backup")
+
+    names = [name for name, _path, _dt in backup_catalog.list_backups(str(backup_root), "Game")]
+    assert names == ["Backup_Game_20240102_000000.zip", "Backup_Game_20240101_000000.zip"]
+    assert backup_catalog.get_summary(str(backup_root), "Game")[0] == 2
+    assert backup_catalog.get_zip_count(str(backup_root), "Game") == 3
+
+    os.rename(folder / "Backup_Game_20240101_000000.zip", folder / "Backup_Game_20231231_000000.zip")
+    os.remove(folder / "Backup_Game_20240102_000000.zip")
+    _bump_dir_mtime(folder)
+    names = [name for name, _path, _dt in backup_catalog.list_backups(str(backup_root), "Game")]
+    assert names == ["Backup_Game_20231231_000000.zip"]
+
+    info = backup_catalog.get_archive_info(str(folder / "Backup_Game_20231231_000000.zip"))
+    assert info["manifest"] == {"profile_name": "Game"}
+
+    (folder / "manual_copy.zip").unlink()
+    _bump_dir_mtime(folder)
+    assert backup_catalog.get_zip_count(str(backup_root), "Game") == 1
+
+
+def test_catalog_records_and_forgets_without_reading_archives(backup_root, monkeypatch):
+    folder = backup_root / "Game"
+    assert backup_catalog.list_backups(str(backup_root), "Game") == []
+
+    reads = []
+    monkeypatch.setattr(hash_cache, "_compute", lambda path: reads.append(path) or {})
+    archive = folder / "Backup_Game_20240103_000000.zip"
+    folder_state = backup_catalog.get_folder_state(str(folder))
+    _write_archive(archive, 1_700_200_000)
+    assert backup_catalog.record_archive(str(archive), sha256="ab" * 32, folder_state=folder_state)
+    assert reads == []
+
+    info = backup_catalog.get_archive_info(str(archive))
+    assert info["sha256"] == "ab" * 32
+    assert info["manifest"]["profile_name"] == "Game"
+    assert backup_catalog.get_summary(str(backup_root), "Game")[0] == 1
+
+    folder_state = backup_catalog.get_folder_state(str(folder))
+    archive.unlink()
+    assert backup_catalog.forget_archive(str(archive), folder_state=folder_state)
+    assert backup_catalog.get_summary(str(backup_root), "Game") == (0, None)
+
+
+def test_catalog_rescans_folders_changed_within_one_mtime_tick(backup_root, monkeypatch):
+    folder = backup_root / "Game"
+
+    def set_dir_mtime(mtime_ns):
+        os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+    def names():
+        return sorted(name for name, _path, _dt in backup_catalog.list_backups(str(backup_root), "Game"))
+
+    # FAT-like 2 s directory timestamps: both writes land in the same tick
+    tick = time.time_ns() // 2_000_000_000 * 2_000_000_000
+    _write_archive(folder / "Backup_Game_20240101_000000.zip", 1_700_000_000)
+    set_dir_mtime(tick)
+    assert names() == ["Backup_Game_20240101_000000.zip"]
+    _write_archive(folder / "Backup_Game_20240102_000000.zip", 1_700_100_000)
+    set_dir_mtime(tick)
+    assert names() == ["Backup_Game_20240101_000000.zip", "Backup_Game_20240102_000000.zip"]
+
+    # Once the mtime is older than the window, an unchanged folder is not listed again
+    set_dir_mtime(tick - 10_000_000_000)
+    assert len(names()) == 2
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(backup_catalog.os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+    assert len(names()) == 2
+    assert scans == []
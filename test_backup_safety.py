@@ -0,0 +1,166 @@
+import os
+import time
+
+import pytest
+
+from backup import backup_safety
+
+
+class FakeClock:
+    """Stands in for the ``time`` module: sleeping advances the clock and runs ``on_sleep``."""
+
+    def __init__(self):
+        self.now = time.time()
+        self.mono = 0.0
+        self.on_sleep = None
+
+    def time(self):
+        return self.now
+
+    def time_ns(self):
+        return int(self.now * 1e9)
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.mono += seconds
+        if self.on_sleep:
+            self.on_sleep()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(backup_safety, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def save(tmp_path, clock):
+    folder = tmp_path / "Saves"
+    folder.mkdir()
+    slot = folder / "slot1.sav"
+    slot.write_bytes(b"save")
+    _age(folder, slot, clock, 3600)
+    return folder, slot
+
+
+def _age(folder, path, clock, seconds):
+    stamp = clock.now - seconds
+    os.utime(path, (stamp, stamp))
+    os.utime(folder, (stamp, stamp))
+
+
+def _check(paths, **kwargs):
+    kwargs.setdefault("settle_seconds", 3.0)
+    kwargs.setdefault("max_wait_seconds", 10.0)
+    return backup_safety.check_quiescence([str(p) for p in paths], **kwargs)
+
+
+def test_nothing_to_protect_is_safe(clock):
+    assert _check([]).safe
+
+
+def test_events_allow_a_quiet_save_without_scanning(save, clock, monkeypatch):
+    monkeypatch.setattr(backup_safety, "_scan_tree", lambda paths: pytest.fail("no scan expected"))
+    result = _check([save[0]], quiet_since=lambda: clock.now - 60)
+    assert (result.safe, result.source, result.full_scans) == (True, "events", 0)
+
+
+def test_events_refuse_while_the_watcher_sees_writes(save, clock):
+    result = _check([save[0]], quiet_since=lambda: clock.now - 1)
+    assert (result.safe, result.source) == (False, "events")
+    assert result.waited_seconds >= 10.0
+
+
+def test_unknown_event_state_falls_back_to_scanning(save, clock):
+    result = _check([save[0]], quiet_since=lambda: None)
+    assert (result.safe, result.source, result.full_scans) == (True, "scan", 2)
+
+
+def test_scan_allows_a_save_untouched_for_a_while(save, clock):
+    result = _check([save[0]])
+    assert result.safe and result.full_scans == 2
+    assert result.waited_seconds <= backup_safety.CONFIRM_SECONDS
+
+
+def test_scan_waits_for_a_recent_write_to_settle(save, clock):
+    folder, slot = save
+    _age(folder, slot, clock, 1)
+    result = _check([folder])
+    assert result.safe
+    assert 2.0 <= result.waited_seconds < 10.0
+
+
+def test_scan_refuses_a_save_that_keeps_changing(save, clock):
+    folder, slot = save
+
+    def write():
+        slot.write_bytes(slot.read_bytes() + b"+")
+        _age(folder, slot, clock, 0)
+
+    clock.on_sleep = write
+    _age(folder, slot, clock, 0)
+    result = _check([folder])
+    assert (result.safe, result.source) == (False, "scan")
+
+
+def test_confirm_scan_catches_a_write_that_keeps_an_old_mtime(save, clock):
+    folder, slot = save
+
+    def rewrite_in_place_once():
+        clock.on_sleep = None
+        slot.write_bytes(b"longer save")
+        _age(folder, slot, clock, 3600)
+
+    clock.on_sleep = rewrite_in_place_once
+    result = _check([folder])
+    assert result.safe and result.full_scans == 3
+    assert result.waited_seconds >= 3.0
+
+    # Refused when the in-place writes never stop
+    clock.on_sleep = lambda: (slot.write_bytes(slot.read_bytes() + b"+"), _age(folder, slot, clock, 3600))
+    assert not _check([folder]).safe
+
+
+def test_scan_refuses_a_file_that_cannot_be_read(save, clock):
+    folder, slot = save
+    os.symlink(folder / "missing.sav", folder / "broken.sav")
+    _age(folder, slot, clock, 3600)
+    assert not _check([folder]).safe
+    (folder / "broken.sav").unlink()
+    _age(folder, slot, clock, 3600)
+    assert _check([folder]).safe
+
+
+def test_wait_for_quiescence_reports_the_decision(save, clock):
+    folder, slot = save
+    assert backup_safety.wait_for_quiescence([str(folder)], settle_seconds=3.0, profile_name="Game")
+    clock.on_sleep = lambda: _age(folder, slot, clock, 0)
+    assert not backup_safety.wait_for_quiescence([str(folder)], settle_seconds=3.0, max_wait_seconds=5.0,
+                                                 profile_name="Game")
+
+
+def test_auto_backup_runs_only_once_the_save_is_confirmed_safe(monkeypatch):
+    pytest.importorskip("PySide6")
+    from backup import auto_backup_manager
+
+    runs = []
+    monkeypatch.setattr(auto_backup_manager.backup_runner, "run_silent_backup", lambda name: runs.append(name) or True)
+    skipped = (False, f"{auto_backup_manager.SKIPPED_IN_USE_PREFIX}Game")
+
+    monkeypatch.setattr(backup_safety, "wait_for_quiescence", lambda paths, **kwargs: False)
+    assert auto_backup_manager._do_silent_backup("Game", ["/saves"]) == skipped
+
+    def broken_check(paths, **kwargs):
+        raise OSError("stat failed")
+
+    monkeypatch.setattr(backup_safety, "wait_for_quiescence", broken_check)
+    assert auto_backup_manager._do_silent_backup("Game", ["/saves"]) == skipped
+    assert runs == []
+
+    monkeypatch.setattr(backup_safety, "wait_for_quiescence", lambda paths, **kwargs: True)
+    assert auto_backup_manager._do_silent_backup("Game", ["/saves"])[0]
+    assert runs == ["Game"]
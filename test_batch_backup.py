@@ -0,0 +1,14 @@
+from backup import batch_backup
+
+
+def test_jobs_hold_a_slot_on_the_backup_device(tmp_path):
+    source = tmp_path / "saves"
+    source.mkdir()
+    backup_dir = tmp_path / "backups" / "not-created-yet"
+    profiles = {"Game": {"path": str(source)}}
+
+    backup_device = batch_backup._device_of(str(backup_dir))
+    assert backup_device == source.stat().st_dev
+    job, result = batch_backup._prepare_job("Game", profiles, {}, str(backup_dir), backup_device=12345)
+    assert result is None
+    assert job.devices == [source.stat().st_dev, 12345]
@@ -0,0 +1,37 @@
+import types
+import zipfile
+
+import pytest
+
+from core import compression_codecs, dedup_store
+
+
+def test_zstd_failures_surface_as_archive_errors(tmp_path, monkeypatch):
+    class FakeZstdError(Exception):
+        pass
+
+    class FailingCompressor:
+        def __init__(self, **kwargs):
+            pass
+
+        def copy_stream(self, src, dest, size=None):
+            raise FakeZstdError("frame too large")
+
+    monkeypatch.setattr(compression_codecs, "zstandard", types.SimpleNamespace(
+        ZstdCompressor=FailingCompressor, ZstdError=FakeZstdError))
+    source = tmp_path / "slot.sav"
+    source.write_bytes(b"save")
+
+    with zipfile.ZipFile(tmp_path / "Backup.zip", "w") as zipf:
+        with pytest.raises(OSError, match="Zstandard compression failed"):
+            compression_codecs.write_zstd_entries(zipf, [(str(source), "slot.sav")])
+
+
+@pytest.mark.parametrize("codec, level, expected", [
+    (compression_codecs.CODEC_STORE, 6, (compression_codecs.CODEC_STORE, None)),
+    (compression_codecs.CODEC_ADAPTIVE, 6, (compression_codecs.CODEC_ADAPTIVE, 6)),
+    (compression_codecs.CODEC_LZMA, None, (compression_codecs.CODEC_DEFLATE, 6)),
+    (compression_codecs.CODEC_ZSTD, 6, (compression_codecs.CODEC_DEFLATE, 6)),
+])
+def test_dedup_chunks_fall_back_to_zlib(codec, level, expected):
+    assert dedup_store._chunk_codec(codec, level) == expected
@@ -0,0 +1,115 @@
+import os
+import threading
+import zipfile
+
+import pytest
+
+from cloud_utils.storage_provider import select_zip_files_for_upload
+from core import backup_catalog, dedup_store, hash_cache
+
+
+@pytest.fixture
+def backup_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(hash_cache, "get_cache_path", lambda: str(tmp_path / "hash_cache.db"))
+    hash_cache.forget_all()
+    root = tmp_path / "backups"
+    (root / "Game").mkdir(parents=True)
+    yield root
+    for conn in dedup_store._connections.values():
+        conn.close()
+    dedup_store._connections.clear()
+    backup_catalog.close_all()
+    hash_cache.forget_all()
+
+
+def _objects(root):
+    objects_dir = os.path.join(dedup_store.get_store_dir(str(root)), dedup_store.OBJECTS_DIRNAME)
+    return sorted(name for _dirs, _subdirs, names in os.walk(objects_dir) for name in names)
+
+
+def _snapshot(root, tmp_path, name, files):
+    source = tmp_path / "source"
+    source.mkdir(exist_ok=True)
+    entries = []
+    for arcname, data in files.items():
+        (source / arcname).write_bytes(data)
+        entries.append((str(source / arcname), arcname))
+    archive = root / "Game" / name
+    ok, message = dedup_store.write_snapshot(str(archive), entries, {"profile_name": "Game"})
+    assert ok, message
+    return archive
+
+
+def test_snapshots_share_chunks_and_export_a_restorable_zip(backup_root, tmp_path):
+    first = _snapshot(backup_root, tmp_path, "Backup_Game_20240101_000000.zip",
+                      {"slot1.sav": b"a" * 5000, "slot2.sav": b"b" * 10})
+    chunk_count = len(_objects(backup_root))
+    second = _snapshot(backup_root, tmp_path, "Backup_Game_20240102_000000.zip",
+                       {"slot1.sav": b"a" * 5000, "slot2.sav": b"changed"})
+    assert len(_objects(backup_root)) == chunk_count + 1
+
+    exported = tmp_path / "restore.zip"
+    assert dedup_store.export_snapshot_to_zip(str(first), str(exported)) == (True, None)
+    with zipfile.ZipFile(exported) as zipf:
+        assert zipf.read("slot1.sav") == b"a" * 5000
+        assert zipf.read("slot2.sav") == b"b" * 10
+        assert "savestate/snapshot.json" not in zipf.namelist()
+
+    # Deleting the first snapshot frees only the chunk nobody else uses
+    assert dedup_store.delete_archive(str(first)) == 1
+    assert not first.exists()
+    exported.unlink()
+    assert dedup_store.export_snapshot_to_zip(str(second), str(exported)) == (True, None)
+
+    # Snapshots are never uploaded on their own
+    (backup_root / "Game" / "Backup_Game_20231231_000000.zip").write_bytes(exported.read_bytes())
+    assert select_zip_files_for_upload(str(backup_root / "Game")) == ["Backup_Game_20231231_000000.zip"]
+
+
+def test_garbage_collection_sweeps_orphans_but_waits_for_writers(backup_root, tmp_path, monkeypatch):
+    archive = _snapshot(backup_root, tmp_path, "Backup_Game_20240101_000000.zip", {"slot.sav": b"live"})
+    live = _objects(backup_root)
+    orphan_dir = os.path.join(dedup_store.get_store_dir(str(backup_root)), dedup_store.OBJECTS_DIRNAME, "ff")
+    os.makedirs(orphan_dir, exist_ok=True)
+    with open(os.path.join(orphan_dir, "ff" * 32), "wb") as f:
+        f.write(b"Rorphan")
+
+    monkeypatch.setattr(dedup_store, "_active_writers", 1)
+    assert dedup_store.collect_garbage(str(backup_root)) == 0
+    monkeypatch.setattr(dedup_store, "_active_writers", 0)
+
+    assert dedup_store.maybe_collect_garbage(str(backup_root)) == 1
+    assert _objects(backup_root) == live
+    # Throttled: the next automatic run is skipped
+    with open(os.path.join(orphan_dir, "ff" * 32), "wb") as f:
+        f.write(b"Rorphan")
+    assert dedup_store.maybe_collect_garbage(str(backup_root)) == 0
+
+    exported = tmp_path / "restore.zip"
+    assert dedup_store.export_snapshot_to_zip(str(archive), str(exported)) == (True, None)
+
+
+def test_chunk_objects_are_written_outside_the_store_lock(backup_root, tmp_path, monkeypatch):
+    real_store_payload = dedup_store._store_payload
+    lock_free = []
+
+    def store_payload(store_dir, digest, payload):
+        # Another thread (e.g. a parallel batch backup) can use the store meanwhile
+        probe = threading.Thread(target=lambda: lock_free.append(_try_lock()))
+        probe.start()
+        probe.join()
+        real_store_payload(store_dir, digest, payload)
+
+    monkeypatch.setattr(dedup_store, "_store_payload", store_payload)
+    archive = _snapshot(backup_root, tmp_path, "Backup_Game_20240101_000000.zip", {"slot.sav": b"x" * 100})
+    assert lock_free == [True]
+
+    exported = tmp_path / "restore.zip"
+    assert dedup_store.export_snapshot_to_zip(str(archive), str(exported)) == (True, None)
+
+
+def _try_lock():
+    if not dedup_store._lock.acquire(timeout=5):
+        return False
+    dedup_store._lock.release()
+    return True
@@ -0,0 +1,104 @@
+import os
+import zipfile
+
+import pytest
+
+from core import core_logic
+
+
+@pytest.fixture
+def differential(monkeypatch):
+    settings = {"restore_mode": "differential"}
+    monkeypatch.setattr(core_logic, "_get_setting_from_settings", lambda key, default=None: settings.get(key, default))
+    return settings
+
+
+def _archive(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for name, data in members.items():
+            zipf.writestr(name, data)
+    return str(path)
+
+
+def _tree(root):
+    return {
+        os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"): open(os.path.join(dirpath, name), "rb").read()
+        for dirpath, _dirs, files in os.walk(root) for name in files
+    }
+
+
+def test_differential_restore_skips_replaces_and_deletes(tmp_path, differential):
+    dest = tmp_path / "Saves"
+    (dest / "old" / "deep").mkdir(parents=True)
+    (dest / "same.sav").write_bytes(b"same")
+    (dest / "changed.sav").write_bytes(b"before")
+    (dest / "old" / "deep" / "extra.sav").write_bytes(b"gone")
+    same_stat = (dest / "same.sav").stat()
+    archive = _archive(tmp_path / "backup.zip", {
+        "same.sav": b"same", "changed.sav": b"after", "new/slot.sav": b"new",
+    })
+
+    ok, message = core_logic.perform_restore("Game", str(dest), archive)
+    assert ok, message
+    assert _tree(dest) == {"same.sav": b"same", "changed.sav": b"after", "new/slot.sav": b"new"}
+    assert not (dest / "old").exists()
+    assert (dest / "same.sav").stat().st_ino == same_stat.st_ino
+    assert (dest / "same.sav").stat().st_mtime_ns == same_stat.st_mtime_ns
+
+
+def test_differential_restore_of_multi_path_and_single_file_profiles(tmp_path, differential):
+    folder = tmp_path / "Saves"
+    folder.mkdir()
+    (folder / "extra.sav").write_bytes(b"gone")
+    config_dir = tmp_path / "Config"
+    config_dir.mkdir()
+    config = config_dir / "settings.ini"
+    config.write_bytes(b"before")
+    (config_dir / "unrelated.txt").write_bytes(b"not part of the profile")
+    archive = _archive(tmp_path / "backup.zip", {
+        "Saves/slot.sav": b"slot", "Config/settings.ini": b"after",
+    })
+
+    ok, message = core_logic.perform_restore("Game", [str(folder), str(config)], archive)
+    assert ok, message
+    assert _tree(folder) == {"slot.sav": b"slot"}
+    assert _tree(config_dir) == {"settings.ini": b"after", "unrelated.txt": b"not part of the profile"}
+
+    config.write_bytes(b"edited")
+    single = _archive(tmp_path / "single.zip", {"Config/settings.ini": b"restored"})
+    ok, message = core_logic.perform_restore("Game", str(config), single)
+    assert ok, message
+    assert config.read_bytes() == b"restored"
+    assert (config_dir / "unrelated.txt").exists()
+
+
+def test_failed_write_keeps_files_missing_from_the_archive(tmp_path, differential, monkeypatch):
+    dest = tmp_path / "Saves"
+    dest.mkdir()
+    (dest / "extra.sav").write_bytes(b"still here")
+    archive = _archive(tmp_path / "backup.zip", {"a.sav": b"a", "b.sav": b"b"})
+    original = core_logic._write_member_atomically
+
+    def failing_write(zipf, info, target_path):
+        if info.filename == "b.sav":
+            raise OSError("disk full")
+        original(zipf, info, target_path)
+
+    monkeypatch.setattr(core_logic, "_write_member_atomically", failing_write)
+    ok, message = core_logic.perform_restore("Game", str(dest), archive)
+    assert not ok and "disk full" in message
+    assert _tree(dest) == {"a.sav": b"a", "extra.sav": b"still here"}
+
+
+def test_clean_restore_is_the_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(core_logic, "_get_setting_from_settings", lambda key, default=None: default)
+    monkeypatch.setattr(core_logic, "_perform_differential_restore",
+                        lambda *args: pytest.fail("differential restore must be opt-in"))
+    dest = tmp_path / "Saves"
+    dest.mkdir()
+    (dest / "extra.sav").write_bytes(b"gone")
+    archive = _archive(tmp_path / "backup.zip", {"a.sav": b"a"})
+
+    ok, message = core_logic.perform_restore("Game", str(dest), archive)
+    assert ok, message
+    assert _tree(dest) == {"a.sav": b"a"}
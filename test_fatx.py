@@ -0,0 +1,194 @@
+import struct
+
+import pytest
+
+from emulator_utils.xemu_lab import fatx
+from emulator_utils.xemu_lab.fatx import FATXBoundsError, FATXFormatError, FATXVolume, XboxRegion
+from emulator_utils.xemu_lab.qcow2 import UnsupportedQCOW2Feature
+
+# 64 KiB partition, 512-byte clusters: FAT16 with 129 entries in one 4 KiB page,
+# data clusters 1..112 starting right after it.
+PARTITION = XboxRegion("T", 0x1000, 0x10000, "Test partition")
+CLUSTER = 0x200
+FAT_OFFSET = PARTITION.offset + fatx.FATX_HEADER_SIZE
+FILE_AREA = FAT_OFFSET + fatx.FATX_PAGE_SIZE
+DATA_CLUSTERS = (PARTITION.end - FILE_AREA) // CLUSTER
+EOC = 0xFFFF
+
+
+class MemoryDevice:
+    """Guest disk in memory, counting reads and bumping write_generation on writes."""
+
+    def __init__(self, size):
+        self.data = bytearray(size)
+        self.reads = []
+        self.write_generation = 0
+        self.unsupported = None  # guest range that raises like a compressed qcow2 cluster
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def read_at(self, offset, size):
+        self.reads.append((offset, size))
+        if self.unsupported and offset < self.unsupported[1] and offset + size > self.unsupported[0]:
+            raise UnsupportedQCOW2Feature("compressed cluster")
+        return bytes(self.data[offset:offset + size])
+
+    def write_at(self, offset, data):
+        self.data[offset:offset + len(data)] = data
+        self.write_generation += 1
+
+    def fat_reads(self):
+        return [r for r in self.reads if FAT_OFFSET <= r[0] < FILE_AREA]
+
+
+def _cluster_offset(cluster):
+    return FILE_AREA + (cluster - 1) * CLUSTER
+
+
+def _set_fat(device, cluster, value):
+    struct.pack_into("<H", device.data, FAT_OFFSET + cluster * 2, value)
+
+
+def _set_chain(device, clusters):
+    for current, following in zip(clusters, clusters[1:] + [EOC]):
+        _set_fat(device, current, following)
+
+
+def _dirent(name, first_cluster, size, directory=False):
+    raw = bytearray(fatx.FATX_DIRENT_SIZE)
+    raw[0] = len(name)
+    raw[1] = fatx.FATX_DIRECTORY_ATTRIBUTE if directory else 0
+    raw[2:2 + len(name)] = name.encode("latin-1")
+    struct.pack_into("<II", raw, 44, first_cluster, size)
+    return bytes(raw)
+
+
+@pytest.fixture
+def device():
+    """Root dir in cluster 1, UDATA/4d530004 with a save split over clusters 3-4 and 9."""
+
+    device = MemoryDevice(PARTITION.end + 0x1000)
+    device.data[PARTITION.offset:PARTITION.offset + 4] = b"FATX"
+    struct.pack_into("<III", device.data, PARTITION.offset + 4, 0x1234, 1, 1)
+    _set_fat(device, 0, 0xFFF8)
+
+    _set_chain(device, [1])
+    _set_chain(device, [2])
+    _set_chain(device, [5])
+    _set_chain(device, [3, 4, 9])
+    _set_chain(device, [10, 11])
+    device.data[_cluster_offset(1):_cluster_offset(1) + 64] = _dirent("UDATA", 2, 0, directory=True)
+    device.data[_cluster_offset(2):_cluster_offset(2) + 64] = _dirent("4d530004", 5, 0, directory=True)
+    save = bytes(range(256)) * 5 + b"tail"
+    dirents = _dirent("slot.sav", 3, len(save)) + _dirent("empty.sav", 0, 0)
+    device.data[_cluster_offset(5):_cluster_offset(5) + len(dirents)] = dirents
+    for index, cluster in enumerate([3, 4, 9]):
+        chunk = save[index * CLUSTER:(index + 1) * CLUSTER]
+        device.data[_cluster_offset(cluster):_cluster_offset(cluster) + len(chunk)] = chunk
+    device.save = save
+    return device
+
+
+def test_header_describes_the_synthetic_partition(device):
+    volume = FATXVolume(device, PARTITION)
+    header = volume.header
+    assert header.is_fat16 and header.cluster_size == CLUSTER
+    assert (header.fat_offset, header.file_area_offset) == (FAT_OFFSET, FILE_AREA)
+    assert header.data_cluster_count == DATA_CLUSTERS
+
+    device.data[PARTITION.offset] = 0
+    with pytest.raises(FATXFormatError):
+        FATXVolume(device, PARTITION)
+
+
+def test_fat_is_read_once_for_every_entry_lookup(device):
+    volume = FATXVolume(device, PARTITION)
+    device.reads.clear()
+    assert [volume.read_fat_entry(c) for c in (3, 4, 9, 6)] == [4, 9, EOC, 0]
+    assert volume.get_chain(3) == [3, 4, 9]
+    assert volume.get_chain(10) == [10, 11]
+    assert device.fat_reads() == [(FAT_OFFSET, volume.header.max_clusters * 2)]
+    with pytest.raises(FATXBoundsError):
+        volume.read_fat_entry(volume.header.max_clusters)
+
+
+def test_broken_and_cyclic_chains_are_rejected(device):
+    _set_chain(device, [20, 21])
+    _set_fat(device, 21, 20)
+    _set_fat(device, 30, 31)
+    volume = FATXVolume(device, PARTITION)
+    with pytest.raises(FATXFormatError, match="cycle"):
+        volume.get_chain(20)
+    with pytest.raises(FATXFormatError, match="broken"):
+        volume.get_chain(30)
+    with pytest.raises(FATXFormatError, match="limit"):
+        volume.get_chain(3, max_clusters=2)
+    with pytest.raises(FATXBoundsError):
+        volume.get_chain(DATA_CLUSTERS + 1)
+
+
+def test_free_runs_come_from_the_cached_free_map(device):
+    volume = FATXVolume(device, PARTITION)
+    # Used: 1-5, 9-11; the rest of the data area is free
+    assert list(volume.iter_free_runs()) == [(6, 3), (12, DATA_CLUSTERS - 11)]
+    assert volume.is_cluster_free(6) and not volume.is_cluster_free(9)
+    assert not volume.is_cluster_free(0) and not volume.is_cluster_free(DATA_CLUSTERS + 1)
+    assert volume.find_free_clusters(4) == [6, 7, 8, 12]
+    assert volume.find_free_clusters(2, exclude={6}) == [7, 8]
+    with pytest.raises(FATXBoundsError):
+        volume.find_free_clusters(DATA_CLUSTERS)
+    assert len(device.fat_reads()) == 1
+
+
+def test_find_free_run_skips_short_and_excluded_runs(device):
+    volume = FATXVolume(device, PARTITION)
+    assert volume.find_free_run(3) == 6
+    assert volume.find_free_run(4) == 12
+    assert volume.find_free_run(3, exclude={7}) == 12
+    assert volume.find_free_run(4, exclude={13}) == 14
+    assert volume.find_free_run(DATA_CLUSTERS - 11) == 12
+    assert volume.find_free_run(DATA_CLUSTERS) is None
+    with pytest.raises(ValueError):
+        volume.find_free_run(0)
+
+
+def test_a_device_write_invalidates_the_cached_fat(device):
+    volume = FATXVolume(device, PARTITION)
+    assert volume.find_free_run(3) == 6
+
+    # Changed behind the volume's back (no generation bump): still cached
+    _set_fat(device, 7, EOC)
+    assert volume.read_fat_entry(7) == 0 and volume.is_cluster_free(7)
+    volume.invalidate_fat_cache()
+    assert volume.read_fat_entry(7) == EOC
+    assert volume.find_free_run(3) == 12
+
+    device.write_at(volume.fat_entry_offset(7), volume.encode_fat_entry(0))
+    assert volume.is_cluster_free(7)
+    assert list(volume.iter_free_runs())[0] == (6, 3)
+    assert len(device.fat_reads()) == 3
+
+
+def test_unreadable_fat_falls_back_to_entry_reads(device):
+    device.unsupported = (FAT_OFFSET + 0x100, FAT_OFFSET + 0x200)
+    volume = FATXVolume(device, PARTITION)
+    assert volume.get_chain(3) == [3, 4, 9]
+    assert volume.find_free_run(3) == 6
+    assert volume.is_cluster_free(7) and not volume.is_cluster_free(10)
+    entry_reads = [r for r in device.fat_reads() if r[1] == 2]
+    assert (FAT_OFFSET + 3 * 2, 2) in entry_reads
+
+
+def test_files_are_read_one_run_of_clusters_at_a_time(device):
+    volume = FATXVolume(device, PARTITION)
+    entry = volume.resolve_path("T:/UDATA/4D530004/slot.sav")
+    device.reads.clear()
+    assert volume.read_file(entry) == device.save
+    data_reads = [r for r in device.reads if r[0] >= FILE_AREA]
+    assert data_reads == [(_cluster_offset(3), 2 * CLUSTER), (_cluster_offset(9), len(device.save) - 2 * CLUSTER)]
+
+    assert volume.read_file(volume.resolve_path("UDATA/4d530004/empty.sav")) == b""
+    assert [g.title_id for g in volume.list_games()] == ["4d530004"]
+    assert volume.collect_title_clusters("4D530004") == {5, 3, 4, 9}
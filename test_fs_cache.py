@@ -0,0 +1,149 @@
+import collections
+import os
+import types
+
+import pytest
+
+from common import fs_cache
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeMonotonic()
+    monkeypatch.setattr(fs_cache, "time", clock)
+    fs_cache.clear()
+    yield clock
+    fs_cache.clear()
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+    original = fs_cache._scan
+
+    def counting_scan(path, mtime_ns, now):
+        calls.append(path)
+        return original(path, mtime_ns, now)
+
+    monkeypatch.setattr(fs_cache, "_scan", counting_scan)
+    return calls
+
+
+def _set_mtime(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_listing_is_reused_until_the_directory_mtime_changes(tmp_path, clock, scans):
+    (tmp_path / "a.sav").write_bytes(b"a")
+    _set_mtime(tmp_path, 1_700_000_000_000_000_000)
+
+    assert fs_cache.listdir(tmp_path) == ["a.sav"]
+    assert fs_cache.listdir(tmp_path) == ["a.sav"]
+    clock.now += fs_cache.VALIDATION_WINDOW_S
+    assert fs_cache.listdir(tmp_path) == ["a.sav"]
+    assert scans == [str(tmp_path)]
+
+    # A new entry bumps the directory mtime: the next validation rescans
+    (tmp_path / "b.sav").write_bytes(b"b")
+    _set_mtime(tmp_path, 1_700_000_001_000_000_000)
+    assert fs_cache.listdir(tmp_path) == ["a.sav"]  # still within the validation window
+    clock.now += fs_cache.VALIDATION_WINDOW_S
+    assert sorted(fs_cache.listdir(tmp_path)) == ["a.sav", "b.sav"]
+    assert len(scans) == 2
+
+
+def test_listings_expire_even_with_an_unchanged_mtime(tmp_path, clock, scans):
+    _set_mtime(tmp_path, 1_700_000_000_000_000_000)
+    assert fs_cache.listdir(tmp_path) == []
+    clock.now += fs_cache.TTL_S
+    assert fs_cache.listdir(tmp_path) == []
+    assert len(scans) == 2
+
+
+def test_child_types_come_from_the_parent_listing(tmp_path, clock, monkeypatch):
+    (tmp_path / "saves").mkdir()
+    (tmp_path / "game.ini").write_bytes(b"")
+    fs_cache.listdir(tmp_path)
+    with monkeypatch.context() as patch:
+        patch.setattr(fs_cache, "_stat_kind", lambda path: pytest.fail(f"stat of {path}"))
+        assert fs_cache.isdir(tmp_path / "saves") and not fs_cache.isfile(tmp_path / "saves")
+        assert fs_cache.isfile(tmp_path / "game.ini") and not fs_cache.isdir(tmp_path / "game.ini")
+        assert not fs_cache.isdir(tmp_path / "missing")
+
+    # Once the parent listing is no longer fresh, the path itself is checked
+    clock.now += fs_cache.VALIDATION_WINDOW_S
+    assert fs_cache.isdir(tmp_path / "saves") and not fs_cache.isdir(tmp_path / "missing")
+
+
+def test_walk_matches_os_walk_without_following_links(tmp_path, clock):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "slot.sav").write_bytes(b"")
+    (tmp_path / "skip").mkdir()
+    (tmp_path / "skip" / "hidden.sav").write_bytes(b"")
+    (tmp_path / "top.sav").write_bytes(b"")
+    os.symlink(tmp_path / "a", tmp_path / "link")
+
+    def collect(walker):
+        seen = []
+        for root, dirs, files in walker:
+            dirs[:] = sorted(d for d in dirs if d != "skip")
+            seen.append((os.path.relpath(root, tmp_path), list(dirs), sorted(files)))
+        return seen
+
+    assert collect(fs_cache.walk(tmp_path)) == collect(os.walk(tmp_path))
+    assert ("a/b", [], ["slot.sav"]) in collect(fs_cache.walk(tmp_path))
+    with pytest.raises(OSError):
+        fs_cache.listdir(tmp_path / "missing")
+    assert list(fs_cache.walk(tmp_path / "missing")) == []
+
+
+def test_cache_is_bounded(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(fs_cache, "MAX_ENTRIES", 2)
+    for name in ("one", "two", "three"):
+        (tmp_path / name).mkdir()
+        fs_cache.listdir(tmp_path / name)
+    assert list(fs_cache._listings) == [str(tmp_path / "two"), str(tmp_path / "three")]
+
+
+def test_drop_runs_a_bounded_number_of_detections(monkeypatch):
+    pytest.importorskip("PySide6")
+    from gui_components import drag_drop_handler
+    from gui_components.drag_drop_handler import DragDropHandler
+
+    monkeypatch.setattr(drag_drop_handler, "MAX_CONCURRENT_DETECTIONS", 2)
+    started = []
+
+    class FakeThread:
+        def __init__(self, name):
+            self.name = name
+
+        def start(self):
+            started.append(self.name)
+
+    handler = types.SimpleNamespace(
+        main_window=types.SimpleNamespace(processing_cancelled=False),
+        processing_cancelled=False,
+        active_threads={},
+        _running_detections=0,
+        _pending_detections=collections.deque(),
+    )
+    handler._start_pending_detections = lambda: DragDropHandler._start_pending_detections(handler)
+    for name in ("a", "b", "c", "d"):
+        handler._pending_detections.append(FakeThread(name))
+        handler._start_pending_detections()
+    assert started == ["a", "b"]
+
+    DragDropHandler._on_detection_thread_finished(handler, False, {}, "a")
+    assert started == ["a", "b", "c"] and handler._running_detections == 2
+
+    handler.processing_cancelled = True
+    DragDropHandler._on_detection_thread_finished(handler, False, {}, "b")
+    assert started == ["a", "b", "c"] and not handler._pending_detections
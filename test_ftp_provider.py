@@ -0,0 +1,221 @@
+import ftplib
+import posixpath
+
+import pytest
+
+from cloud_utils import ftp_provider
+from cloud_utils.ftp_provider import FTPProvider
+
+HOME = "/home/player"
+APP = f"{HOME}/SaveState_Backups"
+
+
+class FakeFTPServer:
+    """Files and folders of an FTP server; every session starts in HOME."""
+
+    def __init__(self):
+        self.dirs = {"/", "/home", HOME}
+        self.files = {}
+        self.refuse_rest = False
+        self.rename_over_files = True
+        self.stored = []  # (path, rest) of every STOR
+
+    def session(self):
+        return FakeFTP(self)
+
+
+class _DataConnection:
+    def __init__(self, on_close):
+        self.chunks = []
+        self._on_close = on_close
+
+    def sendall(self, data):
+        self.chunks.append(bytes(data))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self._on_close(b"".join(self.chunks))
+
+
+class FakeFTP:
+    """The ftplib.FTP calls FTPProvider makes, resolving relative paths against the cwd."""
+
+    def __init__(self, server):
+        self.server = server
+        self.cwd_path = "/"
+        self.timeout = None
+
+    def _abs(self, path):
+        return posixpath.normpath(posixpath.join(self.cwd_path, path or "."))
+
+    def connect(self, host, port):
+        return "220 ready"
+
+    def login(self, user, password):
+        self.cwd_path = HOME
+        return "230 logged in"
+
+    def set_pasv(self, value):
+        pass
+
+    def voidcmd(self, cmd):
+        return "200 ok"
+
+    def voidresp(self):
+        return "226 done"
+
+    def quit(self):
+        pass
+
+    def pwd(self):
+        return self.cwd_path
+
+    def cwd(self, path):
+        target = self._abs(path)
+        if target not in self.server.dirs:
+            raise ftplib.error_perm(f"550 {target}: no such directory")
+        self.cwd_path = target
+
+    def mkd(self, path):
+        target = self._abs(path)
+        if target in self.server.dirs or posixpath.dirname(target) not in self.server.dirs:
+            raise ftplib.error_perm(f"550 {target}: cannot create")
+        self.server.dirs.add(target)
+        return target
+
+    def rmd(self, path):
+        target = self._abs(path)
+        if any(posixpath.dirname(p) == target for p in self.server.files):
+            raise ftplib.error_perm("550 not empty")
+        self.server.dirs.discard(target)
+
+    def delete(self, path):
+        if self.server.files.pop(self._abs(path), None) is None:
+            raise ftplib.error_perm("550 no such file")
+
+    def rename(self, source, target):
+        source, target = self._abs(source), self._abs(target)
+        if target in self.server.files and not self.server.rename_over_files:
+            raise ftplib.error_perm("553 target exists")
+        self.server.files[target] = self.server.files.pop(source)
+
+    def mlsd(self, path="", facts=None):
+        target = self._abs(path)
+        if target not in self.server.dirs:
+            raise ftplib.error_perm("550 no such directory")
+        yield ".", {"type": "cdir"}
+        for d in sorted(self.server.dirs):
+            if d != target and posixpath.dirname(d) == target:
+                yield posixpath.basename(d), {"type": "dir"}
+        for f, data in sorted(self.server.files.items()):
+            if posixpath.dirname(f) == target:
+                yield posixpath.basename(f), {"type": "file", "size": str(len(data)), "modify": "20240101000000"}
+
+    def transfercmd(self, cmd, rest=None):
+        verb, _, path = cmd.partition(" ")
+        assert verb == "STOR"
+        target = self._abs(path)
+        if rest and self.server.refuse_rest:
+            raise ftplib.error_perm("502 REST not implemented")
+        self.server.stored.append((target, rest))
+        existing = self.server.files.get(target, b"")
+
+        def store(data):
+            self.server.files[target] = (existing[:rest] if rest else b"") + data
+        return _DataConnection(store)
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        target = self._abs(cmd.partition(" ")[2])
+        if rest and self.server.refuse_rest:
+            raise ftplib.error_perm("502 REST not implemented")
+        data = self.server.files[target][rest or 0:]
+        for start in range(0, len(data), blocksize):
+            callback(data[start:start + blocksize])
+        return "226 done"
+
+
+@pytest.fixture
+def ftp(monkeypatch):
+    server = FakeFTPServer()
+    monkeypatch.setattr(ftp_provider.ftplib, "FTP", server.session)
+    provider = FTPProvider()
+    provider._block_size = 4
+    assert provider.connect(host="ftp.example", username="player")
+    return provider, server
+
+
+def test_paths_are_absolute_from_the_login_directory(ftp, tmp_path):
+    provider, server = ftp
+    assert provider._app_folder_path == APP and APP in server.dirs
+    local = tmp_path / "Backup_1.zip"
+    local.write_bytes(b"0123456789")
+
+    # Whatever directory the control connection was left in
+    provider._ftp.cwd("/")
+    assert provider.plan_upload(str(tmp_path), "Game", ["Backup_1.zip"])["to_upload"] == ["Backup_1.zip"]
+    assert provider.upload_file(str(local), "Game", "Backup_1.zip")
+    assert server.files == {f"{APP}/Game/Backup_1.zip": b"0123456789"}
+
+    provider._ftp.cwd("/home")
+    assert [b["name"] for b in provider.list_cloud_backups()] == ["Game"]
+    assert provider.list_cloud_backups()[0]["file_count"] == 1
+    assert provider.delete_cloud_backup("Game")
+    assert server.files == {} and f"{APP}/Game" not in server.dirs
+    assert provider._ftp.pwd() == "/home"
+
+
+def test_interrupted_upload_resumes_from_the_part_file(ftp, tmp_path):
+    provider, server = ftp
+    server.dirs.add(f"{APP}/Game")
+    server.files[f"{APP}/Game/Backup_1.zip.part"] = b"012345"
+    local = tmp_path / "Backup_1.zip"
+    local.write_bytes(b"0123456789")
+    sent = []
+
+    assert provider.upload_file(str(local), "Game", "Backup_1.zip", sent.append)
+    assert server.stored == [(f"{APP}/Game/Backup_1.zip.part", 6)]
+    assert server.files == {f"{APP}/Game/Backup_1.zip": b"0123456789"}
+    assert sum(sent) == 10
+
+
+def test_refused_resume_restarts_and_reports_each_byte_once(ftp, tmp_path):
+    provider, server = ftp
+    server.refuse_rest = True
+    server.dirs.add(f"{APP}/Game")
+    server.files[f"{APP}/Game/Backup_1.zip.part"] = b"012345"
+    local = tmp_path / "Backup_1.zip"
+    local.write_bytes(b"0123456789")
+    sent = []
+
+    assert provider.upload_file(str(local), "Game", "Backup_1.zip", sent.append)
+    assert server.stored == [(f"{APP}/Game/Backup_1.zip.part", None)]
+    assert server.files == {f"{APP}/Game/Backup_1.zip": b"0123456789"}
+    assert sum(sent) == 10
+
+
+def test_part_file_replaces_an_existing_backup(ftp, tmp_path):
+    provider, server = ftp
+    server.rename_over_files = False
+    server.dirs.add(f"{APP}/Game")
+    server.files[f"{APP}/Game/Backup_1.zip"] = b"old"
+    local = tmp_path / "Backup_1.zip"
+    local.write_bytes(b"newer")
+
+    assert provider.upload_file(str(local), "Game", "Backup_1.zip")
+    assert server.files == {f"{APP}/Game/Backup_1.zip": b"newer"}
+
+
+def test_interrupted_download_resumes_and_skips_unfinished_uploads(ftp, tmp_path):
+    provider, server = ftp
+    server.dirs.add(f"{APP}/Game")
+    server.files[f"{APP}/Game/Backup_1.zip"] = b"0123456789"
+    server.files[f"{APP}/Game/Backup_2.zip.part"] = b"half"
+    (tmp_path / "Backup_1.zip.part").write_bytes(b"0123")
+
+    result = provider.download_backup("Game", str(tmp_path))
+    assert result["ok"] and result["downloaded"] == 1 and result["total"] == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Backup_1.zip"]
+    assert (tmp_path / "Backup_1.zip").read_bytes() == b"0123456789"
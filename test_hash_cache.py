@@ -0,0 +1,74 @@
+import hashlib
+import zipfile
+
+import pytest
+
+from core import backup_catalog, core_logic, hash_cache, parallel_zip
+from gui_components import lock_backup_manager
+
+
+def test_hash_cache_reuses_digests_until_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(hash_cache, "get_cache_path", lambda: str(tmp_path / "hash_cache.db"))
+    hash_cache.forget_all()
+    reads = []
+    real_compute = hash_cache._compute
+    monkeypatch.setattr(hash_cache, "_compute", lambda path: reads.append(path) or real_compute(path))
+
+    archive = tmp_path / "save.zip"
+    archive.write_bytes(b"first")
+    try:
+        first = hash_cache.get_hashes(str(archive))
+        assert hash_cache.get_md5(str(archive)) == first["md5"]
+        assert hash_cache.get_sha256(str(archive)) == first["sha256"]
+        assert len(reads) == 1
+
+        copy = tmp_path / "copy.zip"
+        copy.write_bytes(b"first")
+        assert hash_cache.remember(str(copy), first)
+        assert hash_cache.peek(str(copy))["md5"] == first["md5"]
+
+        archive.write_bytes(b"second!")
+        assert hash_cache.peek(str(archive)) is None
+        assert hash_cache.get_md5(str(archive)) != first["md5"]
+        assert len(reads) == 2
+    finally:
+        hash_cache.forget_all()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_new_archives_are_hashed_while_they_are_written(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(hash_cache, "get_cache_path", lambda: str(tmp_path / "hash_cache.db"))
+    monkeypatch.setattr(lock_backup_manager, "get_locked_backup_for_profile", lambda name: None)
+    monkeypatch.setattr(lock_backup_manager, "is_backup_locked", lambda path: False)
+    settings = {"compression_workers": workers}
+    monkeypatch.setattr(core_logic, "_get_setting_from_settings",
+                        lambda key, default=None: settings.get(key, default))
+    monkeypatch.setattr(parallel_zip, "BLOCK_SIZE", 4096)
+    hash_cache.forget_all()
+    reads = []
+    monkeypatch.setattr(hash_cache, "_compute", lambda path: reads.append(path) or {})
+
+    source = tmp_path / "saves"
+    source.mkdir()
+    (source / "slot1.sav").write_bytes(bytes(range(256)) * 100)
+    (source / "slot2.sav").write_bytes(b"second slot")
+    backups = tmp_path / "backups"
+    try:
+        ok, message = core_logic.perform_backup(
+            "Game", str(source), str(backups), 5, 100, "standard", {"backup_folder_name": "Game"}
+        )
+        assert ok, message
+        archive = next((backups / "Game").glob("*.zip"))
+        expected = hashlib.sha256(archive.read_bytes()).hexdigest()
+
+        assert hash_cache.peek(str(archive))["sha256"] == expected
+        assert backup_catalog.get_archive_info(str(archive))["sha256"] == expected
+        assert reads == []
+        with zipfile.ZipFile(archive) as zipf:
+            assert zipf.testzip() is None
+            members = {name.rsplit("/", 1)[-1]: name for name in zipf.namelist()}
+            assert zipf.read(members["slot1.sav"]) == bytes(range(256)) * 100
+            assert zipf.read(members["slot2.sav"]) == b"second slot"
+    finally:
+        backup_catalog.close_all()
+        hash_cache.forget_all()
@@ -0,0 +1,164 @@
+import os
+import zipfile
+
+import pytest
+
+from core import backup_catalog, compression_codecs, core_logic, hash_cache, incremental_backup
+from gui_components import lock_backup_manager
+
+PROFILE = {"backup_folder_name": "Game"}
+
+
+@pytest.fixture
+def chain(tmp_path, monkeypatch):
+    monkeypatch.setattr(hash_cache, "get_cache_path", lambda: str(tmp_path / "hash_cache.db"))
+    monkeypatch.setattr(lock_backup_manager, "get_locked_backup_for_profile", lambda name: None)
+    monkeypatch.setattr(lock_backup_manager, "is_backup_locked", lambda path: False)
+    hash_cache.forget_all()
+    source = tmp_path / "saves"
+    source.mkdir()
+    folder = tmp_path / "backups" / "Game"
+    folder.mkdir(parents=True)
+    names = []
+
+    def backup(files, codec=compression_codecs.CODEC_DEFLATE):
+        for index, (name, data) in enumerate(files.items()):
+            path = source / name
+            path.write_bytes(data)
+            stamp = 1_700_000_000 + len(names) * 100 + index
+            os.utime(path, (stamp, stamp))
+        archive = folder / f"Backup_Game_2024010{len(names) + 1}_000000.zip"
+        entries = [(str(source / name), name) for name in sorted(os.listdir(source))]
+        ok, message = incremental_backup.write_backup(
+            str(archive), entries, {"profile_name": "Game", "paths": [str(source)]},
+            zipfile.ZIP_DEFLATED, 6, codec=codec,
+        )
+        assert ok, message
+        stamp = 1_700_000_000 + len(names) * 100 + 50
+        os.utime(archive, (stamp, stamp))
+        names.append(archive.name)
+        return archive
+
+    yield folder, backup, names
+    backup_catalog.close_all()
+    hash_cache.forget_all()
+
+
+def _restored(archive, tmp_path):
+    output = tmp_path / "restore.zip"
+    ok, error = incremental_backup.export_chain_to_zip(str(archive), str(output))
+    assert ok, error
+    with zipfile.ZipFile(output) as zipf:
+        data = {name: zipf.read(name) for name in zipf.namelist() if not name.startswith("savestate/")}
+    output.unlink()
+    return data
+
+
+def test_chain_writes_only_changes_and_rebases_before_rotation(chain, tmp_path):
+    folder, backup, names = chain
+    full = backup({"a.sav": b"A" * 100, "b.png": b"\x89PNG" + bytes(range(256)) * 20}, codec="adaptive")
+    delta = backup({"a.sav": b"changed"}, codec="adaptive")
+    latest = backup({"c.sav": b"new"}, codec="zstd")
+
+    with zipfile.ZipFile(full) as zipf:
+        assert zipf.getinfo("b.png").compress_type == zipfile.ZIP_STORED
+    with zipfile.ZipFile(delta) as zipf:
+        assert [n for n in zipf.namelist() if not n.startswith("savestate/")] == ["a.sav"]
+    assert incremental_backup.is_incremental_archive(str(latest))
+    assert incremental_backup._read_manifest(str(latest))["codec"] == compression_codecs.CODEC_DEFLATE
+    expected = _restored(latest, tmp_path)
+    assert expected["a.sav"] == b"changed" and expected["c.sav"] == b"new"
+
+    deleted = core_logic.manage_backups("Game", str(folder.parent), 2, profile_data=PROFILE)
+    assert deleted == [names[0]]
+    assert not incremental_backup.is_incremental_archive(str(delta))
+    with zipfile.ZipFile(delta) as zipf:
+        assert zipf.getinfo("b.png").compress_type == zipfile.ZIP_STORED
+    assert _restored(latest, tmp_path) == expected
+
+
+def test_parents_of_a_failed_rebase_are_kept(chain, monkeypatch):
+    folder, backup, names = chain
+    backup({"a.sav": b"one"})
+    middle = backup({"a.sav": b"two"})
+    backup({"a.sav": b"three"})
+    monkeypatch.setattr(incremental_backup, "export_chain_to_zip", lambda *args, **kwargs: (False, "disk full"))
+
+    assert incremental_backup.rebase_dependents(str(folder), names[:2]) == set(names[:2])
+    assert core_logic.manage_backups("Game", str(folder.parent), 1, profile_data=PROFILE) == []
+    assert sorted(os.listdir(folder)) == sorted(names)
+
+    ok, message = core_logic.delete_single_backup_file(str(middle))
+    assert not ok and "depend" in message
+    assert middle.exists()
+
+
+def test_backups_in_the_same_second_never_overwrite_their_parent(chain, tmp_path, monkeypatch):
+    folder, backup, names = chain
+    first = backup({"a.sav": b"one"})
+    ok, message = incremental_backup.write_backup(
+        str(first), [(str(tmp_path / "saves" / "a.sav"), "a.sav")],
+        {"profile_name": "Game", "paths": [str(tmp_path / "saves")]}, zipfile.ZIP_DEFLATED, 6,
+    )
+    assert not ok and "already exists" in message
+    assert _restored(first, tmp_path) == {"a.sav": b"one"}
+
+    # perform_backup picks a new name instead, and the delta's parent is the previous archive
+    class FrozenDatetime(core_logic.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 1, 9, 12, 0, 0)
+
+    monkeypatch.setattr(core_logic, "datetime", FrozenDatetime)
+    settings = {"incremental_backups": True}
+    monkeypatch.setattr(core_logic, "_get_setting_from_settings",
+                        lambda key, default=None: settings.get(key, default))
+    source = tmp_path / "saves"
+    for data in (b"two", b"three"):
+        (source / "a.sav").write_bytes(data)
+        ok, message = core_logic.perform_backup("Game", str(source), str(folder.parent), 10, 100,
+                                                "standard", PROFILE)
+        assert ok, message
+    same_second = sorted(folder.glob("Backup_Game_20240109_120000*.zip"))
+    assert [p.name for p in same_second] == ["Backup_Game_20240109_120000.zip",
+                                             "Backup_Game_20240109_120000_1.zip"]
+    assert incremental_backup._read_manifest(str(same_second[1]))["parent"] == same_second[0].name
+    assert list(_restored(same_second[0], tmp_path).values()) == [b"two"]
+    assert list(_restored(same_second[1], tmp_path).values()) == [b"three"]
+    assert core_logic.get_display_name_from_backup_filename(same_second[1].name) == "Backup_Game"
+
+
+def _raw_member(archive, name):
+    with zipfile.ZipFile(archive) as zipf:
+        info = zipf.getinfo(name)
+        zipf.fp.seek(info.header_offset + 26)
+        name_len, extra_len = int.from_bytes(zipf.fp.read(2), "little"), int.from_bytes(zipf.fp.read(2), "little")
+        zipf.fp.seek(name_len + extra_len, os.SEEK_CUR)
+        return info.CRC, zipf.fp.read(info.compress_size)
+
+
+def test_rotation_copies_members_without_recompressing_them(chain, tmp_path, monkeypatch):
+    folder, backup, names = chain
+    backup({"a.sav": b"A" * 5000, "b.sav": os.urandom(3000) + b"B" * 3000})
+    delta = backup({"a.sav": b"changed" * 300})
+    before = {"a.sav": _raw_member(delta, "a.sav"), "b.sav": _raw_member(folder / names[0], "b.sav")}
+    expected = _restored(delta, tmp_path)
+
+    written = []
+    original_open = zipfile.ZipFile.open
+
+    def recording_open(self, name, mode="r", *args, **kwargs):
+        if mode == "w":
+            written.append(name if isinstance(name, str) else name.filename)
+        return original_open(self, name, mode, *args, **kwargs)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(zipfile.ZipFile, "open", recording_open)
+        assert core_logic.manage_backups("Game", str(folder.parent), 1, profile_data=PROFILE) == [names[0]]
+
+    assert all(name.startswith("savestate/") for name in written)
+    assert not incremental_backup.is_incremental_archive(str(delta))
+    assert {name: _raw_member(delta, name) for name in before} == before
+    with zipfile.ZipFile(delta) as zipf:
+        assert zipf.testzip() is None
+    assert _restored(delta, tmp_path) == expected
@@ -927,6 +927,33 @@ def test_unicode_title_components_are_preserved(game_name, folder_name):
     assert linux_finder._component_matches_game(folder_name, state)
 
 
+def test_name_matcher_memoizes_and_prefilters_fuzzy_calls():
+    class CountingFuzz:
+        calls = []
+
+        @classmethod
+        def token_sort_ratio(cls, first, second):
+            cls.calls.append((first, second))
+            return 90
+
+    matcher = linux_finder.GameNameMatcher(
+        "Hollow Knight",
+        linux_finder.generate_abbreviations("Hollow Knight"),
+        ["Hollow", "Knight"],
+        85,
+        fuzz_engine=CountingFuzz,
+        thefuzz_available=True,
+    )
+
+    # Nothing in common with the title: rejected without calling thefuzz.
+    assert not matcher.matches_component("xyzzy")
+    assert CountingFuzz.calls == []
+
+    assert matcher.matches_component("Hollw Knigt")
+    assert matcher.matches_component("Hollw Knigt")
+    assert len(CountingFuzz.calls) == 1
+
+
 def test_immediate_cancellation_returns_empty(isolated_linux_home):
     class Cancelled:
         @staticmethod
@@ -969,6 +996,35 @@ def test_parallel_searches_do_not_share_candidate_state(isolated_linux_home):
         assert results[0][0] == expected[game_name]
 
 
+def test_parallel_phases_rank_like_the_sequential_search(
+    isolated_linux_home, monkeypatch
+):
+    home = isolated_linux_home["home"]
+    xdg_data = isolated_linux_home["xdg_data"]
+    install_dir = home / "Games" / "Hollow Knight"
+    (install_dir / "saves").mkdir(parents=True)
+    (install_dir / "saves" / "user1.dat").write_bytes(b"save")
+    (xdg_data / "Hollow Knight").mkdir()
+    (xdg_data / "Hollow Knight" / "user1.sav").write_bytes(b"save")
+    (home / ".config" / "Team Cherry" / "Hollow Knight").mkdir(parents=True)
+    (home / ".config" / "Team Cherry" / "Hollow Knight" / "user2.sav").write_bytes(b"save")
+
+    def search():
+        return linux_finder.guess_save_path(
+            "Hollow Knight",
+            game_install_dir=str(install_dir),
+            is_steam_game=False,
+        )
+
+    monkeypatch.setattr(linux_finder.config, "SAVE_SEARCH_PARALLEL_PHASES", False, raising=False)
+    sequential = search()
+    monkeypatch.setattr(linux_finder.config, "SAVE_SEARCH_PARALLEL_PHASES", True, raising=False)
+
+    assert sequential
+    for _ in range(5):
+        assert search() == sequential
+
+
 def test_search_budget_does_not_poison_an_unvisited_root(
     tmp_path, monkeypatch
 ):
@@ -993,6 +1049,65 @@ def test_search_budget_does_not_poison_an_unvisited_root(
     assert os.path.normpath(str(target)) in state.guesses_data
 
 
+def test_overlapping_phases_share_explored_directories_and_budget(
+    isolated_linux_home, monkeypatch
+):
+    home = isolated_linux_home["home"]
+    install_dir = home / "Celeste"
+    for index in range(6):
+        (install_dir / f"Content{index}").mkdir(parents=True)
+    (install_dir / "Saves").mkdir()
+    (install_dir / "Saves" / "0.celeste").write_bytes(b"save")
+    saves = os.path.normpath(str(install_dir / "Saves"))
+    monkeypatch.setattr(linux_finder.config, "LINUX_SKIP_HOME_FALLBACK", False)
+
+    def phase_forks():
+        state = linux_finder._build_search_state(
+            "Celeste", str(install_dir), is_steam_game=False
+        )
+        # Ranking order: install directory (4) before home fallback (6)
+        return state, state.fork(4), state.fork(6)
+
+    # The home fallback does not re-crawl the install tree
+    state, install, fallback = phase_forks()
+    linux_finder._search_install_directory(install, str(install_dir))
+    explored = state.explored_paths.directories_explored
+    linux_finder._search_home_fallback(fallback)
+    assert state.explored_paths.directories_explored == explored
+    assert saves in install.guesses_data and saves not in fallback.guesses_data
+
+    # An earlier phase arriving second still explores what it owns
+    state, install, fallback = phase_forks()
+    linux_finder._search_home_fallback(fallback)
+    linux_finder._search_install_directory(install, str(install_dir))
+    assert saves in install.guesses_data
+
+    # One budget for every phase
+    monkeypatch.setattr(
+        linux_finder.config, "LINUX_MAX_DIRECTORIES_PER_SEARCH", 3
+    )
+    state, install, fallback = phase_forks()
+    linux_finder._search_install_directory(install, str(install_dir))
+    linux_finder._search_home_fallback(fallback)
+    assert state.explored_paths.directories_explored == 3
+
+    def search():
+        return linux_finder.guess_save_path(
+            "Celeste", game_install_dir=str(install_dir), is_steam_game=False
+        )
+
+    monkeypatch.setattr(
+        linux_finder.config, "LINUX_MAX_DIRECTORIES_PER_SEARCH", 5000
+    )
+    monkeypatch.setattr(linux_finder.config, "LINUX_MAX_DIRECTORIES_TO_EXPLORE", 3)
+    monkeypatch.setattr(linux_finder.config, "SAVE_SEARCH_PARALLEL_PHASES", False, raising=False)
+    sequential = search()
+    monkeypatch.setattr(linux_finder.config, "SAVE_SEARCH_PARALLEL_PHASES", True, raising=False)
+    assert sequential
+    for _ in range(5):
+        assert search() == sequential
+
+
 @pytest.mark.parametrize("save_filename", ["zzz_slot.sav", "state.db"])
 def test_proton_evidence_is_not_hidden_by_early_log_files(
     isolated_linux_home, tmp_path, save_filename
@@ -0,0 +1,43 @@
+import json
+import os
+
+from core import core_logic, mirror_writer, state_store
+
+
+def test_mirror_writer_coalesces_and_skips_unchanged_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(mirror_writer, "_index_path", lambda: str(tmp_path / "mirror_index.json"))
+    backup_root = tmp_path / "backups"
+    writer = mirror_writer.MirrorWriter(delay=60)
+    for value in range(5):
+        writer.submit("favorites_status.json", {"A": value}, str(backup_root), rotation=3)
+    assert writer.flush(timeout=10)
+
+    mirror_dir = backup_root / ".savestate"
+    mirror = mirror_dir / "favorites_status.json"
+    assert '"A": 4' in mirror.read_text(encoding="utf-8")
+    snapshots = [name for name in os.listdir(mirror_dir) if name != "favorites_status.json"]
+    assert len(snapshots) == 1  # one write for the whole burst
+
+    mtime = mirror.stat().st_mtime_ns
+    writer.submit("favorites_status.json", {"A": 4}, str(backup_root), rotation=3)
+    assert writer.flush(timeout=10)
+    assert mirror.stat().st_mtime_ns == mtime
+    assert len(os.listdir(mirror_dir)) == 2
+
+
+def test_restore_waits_for_queued_mirror_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(mirror_writer, "_index_path", lambda: str(tmp_path / "mirror_index.json"))
+    monkeypatch.setattr(mirror_writer, "_writer", mirror_writer.MirrorWriter(delay=60))
+    monkeypatch.setattr(state_store, "flush_all", lambda: None)
+    backup_root = tmp_path / "backups"
+    mirror_dir = backup_root / ".savestate"
+    mirror_dir.mkdir(parents=True)
+    (mirror_dir / "game_save_profiles.json").write_text('{"Old": {}}', encoding="utf-8")
+    profiles_path = tmp_path / "config" / "game_save_profiles.json"
+    profiles_path.parent.mkdir()
+    monkeypatch.setattr(core_logic, "_get_backup_root_from_settings", lambda: str(backup_root))
+    monkeypatch.setattr(core_logic, "PROFILES_FILE_PATH", str(profiles_path))
+
+    mirror_writer.submit("game_save_profiles.json", {"New": {}}, str(backup_root))
+    assert core_logic.restore_json_from_backup_root()
+    assert json.loads(profiles_path.read_text(encoding="utf-8")) == {"New": {}}
@@ -0,0 +1,41 @@
+import os
+import platform
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+# Needs psutil at import time
+process_watch_utils = pytest.importorskip("common.process_watch_utils")
+
+
+@pytest.mark.skipif(platform.system() != "Linux" or not hasattr(os, "pidfd_open"),
+                    reason="pidfd events are Linux only")
+def test_exit_of_a_high_numbered_pidfd_is_reported(tmp_path):
+    resource = pytest.importorskip("resource")
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and hard < 1200:
+        pytest.skip("cannot open enough file descriptors")
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, 1200), hard))
+    # Push the next descriptors above FD_SETSIZE, where select() fails
+    filler = [os.open(os.devnull, os.O_RDONLY) for _ in range(1100)]
+    binary = tmp_path / "sswatchprobe"
+    shutil.copy(shutil.which("sleep"), binary)
+    process = subprocess.Popen([str(binary), "30"])
+    changed = threading.Event()
+    watcher = process_watch_utils.ProcessWatcher(changed.set, scan_interval=60)
+    try:
+        watcher.set_watched_names({"sswatchprobe"})
+        assert watcher.running_names() == {"sswatchprobe"}
+        assert max(watcher._pidfds) >= 1024
+        process.kill()
+        process.wait()
+        assert changed.wait(5)
+        assert watcher.running_names() == set()
+    finally:
+        watcher.close()
+        process.kill()
+        for fd in filler:
+            os.close(fd)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
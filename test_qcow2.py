@@ -0,0 +1,190 @@
+import mmap
+import struct
+from array import array
+
+import pytest
+
+from emulator_utils.xemu_lab import qcow2
+from emulator_utils.xemu_lab.qcow2 import (
+    QCOW2BlockDevice,
+    QCOW2FormatError,
+    QCOW2WritableBlockDevice,
+    QCOW2WriteError,
+)
+
+CLUSTER = 512
+GUEST_CLUSTERS = 8
+# Host layout: header, L1, refcount table, refcount block, L2, data clusters 5-11
+L1_CLUSTER, REFTABLE_CLUSTER, REFBLOCK_CLUSTER, L2_CLUSTER = 1, 2, 3, 4
+HOST_CLUSTERS = 12
+# Guest cluster -> host cluster; 2 and 7 unallocated, 5 allocated but flagged ZERO
+GUEST_TO_HOST = {0: 5, 1: 6, 3: 8, 4: 9, 5: 10, 6: 11}
+ZERO_FLAGGED = {5}
+
+
+def _guest_cluster_data(guest_cluster):
+    return bytes((guest_cluster * 37 + index) & 0xFF for index in range(CLUSTER))
+
+
+def _expected_disk():
+    return b"".join(
+        _guest_cluster_data(c) if c in GUEST_TO_HOST and c not in ZERO_FLAGGED else bytes(CLUSTER)
+        for c in range(GUEST_CLUSTERS)
+    )
+
+
+@pytest.fixture
+def image(tmp_path):
+    """A small qcow2 v3 image with allocated, unallocated and zero-flagged clusters."""
+
+    host = bytearray(HOST_CLUSTERS * CLUSTER)
+    struct.pack_into(
+        ">IIQIIQIIQQIIQ", host, 0,
+        qcow2.QCOW2_MAGIC, 3, 0, 0, 9, GUEST_CLUSTERS * CLUSTER, 0, 1,
+        L1_CLUSTER * CLUSTER, REFTABLE_CLUSTER * CLUSTER, 1, 0, 0,
+    )
+    struct.pack_into(">QQQII", host, 72, 0, 0, 0, 4, 104)
+    struct.pack_into(">Q", host, L1_CLUSTER * CLUSTER, L2_CLUSTER * CLUSTER | qcow2.QCOW_OFLAG_COPIED)
+    struct.pack_into(">Q", host, REFTABLE_CLUSTER * CLUSTER, REFBLOCK_CLUSTER * CLUSTER)
+    for host_cluster in range(HOST_CLUSTERS):
+        struct.pack_into(">H", host, REFBLOCK_CLUSTER * CLUSTER + host_cluster * 2, 1)
+
+    for guest_cluster, host_cluster in GUEST_TO_HOST.items():
+        entry = host_cluster * CLUSTER | qcow2.QCOW_OFLAG_COPIED
+        if guest_cluster in ZERO_FLAGGED:
+            entry |= qcow2.QCOW_OFLAG_ZERO
+            data = b"\xee" * CLUSTER  # stale bytes that must never be returned
+        else:
+            data = _guest_cluster_data(guest_cluster)
+        struct.pack_into(">Q", host, L2_CLUSTER * CLUSTER + guest_cluster * 8, entry)
+        host[host_cluster * CLUSTER:(host_cluster + 1) * CLUSTER] = data
+
+    path = tmp_path / "xbox_hdd.qcow2"
+    path.write_bytes(bytes(host))
+    return path
+
+
+def _count_host_reads(device, monkeypatch):
+    reads = []
+    original = device._readinto_host
+
+    def counting(offset, target):
+        reads.append((offset, target.nbytes))
+        original(offset, target)
+
+    monkeypatch.setattr(device, "_readinto_host", counting)
+    return reads
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_reads_walk_l1_l2_across_cluster_boundaries(image, use_mmap):
+    expected = _expected_disk()
+    with QCOW2BlockDevice(image, use_mmap=use_mmap) as device:
+        assert (device._mmap is not None) == use_mmap
+        assert device.size == GUEST_CLUSTERS * CLUSTER and device.cluster_size == CLUSTER
+        assert device.read_at(0, device.size) == expected
+        for offset, size in [(500, 30), (1000, 100), (1530, 20), (3000, 600), (3580, 516), (7, 0)]:
+            assert device.read_at(offset, size) == expected[offset:offset + size]
+        assert device.read_cluster(3) == _guest_cluster_data(3)
+        with pytest.raises(ValueError):
+            device.read_at(device.size - 4, 8)
+
+
+def test_unallocated_and_zero_flagged_clusters_read_as_zero(image):
+    with QCOW2BlockDevice(image) as device:
+        assert device.read_at(2 * CLUSTER, CLUSTER) == bytes(CLUSTER)
+        assert device.read_at(5 * CLUSTER, CLUSTER) == bytes(CLUSTER)
+        assert device.read_at(7 * CLUSTER, CLUSTER) == bytes(CLUSTER)
+
+        mappings = {m.guest_cluster: m for m in device.iter_mappings()}
+        assert not mappings[2].allocated and mappings[2].host_offset is None
+        assert mappings[5].allocated and mappings[5].reads_as_zero
+        assert device.map_offset(5 * CLUSTER) is None
+        assert device.map_offset(3 * CLUSTER + 9) == 8 * CLUSTER + 9
+
+
+def test_contiguous_host_clusters_are_read_in_one_go(image, monkeypatch):
+    with QCOW2BlockDevice(image, use_mmap=False) as device:
+        assert device._host_runs(0, device.size) == [
+            (0, 2 * CLUSTER, 5 * CLUSTER),
+            (2 * CLUSTER, CLUSTER, None),
+            (3 * CLUSTER, 2 * CLUSTER, 8 * CLUSTER),
+            (5 * CLUSTER, CLUSTER, None),
+            (6 * CLUSTER, CLUSTER, 11 * CLUSTER),
+            (7 * CLUSTER, CLUSTER, None),
+        ]
+
+        reads = _count_host_reads(device, monkeypatch)
+        assert device.read_at(0, device.size) == _expected_disk()
+        assert reads == [(5 * CLUSTER, 2 * CLUSTER), (8 * CLUSTER, 2 * CLUSTER), (11 * CLUSTER, CLUSTER)]
+
+        # A range inside one contiguous run is a single plain host read
+        reads.clear()
+        exact = []
+        original = device._read_exact_host
+        monkeypatch.setattr(device, "_read_exact_host", lambda offset, size: exact.append((offset, size)) or
+                            original(offset, size))
+        assert device.read_at(3 * CLUSTER + 100, CLUSTER) == _expected_disk()[3 * CLUSTER + 100:4 * CLUSTER + 100]
+        assert (reads, exact) == ([], [(8 * CLUSTER + 100, CLUSTER)])
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_readinto_fills_the_buffer_and_zeroes_holes(image, use_mmap, monkeypatch):
+    expected = _expected_disk()
+    with QCOW2BlockDevice(image, use_mmap=use_mmap) as device:
+        buffer = bytearray(b"\xff" * (3 * CLUSTER))
+        reads = _count_host_reads(device, monkeypatch)
+        assert device.readinto(CLUSTER + 10, buffer) == len(buffer)
+        assert buffer == expected[CLUSTER + 10:4 * CLUSTER + 10]
+        assert reads == [(6 * CLUSTER + 10, CLUSTER - 10), (8 * CLUSTER, CLUSTER + 10)]
+
+        words = array("H", bytes(CLUSTER))
+        assert device.readinto(0, words) == CLUSTER
+        assert words.tobytes() == expected[:CLUSTER]
+        assert device.readinto(0, bytearray()) == 0
+
+
+def test_read_view_maps_single_runs_without_copying(image):
+    expected = _expected_disk()
+    with QCOW2BlockDevice(image) as device:
+        view = device.read_view(3 * CLUSTER + 7, CLUSTER)
+        assert isinstance(view.obj, mmap.mmap) and view.readonly
+        assert view == expected[3 * CLUSTER + 7:4 * CLUSTER + 7]
+
+        # Holes and multi-run ranges fall back to a copy
+        assert not isinstance(device.read_view(2 * CLUSTER, 10).obj, mmap.mmap)
+        spanning = device.read_view(CLUSTER, 3 * CLUSTER)
+        assert not isinstance(spanning.obj, mmap.mmap) and spanning == expected[CLUSTER:4 * CLUSTER]
+        view.release()
+
+    with QCOW2BlockDevice(image, use_mmap=False) as device:
+        view = device.read_view(3 * CLUSTER + 7, CLUSTER)
+        assert not isinstance(view.obj, mmap.mmap)
+        assert view == expected[3 * CLUSTER + 7:4 * CLUSTER + 7]
+
+
+def test_writable_device_reads_its_own_writes(image):
+    with QCOW2WritableBlockDevice(image) as device:
+        assert device._mmap is None and device.write_generation == 0
+        device.write_at(CLUSTER - 2, b"ABCD")
+        assert device.write_generation == 1
+        expected = _expected_disk()
+        assert device.read_at(CLUSTER - 4, 8) == expected[CLUSTER - 4:CLUSTER - 2] + b"ABCD" + expected[CLUSTER + 2:CLUSTER + 4]
+
+        with pytest.raises(QCOW2WriteError):
+            device.write_at(2 * CLUSTER, b"x")
+        device.write_at(2 * CLUSTER + 1, b"new", allocate=True)
+        assert device.clusters_allocated == 1
+        assert device.read_view(2 * CLUSTER, 4) == b"\x00new"
+
+    with QCOW2BlockDevice(image) as device:
+        assert device.read_at(2 * CLUSTER, 4) == b"\x00new"
+        assert device.read_at(CLUSTER - 2, 4) == b"ABCD"
+
+
+def test_invalid_images_are_rejected(image):
+    data = bytearray(image.read_bytes())
+    data[0] = 0
+    image.write_bytes(bytes(data))
+    with pytest.raises(QCOW2FormatError):
+        QCOW2BlockDevice(image).open()
@@ -0,0 +1,86 @@
+import pytest
+
+from core import core_logic, save_location_cache
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    (home / ".local" / "share").mkdir(parents=True)
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("XDG_DATA_HOME", str(home / ".local" / "share"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(home / ".config"))
+    monkeypatch.setattr(save_location_cache, "get_cache_path", lambda: str(tmp_path / "cache.json"))
+    save_location_cache.forget_all()
+    yield home
+    save_location_cache.forget_all()
+
+
+def _saves(home, *parts):
+    path = home.joinpath(".local", "share", *parts)
+    path.mkdir(parents=True)
+    return str(path)
+
+
+def test_generic_executables_and_profile_names_are_not_shared_keys(home):
+    first_saves = _saves(home, "Studio A", "First")
+    first_install = home / "Games" / "First"
+    second_install = home / "Games" / "Second"
+    profiles = {
+        "My favourite": {
+            "path": first_saves,
+            "game_executable": str(first_install / "Game.exe"),
+            "game_install_dir": str(first_install),
+            "game_name": "First Game",
+        },
+    }
+    assert save_location_cache.remember_profiles(profiles) == 1
+
+    assert save_location_cache.lookup(
+        "Second Game", executable=str(second_install / "Game.exe"),
+        game_install_dir=str(second_install),
+    ) == []
+    assert save_location_cache.lookup("My favourite") == []
+
+    hits = save_location_cache.lookup(
+        "Anything", executable=str(first_install / "Game.exe"),
+        game_install_dir=str(first_install),
+    )
+    assert [path for path, _score, _hint in hits] == [first_saves]
+    assert save_location_cache.lookup("First Game") == hits
+
+
+def test_only_an_appid_hit_skips_the_search(home, monkeypatch):
+    appid_saves = _saves(home, "Team Cherry", "Hollow Knight")
+    title_saves = _saves(home, "Celeste")
+    other_saves = _saves(home, "Other")
+    save_location_cache.remember("Hollow Knight", [appid_saves], appid="367520")
+    save_location_cache.remember("Celeste", [title_saves])
+
+    searches = []
+
+    def heuristic(**kwargs):
+        searches.append(kwargs["game_name"])
+        return [(other_saves, 900, True), (title_saves, 800, False)]
+
+    monkeypatch.setattr(core_logic, "_heuristic_guess_save_path", heuristic)
+
+    results = core_logic.guess_save_path("Hollow Knight", appid="367520")
+    assert searches == []
+    assert [path for path, _score, _hint in results] == [appid_saves]
+
+    # A title hit is merged with the search: confirmed locations first
+    results = core_logic.guess_save_path("Celeste", is_steam_game=False)
+    assert searches == ["Celeste"]
+    assert [path for path, _score, _hint in results] == [title_saves, other_saves]
+    assert results[0][1] > results[1][1]
+
+    # An AppID the cache does not know still runs the search
+    core_logic.guess_save_path("Celeste", appid="504230")
+    assert searches == ["Celeste", "Celeste"]
+
+    # A cached location the search did not find ranks below its results
+    monkeypatch.setattr(core_logic, "_heuristic_guess_save_path", lambda **kwargs: [(other_saves, 900, True)])
+    results = core_logic.guess_save_path("Celeste", is_steam_game=False)
+    assert [path for path, _score, _hint in results] == [other_saves, title_saves]
+    assert results[0][1] > results[1][1]
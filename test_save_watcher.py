@@ -0,0 +1,55 @@
+import os
+import platform
+import threading
+import time
+
+import pytest
+
+from backup import save_watcher
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_polling_watcher_rebuilds_profiles_whose_paths_changed(tmp_path):
+    watcher = save_watcher.SaveWatcher()
+    watcher.set_profiles({"Game": [str(tmp_path / "a")]})
+    watcher.mark_clean("Game", 100.0)
+    watcher.set_profiles({"Game": [str(tmp_path / "a")]})
+    assert watcher._profiles["Game"].clean_at == 100.0
+
+    watcher.set_profiles({"Game": [str(tmp_path / "b")]})
+    assert watcher._profiles["Game"].paths == (str(tmp_path / "b"),)
+    assert watcher._profiles["Game"].clean_at is None
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="inotify is Linux only")
+def test_inotify_walks_save_trees_off_the_calling_thread(tmp_path, monkeypatch):
+    try:
+        watcher = save_watcher.InotifySaveWatcher()
+    except (OSError, AttributeError) as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    save_dir = tmp_path / "saves"
+    (save_dir / "slot1").mkdir(parents=True)
+    walkers = []
+    real_walk = os.walk
+    monkeypatch.setattr(save_watcher.os, "walk",
+                        lambda root: walkers.append(threading.current_thread().name) or real_walk(root))
+    try:
+        watcher.set_profiles({"Game": [str(save_dir)]})
+        assert watcher.changed_since_clean("Game") is None
+        assert _wait_for(lambda: watcher.quiet_since("Game") is not None)
+        assert walkers and set(walkers) == {"save-watcher"}
+
+        watcher.mark_clean("Game", time.time())
+        assert watcher.changed_since_clean("Game") is False
+        (save_dir / "slot1" / "save.dat").write_bytes(b"new")
+        assert _wait_for(lambda: watcher.changed_since_clean("Game"))
+    finally:
+        watcher.close()
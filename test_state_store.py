@@ -0,0 +1,53 @@
+import json
+
+from core import state_store
+
+
+def test_state_store_point_updates_and_external_json_changes(tmp_path):
+    json_path = tmp_path / "favorites_status.json"
+    json_path.write_text('{"A": true, "B": false}', encoding="utf-8")
+    store = state_store.StateStore(str(tmp_path))
+    favorites = store.register("favorites", str(json_path), sort_keys=True, mirror=False)
+    changes = []
+    store.subscribe(lambda name, keys: changes.append((name, keys)))
+
+    assert favorites.load() == {"A": True, "B": False}
+    assert favorites.set("C", True)
+    assert not favorites.set("C", True)
+    assert changes == [("favorites", ["C"])]
+    # Exports are deferred until the debounce timer (or an explicit flush)
+    assert "C" not in json_path.read_text(encoding="utf-8")
+    store.flush()
+    assert '"C": true' in json_path.read_text(encoding="utf-8")
+
+    # A file replaced on disk (e.g. restored from the mirror) wins over the store
+    json_path.write_text('{"Z": true}', encoding="utf-8")
+    assert favorites.load(check_json=True) == {"Z": True}
+    store.close()
+
+    reopened = state_store.StateStore(str(tmp_path))
+    assert reopened.register("favorites", str(json_path), mirror=False).load(check_json=True) == {"Z": True}
+    reopened.close()
+
+
+def test_changes_made_before_an_external_replace_are_not_lost(tmp_path):
+    json_path = tmp_path / "favorites_status.json"
+    json_path.write_text('{"A": true, "B": true}', encoding="utf-8")
+    store = state_store.StateStore(str(tmp_path))
+    favorites = store.register("favorites", str(json_path), sort_keys=True, mirror=False)
+    assert favorites.load() == {"A": True, "B": True}
+
+    assert favorites.set("C", True)
+    assert favorites.delete("B")
+    # Restored from the mirror before the deferred export ran
+    json_path.write_text('{"A": false, "B": true, "Z": true}', encoding="utf-8")
+    store.flush()
+
+    expected = {"A": False, "C": True, "Z": True}
+    assert favorites.load() == expected
+    assert json.loads(json_path.read_text(encoding="utf-8")) == expected
+    store.close()
+
+    reopened = state_store.StateStore(str(tmp_path))
+    assert reopened.register("favorites", str(json_path), mirror=False).load(check_json=True) == expected
+    reopened.close()
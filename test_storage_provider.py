@@ -0,0 +1,73 @@
+import os
+
+from cloud_utils import storage_provider
+from cloud_utils.storage_provider import ProviderType, StorageProvider
+
+
+class FolderProvider(StorageProvider):
+    """Minimal provider that only implements the folder-level API."""
+
+    provider_type = ProviderType.SMB
+    name = "Folder"
+    is_connected = True
+
+    def __init__(self, remote_root):
+        super().__init__()
+        self.remote_root = remote_root
+
+    def upload_backup(self, local_path, profile_name, overwrite=True, max_backups=None, latest_only=False):
+        target = os.path.join(self.remote_root, profile_name)
+        os.makedirs(target, exist_ok=True)
+        uploaded = 0
+        for name in os.listdir(local_path):
+            with open(os.path.join(local_path, name), "rb") as f:
+                data = f.read()
+            with open(os.path.join(target, name), "wb") as f:
+                f.write(data)
+            if self.chunk_callback:
+                self.chunk_callback(len(data), len(data))
+            uploaded += 1
+        return {'ok': True, 'uploaded_count': uploaded, 'skipped_newer_or_same': 0, 'total_candidates': uploaded}
+
+    connect = disconnect = lambda self, **kwargs: True
+    download_backup = list_cloud_backups = delete_cloud_backup = lambda self, *args, **kwargs: None
+    get_storage_info = get_config = load_config = lambda self, *args, **kwargs: None
+
+
+def test_default_per_file_upload_goes_through_upload_backup(tmp_path):
+    local = tmp_path / "Game"
+    local.mkdir()
+    (local / "Backup_Game_1.zip").write_bytes(b"one")
+    (local / "Backup_Game_2.zip").write_bytes(b"second")
+    provider = FolderProvider(str(tmp_path / "remote"))
+
+    plan = provider.plan_upload(str(local), "Game", ["Backup_Game_2.zip", "Backup_Game_1.zip"])
+    assert plan == {'ok': True, 'to_upload': ["Backup_Game_2.zip", "Backup_Game_1.zip"], 'skipped': 0}
+
+    sent = []
+    assert provider.upload_file(str(local / "Backup_Game_2.zip"), "Game", "Backup_Game_2.zip", sent.append)
+    assert sent == [6]
+    assert os.listdir(tmp_path / "remote" / "Game") == ["Backup_Game_2.zip"]
+    assert provider.chunk_callback is None
+
+
+def test_only_selected_archives_are_checked_for_snapshots(tmp_path, monkeypatch):
+    for index in range(5):
+        path = tmp_path / f"Backup_Game_{index}.zip"
+        path.write_bytes(b"zip")
+        os.utime(path, (1_700_000_000 + index, 1_700_000_000 + index))
+    checked = []
+
+    def is_snapshot(path):
+        checked.append(os.path.basename(path))
+        return path.endswith("_4.zip")
+
+    monkeypatch.setattr(storage_provider.dedup_store, "is_snapshot_archive", is_snapshot)
+    select = storage_provider.select_zip_files_for_upload
+
+    assert select(str(tmp_path), latest_only=True) == ["Backup_Game_3.zip"]
+    assert checked == ["Backup_Game_4.zip", "Backup_Game_3.zip"]
+    checked.clear()
+    assert select(str(tmp_path), max_backups=2) == ["Backup_Game_3.zip", "Backup_Game_2.zip"]
+    assert len(checked) == 3
+    assert select(str(tmp_path)) == [f"Backup_Game_{index}.zip" for index in (3, 2, 1, 0)]
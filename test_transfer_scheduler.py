@@ -0,0 +1,75 @@
+import os
+
+from cloud_utils import transfer_scheduler
+from cloud_utils.storage_provider import ProviderType, StorageProvider
+
+
+class FlakyProvider(StorageProvider):
+    """Per-file provider whose uploads of the names in ``failing`` fail."""
+
+    provider_type = ProviderType.FTP
+    name = "Flaky"
+    is_connected = True
+    supports_parallel_upload = True
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+        self.uploaded = []
+        self.finished = []
+
+    def upload_file(self, local_file, profile_name, filename, progress=None):
+        if filename in self.failing:
+            return False
+        self.uploaded.append((profile_name, filename))
+        return True
+
+    def finish_upload(self, profile_name, max_backups=None):
+        self.finished.append(profile_name)
+
+    connect = disconnect = lambda self, **kwargs: True
+    upload_backup = download_backup = list_cloud_backups = delete_cloud_backup = lambda self, *args, **kwargs: None
+    get_storage_info = get_config = load_config = lambda self, *args, **kwargs: None
+
+
+def _profile(tmp_path, name, *files):
+    folder = tmp_path / name
+    folder.mkdir()
+    for index, filename in enumerate(files):
+        (folder / filename).write_bytes(b"zip")
+        os.utime(folder / filename, (1_700_000_000 + index, 1_700_000_000 + index))
+    return transfer_scheduler.UploadJob(name, str(folder))
+
+
+def test_failed_uploads_are_reported_and_skip_retention(tmp_path):
+    jobs = [
+        _profile(tmp_path, "Good", "Backup_Good_1.zip", "Backup_Good_2.zip"),
+        _profile(tmp_path, "Bad", "Backup_Bad_1.zip", "Backup_Bad_2.zip"),
+    ]
+    provider = FlakyProvider(failing={"Backup_Bad_1.zip"})
+    queue = transfer_scheduler.UploadQueue(str(tmp_path / "queue.json"))
+    scheduler = transfer_scheduler.TransferScheduler(provider, 2, upload_queue=queue)
+
+    good, bad = scheduler.run(jobs, max_backups=2)
+    assert good["ok"] and good["uploaded_count"] == 2 and good["failed_count"] == 0
+    assert not bad["ok"] and bad["uploaded_count"] == 1 and bad["failed_count"] == 1
+    assert "1 of 2" in bad["error"]
+    assert provider.finished == ["Good"]
+    # The failed file stays queued for the next run
+    assert queue.load(provider.provider_type.value) == {
+        "Bad": {"local_path": jobs[1].local_path, "files": ["Backup_Bad_1.zip"]},
+    }
+
+    provider.failing.clear()
+    [bad] = scheduler.run(jobs[1:], latest_only=True)
+    assert bad["ok"] and bad["failed_count"] == 0
+    assert ("Bad", "Backup_Bad_1.zip") in provider.uploaded
+
+
+def test_serial_upload_skips_retention_after_a_failure(tmp_path):
+    job = _profile(tmp_path, "Bad", "Backup_Bad_1.zip", "Backup_Bad_2.zip")
+    provider = FlakyProvider(failing={"Backup_Bad_1.zip"})
+
+    result = provider._upload_files_serially(job.local_path, "Bad", max_backups=2)
+    assert not result["ok"] and result["uploaded_count"] == 1 and result["failed_count"] == 1
+    assert provider.finished == []
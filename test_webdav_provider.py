@@ -0,0 +1,206 @@
+import itertools
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import quote, unquote, urlsplit
+
+import pytest
+
+from cloud_utils import webdav_provider
+from cloud_utils.webdav_provider import WebDAVProvider
+
+BASE_URL = "https://dav.example/remote/SaveState_Backups"
+ROOT = "/remote/SaveState_Backups"
+
+
+class Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeDAVSession:
+    """In-memory WebDAV server: collections get a new ETag whenever a member changes."""
+
+    def __init__(self, allow_infinity=True):
+        self.allow_infinity = allow_infinity
+        self.etags = itertools.count(1)
+        self.nodes = {ROOT: {"dir": True, "etag": self._etag()}}
+        self.calls = []
+
+    def _etag(self):
+        return f'"e{next(self.etags)}"'
+
+    def _touch_parent(self, path):
+        self.nodes[path.rpartition("/")[0]]["etag"] = self._etag()
+
+    def add_file(self, path, data):
+        self.nodes[path] = {"dir": False, "data": data, "etag": self._etag()}
+        self._touch_parent(path)
+
+    def add_dir(self, path):
+        self.nodes[path] = {"dir": True, "etag": self._etag()}
+        self._touch_parent(path)
+
+    def _entry(self, path, node):
+        modified = format_datetime(datetime(2024, 1, 1, tzinfo=timezone.utc), usegmt=True)
+        kind = "<D:collection/>" if node["dir"] else ""
+        length = "" if node["dir"] else f"<D:getcontentlength>{len(node['data'])}</D:getcontentlength>"
+        return (f"<D:response><D:href>{quote(path)}/</D:href><D:propstat><D:prop>"
+                f"<D:resourcetype>{kind}</D:resourcetype>{length}"
+                f"<D:getlastmodified>{modified}</D:getlastmodified>"
+                f"<D:getetag>{node['etag']}</D:getetag></D:prop></D:propstat></D:response>")
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        path = unquote(urlsplit(url).path).rstrip("/")
+        depth = (headers or {}).get("Depth")
+        self.calls.append((method, path, depth))
+        if method == "MKCOL":
+            self.add_dir(path)
+            return Response(201)
+        if path not in self.nodes:
+            return Response(404)
+        if depth == "infinity" and not self.allow_infinity:
+            return Response(403)
+        found = [path]
+        if depth == "1":
+            found += [p for p in self.nodes if p.rpartition("/")[0] == path]
+        elif depth == "infinity":
+            found += [p for p in self.nodes if p.startswith(path + "/")]
+        body = "".join(self._entry(p, self.nodes[p]) for p in found)
+        return Response(207, f'<D:multistatus xmlns:D="DAV:">{body}</D:multistatus>'.encode())
+
+    def put(self, url, data=None, headers=None, timeout=None):
+        path = unquote(urlsplit(url).path)
+        headers = headers or {}
+        self.calls.append(("PUT", path, dict(headers)))
+        node = self.nodes.get(path)
+        if "If-Match" in headers and (node is None or node["etag"] != headers["If-Match"]):
+            return Response(412)
+        if headers.get("If-None-Match") == "*" and node is not None:
+            return Response(412)
+        self.add_file(path, data.read())
+        return Response(201, headers={"ETag": self.nodes[path]["etag"]})
+
+    def delete(self, url, timeout=None):
+        path = unquote(urlsplit(url).path)
+        self.calls.append(("DELETE", path, None))
+        if self.nodes.pop(path, None) is None:
+            return Response(404)
+        self._touch_parent(path)
+        return Response(204)
+
+    def propfinds(self, depth=None):
+        return [c for c in self.calls if c[0] == "PROPFIND" and (depth is None or c[2] == depth)]
+
+
+@pytest.fixture
+def dav():
+    session = FakeDAVSession()
+    provider = WebDAVProvider()
+    provider._session = session
+    provider._connected = True
+    provider._base_url = BASE_URL
+    return provider, session
+
+
+def test_depth_infinity_prefetch_fills_every_profile_listing(dav):
+    provider, server = dav
+    server.add_dir(f"{ROOT}/Game One")
+    server.add_file(f"{ROOT}/Game One/Backup_1.zip", b"one")
+    server.add_dir(f"{ROOT}/Other")
+
+    assert sorted(provider.prefetch_listings()) == ["Game One", "Other"]
+    assert server.propfinds() == [("PROPFIND", ROOT, "infinity")]
+    server.calls.clear()
+    listing = provider._get_listing(f"{BASE_URL}/{quote('Game One')}")
+    assert list(listing) == ["Backup_1.zip"] and listing["Backup_1.zip"]["size"] == 3
+    assert provider._get_listing(f"{BASE_URL}/Other") == {}
+    assert server.calls == []
+
+
+def test_refused_depth_infinity_falls_back_to_depth_one(dav):
+    provider, server = dav
+    server.allow_infinity = False
+    server.add_dir(f"{ROOT}/Game")
+    server.add_file(f"{ROOT}/Game/Backup_1.zip", b"one")
+
+    assert provider.prefetch_listings(["Game", "Missing"]) == ["Game"]
+    assert [c[2] for c in server.propfinds()] == ["infinity", "1"]
+    assert not provider._depth_infinity_ok
+    # Depth 1 only gave the ETag: the profile is listed on first use, the missing one is not
+    assert provider._get_listing(f"{BASE_URL}/Missing") == {}
+    assert list(provider._get_listing(f"{BASE_URL}/Game")) == ["Backup_1.zip"]
+    assert server.propfinds()[-1] == ("PROPFIND", f"{ROOT}/Game", "1")
+    server.calls.clear()
+    provider.prefetch_listings(["Game"])
+    assert [c[2] for c in server.propfinds()] == ["1"]
+
+
+def test_stale_listing_is_revalidated_with_the_collection_etag(dav, monkeypatch):
+    provider, server = dav
+    monkeypatch.setattr(webdav_provider, "_LISTING_FRESH_S", 0)
+    server.add_dir(f"{ROOT}/Game")
+    server.add_file(f"{ROOT}/Game/Backup_1.zip", b"one")
+    url = f"{BASE_URL}/Game"
+    assert list(provider._get_listing(url)) == ["Backup_1.zip"]
+
+    server.calls.clear()
+    assert list(provider._get_listing(url)) == ["Backup_1.zip"]
+    assert server.propfinds() == [("PROPFIND", f"{ROOT}/Game", "0")]
+
+    server.add_file(f"{ROOT}/Game/Backup_2.zip", b"two")
+    server.calls.clear()
+    assert sorted(provider._get_listing(url)) == ["Backup_1.zip", "Backup_2.zip"]
+    assert [c[2] for c in server.propfinds()] == ["0", "1"]
+
+
+def test_conditional_puts_never_overwrite_a_concurrent_change(dav, tmp_path):
+    provider, server = dav
+    server.add_dir(f"{ROOT}/Game")
+    server.add_file(f"{ROOT}/Game/Backup_1.zip", b"old")
+    listed_etag = server.nodes[f"{ROOT}/Game/Backup_1.zip"]["etag"]
+    local = tmp_path / "Backup_1.zip"
+    local.write_bytes(b"newer")
+    (tmp_path / "Backup_2.zip").write_bytes(b"two")
+
+    plan = provider.plan_upload(str(tmp_path), "Game", ["Backup_1.zip", "Backup_2.zip"])
+    assert plan["to_upload"] == ["Backup_1.zip", "Backup_2.zip"]
+    assert provider.upload_file(str(tmp_path / "Backup_2.zip"), "Game", "Backup_2.zip")
+    assert server.calls[-1][2] == {"If-None-Match": "*"}
+
+    server.add_file(f"{ROOT}/Game/Backup_1.zip", b"from another client")
+    assert not provider.upload_file(str(local), "Game", "Backup_1.zip")
+    assert server.calls[-1][2] == {"If-Match": listed_etag}
+    assert server.nodes[f"{ROOT}/Game/Backup_1.zip"]["data"] == b"from another client"
+    assert provider._listing_cache.get(f"{BASE_URL}/Game") is None
+
+    # The next plan re-lists and the retried PUT matches the new ETag
+    provider.plan_upload(str(tmp_path), "Game", ["Backup_1.zip"])
+    assert provider.upload_file(str(local), "Game", "Backup_1.zip")
+    assert server.nodes[f"{ROOT}/Game/Backup_1.zip"]["data"] == b"newer"
+
+
+def test_cleanup_uses_the_cached_listing_and_evicts_deleted_files(dav, monkeypatch):
+    provider, server = dav
+    server.add_dir(f"{ROOT}/Game")
+    for index in range(3):
+        server.add_file(f"{ROOT}/Game/Backup_{index}.zip", b"zip")
+    url = f"{BASE_URL}/Game"
+    provider.prefetch_listings(["Game"])
+    for index in range(3):
+        provider._listing_cache.record_file(url, f"Backup_{index}.zip", {
+            "is_dir": False, "size": 3, "etag": None,
+            "modified": datetime(2024, 1, 1 + index, tzinfo=timezone.utc),
+        })
+
+    server.calls.clear()
+    provider.finish_upload("Game", max_backups=2)
+    assert server.calls == [("DELETE", f"{ROOT}/Game/Backup_0.zip", None)]
+    assert sorted(provider._get_listing(url)) == ["Backup_1.zip", "Backup_2.zip"]
+
+    # A refused DELETE drops the cached listing instead of pretending the file is gone
+    monkeypatch.setattr(server, "delete", lambda url, timeout=None: Response(423))
+    provider.finish_upload("Game", max_backups=1)
+    assert provider._listing_cache.get(url) is None
+    assert sorted(provider._get_listing(url)) == ["Backup_1.zip", "Backup_2.zip"]
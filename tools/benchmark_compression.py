@@ -0,0 +1,104 @@
+# benchmark_compression.py
+# -*- coding: utf-8 -*-
+"""
+Compare backup archiving throughput: single-threaded zipfile vs parallel Deflate.
+
+Usage:
+    python -m tools.benchmark_compression <source_dir> [--level 6] [--workers 1 2 4 8] [--repeat 3]
+
+Without a source directory a synthetic save folder is generated (mixed
+compressible text/binary data plus incompressible random blocks).
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import parallel_zip  # noqa: E402
+
+
+def _make_synthetic_source(root: str, total_mb: int) -> str:
+    source = os.path.join(root, "SyntheticSaves")
+    os.makedirs(source)
+    text = b"".join(b"slot=%d;hp=100;pos=(%d,%d)\n" % (i, i * 3, i * 7) for i in range(40000))
+    for i in range(total_mb // 2):
+        with open(os.path.join(source, f"save_{i:03d}.dat"), "wb") as f:
+            f.write(text[: 1024 * 1024])
+            f.write(os.urandom(1024 * 1024 // 4))
+            f.write(bytes(1024 * 1024 * 3 // 4))
+    return source
+
+
+def _collect_entries(source: str) -> list:
+    parent_len = len(os.path.dirname(source)) + len(os.sep)
+    entries = []
+    for folder, _dirs, files in os.walk(source):
+        for name in files:
+            path = os.path.join(folder, name)
+            entries.append((path, path[parent_len:]))
+    return entries
+
+
+def _run_sequential(entries, out_path, level):
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level) as zipf:
+        for path, arcname in entries:
+            zipf.write(path, arcname=arcname)
+
+
+def _run_parallel(entries, out_path, level, workers):
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level) as zipf:
+        parallel_zip.write_entries(zipf, entries, level, workers)
+
+
+def _measure(func, out_path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    with zipfile.ZipFile(out_path) as zipf:
+        if zipf.testzip() is not None:
+            raise RuntimeError(f"Benchmark produced a corrupted archive: {out_path}")
+    return best, os.path.getsize(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", help="Folder to archive (default: synthetic data)")
+    parser.add_argument("--level", type=int, default=6, help="Deflate level (default: 6)")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, parallel_zip.get_worker_count(0)}),
+                        help="Worker counts to test for the parallel path")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant, best time is kept")
+    parser.add_argument("--synthetic-mb", type=int, default=128, help="Size of the synthetic data set")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="savestate_bench_")
+    try:
+        source = args.source or _make_synthetic_source(work_dir, args.synthetic_mb)
+        entries = _collect_entries(source)
+        total = sum(os.path.getsize(p) for p, _ in entries)
+        print(f"Source: {source} ({len(entries)} files, {total / 1048576:.1f} MiB), level {args.level}")
+
+        out_path = os.path.join(work_dir, "bench.zip")
+        base_time, base_size = _measure(lambda: _run_sequential(entries, out_path, args.level), out_path, args.repeat)
+        print(f"{'zipfile (sequential)':<24} {base_time:7.2f} s  {total / 1048576 / base_time:8.1f} MiB/s  "
+              f"{base_size / 1048576:8.1f} MiB")
+        for workers in args.workers:
+            elapsed, size = _measure(lambda: _run_parallel(entries, out_path, args.level, workers),
+                                     out_path, args.repeat)
+            print(f"{f'parallel ({workers} workers)':<24} {elapsed:7.2f} s  {total / 1048576 / elapsed:8.1f} MiB/s  "
+                  f"{size / 1048576:8.1f} MiB  x{base_time / elapsed:.2f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()